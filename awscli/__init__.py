@@ -17,6 +17,13 @@ A Universal Command Line Environment for Amazon Web Services.
 """
 
 import os
+import sys
+import time
+
+# When the CLI started to be imported, which is where the timings written
+# by ``--debug-timing`` start from.
+IMPORT_START_TIME = time.perf_counter()
+IMPORT_START_MODULES = len(sys.modules)
 
 __version__ = '1.45.55'
 
@@ -0,0 +1,440 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Running the commands of a batch file in a single process.
+
+``aws --batch-file cmds.txt`` runs each line of ``cmds.txt`` as if it
+were the arguments of its own ``aws`` command, with the other global
+arguments of the batch command added to every line::
+
+    # cmds.txt
+    s3api put-bucket-tagging --bucket bucket-1 --tagging file://tags.json
+    s3api put-bucket-tagging --bucket bucket-2 --tagging file://tags.json
+
+Every line runs with its own CLI driver, session and clients, so its
+arguments and the handlers its command registers cannot affect the other
+lines, but the lines share the loaded models and the connections of the
+clients of the operations they call.
+
+With ``--batch-concurrency`` greater than one, up to that many lines run
+at the same time.  Lines that depend on the lines before them are
+separated from them by a blank line: each group of lines between blank
+lines only starts once the group before it is done.
+
+"""
+import concurrent.futures
+import io
+import logging
+import shlex
+import signal
+import sys
+import threading
+
+from awscli.argparser import ArgTableArgParser
+from awscli.compat import bytes_print, compat_open, get_stderr_text_writer
+from awscli.utils import write_exception
+
+LOG = logging.getLogger(__name__)
+
+BATCH_ARGUMENTS = ['batch-file', 'batch-concurrency', 'batch-output']
+ORDERED_OUTPUT = 'ordered'
+TAGGED_OUTPUT = 'tagged'
+
+_BATCH_OPTIONS = ['--' + name for name in BATCH_ARGUMENTS]
+# The global arguments that only change how the response of an operation
+# is displayed, so the lines that only differ in them can share connections.
+_DISPLAY_GLOBALS = [
+    'command',
+    'output',
+    'query',
+    'color',
+    'paginate',
+    'debug',
+    'debug_timing',
+]
+# The loggers that the global arguments of every line configure.
+_CONFIGURED_LOGGERS = ['awscli', 'botocore', 's3transfer', 'urllib3']
+_ERROR_RC = 255
+_INTERRUPTED_RC = 128 + signal.SIGINT
+
+
+class BatchFileError(Exception):
+    pass
+
+
+def is_batch_command(args):
+    return any(_get_option_name(arg) in _BATCH_OPTIONS for arg in args)
+
+
+def split_batch_args(args):
+    """Splits the batch arguments from the arguments shared by all lines
+
+    :returns: The batch arguments and the shared arguments.
+    """
+    batch_args = []
+    shared_args = []
+    remaining = iter(args)
+    for arg in remaining:
+        if _get_option_name(arg) not in _BATCH_OPTIONS:
+            shared_args.append(arg)
+            continue
+        batch_args.append(arg)
+        if '=' not in arg:
+            value = next(remaining, None)
+            if value is not None:
+                batch_args.append(value)
+    return batch_args, shared_args
+
+
+def _get_option_name(arg):
+    return arg.split('=', 1)[0]
+
+
+class BatchCommand:
+    def __init__(self, line_number, args):
+        self.line_number = line_number
+        self.args = args
+
+
+def read_batch_file(filename, stdin=None):
+    """Reads the commands of a batch file
+
+    Lines are split into arguments like a shell would split them, and a
+    line that ends with a backslash is continued on the next line.  Empty
+    lines and comments are skipped, and a leading ``aws`` is removed.
+
+    :param filename: The file to read, or ``-`` to read from stdin.
+
+    :returns: The groups of commands separated by blank lines.
+    """
+    if filename == '-':
+        lines = (stdin or sys.stdin).read().splitlines()
+    else:
+        try:
+            with compat_open(filename, 'r') as f:
+                lines = f.read().splitlines()
+        except (IOError, OSError, UnicodeDecodeError) as e:
+            raise BatchFileError(f'Unable to read batch file {filename}: {e}')
+    groups = [[]]
+    line_number = 0
+    while line_number < len(lines):
+        start = line_number
+        text = lines[line_number]
+        line_number += 1
+        while text.endswith('\\') and line_number < len(lines):
+            text = text[:-1] + lines[line_number]
+            line_number += 1
+        if not text.strip():
+            if groups[-1]:
+                groups.append([])
+            continue
+        command = _parse_line(text, start + 1)
+        if command is not None:
+            groups[-1].append(command)
+    return [group for group in groups if group]
+
+
+def _parse_line(text, line_number):
+    try:
+        args = shlex.split(text, comments=True)
+    except ValueError as e:
+        raise BatchFileError(
+            f'Unable to parse line {line_number} of batch file: {e}'
+        )
+    if args and args[0] == 'aws':
+        args = args[1:]
+    if not args:
+        return None
+    if is_batch_command(args):
+        raise BatchFileError(
+            f'Batch file cannot run another batch file on line {line_number}'
+        )
+    return BatchCommand(line_number, args)
+
+
+class HTTPSessionCache:
+    """The HTTP sessions shared by the clients of the commands of a batch
+
+    Every command creates its own clients, since a client keeps the event
+    handlers of the session that created it, and the handlers that the
+    command registers while it runs must only apply to its own calls.  The
+    clients of the commands that call operations of the same service with
+    the same global arguments, other than the ones that only change how the
+    response is displayed, share the HTTP session, and so the connections,
+    of the first of these clients.
+    """
+
+    def __init__(self):
+        self._http_sessions = {}
+        self._lock = threading.Lock()
+
+    def share_http_session(self, service_name, parsed_globals, client):
+        """Makes a client use the cached HTTP session for its arguments
+
+        The HTTP session of the client is cached if there is none yet.
+        """
+        key = self._get_key(service_name, parsed_globals)
+        endpoint = client._endpoint
+        with self._lock:
+            http_session = self._http_sessions.setdefault(
+                key, endpoint.http_session
+            )
+        endpoint.http_session = http_session
+
+    def _get_key(self, service_name, parsed_globals):
+        return (
+            service_name,
+            tuple(
+                (name, repr(value))
+                for name, value in sorted(vars(parsed_globals).items())
+                if name not in _DISPLAY_GLOBALS
+            ),
+        )
+
+
+class BatchResult:
+    def __init__(self, command, rc, stdout=b'', stderr=b''):
+        self.command = command
+        self.rc = rc
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class BatchRunner:
+    def __init__(self, create_driver, argument_table):
+        """Runs the commands of a batch file
+
+        :param create_driver: Called with an ``HTTPSessionCache`` to create
+            the CLI driver that runs a command.
+        :param argument_table: The argument table of the global arguments.
+        """
+        self._create_driver = create_driver
+        self._argument_table = argument_table
+        self._http_session_cache = HTTPSessionCache()
+
+    def run(self, args):
+        """Runs a batch command
+
+        :param args: The arguments of the batch command, with the 'aws'
+            removed.
+
+        :returns: The return code of the first command that failed, in the
+            order of the lines of the batch file, or 0 if all succeeded.
+        """
+        batch_args, shared_args = split_batch_args(args)
+        parsed_args = self._parse_batch_args(batch_args)
+        try:
+            groups = read_batch_file(parsed_args.batch_file)
+        except BatchFileError as e:
+            write_exception(e, outfile=get_stderr_text_writer())
+            return _ERROR_RC
+        if parsed_args.batch_output == TAGGED_OUTPUT or (
+            parsed_args.batch_concurrency > 1
+        ):
+            results = self._run_captured(
+                groups,
+                shared_args,
+                parsed_args.batch_concurrency,
+                parsed_args.batch_output,
+            )
+        else:
+            results = self._run_sequentially(groups, shared_args)
+        if results and results[-1].rc == _INTERRUPTED_RC:
+            return _INTERRUPTED_RC
+        for result in results:
+            if result.rc:
+                return result.rc
+        return 0
+
+    def _parse_batch_args(self, batch_args):
+        parser = ArgTableArgParser(
+            {name: self._argument_table[name] for name in BATCH_ARGUMENTS}
+        )
+        parsed_args, remaining = parser.parse_known_args(batch_args)
+        if remaining:
+            parser.error(f'unrecognized arguments: {" ".join(remaining)}')
+        try:
+            parsed_args.batch_concurrency = int(parsed_args.batch_concurrency)
+        except ValueError:
+            parsed_args.batch_concurrency = 0
+        if parsed_args.batch_concurrency < 1:
+            parser.error('--batch-concurrency must be a number of at least 1')
+        return parsed_args
+
+    def _run_sequentially(self, groups, shared_args):
+        # The output of a command that runs on its own is not captured, so
+        # it is displayed as it is written.
+        results = []
+        for group in groups:
+            for command in group:
+                loggers = _get_logger_state()
+                rc = self._run_command(command, shared_args)
+                _restore_logger_state(loggers)
+                result = BatchResult(command, rc)
+                results.append(result)
+                self._report_rc(result, ORDERED_OUTPUT)
+                if result.rc == _INTERRUPTED_RC:
+                    return results
+        return results
+
+    def _run_captured(self, groups, shared_args, concurrency, output):
+        stdout = _ThreadLocalStream(sys.stdout)
+        stderr = _ThreadLocalStream(sys.stderr)
+        sys.stdout, sys.stderr = stdout, stderr
+        executor = concurrent.futures.ThreadPoolExecutor(concurrency)
+        results = []
+        loggers = _get_logger_state()
+        try:
+            for group in groups:
+                futures = [
+                    executor.submit(
+                        self._run_captured_command,
+                        command,
+                        shared_args,
+                        stdout,
+                        stderr,
+                    )
+                    for command in group
+                ]
+                if output == TAGGED_OUTPUT:
+                    futures = concurrent.futures.as_completed(futures)
+                for future in futures:
+                    result = future.result()
+                    results.append(result)
+                    self._write_result(result, output, stdout, stderr)
+                _restore_logger_state(loggers)
+        except KeyboardInterrupt:
+            # Commands that are already running cannot be interrupted, but
+            # no more commands are started.
+            executor.shutdown(wait=False, cancel_futures=True)
+            stdout.write('\n')
+            results.append(BatchResult(None, _INTERRUPTED_RC))
+            return results
+        finally:
+            sys.stdout, sys.stderr = stdout.stream, stderr.stream
+        executor.shutdown()
+        return results
+
+    def _run_captured_command(self, command, shared_args, stdout, stderr):
+        captured_stdout = self._create_capture(stdout.stream)
+        captured_stderr = self._create_capture(stderr.stream)
+        stdout.set_thread_stream(captured_stdout)
+        stderr.set_thread_stream(captured_stderr)
+        try:
+            rc = self._run_command(command, shared_args)
+        finally:
+            stdout.set_thread_stream(None)
+            stderr.set_thread_stream(None)
+        return BatchResult(
+            command,
+            rc,
+            self._get_captured(captured_stdout),
+            self._get_captured(captured_stderr),
+        )
+
+    def _create_capture(self, stream):
+        return io.TextIOWrapper(
+            io.BytesIO(),
+            encoding=getattr(stream, 'encoding', None) or 'utf-8',
+            errors=getattr(stream, 'errors', None) or 'strict',
+            write_through=True,
+        )
+
+    def _get_captured(self, stream):
+        stream.flush()
+        return stream.buffer.getvalue()
+
+    def _run_command(self, command, shared_args):
+        try:
+            driver = self._create_driver(self._http_session_cache)
+            return driver.main(shared_args + command.args)
+        except SystemExit as e:
+            # Errors parsing the arguments of the command exit through
+            # argparse.
+            return e.code if isinstance(e.code, int) else _ERROR_RC
+        except Exception as e:
+            LOG.debug('Exception running batch command', exc_info=True)
+            write_exception(e, outfile=get_stderr_text_writer())
+            return _ERROR_RC
+
+    def _write_result(self, result, output, stdout, stderr):
+        if output == TAGGED_OUTPUT:
+            prefix = f'[{result.command.line_number}] '.encode('utf-8')
+            self._write_tagged(stdout.stream, prefix, result.stdout)
+            self._write_tagged(stderr.stream, prefix, result.stderr)
+        else:
+            self._write_bytes(stdout.stream, result.stdout)
+            self._write_bytes(stderr.stream, result.stderr)
+        self._report_rc(result, output, stderr.stream)
+
+    def _write_tagged(self, stream, prefix, data):
+        if not data:
+            return
+        lines = data.split(b'\n')
+        if not lines[-1]:
+            lines.pop()
+        self._write_bytes(
+            stream, b''.join(prefix + line + b'\n' for line in lines)
+        )
+
+    def _write_bytes(self, stream, data):
+        if not data:
+            return
+        stream.flush()
+        bytes_print(data, stream)
+        stream.flush()
+
+    def _report_rc(self, result, output, stream=None):
+        if stream is None:
+            stream = sys.stderr
+        line_number = result.command.line_number
+        if output == TAGGED_OUTPUT:
+            stream.write(f'[{line_number}] return code: {result.rc}\n')
+        elif result.rc:
+            stream.write(
+                f'Command on line {line_number} failed with return code '
+                f'{result.rc}\n'
+            )
+        stream.flush()
+
+
+class _ThreadLocalStream:
+    """A standard stream that each thread can redirect on its own"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def set_thread_stream(self, stream):
+        self._local.stream = stream
+
+    def __getattr__(self, name):
+        stream = getattr(self._local, 'stream', None)
+        if stream is None:
+            stream = self.stream
+        return getattr(stream, name)
+
+
+# Every command configures the loggers for its --debug argument, and the
+# handlers it adds would otherwise pile up over the batch.
+def _get_logger_state():
+    state = []
+    for name in _CONFIGURED_LOGGERS:
+        logger = logging.getLogger(name)
+        state.append((logger, logger.level, list(logger.handlers)))
+    return state
+
+
+def _restore_logger_state(state):
+    for logger, level, handlers in state:
+        logger.setLevel(level)
+        logger.handlers[:] = handlers
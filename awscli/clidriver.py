@@ -13,6 +13,7 @@
 import logging
 import signal
 import sys
+import time
 
 import botocore.session
 from botocore.compat import OrderedDict, copy_kwargs
@@ -23,7 +24,12 @@ from botocore.exceptions import (
 )
 from botocore.history import get_global_history_recorder
 
-from awscli import EnvironmentVariables, __version__
+from awscli import (
+    IMPORT_START_MODULES,
+    IMPORT_START_TIME,
+    EnvironmentVariables,
+    __version__,
+)
 from awscli.alias import AliasCommandInjector, AliasLoader
 from awscli.argparser import (
     USAGE,
@@ -39,6 +45,8 @@ from awscli.arguments import (
     ListArgument,
     UnknownArgumentError,
 )
+from awscli.batch import BatchRunner, is_batch_command
+from awscli.commandcache import CommandTableCache
 from awscli.commands import CLICommand
 from awscli.compat import get_stderr_text_writer
 from awscli.formatter import get_formatter
@@ -48,6 +56,11 @@ from awscli.help import (
     ServiceHelpCommand,
 )
 from awscli.plugin import load_plugins
+from awscli.timing import (
+    NullPhaseTimer,
+    PhaseTimer,
+    resolve_debug_timing_format,
+)
 from awscli.utils import emit_top_level_args_parsed_event, write_exception, create_nested_client, resolve_v2_debug_mode
 from botocore import __version__ as botocore_version
 from botocore import xform_name
@@ -70,20 +83,36 @@ HISTORY_RECORDER = get_global_history_recorder()
 
 
 def main():
-    driver = create_clidriver()
+    phase_timer = PhaseTimer(start_time=IMPORT_START_TIME)
+    phase_timer.add_phase(
+        'import',
+        IMPORT_START_TIME,
+        time.perf_counter(),
+        imports=len(sys.modules) - IMPORT_START_MODULES,
+    )
+    driver = create_clidriver(phase_timer=phase_timer)
     rc = driver.main()
     HISTORY_RECORDER.record('CLI_RC', rc, 'CLI')
     return rc
 
 
-def create_clidriver():
-    session = botocore.session.Session(EnvironmentVariables)
-    _set_user_agent_for_session(session)
-    load_plugins(
-        session.full_config.get('plugins', {}),
-        event_hooks=session.get_component('event_emitter'),
+def create_clidriver(phase_timer=None):
+    if phase_timer is None:
+        phase_timer = PhaseTimer()
+    with phase_timer.phase('create-session'):
+        session = botocore.session.Session(EnvironmentVariables)
+        _set_user_agent_for_session(session)
+    with phase_timer.phase('load-config'):
+        plugins = session.full_config.get('plugins', {})
+    with phase_timer.phase('load-plugins'):
+        load_plugins(
+            plugins, event_hooks=session.get_component('event_emitter')
+        )
+    driver = CLIDriver(
+        session=session,
+        command_table_cache=CommandTableCache(session),
+        phase_timer=phase_timer,
     )
-    driver = CLIDriver(session=session)
     return driver
 
 
@@ -94,12 +123,23 @@ def _set_user_agent_for_session(session):
 
 
 class CLIDriver:
-    def __init__(self, session=None):
+    def __init__(
+        self,
+        session=None,
+        command_table_cache=None,
+        phase_timer=None,
+        http_session_cache=None,
+    ):
         if session is None:
             self.session = botocore.session.get_session(EnvironmentVariables)
             _set_user_agent_for_session(self.session)
         else:
             self.session = session
+        self.command_table_cache = command_table_cache
+        if phase_timer is None:
+            phase_timer = PhaseTimer()
+        self.phase_timer = phase_timer
+        self.http_session_cache = http_session_cache
         self._cli_data = None
         self._command_table = None
         self._argument_table = None
@@ -142,12 +182,20 @@ class CLIDriver:
 
     def _build_builtin_commands(self, session):
         commands = OrderedDict()
-        services = session.get_available_services()
+        if self.command_table_cache is None:
+            services = session.get_available_services()
+        else:
+            services = self.command_table_cache.get(
+                'services', session.get_available_services
+            )
         for service_name in services:
             commands[service_name] = ServiceCommand(
                 cli_name=service_name,
                 session=self.session,
                 service_name=service_name,
+                command_table_cache=self.command_table_cache,
+                phase_timer=self.phase_timer,
+                http_session_cache=self.http_session_cache,
             )
         return commands
 
@@ -216,22 +264,33 @@ class CLIDriver:
         """
         if args is None:
             args = sys.argv[1:]
-        command_table = self._get_command_table()
-        parser = self._create_parser(command_table)
-        self._add_aliases(command_table, parser)
-        parsed_args, remaining = parser.parse_known_args(args)
+        if is_batch_command(args):
+            return self._run_batch(args)
+        with self.phase_timer.phase('build-command-table'):
+            command_table = self._get_command_table()
+            parser = self._create_parser(command_table)
+            self._add_aliases(command_table, parser)
+        with self.phase_timer.phase('parse-global-args'):
+            parsed_args, remaining = parser.parse_known_args(args)
+        debug_timing_format = resolve_debug_timing_format(parsed_args)
+        if debug_timing_format is not None:
+            self.phase_timer.register_request_timing(self.session)
         try:
             # Because _handle_top_level_args emits events, it's possible
             # that exceptions can be raised, which should have the same
             # general exception handling logic as calling into the
             # command table.  This is why it's in the try/except clause.
-            self._handle_top_level_args(parsed_args, remaining)
-            self._emit_session_event(parsed_args)
+            with self.phase_timer.phase('handle-global-args'):
+                self._handle_top_level_args(parsed_args, remaining)
+                self._emit_session_event(parsed_args)
             HISTORY_RECORDER.record(
                 'CLI_VERSION', self.session.user_agent(), 'CLI'
             )
             HISTORY_RECORDER.record('CLI_ARGUMENTS', args, 'CLI')
-            return command_table[parsed_args.command](remaining, parsed_args)
+            with self.phase_timer.phase('run-command'):
+                return command_table[parsed_args.command](
+                    remaining, parsed_args
+                )
         except UnknownArgumentError as e:
             sys.stderr.write("usage: %s\n" % USAGE)
             sys.stderr.write(str(e))
@@ -261,6 +320,26 @@ class CLIDriver:
             LOG.debug("Exiting with rc 255")
             write_exception(e, outfile=get_stderr_text_writer())
             return 255
+        finally:
+            if debug_timing_format is not None:
+                self.phase_timer.write(debug_timing_format)
+
+    def _run_batch(self, args):
+        runner = BatchRunner(
+            self._create_batch_driver, self._get_argument_table()
+        )
+        return runner.run(args)
+
+    def _create_batch_driver(self, http_session_cache):
+        driver = create_clidriver()
+        # The commands of a batch share the data this driver loaded.
+        driver.session.register_component(
+            'data_loader', self.session.get_component('data_loader')
+        )
+        if self.command_table_cache is None:
+            driver.command_table_cache = None
+        driver.http_session_cache = http_session_cache
+        return driver
 
     def _emit_session_event(self, parsed_args):
         # This event is guaranteed to run after the session has been
@@ -319,7 +398,15 @@ class ServiceCommand(CLICommand):
 
     """
 
-    def __init__(self, cli_name, session, service_name=None):
+    def __init__(
+        self,
+        cli_name,
+        session,
+        service_name=None,
+        command_table_cache=None,
+        phase_timer=None,
+        http_session_cache=None,
+    ):
         # The cli_name is the name the user types, the name we show
         # in doc, etc.
         # The service_name is the name we used internally with botocore.
@@ -340,6 +427,11 @@ class ServiceCommand(CLICommand):
             self._service_name = service_name
         self._lineage = [self]
         self._service_model = None
+        self._command_table_cache = command_table_cache
+        if phase_timer is None:
+            phase_timer = NullPhaseTimer()
+        self._phase_timer = phase_timer
+        self._http_session_cache = http_session_cache
 
     @property
     def name(self):
@@ -368,39 +460,87 @@ class ServiceCommand(CLICommand):
 
     def _get_service_model(self):
         if self._service_model is None:
-            try:
-                api_version = self.session.get_config_variable(
-                    'api_versions'
-                ).get(self._service_name, None)
-            except ProfileNotFound:
-                api_version = None
             self._service_model = self.session.get_service_model(
-                self._service_name, api_version=api_version
+                self._service_name, api_version=self._get_api_version()
             )
         return self._service_model
 
+    def _get_api_version(self):
+        try:
+            return self.session.get_config_variable('api_versions').get(
+                self._service_name, None
+            )
+        except ProfileNotFound:
+            return None
+
+    def get_cached_value(self, name, load):
+        """Returns a value derived from the model of the service
+
+        The value is cached with the command table cache of the CLI, if it
+        has one, for the API version of the service that is used.
+
+        :param name: The name of the value.
+        :param load: Called with no arguments to load the value from the
+            service model.  It must return a value that can be serialized
+            to JSON.
+        """
+        if self._command_table_cache is None:
+            return load()
+        api_version = self._get_api_version() or ''
+        return self._command_table_cache.get(
+            f'{self._service_name}/{api_version}/{name}', load
+        )
+
     def __call__(self, args, parsed_globals):
         # Once we know we're trying to call a service for this operation
         # we can go ahead and create the parser for it.  We
         # can also grab the Service object from botocore.
-        service_parser = self._create_parser()
-        parsed_args, remaining = service_parser.parse_known_args(args)
-        command_table = self._get_command_table()
+        with self._phase_timer.phase('build-service-command-table'):
+            service_parser = self._create_parser()
+            parsed_args, remaining = service_parser.parse_known_args(args)
+            command_table = self._get_command_table()
         return command_table[parsed_args.operation](remaining, parsed_globals)
 
     def _create_command_table(self):
         command_table = OrderedDict()
-        service_model = self._get_service_model()
-        for operation_name in service_model.operation_names:
-            cli_name = xform_name(operation_name, '-')
-            operation_model = service_model.operation_model(operation_name)
-            command_table[cli_name] = ServiceOperation(
-                name=cli_name,
-                parent_name=self._name,
-                session=self.session,
-                operation_model=operation_model,
-                operation_caller=CLIOperationCaller(self.session),
+        if self._command_table_cache is None:
+            service_model = self._get_service_model()
+            for operation_name in service_model.operation_names:
+                cli_name = xform_name(operation_name, '-')
+                operation_model = service_model.operation_model(operation_name)
+                command_table[cli_name] = ServiceOperation(
+                    name=cli_name,
+                    parent_name=self._name,
+                    session=self.session,
+                    operation_model=operation_model,
+                    operation_caller=CLIOperationCaller(
+                        self.session,
+                        self._phase_timer,
+                        self._http_session_cache,
+                    ),
+                    phase_timer=self._phase_timer,
+                )
+        else:
+            # The service model is only loaded once one of the operations
+            # needs it, which is usually only the operation that is run.
+            operations = self.get_cached_value(
+                'operations', self._load_operations
             )
+            for cli_name, operation_name, deprecated in operations:
+                command_table[cli_name] = LazyServiceOperation(
+                    name=cli_name,
+                    parent_name=self._name,
+                    session=self.session,
+                    operation_caller=CLIOperationCaller(
+                        self.session,
+                        self._phase_timer,
+                        self._http_session_cache,
+                    ),
+                    service_command=self,
+                    operation_name=operation_name,
+                    deprecated=deprecated,
+                    phase_timer=self._phase_timer,
+                )
         self.session.emit(
             f'building-command-table.{self._name}',
             command_table=command_table,
@@ -410,6 +550,17 @@ class ServiceCommand(CLICommand):
         self._add_lineage(command_table)
         return command_table
 
+    def _load_operations(self):
+        service_model = self._get_service_model()
+        return [
+            [
+                xform_name(operation_name, '-'),
+                operation_name,
+                service_model.operation_model(operation_name).deprecated,
+            ]
+            for operation_name in service_model.operation_names
+        ]
+
     def _add_lineage(self, command_table):
         for command in command_table:
             command_obj = command_table[command]
@@ -450,7 +601,13 @@ class ServiceOperation:
     DEFAULT_ARG_CLASS = CLIArgument
 
     def __init__(
-        self, name, parent_name, operation_caller, operation_model, session
+        self,
+        name,
+        parent_name,
+        operation_caller,
+        operation_model,
+        session,
+        phase_timer=None,
     ):
         """
 
@@ -471,6 +628,9 @@ class ServiceOperation:
         :type session: ``botocore.session.Session``
         :param session: The session object.
 
+        :type phase_timer: ``awscli.timing.PhaseTimer``
+        :param phase_timer: Times the phases of running the operation.
+
         """
         self._arg_table = None
         self._name = name
@@ -481,9 +641,15 @@ class ServiceOperation:
         self._lineage = [self]
         self._operation_model = operation_model
         self._session = session
-        if operation_model.deprecated:
+        if phase_timer is None:
+            phase_timer = NullPhaseTimer()
+        self._phase_timer = phase_timer
+        if self._is_deprecated():
             self._UNDOCUMENTED = True
 
+    def _is_deprecated(self):
+        return self._operation_model.deprecated
+
     @property
     def name(self):
         return self._name
@@ -518,16 +684,18 @@ class ServiceOperation:
             'before-building-argument-table-parser.'
             f'{self._parent_name}.{self._name}'
         )
-        self._emit(
-            event,
-            argument_table=self.arg_table,
-            args=args,
-            session=self._session,
-            parsed_globals=parsed_globals,
-        )
-        operation_parser = self._create_operation_parser(self.arg_table)
-        self._add_help(operation_parser)
-        parsed_args, remaining = operation_parser.parse_known_args(args)
+        with self._phase_timer.phase('build-argument-table'):
+            self._emit(
+                event,
+                argument_table=self.arg_table,
+                args=args,
+                session=self._session,
+                parsed_globals=parsed_globals,
+            )
+        with self._phase_timer.phase('parse-arguments'):
+            operation_parser = self._create_operation_parser(self.arg_table)
+            self._add_help(operation_parser)
+            parsed_args, remaining = operation_parser.parse_known_args(args)
         if parsed_args.help == 'help':
             op_help = self.create_help_command()
             return op_help(remaining, parsed_globals)
@@ -541,9 +709,10 @@ class ServiceOperation:
         self._emit(
             event, parsed_args=parsed_args, parsed_globals=parsed_globals
         )
-        call_parameters = self._build_call_parameters(
-            parsed_args, self.arg_table, parsed_globals
-        )
+        with self._phase_timer.phase('build-parameters'):
+            call_parameters = self._build_call_parameters(
+                parsed_args, self.arg_table, parsed_globals
+            )
 
         self._detect_binary_file_migration_change(
             self._session,
@@ -708,11 +877,65 @@ class ServiceOperation:
                 )
 
 
+class LazyServiceOperation(ServiceOperation):
+    """A service operation that loads its model once it is needed.
+
+    This is used for the command tables of services that are built from
+    the operation names in the command table cache, so the model of the
+    service is only loaded when one of its operations is run or
+    documented.
+
+    """
+
+    def __init__(
+        self,
+        name,
+        parent_name,
+        operation_caller,
+        session,
+        service_command,
+        operation_name,
+        deprecated=False,
+        phase_timer=None,
+    ):
+        self._service_command = service_command
+        self._operation_name = operation_name
+        self._deprecated = deprecated
+        super().__init__(
+            name=name,
+            parent_name=parent_name,
+            operation_caller=operation_caller,
+            operation_model=None,
+            session=session,
+            phase_timer=phase_timer,
+        )
+
+    @property
+    def _operation_model(self):
+        if self._loaded_operation_model is None:
+            service_model = self._service_command.service_model
+            self._loaded_operation_model = service_model.operation_model(
+                self._operation_name
+            )
+        return self._loaded_operation_model
+
+    @_operation_model.setter
+    def _operation_model(self, value):
+        self._loaded_operation_model = value
+
+    def _is_deprecated(self):
+        return self._deprecated
+
+
 class CLIOperationCaller:
     """Call an AWS operation and format the response."""
 
-    def __init__(self, session):
+    def __init__(self, session, phase_timer=None, http_session_cache=None):
         self._session = session
+        if phase_timer is None:
+            phase_timer = NullPhaseTimer()
+        self._phase_timer = phase_timer
+        self._http_session_cache = http_session_cache
 
     def invoke(self, service_name, operation_name, parameters, parsed_globals):
         """Invoke an operation and format the response.
@@ -738,18 +961,38 @@ class CLIOperationCaller:
             value is returned.
 
         """
-        client = create_nested_client(
+        if resolve_debug_timing_format(parsed_globals) is not None:
+            # Creating the client resolves the credentials, which are
+            # resolved first so that they are timed on their own.
+            with self._phase_timer.phase('resolve-credentials'):
+                self._session.get_credentials()
+        with self._phase_timer.phase('create-client'):
+            client = self._get_client(service_name, parsed_globals)
+        with self._phase_timer.phase('call-operation'):
+            response = self._make_client_call(
+                client, operation_name, parameters, parsed_globals
+            )
+        # Paginated responses are only requested while they are displayed.
+        with self._phase_timer.phase('display-response'):
+            self._display_response(operation_name, response, parsed_globals)
+        return 0
+
+    def _get_client(self, service_name, parsed_globals):
+        client = self._create_client(service_name, parsed_globals)
+        if self._http_session_cache is not None:
+            self._http_session_cache.share_http_session(
+                service_name, parsed_globals, client
+            )
+        return client
+
+    def _create_client(self, service_name, parsed_globals):
+        return create_nested_client(
             self._session,
             service_name,
             region_name=parsed_globals.region,
             endpoint_url=parsed_globals.endpoint_url,
             verify=parsed_globals.verify_ssl,
         )
-        response = self._make_client_call(
-            client, operation_name, parameters, parsed_globals
-        )
-        self._display_response(operation_name, response, parsed_globals)
-        return 0
 
     def _make_client_call(
         self, client, operation_name, parameters, parsed_globals
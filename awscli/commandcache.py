@@ -0,0 +1,117 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import threading
+
+from botocore import __version__ as botocore_version
+from botocore.loaders import Loader
+
+from awscli import __version__ as awscli_version
+from awscli.utils import SharedJSONFile
+
+COMMAND_TABLE_CACHE_FILENAME = os.path.expanduser(
+    os.path.join('~', '.aws', 'cli', 'cache', 'command-tables.json')
+)
+
+# The data paths that are only changed by upgrading awscli or botocore,
+# which is already part of the cache key.
+_PACKAGE_DATA_PATHS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'),
+    Loader.BUILTIN_DATA_PATH,
+]
+
+
+def get_data_path_state(path):
+    """Returns what changes when models are added to a data path"""
+    if path in _PACKAGE_DATA_PATHS:
+        return [path]
+    # Models added to the other data paths, for example with
+    # ``aws configure add-model``, change the modification times of
+    # the files and directories they are added to.
+    mtimes = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in [''] + sorted(filenames):
+            filename = os.path.join(dirpath, name)
+            try:
+                mtimes.append([filename, os.stat(filename).st_mtime_ns])
+            except OSError:
+                continue
+    return [path, mtimes]
+
+
+class CommandTableCache:
+    def __init__(self, session, filename=None):
+        """Caches what the command tables are built from on disk
+
+        Building the command tables of the CLI needs the list of available
+        services and the service models of the services that are run.
+        These are cached for the versions of awscli and botocore, the
+        plugins, and the models that are installed, so that the models only
+        need to be loaded once an operation actually runs.
+
+        :type session: botocore.session.Session
+        :param session: The session the command tables are built with.
+        :param filename: The JSON file the values are kept in.
+        """
+        self._session = session
+        if filename is None:
+            filename = COMMAND_TABLE_CACHE_FILENAME
+        self._file = SharedJSONFile(filename, 'command table cache')
+        self._lock = threading.Lock()
+        self._key = None
+        self._values = None
+
+    def get(self, name, load):
+        """Returns a cached value, loading and caching it if it is missing
+
+        :param name: The name of the value.
+        :param load: Called with no arguments to load the value.  It must
+            return a value that can be serialized to JSON.
+        """
+        with self._lock:
+            if self._values is None:
+                self._key = self._get_key()
+                self._values = self._get_values(self._file.load())
+            if name in self._values:
+                return self._values[name]
+        value = load()
+        with self._lock:
+            cached = self._file.update(
+                lambda cached: self._add_value(cached, name, value))
+            self._values = cached['values']
+        return value
+
+    def _add_value(self, cached, name, value):
+        values = self._get_values(cached)
+        values[name] = value
+        return {'key': self._key, 'values': values}
+
+    def _get_key(self):
+        loader = self._session.get_component('data_loader')
+        return {
+            'awscli': awscli_version,
+            'botocore': botocore_version,
+            'plugins': self._session.full_config.get('plugins', {}),
+            'data_paths': [
+                get_data_path_state(path) for path in loader.search_paths
+            ],
+        }
+
+    def _get_values(self, cached):
+        if not isinstance(cached, dict) or cached.get('key') != self._key:
+            return {}
+        values = cached.get('values')
+        if not isinstance(values, dict):
+            return {}
+        return values
@@ -32,6 +32,11 @@ from awscli.customizations.cloudtrail.utils import (
     get_trail_by_arn,
 )
 from awscli.customizations.commands import BasicCommand
+from awscli.customizations.s3.resolutioncache import (
+    BUCKET_REGION,
+    get_resolution_cache,
+    register_bucket_region_cache,
+)
 from awscli.schema import ParameterRequiredError
 from awscli.utils import create_nested_client
 
@@ -194,11 +199,20 @@ class S3ClientProvider:
 
     This class will cache the location constraints of previously requested
     buckets and cache previously created clients for the same region.
+    If a ``resolution_cache`` is provided, the location constraints are
+    also cached across invocations, and the clients use and update the
+    regions cached for their buckets.
     """
 
-    def __init__(self, session, get_bucket_location_region='us-east-1'):
+    def __init__(
+        self,
+        session,
+        get_bucket_location_region='us-east-1',
+        resolution_cache=None,
+    ):
         self._session = session
         self._get_bucket_location_region = get_bucket_location_region
+        self._resolution_cache = resolution_cache
         self._client_cache = {}
         self._region_cache = {}
 
@@ -210,18 +224,41 @@ class S3ClientProvider:
     def _get_bucket_region(self, bucket_name):
         """Returns the region of a bucket"""
         if bucket_name not in self._region_cache:
-            client = self._create_client(self._get_bucket_location_region)
-            result = client.get_bucket_location(Bucket=bucket_name)
-            region = result['LocationConstraint'] or 'us-east-1'
+            region = self._get_cached_bucket_region(bucket_name)
+            if region is None:
+                client = self._create_client(self._get_bucket_location_region)
+                result = client.get_bucket_location(Bucket=bucket_name)
+                region = result['LocationConstraint'] or 'us-east-1'
+                self._cache_bucket_region(bucket_name, region)
             self._region_cache[bucket_name] = region
         return self._region_cache[bucket_name]
 
+    def _get_cached_bucket_region(self, bucket_name):
+        if self._resolution_cache is None:
+            return None
+        return self._resolution_cache.get(
+            BUCKET_REGION, self._get_resolution_key(bucket_name)
+        )
+
+    def _cache_bucket_region(self, bucket_name, region):
+        if self._resolution_cache is not None:
+            self._resolution_cache.put(
+                BUCKET_REGION, self._get_resolution_key(bucket_name), region
+            )
+
+    def _get_resolution_key(self, bucket_name):
+        # Uses the same keys as the s3 clients' cached bucket regions.
+        client = self._create_client(self._get_bucket_location_region)
+        return f'{client.meta.partition}/{bucket_name}'
+
     def _create_client(self, region_name):
         """Creates an Amazon S3 client for the given region name"""
         if region_name not in self._client_cache:
             client = create_nested_client(
                 self._session, 's3', region_name=region_name
             )
+            if self._resolution_cache is not None:
+                register_bucket_region_cache(client, self._resolution_cache)
             # Remove the CLI error event that prevents exceptions.
             self._client_cache[region_name] = client
         return self._client_cache[region_name]
@@ -1031,7 +1068,9 @@ class CloudTrailValidateLogs(BasicCommand):
         self._source_region = parsed_globals.region
         # Use the the same region as the region of the CLI to get locations.
         self.s3_client_provider = S3ClientProvider(
-            self._session, self._source_region
+            self._session,
+            self._source_region,
+            resolution_cache=get_resolution_cache(),
         )
         client_args = {
             'region_name': parsed_globals.region,
@@ -11,6 +11,8 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 import logging
+from collections import deque
+
 from awscli.compat import advance_iterator
 
 
@@ -73,6 +75,13 @@ class Comparator(object):
         # :var dest_take: Take the next dest file from the generated files if
         #     true
         dest_take = True
+        # :var pending: The files that still need to be compared, in order,
+        #     as tuples of the strategy to compare them with, the source and
+        #     destination files and the file to yield if it should be synced.
+        #     Up to ``lookahead`` files are only compared once the files
+        #     after them are prepared by the strategy.
+        pending = deque()
+        lookahead = self._sync_strategy.lookahead
         while True:
             try:
                 if (not src_done) and src_take:
@@ -94,39 +103,49 @@ class Comparator(object):
                 compare_keys = self.compare_comp_key(src_file, dest_file)
 
                 if compare_keys == 'equal':
-                    should_sync = self._sync_strategy.determine_should_sync(
-                        src_file, dest_file
-                    )
-                    if should_sync:
-                        yield src_file
+                    if lookahead:
+                        self._sync_strategy.prepare_should_sync(
+                            src_file, dest_file)
+                    pending.append(
+                        (self._sync_strategy, src_file, dest_file, src_file))
                 elif compare_keys == 'less_than':
                     src_take = True
                     dest_take = False
-                    should_sync = self._not_at_dest_sync_strategy.determine_should_sync(src_file, None)
-                    if should_sync:
-                        yield src_file
+                    pending.append((self._not_at_dest_sync_strategy,
+                                    src_file, None, src_file))
 
                 elif compare_keys == 'greater_than':
                     src_take = False
                     dest_take = True
-                    should_sync = self._not_at_src_sync_strategy.determine_should_sync(None, dest_file)
-                    if should_sync:
-                        yield dest_file
+                    pending.append((self._not_at_src_sync_strategy,
+                                    None, dest_file, dest_file))
 
             elif (not src_done) and dest_done:
                 src_take = True
-                should_sync = self._not_at_dest_sync_strategy.determine_should_sync(src_file, None)
-                if should_sync:
-                    yield src_file
+                pending.append((self._not_at_dest_sync_strategy,
+                                src_file, None, src_file))
 
             elif src_done and (not dest_done):
                 dest_take = True
-                should_sync = self._not_at_src_sync_strategy.determine_should_sync(None, dest_file)
-                if should_sync:
-                    yield dest_file
+                pending.append((self._not_at_src_sync_strategy,
+                                None, dest_file, dest_file))
             else:
                 break
 
+            while len(pending) > lookahead:
+                file_to_sync = self._compare(*pending.popleft())
+                if file_to_sync is not None:
+                    yield file_to_sync
+        while pending:
+            file_to_sync = self._compare(*pending.popleft())
+            if file_to_sync is not None:
+                yield file_to_sync
+
+    def _compare(self, sync_strategy, src_file, dest_file, file_to_sync):
+        if sync_strategy.determine_should_sync(src_file, dest_file):
+            return file_to_sync
+        return None
+
     def compare_comp_key(self, src_file, dest_file):
         """
         Determines if the source compare_key is less than, equal to,
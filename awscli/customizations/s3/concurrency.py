@@ -0,0 +1,222 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from s3transfer.copies import CopyObjectTask, CopyPartTask
+from s3transfer.delete import DeleteObjectTask
+from s3transfer.download import GetObjectTask
+from s3transfer.subscribers import BaseSubscriber
+from s3transfer.upload import PutObjectTask, UploadPartTask
+
+
+LOGGER = logging.getLogger(__name__)
+
+# The tasks of the transfer manager that each make a request that
+# transfers data, or that deletes an object.
+REQUEST_TASK_TYPES = (
+    PutObjectTask, UploadPartTask, GetObjectTask, CopyObjectTask,
+    CopyPartTask, DeleteObjectTask,
+)
+
+THROTTLING_ERROR_CODES = [
+    'SlowDown', 'Throttling', 'ThrottlingException', 'RequestLimitExceeded',
+    'RequestThrottled', 'TooManyRequestsException',
+]
+THROTTLING_STATUS_CODES = [429, 503]
+
+
+class AdaptiveConcurrencyController(object):
+    # How often, in seconds, the concurrency limit is adjusted.
+    ADJUSTMENT_INTERVAL = 1
+    # The limit is multiplied by this factor after requests are throttled.
+    DECREASE_FACTOR = 0.5
+    # The limit only grows while each interval transfers at least this
+    # fraction of the previous interval's throughput.
+    THROUGHPUT_TOLERANCE = 0.9
+    # The limit shrinks if the average latency of requests grows past this
+    # multiple of the lowest average latency seen while throughput drops.
+    LATENCY_TOLERANCE = 2.0
+
+    def __init__(self, initial_limit, max_limit, min_limit=1,
+                 clock=time.monotonic):
+        """Adjusts the number of concurrent requests during a transfer
+
+        The limit is adjusted with additive increase and multiplicative
+        decrease.  Each interval the limit was reached without requests
+        being throttled, and without throughput dropping, the limit is
+        increased by one.  If requests were throttled, the limit is
+        halved.  If latency grew while throughput dropped, more
+        concurrent requests are only slowing each other down, and the
+        limit is decreased by one.
+
+        :param initial_limit: The number of concurrent requests to start
+            with.
+        :param max_limit: The highest the limit can grow to.
+        :param min_limit: The lowest the limit can shrink to.
+        :param clock: Returns the current time in seconds.
+        """
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._limit = max(min_limit, min(initial_limit, max_limit))
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._best_latency = None
+        self._previous_throughput = 0
+        self._start_interval(self._clock())
+
+    @property
+    def limit(self):
+        return self._limit
+
+    def register(self, event_emitter):
+        """Registers to detect throttled requests of a client"""
+        event_emitter.register('needs-retry.s3', self._detect_throttling)
+
+    def run(self, fn, *args, **kwargs):
+        """Runs a request once it is within the concurrency limit"""
+        self.acquire()
+        start_time = self._clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.release(self._clock() - start_time)
+
+    def acquire(self):
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._saturated = True
+                self._condition.wait()
+            self._in_flight += 1
+            if self._in_flight >= self._limit:
+                self._saturated = True
+
+    def release(self, latency):
+        with self._condition:
+            self._in_flight -= 1
+            self._num_requests += 1
+            self._total_latency += latency
+            self._adjust_if_due()
+            self._condition.notify()
+
+    def record_bytes(self, num_bytes):
+        with self._condition:
+            self._num_bytes += num_bytes
+            self._adjust_if_due()
+
+    def record_throttling(self):
+        with self._condition:
+            self._num_throttled += 1
+            self._adjust_if_due()
+
+    def _detect_throttling(self, response=None, **kwargs):
+        if response is None:
+            return
+        http_response, parsed = response
+        error_code = parsed.get('Error', {}).get('Code')
+        if http_response.status_code in THROTTLING_STATUS_CODES or \
+                error_code in THROTTLING_ERROR_CODES:
+            self.record_throttling()
+
+    def _start_interval(self, now):
+        self._interval_start = now
+        self._num_requests = 0
+        self._num_bytes = 0
+        self._total_latency = 0
+        self._num_throttled = 0
+        self._saturated = self._in_flight >= self._limit
+
+    def _adjust_if_due(self):
+        now = self._clock()
+        elapsed = now - self._interval_start
+        if elapsed < self.ADJUSTMENT_INTERVAL:
+            return
+        throughput = self._num_bytes / elapsed
+        latency = None
+        if self._num_requests:
+            latency = self._total_latency / self._num_requests
+        limit = self._get_new_limit(throughput, latency)
+        LOGGER.debug(
+            'Request concurrency limit: %s, in flight: %s, requests: %s, '
+            'throughput: %.0f bytes/s, average latency: %s, throttled: %s',
+            limit, self._in_flight, self._num_requests, throughput,
+            '%.3fs' % latency if latency is not None else 'n/a',
+            self._num_throttled)
+        if limit > self._limit:
+            self._condition.notify(limit - self._limit)
+        self._limit = limit
+        if latency is not None and (
+                self._best_latency is None or latency < self._best_latency):
+            self._best_latency = latency
+        self._previous_throughput = throughput
+        self._start_interval(now)
+
+    def _get_new_limit(self, throughput, latency):
+        limit = self._limit
+        throughput_dropped = throughput < \
+            self._previous_throughput * self.THROUGHPUT_TOLERANCE
+        if self._num_throttled:
+            limit = int(limit * self.DECREASE_FACTOR)
+            reason = '%s throttled requests' % self._num_throttled
+        elif latency is not None and self._best_latency is not None and \
+                latency > self._best_latency * self.LATENCY_TOLERANCE and \
+                throughput_dropped:
+            limit -= 1
+            reason = 'increased latency'
+        elif self._saturated and not throughput_dropped:
+            limit += 1
+            reason = 'limit reached'
+        limit = max(self._min_limit, min(limit, self._max_limit))
+        if limit != self._limit:
+            LOGGER.debug(
+                'Changing request concurrency from %s to %s due to %s.',
+                self._limit, limit, reason)
+        return limit
+
+
+class AdaptiveConcurrencyExecutor(object):
+    def __init__(self, max_workers, controller):
+        """Runs the requests of a transfer manager within a limit
+
+        It is used as the ``executor_cls`` of a transfer manager.  Only the
+        tasks that make requests are held to the controller's limit, so
+        that the tasks that submit requests, or that write downloaded data
+        to disk, are never waiting on them.
+
+        :param max_workers: The maximum number of threads.
+        :type controller: AdaptiveConcurrencyController
+        :param controller: The controller of the concurrency limit.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._controller = controller
+
+    def submit(self, fn, *args, **kwargs):
+        if isinstance(fn, REQUEST_TASK_TYPES):
+            return self._executor.submit(
+                self._controller.run, fn, *args, **kwargs)
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait)
+
+
+class AdaptiveConcurrencySubscriber(BaseSubscriber):
+    """Reports the progress of transfers to an adaptive controller"""
+    def __init__(self, controller):
+        self._controller = controller
+
+    def on_progress(self, future, bytes_transferred, **kwargs):
+        self._controller.record_bytes(bytes_transferred)
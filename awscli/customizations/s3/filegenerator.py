@@ -13,14 +13,21 @@
 import os
 import sys
 import stat
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 from dateutil.parser import parse
 from dateutil.tz import tzlocal
 from botocore.exceptions import ClientError
+from botocore.utils import is_s3express_bucket
 
-from awscli.customizations.s3.utils import find_bucket_key, get_file_stat
+from awscli.customizations.s3.utils import find_bucket_key, get_file_stat, \
+    get_file_stat_from_stat_result, LastUpdateMixin
 from awscli.customizations.s3.utils import BucketLister, create_warning, \
-    find_dest_path_comp_key, EPOCH_TIME
+    find_dest_path_comp_key, EPOCH_TIME, ShardedBucketLister
+from awscli.customizations.s3.utils import DEFAULT_SORT_BUFFER_SIZE, \
+    ExternalSorter
 from awscli.compat import queue
 
 _open = open
@@ -32,7 +39,15 @@ def is_special_file(path):
     file is a character special device, block special device, FIFO, or
     socket.
     """
-    mode = os.stat(path).st_mode
+    return is_special_file_mode(os.stat(path).st_mode)
+
+
+def is_special_file_mode(mode):
+    """
+    This function checks if a file mode, as returned from ``os.stat``,
+    belongs to a character special device, block special device, FIFO, or
+    socket.
+    """
     # Character special device.
     if stat.S_ISCHR(mode):
         return True
@@ -68,6 +83,33 @@ def is_readable(path):
     return True
 
 
+def _iter_directory_names(path):
+    # Unlike ``os.listdir()`` this does not build a list of every name in
+    # the directory.
+    with os.scandir(path) as directory_entries:
+        for dir_entry in directory_entries:
+            yield dir_entry.name
+
+
+def _is_readable_file(path):
+    # Checking access with the effective ids matches what opening the file
+    # would do, without the cost of an open() and close().
+    if os.access in os.supports_effective_ids:
+        return os.access(path, os.R_OK, effective_ids=True)
+    return os.access(path, os.R_OK)
+
+
+# A single entry of a scanned directory.  ``file_stat`` is a tuple of the
+# size and last update time for files and None for directories.
+_ScannedEntry = namedtuple('_ScannedEntry', ['path', 'is_dir', 'file_stat'])
+
+# The result of scanning a directory.  ``warnings`` holds the warnings for
+# entries that were skipped while scanning and ``entries`` holds the
+# remaining entries already in normalized sort order.
+_ScannedDirectory = namedtuple(
+    '_ScannedDirectory', ['warnings', 'entries'])
+
+
 # This class is provided primarily to provide a detailed error message.
 
 class FileDecodingError(Exception):
@@ -91,7 +133,15 @@ class FileDecodingError(Exception):
         super(FileDecodingError, self).__init__(self.error_message)
 
 
-class FileStat(object):
+class FileStat(LastUpdateMixin):
+    # Sync commands can create millions of these so they do not have a
+    # ``__dict__``.
+    __slots__ = (
+        'src', 'dest', 'compare_key', 'size', 'src_type', 'dest_type',
+        'operation_name', 'response_data', 'etag', 'case_conflict_submitted',
+        'case_conflict_key',
+    )
+
     def __init__(self, src, dest=None, compare_key=None, size=None,
                  last_update=None, src_type=None, dest_type=None,
                  operation_name=None, response_data=None, etag=None,
@@ -117,9 +167,18 @@ class FileGenerator(object):
     it will handle s3 files, local files, local directories, and s3 objects
     under the same common prefix.  The generator yields corresponding
     ``FileInfo`` objects to send to a ``Comparator`` or ``S3Handler``.
+
+    Local directories are always listed in the same byte order as S3
+    lists keys.  Directory buckets do not list keys in that order, so their
+    listings are only sorted when ``sort_listings`` is True.  At most
+    ``sort_buffer_size`` entries are sorted in memory at a time and larger
+    listings are sorted with temporary files.
     """
     def __init__(self, client, operation_name, follow_symlinks=True,
-                 page_size=None, result_queue=None, request_parameters=None):
+                 page_size=None, result_queue=None, request_parameters=None,
+                 max_list_concurrency=1, max_walk_concurrency=1,
+                 file_filter=None, sort_listings=False,
+                 sort_buffer_size=DEFAULT_SORT_BUFFER_SIZE):
         self._client = client
         self.operation_name = operation_name
         self.follow_symlinks = follow_symlinks
@@ -130,6 +189,14 @@ class FileGenerator(object):
         self.request_parameters = {}
         if request_parameters is not None:
             self.request_parameters = request_parameters
+        self.max_list_concurrency = max_list_concurrency
+        self.max_walk_concurrency = max_walk_concurrency
+        # The ``Filter`` applied to the generated files.  It is only used
+        # to avoid listing directories and prefixes whose contents would
+        # all be filtered out.
+        self._file_filter = file_filter
+        self.sort_listings = sort_listings
+        self.sort_buffer_size = sort_buffer_size
 
     def call(self, files):
         """
@@ -173,35 +240,31 @@ class FileGenerator(object):
         update
         """
         join, isdir, isfile = os.path.join, os.path.isdir, os.path.isfile
-        error, listdir = os.error, os.listdir
+        error = os.error
         if not self.should_ignore_file(path):
             if not dir_op:
                 stats = self._safely_get_file_stats(path)
                 if stats:
                     yield stats
+            elif self.max_walk_concurrency > 1:
+                for stats in self._walk_files(path):
+                    yield stats
             else:
                 # We need to list files in byte order based on the full
                 # expanded path of the key: 'test/1/2/3.txt'  However,
-                # listdir() will only give us contents a single directory
-                # at a time, so we'll get 'test'.  At the same time we don't
-                # want to load the entire list of files into memory.  This
-                # is handled by first going through the current directory
-                # contents and adding the directory separator to any
-                # directories.  We can then sort the contents,
-                # and ensure byte order.
-                listdir_names = listdir(path)
-                names = []
-                for name in listdir_names:
-                    if not self.should_ignore_file_with_decoding_warnings(
-                            path, name):
-                        file_path = join(path, name)
-                        if isdir(file_path):
-                            name = name + os.path.sep
-                        names.append(name)
-                self.normalize_sort(names, os.sep, '/')
+                # a directory can only be read one at a time, so we'll get
+                # 'test'.  At the same time we don't want to load the
+                # entire list of files into memory.  This is handled by
+                # first going through the current directory contents and
+                # adding the directory separator to any directories.  We
+                # can then sort the contents, spilling to temporary files
+                # for very large directories, and ensure byte order.
+                names = self._sort_names(self._iter_listable_names(path))
                 for name in names:
                     file_path = join(path, name)
                     if isdir(file_path):
+                        if self._is_excluded_directory(file_path):
+                            continue
                         # Anything in a directory will have a prefix of
                         # this current directory and will come before the
                         # remaining contents in this directory.  This
@@ -215,6 +278,148 @@ class FileGenerator(object):
                         if stats:
                             yield stats
 
+    def _iter_listable_names(self, path):
+        for name in _iter_directory_names(path):
+            if not self.should_ignore_file_with_decoding_warnings(
+                    path, name):
+                if os.path.isdir(os.path.join(path, name)):
+                    name = name + os.path.sep
+                yield name
+
+    def _sort_names(self, names):
+        # The same ordering as ``normalize_sort()``.
+        sorter = self._create_sorter(
+            key=lambda item: item.replace(os.sep, '/'))
+        return sorter.sort(names)
+
+    def _create_sorter(self, key):
+        return ExternalSorter(key=key, buffer_size=self.sort_buffer_size)
+
+    def _walk_files(self, path):
+        """
+        Yields the same files in the same order as ``list_files`` but walks
+        the directory tree with ``os.scandir()``.  The stat results cached
+        on each ``DirEntry`` are reused so each file costs a single stat
+        call, and upcoming subdirectories are scanned ahead of time by a
+        bounded pool of threads.  Only this generator's thread puts
+        results on the result queue, so warnings are reported in the same
+        order as the files are yielded.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_walk_concurrency)
+        try:
+            root = executor.submit(self._scan_directory, path)
+            for stats in self._walk_scanned_directory(executor, root.result()):
+                yield stats
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _walk_scanned_directory(self, executor, scanned_directory):
+        for warning in scanned_directory.warnings:
+            self.result_queue.put(warning)
+        # Scans of subdirectories are submitted in the order they will be
+        # walked and only a bounded number of them is outstanding, which
+        # caps how much of the tree is held in memory.
+        subdirectories = iter(
+            [entry.path for entry in scanned_directory.entries
+             if entry.is_dir])
+        pending_scans = {}
+        self._submit_subdirectory_scans(
+            executor, subdirectories, pending_scans)
+        for entry in scanned_directory.entries:
+            if entry.is_dir:
+                scan = pending_scans.pop(entry.path)
+                self._submit_subdirectory_scans(
+                    executor, subdirectories, pending_scans)
+                try:
+                    subdirectory = scan.result()
+                except OSError:
+                    self.triggers_warning(entry.path)
+                    continue
+                for stats in self._walk_scanned_directory(
+                        executor, subdirectory):
+                    yield stats
+            else:
+                size, last_update = entry.file_stat
+                last_update = self._validate_update_time(
+                    last_update, entry.path)
+                yield entry.path, {'Size': size, 'LastModified': last_update}
+
+    def _submit_subdirectory_scans(self, executor, subdirectories,
+                                   pending_scans):
+        while len(pending_scans) < self.max_walk_concurrency:
+            subdirectory = next(subdirectories, None)
+            if subdirectory is None:
+                return
+            pending_scans[subdirectory] = executor.submit(
+                self._scan_directory, subdirectory)
+
+    def _scan_directory(self, path):
+        # This runs on a worker thread so it must not put anything on the
+        # result queue.  Warnings are returned so they can be reported in
+        # walk order.
+        warnings = []
+        names = []
+        entries = {}
+        with os.scandir(path) as directory_entries:
+            for dir_entry in directory_entries:
+                name = dir_entry.name
+                if not isinstance(name, str):
+                    decoding_error = FileDecodingError(path, name)
+                    warnings.append(create_warning(
+                        repr(name), decoding_error.error_message))
+                    continue
+                entry, warning = self._scan_entry(dir_entry)
+                if warning is not None:
+                    warnings.append(warning)
+                if entry is None:
+                    continue
+                if entry.is_dir:
+                    name = name + os.path.sep
+                    if self._is_excluded_directory(entry.path + os.sep):
+                        continue
+                names.append(name)
+                entries[name] = entry
+        self.normalize_sort(names, os.sep, '/')
+        return _ScannedDirectory(
+            warnings=warnings, entries=[entries[name] for name in names])
+
+    def _scan_entry(self, dir_entry):
+        # Mirrors the checks of ``should_ignore_file()`` and
+        # ``_safely_get_file_stats()`` using the cached DirEntry
+        # information.  Returns a tuple of the entry, or None if it
+        # should be skipped, and an optional warning.
+        file_path = dir_entry.path
+        if not self.follow_symlinks and dir_entry.is_symlink():
+            return None, None
+        try:
+            file_stat = dir_entry.stat()
+        except FileNotFoundError:
+            return None, create_warning(file_path, "File does not exist.")
+        except OSError:
+            return None, create_warning(
+                file_path, "File/Directory is not readable.")
+        if stat.S_ISDIR(file_stat.st_mode):
+            # Whether a directory can be read is only known once it is
+            # scanned, which is also when a warning is reported for it.
+            return _ScannedEntry(file_path, True, None), None
+        if is_special_file_mode(file_stat.st_mode):
+            return None, create_warning(
+                file_path,
+                ("File is character special device, "
+                 "block special device, FIFO, or "
+                 "socket."))
+        if not _is_readable_file(file_path):
+            return None, create_warning(
+                file_path, "File/Directory is not readable.")
+        return _ScannedEntry(
+            file_path, False,
+            get_file_stat_from_stat_result(file_stat)), None
+
+    def _is_excluded_directory(self, path):
+        if self._file_filter is None:
+            return False
+        return self._file_filter.is_excluded_subtree(path, 'local')
+
     def _safely_get_file_stats(self, file_path):
         try:
             size, last_update = get_file_stat(file_path)
@@ -321,11 +526,7 @@ class FileGenerator(object):
         if not dir_op and prefix:
             yield self._list_single_object(s3_path)
         else:
-            lister = BucketLister(self._client)
-            extra_args = self.request_parameters.get('ListObjectsV2', {})
-            for key in lister.list_objects(bucket=bucket, prefix=prefix,
-                                           page_size=self.page_size,
-                                           extra_args=extra_args):
+            for key in self._list_objects_under(s3_path, dir_op):
                 source_path, response_data = key
                 if response_data['Size'] == 0 and source_path.endswith('/'):
                     if self.operation_name == 'delete':
@@ -341,6 +542,46 @@ class FileGenerator(object):
                 else:
                     yield source_path, response_data
 
+    def _list_objects_under(self, s3_path, dir_op):
+        bucket, _ = find_bucket_key(s3_path)
+        keys = self._list_objects_under_paths(s3_path, dir_op)
+        if self.sort_listings and is_s3express_bucket(bucket):
+            # Directory buckets do not list keys in lexicographical order.
+            keys = self._create_sorter(key=itemgetter(0)).sort(keys)
+        for key in keys:
+            yield key
+
+    def _list_objects_under_paths(self, s3_path, dir_op):
+        bucket, _ = find_bucket_key(s3_path)
+        lister = self._create_bucket_lister(bucket)
+        extra_args = self.request_parameters.get('ListObjectsV2', {})
+        for listing_path in self._get_listing_paths(s3_path, dir_op):
+            bucket, prefix = find_bucket_key(listing_path)
+            for key in lister.list_objects(bucket=bucket, prefix=prefix,
+                                           page_size=self.page_size,
+                                           extra_args=extra_args):
+                yield key
+
+    def _get_listing_paths(self, s3_path, dir_op):
+        # The listing paths are sorted and none is a prefix of another, so
+        # listing them in turn preserves the order of the full listing.
+        # Directory buckets only support listing prefixes that end with a
+        # delimiter, so their listings are never narrowed.
+        if self._file_filter is None or not dir_op:
+            return [s3_path]
+        if is_s3express_bucket(find_bucket_key(s3_path)[0]):
+            return [s3_path]
+        return self._file_filter.get_listing_prefixes(s3_path)
+
+    def _create_bucket_lister(self, bucket):
+        # Sharded listings start each range after a given key, which
+        # directory buckets do not support.
+        if self.max_list_concurrency > 1 and not is_s3express_bucket(bucket):
+            return ShardedBucketLister(
+                self._client, max_concurrency=self.max_list_concurrency,
+                date_parser=None)
+        return BucketLister(self._client, date_parser=None)
+
     def _list_single_object(self, s3_path):
         # When we know we're dealing with a single object, we can avoid
         # a ListObjects operation (which causes concern for anyone setting
@@ -10,9 +10,10 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+from awscli.customizations.s3.utils import LastUpdateMixin
 
 
-class FileInfo(object):
+class FileInfo(LastUpdateMixin):
     """This class contains important details related to performing a task.
 
     It can perform operations such as ``upload``, ``download``, ``copy``,
@@ -27,7 +28,9 @@ class FileInfo(object):
     :type compare_key: string
     :param size: The size of the file in bytes.
     :type size: integer
-    :param last_update: the local time of last modification.
+    :param last_update: the local time of last modification.  A
+        ``LastModified`` string listed from S3 is converted when it is
+        first accessed.
     :type last_update: datetime object
     :param dest_type: if the destination is s3 or local.
     :param dest_type: string
@@ -38,6 +41,13 @@ class FileInfo(object):
         from the list of a ListObjects or the response from a HeadObject. It
         will only be filled if the task was generated from an S3 bucket.
     """
+    __slots__ = (
+        'src', 'src_type', 'operation_name', 'client', 'dest', 'dest_type',
+        'compare_key', 'size', 'parameters', 'source_client', 'is_stream',
+        'associated_response_data', 'etag', 'case_conflict_submitted',
+        'case_conflict_key',
+    )
+
     def __init__(self, src, dest=None, compare_key=None, size=None,
                  last_update=None, src_type=None, dest_type=None,
                  operation_name=None, client=None, parameters=None,
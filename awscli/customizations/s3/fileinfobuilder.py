@@ -38,7 +38,9 @@ class FileInfoBuilder(object):
         file_info_attr['dest'] = file_base.dest
         file_info_attr['compare_key'] = file_base.compare_key
         file_info_attr['size'] = file_base.size
-        file_info_attr['last_update'] = file_base.last_update
+        # The timestamp is passed on as it was listed, so that it is only
+        # parsed if a sync strategy compares it.
+        file_info_attr['last_update'] = file_base.raw_last_update
         file_info_attr['src_type'] = file_base.src_type
         file_info_attr['dest_type'] = file_base.dest_type
         file_info_attr['operation_name'] = file_base.operation_name
@@ -13,11 +13,14 @@
 import logging
 import fnmatch
 import os
+import re
 
 from awscli.customizations.s3.utils import split_s3_bucket_key
 
 
 LOG = logging.getLogger(__name__)
+# Characters that make a pattern something other than a literal path.
+_WILDCARD_RE = re.compile(r'[*?[]')
 
 
 def create_filter(parameters):
@@ -92,6 +95,8 @@ class Filter(object):
         self._original_patterns = patterns
         self.patterns = self._full_path_patterns(patterns, rootdir)
         self.dst_patterns = self._full_path_patterns(patterns, dst_rootdir)
+        self._ordered_patterns = {}
+        self._matchers = {}
 
     def _full_path_patterns(self, original_patterns, rootdir):
         # We need to transform the patterns into patterns that have
@@ -116,38 +121,144 @@ class Filter(object):
         before it.
         """
         for file_info in file_infos:
-            file_path = file_info.src
-            file_status = (file_info, True)
-            for pattern, dst_pattern in zip(self.patterns, self.dst_patterns):
-                current_file_status = self._match_pattern(pattern, file_info)
-                if current_file_status is not None:
-                    file_status = current_file_status
-                dst_current_file_status = self._match_pattern(dst_pattern, file_info)
-                if dst_current_file_status is not None:
-                    file_status = dst_current_file_status
+            should_include = self.should_include(
+                file_info.src, file_info.src_type)
             LOG.debug("=%s final filtered status, should_include: %s",
-                      file_path, file_status[1])
-            if file_status[1]:
+                      file_info.src, should_include)
+            if should_include:
                 yield file_info
 
-    def _match_pattern(self, pattern, file_info):
-        file_status = None
-        file_path = file_info.src
-        pattern_type = pattern[0]
-        if file_info.src_type == 'local':
-            path_pattern = pattern[1].replace('/', os.sep)
-        else:
-            path_pattern = pattern[1].replace(os.sep, '/')
-        is_match = fnmatch.fnmatch(file_path, path_pattern)
-        if is_match and pattern_type == 'include':
-            file_status = (file_info, True)
-            LOG.debug("%s matched include filter: %s",
-                        file_path, path_pattern)
-        elif is_match and pattern_type == 'exclude':
-            file_status = (file_info, False)
-            LOG.debug("%s matched exclude filter: %s",
-                        file_path, path_pattern)
-        else:
-            LOG.debug("%s did not match %s filter: %s",
-                        file_path, pattern_type, path_pattern)
-        return file_status
+    def should_include(self, file_path, src_type):
+        """
+        Determines whether a single path passes the filter.  All of the
+        patterns are compiled into a single regular expression whose
+        alternatives are in reverse order, so the alternative that matches
+        is the last pattern that applies to the path.
+        """
+        matcher = self._get_matcher(src_type)
+        if matcher is None:
+            return True
+        match = matcher.match(os.path.normcase(file_path))
+        if match is None:
+            return True
+        pattern_type, path_pattern = self._get_ordered_patterns(src_type)[
+            int(match.lastgroup[len('pattern'):])]
+        LOG.debug("%s matched %s filter: %s",
+                  file_path, pattern_type, path_pattern)
+        return pattern_type == 'include'
+
+    def is_excluded_subtree(self, dir_path, src_type):
+        """
+        Determines whether every path under a directory or prefix is
+        excluded, which means the directory does not need to be listed.
+
+        This is conservative. A True value means that no path under
+        ``dir_path`` can pass the filter, while a False value only means
+        that some path under it might.
+
+        :param dir_path: The directory, including its trailing separator,
+            or the S3 prefix in the ``bucket/key`` form.
+        :param src_type: Either ``local`` or ``s3``.
+        """
+        dir_path = os.path.normcase(dir_path)
+        for pattern_type, pattern in reversed(
+                self._get_ordered_patterns(src_type)):
+            if pattern_type == 'include':
+                if self._could_match_under(pattern, dir_path):
+                    return False
+            elif self._matches_all_under(pattern, dir_path):
+                return True
+        return False
+
+    def get_listing_prefixes(self, s3_path):
+        """
+        Returns the smallest set of S3 prefixes that need to be listed to
+        find every object under ``s3_path`` that could pass the filter.
+
+        The prefixes are returned in sorted order and none of them is a
+        prefix of another, so listing them one after the other yields keys
+        in the same order as listing ``s3_path`` itself.
+
+        :param s3_path: The S3 path to list in the ``bucket/key`` form.
+        """
+        candidates = []
+        for pattern_type, pattern in reversed(
+                self._get_ordered_patterns('s3')):
+            if pattern_type == 'include':
+                literal_prefix, has_wildcard = self._split_literal_prefix(
+                    pattern)
+                if not has_wildcard:
+                    # A literal pattern only ever matches itself.
+                    if pattern.startswith(s3_path):
+                        candidates.append(pattern)
+                elif literal_prefix.startswith(s3_path):
+                    candidates.append(literal_prefix)
+                elif s3_path.startswith(literal_prefix):
+                    return [s3_path]
+            elif self._matches_all_under(pattern, s3_path):
+                # Everything not included by a later pattern is excluded
+                # so only the included prefixes need to be listed.
+                return self._remove_nested_prefixes(candidates)
+        return [s3_path]
+
+    def _remove_nested_prefixes(self, prefixes):
+        reduced_prefixes = []
+        for prefix in sorted(set(prefixes)):
+            if reduced_prefixes and prefix.startswith(reduced_prefixes[-1]):
+                continue
+            reduced_prefixes.append(prefix)
+        return reduced_prefixes
+
+    def _get_ordered_patterns(self, src_type):
+        # Each source pattern is immediately followed by its destination
+        # pattern which is the order in which they are applied.
+        if src_type not in self._ordered_patterns:
+            ordered_patterns = []
+            for pattern, dst_pattern in zip(self.patterns, self.dst_patterns):
+                for pattern_type, path_pattern in [pattern, dst_pattern]:
+                    if src_type == 'local':
+                        path_pattern = path_pattern.replace('/', os.sep)
+                    else:
+                        path_pattern = path_pattern.replace(os.sep, '/')
+                    ordered_patterns.append(
+                        (pattern_type, os.path.normcase(path_pattern)))
+            self._ordered_patterns[src_type] = ordered_patterns
+        return self._ordered_patterns[src_type]
+
+    def _get_matcher(self, src_type):
+        if src_type not in self._matchers:
+            ordered_patterns = self._get_ordered_patterns(src_type)
+            matcher = None
+            if ordered_patterns:
+                alternatives = []
+                for i in reversed(range(len(ordered_patterns))):
+                    alternatives.append('(?P<pattern%s>%s)' % (
+                        i, fnmatch.translate(ordered_patterns[i][1])))
+                matcher = re.compile('|'.join(alternatives))
+            self._matchers[src_type] = matcher
+        return self._matchers[src_type]
+
+    def _split_literal_prefix(self, pattern):
+        match = _WILDCARD_RE.search(pattern)
+        if match is None:
+            return pattern, False
+        return pattern[:match.start()], True
+
+    def _matches_all_under(self, pattern, dir_path):
+        # Only patterns made of a literal prefix followed by nothing but
+        # ``*`` are known to match every path under a directory.
+        literal_prefix, has_wildcard = self._split_literal_prefix(pattern)
+        remainder = pattern[len(literal_prefix):]
+        return (
+            has_wildcard and remainder.strip('*') == '' and
+            dir_path.startswith(literal_prefix)
+        )
+
+    def _could_match_under(self, pattern, dir_path):
+        literal_prefix, has_wildcard = self._split_literal_prefix(pattern)
+        if not has_wildcard:
+            return pattern.startswith(dir_path)
+        return (
+            literal_prefix.startswith(dir_path) or
+            dir_path.startswith(literal_prefix)
+        )
@@ -0,0 +1,400 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import logging
+import multiprocessing
+import pickle
+import signal
+import sys
+import threading
+import zlib
+from collections import namedtuple
+
+from awscli.compat import queue
+from awscli.customizations.s3.results import ErrorResult
+from awscli.customizations.s3.results import FinalTotalSubmissionsResult
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Sent by a worker process once it has processed all of its results.
+_WorkerFinished = namedtuple('_WorkerFinished', ['worker_id'])
+
+# Sent to a worker process to cancel its transfers.
+_CancelTransfers = namedtuple('_CancelTransfers', ['message', 'is_ctrl_c'])
+
+# Sent to a worker process once all of its files have been sent.
+_NO_MORE_TASKS = None
+
+
+def get_process_context():
+    """Returns the multiprocessing context used for worker processes
+
+    Worker processes are forked so that they inherit the session, and with
+    it any credentials that were already resolved.  None is returned on
+    platforms other than Linux, as processes cannot be forked on Windows
+    and forked processes may crash on macOS once system frameworks have
+    been loaded.
+    """
+    if not sys.platform.startswith('linux') or \
+            'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
+
+class TransfersCancelledError(Exception):
+    """Raised in a worker process when its transfers are cancelled"""
+
+
+class ProcessPoolTransferHandler(object):
+    # The number of files sent to a worker process at a time.
+    TASK_BATCH_SIZE = 100
+    MAX_QUEUED_BATCHES = 10
+    # How often, in seconds, the worker processes are checked for having
+    # exited unexpectedly.
+    POLL_INTERVAL = 1
+
+    def __init__(self, clients, client_factory, create_worker_handler,
+                 result_command_recorder, num_processes, context):
+        """Performs S3 transfers with a pool of worker processes
+
+        The files are partitioned across the worker processes by the hash
+        of their keys.  Each worker process transfers its files with its
+        own S3TransferHandler, which sends its results back to this process
+        so they are processed, and printed, the same as if the files were
+        transferred by a single process.
+
+        :type clients: tuple
+        :param clients: The client and source client referenced by the
+            FileInfos to transfer
+
+        :type client_factory: callable
+        :param client_factory: Creates the equivalent of ``clients`` in a
+            worker process
+
+        :type create_worker_handler: callable
+        :param create_worker_handler: Creates the S3TransferHandler of a
+            worker process given its client and result command recorder
+
+        :type result_command_recorder: ResultCommandRecorder
+        :param result_command_recorder: The result command recorder to be
+            used to get the final result of the transfer
+
+        :type num_processes: int
+        :param num_processes: The number of worker processes
+
+        :param context: The multiprocessing context to create the worker
+            processes with
+        """
+        self._clients = clients
+        self._client_factory = client_factory
+        self._create_worker_handler = create_worker_handler
+        self._result_command_recorder = result_command_recorder
+        self._num_processes = num_processes
+        self._context = context
+        self._workers = None
+        self._worker_results = None
+
+    def start(self):
+        """Start the worker processes
+
+        The worker processes are forked, so they must be started before the
+        command starts any threads, such as the threads of its pipeline
+        stages, or they could inherit locks held by those threads.  If they
+        were not started yet, they are started when files are sent to them.
+        """
+        if self._workers is not None:
+            return
+        self._worker_results = self._context.Queue()
+        self._workers = [
+            self._start_worker(worker_id, self._worker_results)
+            for worker_id in range(self._num_processes)
+        ]
+
+    def close(self):
+        """Stop worker processes that were started but never sent files"""
+        if self._workers is None:
+            return
+        for worker in self._workers:
+            worker.process.terminate()
+            worker.process.join()
+        self._workers = None
+
+    def call(self, fileinfos):
+        """Process iterable of FileInfos for transfer
+
+        :type fileinfos: iterable of FileInfos
+        param fileinfos: Set of FileInfos to transfer with the worker
+            processes
+
+        :rtype: CommandResult
+        :returns: The result of the command that specifies the number of
+            failures and warnings encountered.
+        """
+        LOGGER.debug(
+            'Transferring files with %s processes.', self._num_processes)
+        self.start()
+        workers, worker_results = self._workers, self._worker_results
+        # The workers are waited on below, so they no longer need to be
+        # stopped by close().
+        self._workers = None
+        with self._result_command_recorder:
+            forwarder = threading.Thread(
+                target=self._forward_results,
+                args=(workers, worker_results), name='s3-result-forwarder')
+            forwarder.daemon = True
+            forwarder.start()
+            try:
+                self._dispatch(workers, fileinfos)
+                self._wait(forwarder, workers)
+            except BaseException as e:
+                self._cancel(workers, e)
+                self._wait(forwarder, workers)
+                raise
+        return self._result_command_recorder.get_command_result()
+
+    def _start_worker(self, worker_id, worker_results):
+        tasks = self._context.Queue(self.MAX_QUEUED_BATCHES)
+        process = self._context.Process(
+            target=_run_worker,
+            args=(worker_id, tasks, worker_results, self._client_factory,
+                  self._create_worker_handler),
+            name='s3-transfer-worker-%s' % worker_id)
+        # Worker processes are stopped if this process exits without
+        # waiting for them, such as on a second ctrl-c.
+        process.daemon = True
+        process.start()
+        return _Worker(worker_id, process, tasks)
+
+    def _dispatch(self, workers, fileinfos):
+        batches = [[] for _ in workers]
+        for fileinfo in fileinfos:
+            index = self._get_worker_index(fileinfo)
+            batches[index].append(self._detach_clients(fileinfo))
+            if len(batches[index]) >= self.TASK_BATCH_SIZE:
+                self._put_task(workers[index], batches[index])
+                batches[index] = []
+        for worker, batch in zip(workers, batches):
+            if batch:
+                self._put_task(worker, batch)
+            self._put_task(worker, _NO_MORE_TASKS)
+
+    def _get_worker_index(self, fileinfo):
+        key = fileinfo.compare_key or fileinfo.src
+        return zlib.crc32(
+            key.encode('utf-8', 'surrogateescape')) % self._num_processes
+
+    def _detach_clients(self, fileinfo):
+        # Clients cannot be sent to another process, so they are replaced
+        # with their position in ``clients`` and the worker process
+        # substitutes its own clients.
+        fileinfo.client = self._get_client_index(fileinfo.client)
+        fileinfo.source_client = self._get_client_index(
+            fileinfo.source_client)
+        return fileinfo
+
+    def _get_client_index(self, client):
+        for index, known_client in enumerate(self._clients):
+            if client is known_client:
+                return index
+        return None
+
+    def _put_task(self, worker, task):
+        while True:
+            try:
+                worker.tasks.put(task, timeout=self.POLL_INTERVAL)
+                return
+            except queue.Full:
+                # A worker process that exited unexpectedly is reported
+                # by the result forwarder.
+                if worker.process.exitcode is not None:
+                    return
+
+    def _cancel(self, workers, exception):
+        cancel = _CancelTransfers(
+            message=str(exception) or repr(exception),
+            is_ctrl_c=isinstance(exception, KeyboardInterrupt))
+        for worker in workers:
+            # Files that have not been picked up by a worker process are
+            # dropped to make room for the cancellation.
+            while worker.process.exitcode is None:
+                try:
+                    worker.tasks.put_nowait(cancel)
+                    break
+                except queue.Full:
+                    try:
+                        worker.tasks.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def _wait(self, forwarder, workers):
+        forwarder.join()
+        for worker in workers:
+            worker.process.join()
+            # Stop the thread that fed the worker process its files.  Files
+            # that a worker process that exited unexpectedly never read
+            # are not flushed, as that could block forever.
+            if worker.process.exitcode != 0:
+                worker.tasks.cancel_join_thread()
+            worker.tasks.close()
+            worker.tasks.join_thread()
+
+    def _forward_results(self, workers, worker_results):
+        result_queue = self._result_command_recorder.result_queue
+        running = dict((worker.worker_id, worker) for worker in workers)
+        total_submissions = 0
+        num_totals = 0
+        while running:
+            try:
+                result = worker_results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                self._remove_exited_workers(running, result_queue)
+                continue
+            if isinstance(result, _WorkerFinished):
+                del running[result.worker_id]
+            elif isinstance(result, FinalTotalSubmissionsResult):
+                # The total is only final once every worker process has
+                # submitted all of its files.
+                total_submissions += result.total_submissions
+                num_totals += 1
+                if num_totals == len(workers):
+                    self._result_command_recorder.notify_total_submissions(
+                        total_submissions)
+            else:
+                result_queue.put(result)
+        if num_totals != len(workers):
+            self._result_command_recorder.notify_total_submissions(
+                total_submissions)
+
+    def _remove_exited_workers(self, running, result_queue):
+        for worker_id, worker in list(running.items()):
+            # Worker processes that finish normally exit with a zero exit
+            # code after their last result was sent.
+            exitcode = worker.process.exitcode
+            if exitcode is not None and exitcode != 0:
+                del running[worker_id]
+                result_queue.put(ErrorResult(exception=RuntimeError(
+                    'Transfer process %s exited unexpectedly with exit '
+                    'code %s' % (worker.process.name, exitcode))))
+
+
+_Worker = namedtuple('_Worker', ['worker_id', 'process', 'tasks'])
+
+
+def _run_worker(worker_id, tasks, worker_results, client_factory,
+                create_worker_handler):
+    # Ctrl-C is handled by the parent process, which cancels the transfers
+    # of its worker processes.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    result_queue = _WorkerResultQueue(worker_results)
+    worker_tasks = _WorkerTasks(tasks)
+    try:
+        clients = client_factory()
+        handler = create_worker_handler(
+            clients[0], _WorkerCommandResultRecorder(result_queue))
+        handler.call(worker_tasks.iter_fileinfos(clients))
+    except Exception as e:
+        LOGGER.debug(
+            'Exception caught in transfer process: %s', e, exc_info=True)
+        result_queue.put(ErrorResult(exception=e))
+    finally:
+        worker_tasks.drain()
+        worker_results.put(_WorkerFinished(worker_id))
+
+
+class _WorkerTasks(object):
+    def __init__(self, tasks):
+        self._tasks = tasks
+        self._done = False
+
+    def iter_fileinfos(self, clients):
+        while not self._done:
+            task = self._get_task()
+            if isinstance(task, _CancelTransfers):
+                if task.is_ctrl_c:
+                    raise KeyboardInterrupt()
+                raise TransfersCancelledError(task.message)
+            for fileinfo in task or []:
+                fileinfo.client = self._attach_client(
+                    clients, fileinfo.client)
+                fileinfo.source_client = self._attach_client(
+                    clients, fileinfo.source_client)
+                yield fileinfo
+
+    def drain(self):
+        # The parent process may still be sending files to a worker process
+        # that stopped submitting them.
+        while not self._done:
+            self._get_task()
+
+    def _get_task(self):
+        task = self._tasks.get()
+        if task is _NO_MORE_TASKS or isinstance(task, _CancelTransfers):
+            self._done = True
+        return task
+
+    def _attach_client(self, clients, index):
+        if index is None:
+            return None
+        return clients[index]
+
+
+class _WorkerResultQueue(object):
+    """Sends the results of a worker process to the parent process"""
+    def __init__(self, worker_results):
+        self._worker_results = worker_results
+
+    def put(self, result):
+        self._worker_results.put(self._make_picklable(result))
+
+    def _make_picklable(self, result):
+        # A result that cannot be pickled would be dropped, so exceptions
+        # that cannot be sent to the parent process are replaced with
+        # their message.
+        exception = getattr(result, 'exception', None)
+        if exception is None:
+            return result
+        try:
+            pickle.dumps(exception)
+        except Exception:
+            return result._replace(
+                exception=Exception(str(exception) or repr(exception)))
+        return result
+
+
+class _WorkerCommandResultRecorder(object):
+    """Stands in for the CommandResultRecorder of a worker process
+
+    The results of a worker process are processed by its parent process.
+    """
+    def __init__(self, result_queue):
+        self.result_queue = result_queue
+
+    def notify_total_submissions(self, total):
+        self.result_queue.put(FinalTotalSubmissionsResult(total))
+
+    def get_command_result(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, *args):
+        if exc_type:
+            # The parent process reports why the transfers were cancelled.
+            if not isinstance(exc_value, (TransfersCancelledError,
+                                          KeyboardInterrupt)):
+                LOGGER.debug(
+                    'Exception caught in transfer process: %s', exc_value,
+                    exc_info=True)
+                self.result_queue.put(ErrorResult(exception=exc_value))
+            return True
@@ -0,0 +1,200 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import logging
+import os
+import threading
+import time
+
+from botocore.utils import ArnParser
+
+from awscli.utils import SharedJSONFile
+
+
+LOGGER = logging.getLogger(__name__)
+
+RESOLUTION_CACHE_FILENAME = os.path.expanduser(
+    os.path.join('~', '.aws', 'cli', 's3', 'resolutions.json'))
+
+# The namespaces of the resolutions in the cache.
+BUCKET_REGION = 'bucket-region'
+ACCESS_POINT_BUCKET = 'access-point-bucket'
+ACCESS_POINT_ALIAS_BUCKET = 'access-point-alias-bucket'
+MRAP_BUCKETS = 'mrap-buckets'
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_resolution_cache():
+    """Returns the resolution cache of this process"""
+    with _caches_lock:
+        filename = RESOLUTION_CACHE_FILENAME
+        if filename not in _caches:
+            _caches[filename] = ResolutionCache(filename)
+        return _caches[filename]
+
+
+class ResolutionCache(object):
+    # How long, in seconds, a resolution is used before it is resolved
+    # again.
+    DEFAULT_TTL = 24 * 60 * 60
+    # The most resolutions kept. The ones closest to expiring are evicted
+    # first.
+    MAX_ENTRIES = 1000
+
+    def __init__(self, filename=None, ttl=DEFAULT_TTL,
+                 max_entries=MAX_ENTRIES, clock=time.time):
+        """Caches bucket regions and access point buckets on disk
+
+        The resolutions are shared by every invocation of the CLI, so that
+        they are not requested again each time the CLI is run.
+
+        :param filename: The JSON file the resolutions are kept in.
+        :param ttl: The number of seconds a resolution is kept for.
+        :param max_entries: The most resolutions kept.
+        :param clock: Returns the current time in seconds.
+        """
+        if filename is None:
+            filename = RESOLUTION_CACHE_FILENAME
+        self._file = SharedJSONFile(filename, 'resolution cache')
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def get(self, namespace, key):
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._get_entries(self._file.load())
+            entry = self._entries.get(self._get_entry_key(namespace, key))
+            if entry is None or entry[1] <= self._clock():
+                return None
+            return entry[0]
+
+    def put(self, namespace, key, value):
+        entry_key = self._get_entry_key(namespace, key)
+        with self._lock:
+            self._update(entry_key, [value, self._clock() + self._ttl])
+
+    def delete(self, namespace, key):
+        entry_key = self._get_entry_key(namespace, key)
+        with self._lock:
+            self._update(entry_key, None)
+
+    def _get_entry_key(self, namespace, key):
+        return '%s:%s' % (namespace, key)
+
+    def _update(self, entry_key, entry):
+        self._file.update(
+            lambda entries: self._apply(entries, entry_key, entry))
+
+    def _apply(self, entries, entry_key, entry):
+        entries = self._get_entries(entries)
+        if entry is None:
+            if entries.pop(entry_key, None) is None:
+                self._entries = entries
+                return None
+        else:
+            entries[entry_key] = entry
+        self._entries = self._evict(entries)
+        return self._entries
+
+    def _evict(self, entries):
+        now = self._clock()
+        entries = dict(
+            (entry_key, entry) for entry_key, entry in entries.items()
+            if entry[1] > now
+        )
+        if len(entries) > self._max_entries:
+            by_expiry = sorted(entries.items(), key=lambda item: item[1][1])
+            entries = dict(by_expiry[-self._max_entries:])
+        return entries
+
+    def _get_entries(self, entries):
+        if not isinstance(entries, dict):
+            return {}
+        return entries
+
+
+class BucketRegionCacheHandler(object):
+    # The errors that S3 returns for a request sent to the wrong region.
+    REDIRECT_ERROR_CODES = [
+        'PermanentRedirect', 'AuthorizationHeaderMalformed',
+        'IllegalLocationConstraintException',
+    ]
+    REDIRECT_STATUS_CODES = [301, 302, 307]
+
+    def __init__(self, cache, partition='aws'):
+        """Sends requests to the cached region of their bucket
+
+        The region of a bucket is cached when a request is redirected to
+        it. A redirect of a request that was sent to a cached region
+        replaces the cached region with the region the request was
+        redirected to, or removes it if that region is not known.
+
+        :type cache: ResolutionCache
+        :param cache: The cache of the bucket regions.
+        :param partition: The partition of the client. Buckets are only
+            unique within a partition.
+        """
+        self._cache = cache
+        self._partition = partition
+
+    def register(self, event_emitter):
+        event_emitter.register(
+            'before-endpoint-resolution.s3', self.redirect_from_cache)
+        event_emitter.register('needs-retry.s3', self.update_from_error)
+
+    def redirect_from_cache(self, builtins, params, **kwargs):
+        bucket = params.get('Bucket')
+        if not self._is_cacheable(bucket):
+            return
+        region = self._cache.get(BUCKET_REGION, self._get_key(bucket))
+        if region is not None:
+            builtins['AWS::Region'] = region
+
+    def update_from_error(self, request_dict, response, operation=None,
+                          **kwargs):
+        if response is None:
+            return
+        redirect_ctx = request_dict.get('context', {}).get('s3_redirect', {})
+        bucket = redirect_ctx.get('bucket')
+        if not self._is_cacheable(bucket):
+            return
+        http_response, parsed = response
+        error = parsed.get('Error', {})
+        if error.get('Code') not in self.REDIRECT_ERROR_CODES and \
+                http_response.status_code not in self.REDIRECT_STATUS_CODES:
+            return
+        headers = parsed.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        region = headers.get('x-amz-bucket-region') or error.get('Region')
+        if region:
+            LOGGER.debug('Caching region %s of bucket %s', region, bucket)
+            self._cache.put(BUCKET_REGION, self._get_key(bucket), region)
+        else:
+            self._cache.delete(BUCKET_REGION, self._get_key(bucket))
+
+    def _is_cacheable(self, bucket):
+        return bool(bucket) and not ArnParser.is_arn(bucket)
+
+    def _get_key(self, bucket):
+        return '%s/%s' % (self._partition, bucket)
+
+
+def register_bucket_region_cache(client, cache=None):
+    """Registers a client to use and update the cached bucket regions"""
+    if cache is None:
+        cache = get_resolution_cache()
+    handler = BucketRegionCacheHandler(cache, client.meta.partition)
+    handler.register(client.meta.events)
@@ -32,6 +32,9 @@ from awscli.customizations.s3.utils import OnDoneFilteredSubscriber
 
 LOGGER = logging.getLogger(__name__)
 
+# How often, in seconds, the progress of a transfer is repainted.
+PROGRESS_REFRESH_INTERVAL = 0.1
+
 
 BaseResult = namedtuple('BaseResult', ['transfer_type', 'src', 'dest'])
 
@@ -375,7 +378,8 @@ class ResultPrinter(BaseResultHandler):
     SRC_DEST_TRANSFER_LOCATION_FORMAT = u'{src} to {dest}'
     SRC_TRANSFER_LOCATION_FORMAT = u'{src}'
 
-    def __init__(self, result_recorder, out_file=None, error_file=None):
+    def __init__(self, result_recorder, out_file=None, error_file=None,
+                 progress_interval=None, clock=time.time):
         """Prints status of ongoing transfer
 
         :type result_recorder: ResultRecorder
@@ -388,6 +392,14 @@ class ResultPrinter(BaseResultHandler):
         :type error_file: file-like obj
         :param error_file: Location to write warnings and errors.
             By default, the location is sys.stderr.
+
+        :type progress_interval: float
+        :param progress_interval: The minimum number of seconds between
+            repaints of the progress. Progress that is not repainted right
+            away is repainted by ``flush()``. By default, the progress is
+            repainted for every result.
+
+        :param clock: Returns the current time in seconds.
         """
         self._result_recorder = result_recorder
         self._out_file = out_file
@@ -397,6 +409,10 @@ class ResultPrinter(BaseResultHandler):
         if self._error_file is None:
             self._error_file = sys.stderr
         self._progress_length = 0
+        self._progress_interval = progress_interval
+        self._clock = clock
+        self._last_progress_time = None
+        self._progress_pending = False
         self._result_handler_map = {
             ProgressResult: self._print_progress,
             SuccessResult: self._print_success,
@@ -414,6 +430,12 @@ class ResultPrinter(BaseResultHandler):
         self._result_handler_map.get(type(result), self._print_noop)(
             result=result)
 
+    def flush(self):
+        """Repaints progress that was held back by the progress interval"""
+        if self._progress_pending and self._is_progress_due() and \
+                self._has_remaining_progress():
+            self._print_progress()
+
     def _print_noop(self, **kwargs):
         # If the result does not have a handler, then do nothing with it.
         pass
@@ -480,6 +502,12 @@ class ResultPrinter(BaseResultHandler):
             self._print_progress()
 
     def _print_progress(self, **kwargs):
+        if not self._is_progress_due():
+            self._progress_pending = True
+            return
+        self._progress_pending = False
+        if self._progress_interval is not None:
+            self._last_progress_time = self._clock()
         # Get all of the statistics in the correct form.
         remaining_files = self._get_expected_total(
             str(self._result_recorder.expected_files_transferred -
@@ -526,6 +554,13 @@ class ResultPrinter(BaseResultHandler):
         # Print the progress out.
         self._print_to_out_file(progress_statement)
 
+    def _is_progress_due(self):
+        if self._progress_interval is None or \
+                self._last_progress_time is None:
+            return True
+        elapsed = self._clock() - self._last_progress_time
+        return elapsed >= self._progress_interval
+
     def _get_expected_total(self, expected_total):
         if not self._result_recorder.expected_totals_are_final():
             return self._ESTIMATED_EXPECTED_TOTAL.format(
@@ -570,10 +605,17 @@ class OnlyShowErrorsResultPrinter(ResultPrinter):
 
 
 class ResultProcessor(threading.Thread):
+    # The most results taken from the result queue at once.
+    MAX_BATCH_SIZE = 1000
+
     def __init__(self, result_queue, result_handlers=None):
         """Thread to process results from result queue
 
-        This includes recording statistics and printing transfer status
+        This includes recording statistics and printing transfer status.
+        Results are taken from the queue in batches, and the progress
+        results of a batch are combined into one per transfer. Handlers
+        that have a ``flush()`` method are flushed after each batch, and
+        at least every ``PROGRESS_REFRESH_INTERVAL`` seconds.
 
         :param result_queue: The result queue to process results from
         :param result_handlers: A list of callables that take a result in as
@@ -585,16 +627,27 @@ class ResultProcessor(threading.Thread):
         if self._result_handlers is None:
             self._result_handlers = []
         self._result_handlers_enabled = True
+        self._flush_handlers = [
+            handler for handler in self._result_handlers
+            if hasattr(handler, 'flush')
+        ]
 
     def run(self):
+        timeout = None
+        if self._flush_handlers:
+            timeout = PROGRESS_REFRESH_INTERVAL
         while True:
             try:
-                result = self._result_queue.get(True)
+                results = self._get_results(timeout)
+            except queue.Empty:
+                self._flush()
+                continue
+            for result in self._combine_progress_results(results):
                 if isinstance(result, ShutdownThreadRequest):
                     LOGGER.debug(
                         'Shutdown request received in result processing '
                         'thread, shutting down result thread.')
-                    break
+                    return
                 if self._result_handlers_enabled:
                     self._process_result(result)
                 # ErrorResults are fatal to the command. If a fatal error
@@ -604,8 +657,56 @@ class ResultProcessor(threading.Thread):
                 # the shutdown request to clean up the process.
                 if isinstance(result, ErrorResult):
                     self._result_handlers_enabled = False
+            self._flush()
+
+    def _get_results(self, timeout):
+        results = [self._result_queue.get(True, timeout)]
+        while len(results) < self.MAX_BATCH_SIZE:
+            try:
+                results.append(self._result_queue.get_nowait())
             except queue.Empty:
-                pass
+                break
+        return results
+
+    def _combine_progress_results(self, results):
+        # The progress results of a transfer are replaced by a single
+        # result, in the place of the first one, with the sum of their
+        # bytes. A transfer's progress always comes before its success or
+        # failure, so moving it earlier does not change any totals.
+        combined = []
+        progress_indexes = {}
+        for result in results:
+            if not isinstance(result, ProgressResult):
+                combined.append(result)
+                continue
+            key = (result.transfer_type, result.src, result.dest)
+            index = progress_indexes.get(key)
+            if index is None:
+                progress_indexes[key] = len(combined)
+                combined.append(result)
+                continue
+            previous = combined[index]
+            total_transfer_size = result.total_transfer_size
+            if total_transfer_size is None:
+                total_transfer_size = previous.total_transfer_size
+            combined[index] = previous._replace(
+                bytes_transferred=(
+                    previous.bytes_transferred + result.bytes_transferred),
+                total_transfer_size=total_transfer_size,
+                timestamp=result.timestamp,
+            )
+        return combined
+
+    def _flush(self):
+        if not self._result_handlers_enabled:
+            return
+        for handler in self._flush_handlers:
+            try:
+                handler.flush()
+            except Exception as e:
+                LOGGER.debug(
+                    'Error flushing handler %s: %s', handler, e,
+                    exc_info=True)
 
     def _process_result(self, result):
         for result_handler in self._result_handlers:
@@ -14,7 +14,7 @@ from awscli.customizations import utils
 from awscli.customizations.commands import BasicCommand
 from awscli.customizations.s3.subcommands import ListCommand, WebsiteCommand, \
     CpCommand, MvCommand, RmCommand, SyncCommand, MbCommand, RbCommand, \
-    PresignCommand
+    PresignCommand, AbortResumableCommand, DiskUsageCommand
 from awscli.customizations.s3.syncstrategy.register import \
     register_sync_strategies
 
@@ -53,6 +53,7 @@ class S3(BasicCommand):
     SYNOPSIS = "aws s3 <Command> [<Arg> ...]"
     SUBCOMMANDS = [
         {'name': 'ls', 'command_class': ListCommand},
+        {'name': 'du', 'command_class': DiskUsageCommand},
         {'name': 'website', 'command_class': WebsiteCommand},
         {'name': 'cp', 'command_class': CpCommand},
         {'name': 'mv', 'command_class': MvCommand},
@@ -61,6 +62,7 @@ class S3(BasicCommand):
         {'name': 'mb', 'command_class': MbCommand},
         {'name': 'rb', 'command_class': RbCommand},
         {'name': 'presign', 'command_class': PresignCommand},
+        {'name': 'abort-resumable', 'command_class': AbortResumableCommand},
     ]
 
     def _run_main(self, parsed_args, parsed_globals):
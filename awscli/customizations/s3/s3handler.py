@@ -10,16 +10,24 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import functools
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from botocore.exceptions import ClientError
 from s3transfer.manager import TransferManager
+from s3transfer.utils import ChunksizeAdjuster
 
 from awscli.customizations.s3.utils import (
     human_readable_size, MAX_UPLOAD_SIZE, find_bucket_key, relative_path,
-    create_warning, NonSeekableStream)
+    create_warning, ReadAheadStream, NonSeekableStream)
 from awscli.customizations.s3.transferconfig import \
     create_transfer_config_from_runtime_config
+from awscli.customizations.s3.transferconfig import InvalidConfigError
+from awscli.customizations.s3.transferconfig import MAX_DELETE_BATCH_SIZE
+from awscli.customizations.s3.transferconfig import DEFAULTS
 from awscli.customizations.s3.results import UploadResultSubscriber
 from awscli.customizations.s3.results import DownloadResultSubscriber
 from awscli.customizations.s3.results import CopyResultSubscriber
@@ -32,10 +40,22 @@ from awscli.customizations.s3.results import FailureResult
 from awscli.customizations.s3.results import DryRunResult
 from awscli.customizations.s3.results import ResultRecorder
 from awscli.customizations.s3.results import ResultPrinter
+from awscli.customizations.s3.results import PROGRESS_REFRESH_INTERVAL
 from awscli.customizations.s3.results import OnlyShowErrorsResultPrinter
 from awscli.customizations.s3.results import NoProgressResultPrinter
 from awscli.customizations.s3.results import ResultProcessor
 from awscli.customizations.s3.results import CommandResultRecorder
+from awscli.customizations.s3.processpool import ProcessPoolTransferHandler
+from awscli.customizations.s3.concurrency import \
+    AdaptiveConcurrencyController
+from awscli.customizations.s3.concurrency import AdaptiveConcurrencyExecutor
+from awscli.customizations.s3.concurrency import \
+    AdaptiveConcurrencySubscriber
+from awscli.customizations.s3.processpool import get_process_context
+from awscli.customizations.s3.transferjournal import ResumableTransfers
+from awscli.customizations.s3.transferjournal import \
+    ResumableTransferSubscriber
+from awscli.customizations.s3.transferjournal import TransferJournal
 from awscli.customizations.s3.utils import RequestParamsMapper
 from awscli.customizations.s3.utils import StdoutBytesWriter
 from awscli.customizations.s3.utils import ProvideSizeSubscriber
@@ -53,6 +73,44 @@ from awscli.compat import get_binary_stdin
 LOGGER = logging.getLogger(__name__)
 
 
+def get_stream_part_size(transfer_config, expected_size=None):
+    """Determines the part size of a multipart upload of a stream
+
+    This is the part size the transfer manager uploads the stream with,
+    i.e. the configured part size raised so that a stream of
+    ``expected_size`` bytes fits in the maximum number of parts.
+    """
+    if expected_size is not None:
+        expected_size = int(expected_size)
+    return ChunksizeAdjuster().adjust_chunksize(
+        transfer_config.multipart_chunksize, expected_size)
+
+
+def get_stream_memory_parts(max_stream_memory, part_size):
+    """Splits the memory of a stream upload between the parts of the stream
+
+    Besides the parts being uploaded, one part of the stream is being read
+    and up to ``ReadAheadStream.MAX_BUFFERED_PARTS`` parts are read ahead.
+    If ``max_stream_memory`` does not fit these and at least one part being
+    uploaded, the stream is read ahead by fewer parts, down to none.
+
+    :returns: The number of parts read ahead and the number of parts
+        uploaded at a time, which is None if the memory is not capped.
+    :raises InvalidConfigError: If ``max_stream_memory`` does not fit a
+        part being read and a part being uploaded.
+    """
+    if not max_stream_memory:
+        return ReadAheadStream.MAX_BUFFERED_PARTS, None
+    num_parts = max_stream_memory // part_size
+    if num_parts < 2:
+        raise InvalidConfigError(
+            'max_stream_memory of %s bytes is too small to upload a stream '
+            'in parts of %s bytes, it must be at least %s bytes.' % (
+                max_stream_memory, part_size, 2 * part_size))
+    read_ahead_parts = min(ReadAheadStream.MAX_BUFFERED_PARTS, num_parts - 2)
+    return read_ahead_parts, num_parts - read_ahead_parts - 1
+
+
 class S3TransferHandlerFactory(object):
     MAX_IN_MEMORY_CHUNKS = 6
 
@@ -69,7 +127,8 @@ class S3TransferHandlerFactory(object):
         self._cli_params = cli_params
         self._runtime_config = runtime_config
 
-    def __call__(self, client, result_queue):
+    def __call__(self, client, result_queue, result_handlers=None,
+                 source_client=None, client_factory=None):
         """Creates a S3TransferHandler instance
 
         :type client: botocore.client.Client
@@ -79,31 +138,134 @@ class S3TransferHandlerFactory(object):
         :param result_queue: The result queue to be used to process results
             for the S3TransferHandler
 
+        :type result_handlers: list
+        :param result_handlers: Additional callables to process each result
+            with
+
+        :type source_client: botocore.client.Client
+        :param source_client: The client used for the source of copies, if
+            it differs from ``client``
+
+        :type client_factory: callable
+        :param client_factory: A callable that creates new clients
+            equivalent to ``client`` and ``source_client`` as a tuple.  It
+            is required to transfer files with more than one process.
+
         :returns: A S3TransferHandler instance
         """
+        result_recorder = ResultRecorder()
+        result_processor_handlers = [result_recorder]
+        if result_handlers:
+            result_processor_handlers.extend(result_handlers)
+        self._add_result_printer(result_recorder, result_processor_handlers)
+        result_processor = ResultProcessor(
+            result_queue, result_processor_handlers)
+        command_result_recorder = CommandResultRecorder(
+            result_queue, result_recorder, result_processor)
+
+        process_context = self._get_process_context(client_factory)
+        if process_context is not None:
+            if source_client is None:
+                source_client = client
+            return ProcessPoolTransferHandler(
+                clients=(client, source_client),
+                client_factory=client_factory,
+                create_worker_handler=self._create_worker_handler,
+                result_command_recorder=command_result_recorder,
+                num_processes=self._runtime_config['max_processes'],
+                context=process_context)
+        return self._create_transfer_handler(client, command_result_recorder)
+
+    def _create_transfer_handler(self, client, result_command_recorder):
         transfer_config = create_transfer_config_from_runtime_config(
             self._runtime_config)
         transfer_config.max_in_memory_upload_chunks = self.MAX_IN_MEMORY_CHUNKS
         transfer_config.max_in_memory_download_chunks = \
             self.MAX_IN_MEMORY_CHUNKS
 
-        transfer_manager = TransferManager(client, transfer_config)
-
         LOGGER.debug(
             "Using a multipart threshold of %s and a part size of %s",
             transfer_config.multipart_threshold,
             transfer_config.multipart_chunksize
         )
-        result_recorder = ResultRecorder()
-        result_processor_handlers = [result_recorder]
-        self._add_result_printer(result_recorder, result_processor_handlers)
-        result_processor = ResultProcessor(
-            result_queue, result_processor_handlers)
-        command_result_recorder = CommandResultRecorder(
-            result_queue, result_recorder, result_processor)
-
+        if self._cli_params.get('is_stream'):
+            self._limit_stream_memory(transfer_config)
+        resumable_transfers = None
+        osutil = None
+        if self._cli_params.get('resume'):
+            resumable_transfers = ResumableTransfers(
+                TransferJournal(), client, transfer_config)
+            osutil = resumable_transfers.osutil
+        concurrency_controller = None
+        executor_cls = None
+        if self._runtime_config and \
+                self._runtime_config.get('adaptive_concurrency'):
+            concurrency_controller = AdaptiveConcurrencyController(
+                initial_limit=DEFAULTS['max_concurrent_requests'],
+                max_limit=transfer_config.max_request_concurrency)
+            concurrency_controller.register(client.meta.events)
+            executor_cls = functools.partial(
+                AdaptiveConcurrencyExecutor,
+                controller=concurrency_controller)
+            LOGGER.debug(
+                'Adjusting the number of concurrent requests between 1 '
+                'and %s.', transfer_config.max_request_concurrency)
         return S3TransferHandler(
-            transfer_manager, self._cli_params, command_result_recorder)
+            TransferManager(
+                client, transfer_config, osutil=osutil,
+                executor_cls=executor_cls),
+            self._cli_params, result_command_recorder, self._runtime_config,
+            resumable_transfers=resumable_transfers,
+            concurrency_controller=concurrency_controller)
+
+    def _limit_stream_memory(self, transfer_config):
+        max_memory = None
+        if self._runtime_config:
+            max_memory = self._runtime_config.get('max_stream_memory')
+        if not max_memory:
+            return
+        part_size = get_stream_part_size(
+            transfer_config, self._cli_params.get('expected_size'))
+        read_ahead_parts, upload_parts = get_stream_memory_parts(
+            max_memory, part_size)
+        transfer_config.max_in_memory_upload_chunks = upload_parts
+        LOGGER.debug(
+            'Uploading up to %s parts of %s bytes of the stream at a time, '
+            'reading %s parts ahead.', upload_parts, part_size,
+            read_ahead_parts)
+
+    def _create_worker_handler(self, client, result_command_recorder):
+        # Each worker process transfers its share of the files with its
+        # own transfer manager, and journals them with its own connection
+        # to the transfer journal.
+        return self._create_transfer_handler(client, result_command_recorder)
+
+    def _get_process_context(self, client_factory):
+        if not self._runtime_config or \
+                self._runtime_config.get('max_processes', 1) <= 1:
+            return None
+        # Streams can only be read or written by this process, and the
+        # keys submitted to detect case conflicts are tracked in this
+        # process's memory.
+        if client_factory is None or self._cli_params.get('is_stream') or \
+                self._cli_params.get('case_conflict', 'ignore') != 'ignore':
+            LOGGER.debug('Transferring files with a single process.')
+            return None
+        context = get_process_context()
+        if context is None:
+            LOGGER.debug(
+                'Transferring files with a single process as processes '
+                'cannot be forked on this platform.')
+            return None
+        # A forked process only has a copy of the thread that forked it,
+        # so locks held by any other thread, such as those of other
+        # commands run from a --batch-file, would never be released.
+        if threading.active_count() > 1:
+            LOGGER.debug(
+                'Transferring files with a single process as other threads '
+                'are running.')
+            return None
+        return context
 
     def _add_result_printer(self, result_recorder, result_processor_handlers):
         if self._cli_params.get('quiet'):
@@ -115,12 +277,15 @@ class S3TransferHandlerFactory(object):
         elif not self._cli_params.get('progress'):
             result_printer = NoProgressResultPrinter(result_recorder)
         else:
-            result_printer = ResultPrinter(result_recorder)
+            result_printer = ResultPrinter(
+                result_recorder, progress_interval=PROGRESS_REFRESH_INTERVAL)
         result_processor_handlers.append(result_printer)
 
 
 class S3TransferHandler(object):
-    def __init__(self, transfer_manager, cli_params, result_command_recorder):
+    def __init__(self, transfer_manager, cli_params, result_command_recorder,
+                 runtime_config=None, resumable_transfers=None,
+                 concurrency_controller=None):
         """Backend for performing S3 transfers
 
         :type transfer_manager: s3transfer.manager.TransferManager
@@ -133,8 +298,22 @@ class S3TransferHandler(object):
         :type result_command_recorder: ResultCommandRecorder
         :param result_command_recorder: The result command recorder to be
             used to get the final result of the transfer
+
+        :type runtime_config: dict
+        :param runtime_config: The runtime config for the CLI command
+            being run
+
+        :type resumable_transfers: ResumableTransfers
+        :param resumable_transfers: Journals uploads and downloads so that
+            they can be resumed, if ``--resume`` was specified
+
+        :type concurrency_controller: AdaptiveConcurrencyController
+        :param concurrency_controller: Adjusts the number of concurrent
+            requests, if max_concurrent_requests is ``auto``. It is told
+            the progress of every transfer.
         """
         self._transfer_manager = transfer_manager
+        self._resumable_transfers = resumable_transfers
         # TODO: Ideally the s3 transfer handler should not need to know
         # about the result command recorder. It really only needs an interface
         # for adding results to the queue. When all of the commands have
@@ -147,12 +326,38 @@ class S3TransferHandler(object):
             self._transfer_manager, self._result_command_recorder.result_queue,
             cli_params
         )
+        transfer_subscribers = []
+        if concurrency_controller is not None:
+            transfer_subscribers.append(
+                AdaptiveConcurrencySubscriber(concurrency_controller))
+        submitter_kwargs = {'transfer_subscribers': transfer_subscribers}
+        max_stream_memory = None
+        if runtime_config:
+            max_stream_memory = runtime_config.get('max_stream_memory')
         self._submitters = [
-            UploadStreamRequestSubmitter(*submitter_args),
-            DownloadStreamRequestSubmitter(*submitter_args),
-            UploadRequestSubmitter(*submitter_args),
-            DownloadRequestSubmitter(*submitter_args),
-            CopyRequestSubmitter(*submitter_args),
+            UploadStreamRequestSubmitter(
+                *submitter_args, max_stream_memory=max_stream_memory,
+                **submitter_kwargs),
+            DownloadStreamRequestSubmitter(
+                *submitter_args, **submitter_kwargs),
+            UploadRequestSubmitter(
+                *submitter_args, resumable_transfers=resumable_transfers,
+                **submitter_kwargs),
+            DownloadRequestSubmitter(
+                *submitter_args, resumable_transfers=resumable_transfers,
+                **submitter_kwargs),
+            CopyRequestSubmitter(*submitter_args, **submitter_kwargs),
+        ]
+        delete_batch_size = 1
+        if runtime_config:
+            delete_batch_size = runtime_config.get('delete_batch_size', 1)
+        if delete_batch_size > 1:
+            # Recursive deletes are sent as DeleteObjects batches. Any
+            # other delete falls through to the DeleteRequestSubmitter.
+            self._submitters.append(BatchDeleteRequestSubmitter(
+                *submitter_args, batch_size=delete_batch_size,
+                concurrency_controller=concurrency_controller))
+        self._submitters += [
             DeleteRequestSubmitter(*submitter_args),
             LocalDeleteRequestSubmitter(*submitter_args)
         ]
@@ -168,25 +373,42 @@ class S3TransferHandler(object):
         :returns: The result of the command that specifies the number of
             failures and warnings encountered.
         """
+        try:
+            self._submit_transfers(fileinfos)
+        finally:
+            if self._resumable_transfers is not None:
+                self._resumable_transfers.close()
+        return self._result_command_recorder.get_command_result()
+
+    def _submit_transfers(self, fileinfos):
         with self._result_command_recorder:
             with self._transfer_manager:
                 total_submissions = 0
-                for fileinfo in fileinfos:
-                    for submitter in self._submitters:
-                        if submitter.can_submit(fileinfo):
-                            if submitter.submit(fileinfo):
-                                total_submissions += 1
-                            break
-                self._result_command_recorder.notify_total_submissions(
-                    total_submissions)
-        return self._result_command_recorder.get_command_result()
+                try:
+                    for fileinfo in fileinfos:
+                        for submitter in self._submitters:
+                            if submitter.can_submit(fileinfo):
+                                if submitter.submit(fileinfo):
+                                    total_submissions += 1
+                                break
+                    self._result_command_recorder.notify_total_submissions(
+                        total_submissions)
+                except BaseException:
+                    self._shutdown_submitters(cancel=True)
+                    raise
+                self._shutdown_submitters()
+
+    def _shutdown_submitters(self, cancel=False):
+        for submitter in self._submitters:
+            submitter.shutdown(cancel=cancel)
 
 
 class BaseTransferRequestSubmitter(object):
     REQUEST_MAPPER_METHOD = None
     RESULT_SUBSCRIBER_CLASS = None
 
-    def __init__(self, transfer_manager, result_queue, cli_params):
+    def __init__(self, transfer_manager, result_queue, cli_params,
+                 transfer_subscribers=None):
         """Submits transfer requests to the TransferManager
 
         Given a FileInfo object and provided CLI parameters, it will add the
@@ -202,10 +424,15 @@ class BaseTransferRequestSubmitter(object):
         :type cli_params: dict
         :param cli_params: The associated CLI parameters passed in to the
             command as a dictionary.
+
+        :type transfer_subscribers: list
+        :param transfer_subscribers: Subscribers to add to every transfer
+            request.
         """
         self._transfer_manager = transfer_manager
         self._result_queue = result_queue
         self._cli_params = cli_params
+        self._transfer_subscribers = transfer_subscribers or []
 
     def submit(self, fileinfo):
         """Submits a transfer request based on the FileInfo provided
@@ -239,12 +466,25 @@ class BaseTransferRequestSubmitter(object):
         """
         raise NotImplementedError('can_submit()')
 
+    def shutdown(self, cancel=False):
+        """Waits for any transfer requests held back by the submitter
+
+        Most submitters hand every request to the transfer manager right
+        away, in which case there is nothing to wait on.
+
+        :type cancel: boolean
+        :param cancel: If True, requests that have not been sent yet
+            are abandoned instead of sent.
+        """
+        pass
+
     def _do_submit(self, fileinfo):
         extra_args = {}
         if self.REQUEST_MAPPER_METHOD:
             self.REQUEST_MAPPER_METHOD(extra_args, self._cli_params)
         subscribers = []
         self._add_additional_subscribers(subscribers, fileinfo)
+        subscribers.extend(self._transfer_subscribers)
         # The result subscriber class should always be the last registered
         # subscriber to ensure it is not missing any information that
         # may have been added in a different subscriber such as size.
@@ -349,6 +589,12 @@ class UploadRequestSubmitter(BaseTransferRequestSubmitter):
     REQUEST_MAPPER_METHOD = RequestParamsMapper.map_put_object_params
     RESULT_SUBSCRIBER_CLASS = UploadResultSubscriber
 
+    def __init__(self, transfer_manager, result_queue, cli_params,
+                 resumable_transfers=None, **kwargs):
+        super(UploadRequestSubmitter, self).__init__(
+            transfer_manager, result_queue, cli_params, **kwargs)
+        self._resumable_transfers = resumable_transfers
+
     def can_submit(self, fileinfo):
         return fileinfo.operation_name == 'upload'
 
@@ -358,6 +604,13 @@ class UploadRequestSubmitter(BaseTransferRequestSubmitter):
             subscribers.append(ProvideUploadContentTypeSubscriber())
         if self._cli_params.get('is_move', False):
             subscribers.append(DeleteSourceFileSubscriber())
+        if self._resumable_transfers is not None and \
+                not self._cli_params.get('dryrun'):
+            bucket, key = find_bucket_key(fileinfo.dest)
+            if self._resumable_transfers.add_upload(
+                    bucket, key, fileinfo.src, fileinfo.size):
+                subscribers.append(ResumableTransferSubscriber(
+                    self._resumable_transfers.remove_upload, bucket, key))
 
     def _submit_transfer_request(self, fileinfo, extra_args, subscribers):
         bucket, key = find_bucket_key(fileinfo.dest)
@@ -393,6 +646,12 @@ class DownloadRequestSubmitter(BaseTransferRequestSubmitter):
     REQUEST_MAPPER_METHOD = RequestParamsMapper.map_get_object_params
     RESULT_SUBSCRIBER_CLASS = DownloadResultSubscriber
 
+    def __init__(self, transfer_manager, result_queue, cli_params,
+                 resumable_transfers=None, **kwargs):
+        super(DownloadRequestSubmitter, self).__init__(
+            transfer_manager, result_queue, cli_params, **kwargs)
+        self._resumable_transfers = resumable_transfers
+
     def can_submit(self, fileinfo):
         return fileinfo.operation_name == 'download'
 
@@ -400,6 +659,14 @@ class DownloadRequestSubmitter(BaseTransferRequestSubmitter):
         subscribers.append(ProvideSizeSubscriber(fileinfo.size))
         subscribers.append(ProvideETagSubscriber(fileinfo.etag))
         subscribers.append(DirectoryCreatorSubscriber())
+        if self._resumable_transfers is not None and \
+                not self._cli_params.get('dryrun'):
+            bucket, key = find_bucket_key(fileinfo.src)
+            if self._resumable_transfers.add_download(
+                    bucket, key, fileinfo.dest, fileinfo.size,
+                    fileinfo.etag):
+                subscribers.append(ResumableTransferSubscriber(
+                    self._resumable_transfers.remove_download, bucket, key))
         subscribers.append(ProvideLastModifiedTimeSubscriber(
             fileinfo.last_update, self._result_queue))
         if self._cli_params.get('is_move', False):
@@ -469,6 +736,12 @@ class CopyRequestSubmitter(BaseTransferRequestSubmitter):
 class UploadStreamRequestSubmitter(UploadRequestSubmitter):
     RESULT_SUBSCRIBER_CLASS = UploadStreamResultSubscriber
 
+    def __init__(self, transfer_manager, result_queue, cli_params,
+                 max_stream_memory=None, **kwargs):
+        super(UploadStreamRequestSubmitter, self).__init__(
+            transfer_manager, result_queue, cli_params, **kwargs)
+        self._max_stream_memory = max_stream_memory
+
     def can_submit(self, fileinfo):
         return (
             fileinfo.operation_name == 'upload' and
@@ -482,7 +755,15 @@ class UploadStreamRequestSubmitter(UploadRequestSubmitter):
 
     def _get_filein(self, fileinfo):
         binary_stdin = get_binary_stdin()
-        return NonSeekableStream(binary_stdin)
+        part_size = get_stream_part_size(
+            self._transfer_manager.config,
+            self._cli_params.get('expected_size'))
+        read_ahead_parts, _ = get_stream_memory_parts(
+            self._max_stream_memory, part_size)
+        if not read_ahead_parts:
+            return NonSeekableStream(binary_stdin)
+        return ReadAheadStream(
+            binary_stdin, part_size, max_buffered_parts=read_ahead_parts)
 
     def _format_local_path(self, path):
         return '-'
@@ -525,6 +806,125 @@ class DeleteRequestSubmitter(BaseTransferRequestSubmitter):
         return self._format_s3_path(fileinfo.src), None
 
 
+class BatchDeleteRequestSubmitter(DeleteRequestSubmitter):
+    """Deletes objects of recursive deletes with DeleteObjects requests
+
+    Keys are accumulated per bucket and sent in batches of up to
+    ``batch_size`` keys. Batches are sent concurrently on a bounded pool of
+    threads and each key in the response is reported back as its own
+    SuccessResult or FailureResult, so the results are the same as if
+    every key was deleted with its own DeleteObject request.
+    """
+    # The number of batches that can be waiting for a thread, per thread,
+    # before submitting another batch blocks.
+    MAX_PENDING_BATCHES_PER_THREAD = 2
+
+    def __init__(self, transfer_manager, result_queue, cli_params,
+                 batch_size=MAX_DELETE_BATCH_SIZE,
+                 concurrency_controller=None, **kwargs):
+        super(BatchDeleteRequestSubmitter, self).__init__(
+            transfer_manager, result_queue, cli_params, **kwargs)
+        self._batch_size = min(batch_size, MAX_DELETE_BATCH_SIZE)
+        self._concurrency_controller = concurrency_controller
+        self._pending_keys = {}
+        self._executor = None
+        self._max_concurrency = \
+            transfer_manager.config.max_request_concurrency
+        self._batch_semaphore = threading.BoundedSemaphore(
+            self._max_concurrency * (self.MAX_PENDING_BATCHES_PER_THREAD + 1))
+
+    def can_submit(self, fileinfo):
+        return (
+            super(BatchDeleteRequestSubmitter, self).can_submit(fileinfo) and
+            self._cli_params.get('dir_op', False)
+        )
+
+    def shutdown(self, cancel=False):
+        if not cancel:
+            for bucket in list(self._pending_keys):
+                self._send_batch(bucket)
+        self._pending_keys = {}
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=cancel)
+            self._executor = None
+
+    def _submit_transfer_request(self, fileinfo, extra_args, subscribers):
+        bucket, key = find_bucket_key(fileinfo.src)
+        self._result_queue.put(QueuedResult(
+            total_transfer_size=None, **self._get_result_kwargs(bucket, key)))
+        keys = self._pending_keys.setdefault(bucket, [])
+        keys.append(key)
+        if len(keys) >= self._batch_size:
+            self._send_batch(bucket)
+        # Return True to indicate that the delete was submitted. Its result
+        # is queued once the batch it is part of has been sent.
+        return True
+
+    def _send_batch(self, bucket):
+        keys = self._pending_keys.pop(bucket)
+        extra_args = {}
+        self.REQUEST_MAPPER_METHOD(extra_args, self._cli_params)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_concurrency)
+        # Block once enough batches are waiting so keys are not read from
+        # the listing faster than they can be deleted.
+        self._batch_semaphore.acquire()
+        if self._concurrency_controller is not None:
+            future = self._executor.submit(
+                self._concurrency_controller.run, self._delete_batch,
+                bucket, keys, extra_args)
+        else:
+            future = self._executor.submit(
+                self._delete_batch, bucket, keys, extra_args)
+        future.add_done_callback(
+            lambda f: self._batch_semaphore.release())
+
+    def _delete_batch(self, bucket, keys, extra_args):
+        try:
+            response = self._transfer_manager.client.delete_objects(
+                Bucket=bucket,
+                Delete={
+                    'Objects': [{'Key': key} for key in keys],
+                    'Quiet': True,
+                },
+                **extra_args
+            )
+        except Exception as e:
+            for key in keys:
+                self._result_queue.put(FailureResult(
+                    exception=e, **self._get_result_kwargs(bucket, key)))
+            return
+        errors = {}
+        for error in response.get('Errors', []):
+            errors[error['Key']] = error
+        for key in keys:
+            result_kwargs = self._get_result_kwargs(bucket, key)
+            if key in errors:
+                self._result_queue.put(FailureResult(
+                    exception=self._create_key_error(errors[key]),
+                    **result_kwargs))
+            else:
+                self._result_queue.put(SuccessResult(**result_kwargs))
+
+    def _create_key_error(self, error):
+        return ClientError(
+            {'Error': {'Code': error.get('Code'),
+                       'Message': error.get('Message')}},
+            'DeleteObjects'
+        )
+
+    def _get_result_kwargs(self, bucket, key):
+        transfer_type = 'delete'
+        if self._cli_params.get('is_move', False):
+            transfer_type = 'move'
+        return {
+            'transfer_type': transfer_type,
+            'src': self._format_s3_path(bucket + '/' + key),
+            'dest': None,
+        }
+
+
 class LocalDeleteRequestSubmitter(BaseTransferRequestSubmitter):
     REQUEST_MAPPER_METHOD = None
     RESULT_SUBSCRIBER_CLASS = None
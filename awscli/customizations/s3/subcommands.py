@@ -10,11 +10,14 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import datetime
 import os
 import logging
 import sys
+import time
 
 from botocore.client import Config
+from botocore.exceptions import ClientError
 from botocore.utils import is_s3express_bucket, ensure_boolean
 from dateutil.parser import parse
 from dateutil.tz import tzlocal
@@ -28,10 +31,17 @@ from awscli.customizations.s3.filegenerator import FileGenerator
 from awscli.customizations.s3.fileinfo import FileInfo
 from awscli.customizations.s3.filters import create_filter
 from awscli.customizations.s3.s3handler import S3TransferHandlerFactory
+from awscli.customizations.s3.processpool import ProcessPoolTransferHandler
+from awscli.customizations.s3.syncmanifest import SyncManifest, \
+    ManifestFileGenerator, ManifestRecorder
+from awscli.customizations.s3.transferjournal import TransferJournal
+from awscli.customizations.s3.resolutioncache import \
+    get_resolution_cache, register_bucket_region_cache
 from awscli.customizations.s3.utils import find_bucket_key, AppendFilter, \
-    find_dest_path_comp_key, human_readable_size, \
+    find_dest_path_comp_key, human_readable_size, relative_path, \
     RequestParamsMapper, split_s3_bucket_key, block_unsupported_resources, \
-    S3PathResolver, is_account_regional_namespace_bucket
+    S3PathResolver, is_account_regional_namespace_bucket, PipelineStage, \
+    get_connection_pool_stats, ShardedBucketLister
 from awscli.customizations.utils import uni_print
 from awscli.customizations.s3.syncstrategy.base import MissingFileSync, \
     SizeAndLastModifiedSync, NeverSync, AlwaysSync
@@ -522,6 +532,83 @@ CASE_CONFLICT = {
     ),
  }
 
+MANIFEST = {
+    'name': 'manifest',
+    'help_text': (
+        'The path of a file that records the state of the destination '
+        'after each sync, created if it does not exist. When syncing a '
+        'local directory to S3, later syncs take the destination objects '
+        'from the manifest instead of listing the whole destination, and '
+        'only list the prefixes of local directories whose modification '
+        'time changed since the last successful sync. Changes made to the '
+        'destination by anything other than syncs using the manifest are '
+        'not detected until ``--verify-manifest`` is used. A manifest can '
+        'be shared by any number of syncs.'
+    )
+}
+
+VERIFY_MANIFEST = {
+    'name': 'verify-manifest', 'action': 'store_true',
+    'help_text': (
+        'Lists the whole destination instead of trusting the '
+        '``--manifest``, and rebuilds the manifest from the listing. Use '
+        'this periodically, or whenever the destination may have been '
+        'changed by something other than a sync using the manifest.'
+    )
+}
+
+RESUME = {
+    'name': 'resume', 'action': 'store_true',
+    'help_text': (
+        'Records the progress of large uploads and downloads in a journal '
+        'so that an interrupted transfer is resumed when the command is run '
+        'again. The multipart upload of an interrupted upload is not '
+        'aborted, and a re-run only uploads the parts that were not already '
+        'uploaded. An interrupted download is kept in a partial file next '
+        'to the destination, and a re-run only downloads the parts that '
+        'are not already in it. Each part is checked against its recorded '
+        'checksum before it is skipped. Only transfers large enough to be '
+        'transferred in parts, as set by ``multipart_threshold``, are '
+        'journaled. Use ``aws s3 abort-resumable`` to abort interrupted '
+        'transfers that will not be resumed.'
+    )
+}
+
+OLDER_THAN = {
+    'name': 'older-than', 'cli_type_name': 'integer', 'default': 1,
+    'help_text': (
+        'Only aborts transfers that were started at least this many days '
+        'ago, so that transfers that are still running are not aborted. '
+        'Defaults to 1.'
+    )
+}
+
+DEPTH = {
+    'name': 'depth', 'cli_type_name': 'integer', 'default': 0,
+    'help_text': (
+        'The number of prefix levels, delimited by "/", below the given '
+        'prefix to report the totals of. The total of each prefix '
+        'includes the objects of all of its prefixes. With the default '
+        'of 0, only the total of the whole prefix is reported.'
+    )
+}
+
+BY_STORAGE_CLASS = {
+    'name': 'by-storage-class', 'action': 'store_true',
+    'help_text': (
+        'Breaks down each total by the storage class of the objects.'
+    )
+}
+
+BY_AGE = {
+    'name': 'by-age', 'action': 'store_true',
+    'help_text': (
+        'Breaks down each total by the time since the objects were last '
+        'modified: less than 30 days, 30 to 90 days, 90 to 365 days and '
+        'more than 365 days.'
+    )
+}
+
 TRANSFER_ARGS = [DRYRUN, QUIET, INCLUDE, EXCLUDE, ACL,
                  FOLLOW_SYMLINKS, NO_FOLLOW_SYMLINKS, NO_GUESS_MIME_TYPE,
                  SSE, SSE_C, SSE_C_KEY, SSE_KMS_KEY_ID, SSE_C_COPY_SOURCE,
@@ -534,9 +621,14 @@ TRANSFER_ARGS = [DRYRUN, QUIET, INCLUDE, EXCLUDE, ACL,
 
 
 def get_client(session, region, endpoint_url, verify, config=None):
-    return session.create_client('s3', region_name=region,
-                                 endpoint_url=endpoint_url, verify=verify,
-                                 config=config)
+    client = session.create_client('s3', region_name=region,
+                                   endpoint_url=endpoint_url, verify=verify,
+                                   config=config)
+    # Buckets behind a custom endpoint are not necessarily the same as the
+    # buckets of the same name in AWS, so their regions are not cached.
+    if endpoint_url is None:
+        register_bucket_region_cache(client)
+    return client
 
 
 class S3Command(BasicCommand):
@@ -720,6 +812,168 @@ class ListCommand(S3Command):
         uni_print("Total Size: ".rjust(15, ' ') + print_str + "\n")
 
 
+class DiskUsageCommand(S3Command):
+    NAME = 'du'
+    DESCRIPTION = (
+        "Reports the number and total size of the objects under an S3 "
+        "prefix, and optionally under each of its prefixes down to "
+        "``--depth`` levels. The prefix is split into ranges of keys that "
+        "are listed in parallel, with ``max_list_concurrency`` concurrent "
+        "requests, or 10 if it is not configured. Nothing is printed per "
+        "object. Note that the --output and --no-paginate arguments are "
+        "ignored for this command."
+    )
+    USAGE = "<S3Uri>"
+    ARG_TABLE = [{'name': 'paths', 'nargs': 1, 'positional_arg': True,
+                  'synopsis': USAGE}, DEPTH, BY_STORAGE_CLASS, BY_AGE,
+                 PAGE_SIZE, HUMAN_READABLE, REQUEST_PAYER]
+    # The number of concurrent listing requests if max_list_concurrency
+    # is not configured.
+    DEFAULT_LIST_CONCURRENCY = 10
+    # The upper bound, in days, and the label of each age group.
+    AGE_GROUPS = [
+        (30, '< 30 days'),
+        (90, '30-90 days'),
+        (365, '90-365 days'),
+        (None, '> 365 days'),
+    ]
+    DEFAULT_STORAGE_CLASS = 'STANDARD'
+
+    def _run_main(self, parsed_args, parsed_globals):
+        path = parsed_args.paths[0]
+        if path.startswith('s3://'):
+            path = path[5:]
+        bucket, prefix = find_bucket_key(path)
+        if not bucket:
+            raise ValueError('du requires an S3 URI with a bucket: %s' %
+                             parsed_args.paths[0])
+        if parsed_args.depth < 0:
+            raise ValueError(
+                'Value for --depth must not be negative: %s' %
+                parsed_args.depth)
+        max_concurrency = self._get_list_concurrency()
+        config = None
+        if max_concurrency > transferconfig.DEFAULT_MAX_POOL_CONNECTIONS:
+            config = Config(max_pool_connections=max_concurrency)
+        self.client = get_client(self._session, parsed_globals.region,
+                                 parsed_globals.endpoint_url,
+                                 parsed_globals.verify_ssl, config)
+        self._human_readable = parsed_args.human_readable
+        self._now = datetime.datetime.now(datetime.timezone.utc)
+        extra_args = {}
+        if parsed_args.request_payer is not None:
+            extra_args['RequestPayer'] = parsed_args.request_payer
+        # The timestamps are only parsed if they are grouped by age.
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=max_concurrency, date_parser=None)
+        totals = self._aggregate(
+            lister.list_objects(bucket, prefix, parsed_args.page_size,
+                                extra_args),
+            bucket, prefix, parsed_args.depth,
+            parsed_args.by_storage_class, parsed_args.by_age)
+        self._print_totals(totals, bucket, prefix)
+        return 0
+
+    def _get_list_concurrency(self):
+        s3_config = self._session.get_scoped_config().get('s3', {})
+        if 'max_list_concurrency' not in s3_config:
+            return self.DEFAULT_LIST_CONCURRENCY
+        runtime_config = transferconfig.RuntimeConfig().build_config(
+            max_list_concurrency=s3_config['max_list_concurrency'])
+        return runtime_config['max_list_concurrency']
+
+    def _aggregate(self, listing, bucket, prefix, depth, by_storage_class,
+                   by_age):
+        # Maps each reported prefix to its [count, size] and the
+        # [count, size] of each of its storage classes and age groups.
+        # Like du, each object is counted in the given prefix and in
+        # each of its prefixes down to the given depth.
+        totals = {}
+        prefix_length = len(prefix)
+        for _, content in listing:
+            key = content['Key']
+            groups = [prefix]
+            if depth:
+                parts = key[prefix_length:].split('/', depth)
+                # The last part is either the rest of the key or the name
+                # of an object that is not deeper than the given depth.
+                group = prefix
+                for part in parts[:-1]:
+                    group += part + '/'
+                    groups.append(group)
+            size = int(content['Size'])
+            storage_class = None
+            if by_storage_class:
+                storage_class = content.get(
+                    'StorageClass', self.DEFAULT_STORAGE_CLASS)
+            age_group = None
+            if by_age:
+                age_group = self._get_age_group(content['LastModified'])
+            for group in groups:
+                group_totals = totals.get(group)
+                if group_totals is None:
+                    group_totals = totals[group] = [[0, 0], {}, {}]
+                group_totals[0][0] += 1
+                group_totals[0][1] += size
+                if storage_class is not None:
+                    self._add(group_totals[1], storage_class, size)
+                if age_group is not None:
+                    self._add(group_totals[2], age_group, size)
+        return totals
+
+    def _add(self, breakdown, name, size):
+        counts = breakdown.get(name)
+        if counts is None:
+            counts = breakdown[name] = [0, 0]
+        counts[0] += 1
+        counts[1] += size
+
+    def _get_age_group(self, last_modified):
+        if isinstance(last_modified, str):
+            last_modified = self._parse_timestamp(last_modified)
+        age = self._now - last_modified
+        for days, label in self.AGE_GROUPS:
+            if days is None or age < datetime.timedelta(days=days):
+                return label
+
+    def _parse_timestamp(self, timestamp):
+        # S3 returns timestamps such as 2024-01-09T20:45:49.000Z, which
+        # fromisoformat() parses much faster than dateutil once the Z is
+        # spelled as an offset.
+        try:
+            return datetime.datetime.fromisoformat(
+                timestamp.replace('Z', '+00:00'))
+        except ValueError:
+            return parse(timestamp)
+
+    def _print_totals(self, totals, bucket, prefix):
+        # The row of the given prefix is printed first and already
+        # includes the objects of all of its prefixes.
+        if not totals:
+            totals = {prefix: [[0, 0], {}, {}]}
+        for group in sorted(totals):
+            (count, size), storage_classes, age_groups = totals[group]
+            self._print_line(count, size, 's3://%s/%s' % (bucket, group))
+            self._print_breakdowns(storage_classes, age_groups)
+
+    def _print_breakdowns(self, storage_classes, age_groups):
+        for name in sorted(storage_classes):
+            count, size = storage_classes[name]
+            self._print_line(count, size, '    ' + name)
+        for _, label in self.AGE_GROUPS:
+            if label in age_groups:
+                count, size = age_groups[label]
+                self._print_line(count, size, '    ' + label)
+
+    def _print_line(self, count, size, name):
+        if self._human_readable:
+            size_str = human_readable_size(size)
+        else:
+            size_str = str(size)
+        uni_print('%s %s %s\n' % (
+            size_str.rjust(10, ' '), str(count).rjust(10, ' '), name))
+
+
 class WebsiteCommand(S3Command):
     NAME = 'website'
     DESCRIPTION = 'Set the website configuration for a bucket.'
@@ -848,7 +1102,7 @@ class CpCommand(S3TransferCommand):
     ARG_TABLE = [{'name': 'paths', 'nargs': 2, 'positional_arg': True,
                   'synopsis': USAGE}] + TRANSFER_ARGS + \
                 [METADATA, METADATA_DIRECTIVE, EXPECTED_SIZE, RECURSIVE,
-                 CASE_CONFLICT]
+                 CASE_CONFLICT, RESUME]
 
 
 class MvCommand(S3TransferCommand):
@@ -859,7 +1113,7 @@ class MvCommand(S3TransferCommand):
     ARG_TABLE = [{'name': 'paths', 'nargs': 2, 'positional_arg': True,
                   'synopsis': USAGE}] + TRANSFER_ARGS +\
                 [METADATA, METADATA_DIRECTIVE, RECURSIVE, VALIDATE_SAME_S3_PATHS,
-                 CASE_CONFLICT]
+                 CASE_CONFLICT, RESUME]
 
 
 class RmCommand(S3TransferCommand):
@@ -881,7 +1135,8 @@ class SyncCommand(S3TransferCommand):
             "<LocalPath> or <S3Uri> <S3Uri>"
     ARG_TABLE = [{'name': 'paths', 'nargs': 2, 'positional_arg': True,
                   'synopsis': USAGE}] + TRANSFER_ARGS + \
-                [METADATA, METADATA_DIRECTIVE, CASE_CONFLICT]
+                [METADATA, METADATA_DIRECTIVE, CASE_CONFLICT, MANIFEST,
+                 VERIFY_MANIFEST, RESUME]
 
 
 class MbCommand(S3Command):
@@ -988,6 +1243,83 @@ class RbCommand(S3Command):
                 "bucket, bucket will not be deleted.")
 
 
+class AbortResumableCommand(S3Command):
+    NAME = 'abort-resumable'
+    DESCRIPTION = (
+        "Aborts the interrupted transfers recorded by the ``--resume`` "
+        "parameter of the ``cp``, ``mv`` and ``sync`` commands. The "
+        "multipart upload of each interrupted upload is aborted, so that "
+        "its parts are no longer stored, and the partial file of each "
+        "interrupted download is deleted. Use ``--dryrun`` to list the "
+        "interrupted transfers without aborting them."
+    )
+    USAGE = ""
+    ARG_TABLE = [OLDER_THAN, DRYRUN, REQUEST_PAYER]
+
+    def _run_main(self, parsed_args, parsed_globals):
+        super(AbortResumableCommand, self)._run_main(
+            parsed_args, parsed_globals)
+        started_before = time.time() - parsed_args.older_than * 24 * 60 * 60
+        journal = TransferJournal()
+        rc = 0
+        try:
+            for transfer_id, upload in journal.list_uploads():
+                if upload.created <= started_before and \
+                        not self._abort_upload(
+                            journal, transfer_id, upload, parsed_args):
+                    rc = 1
+            for transfer_id, download in journal.list_downloads():
+                if download.created <= started_before and \
+                        not self._abort_download(
+                            journal, transfer_id, download, parsed_args):
+                    rc = 1
+        finally:
+            journal.close()
+        return rc
+
+    def _abort_upload(self, journal, transfer_id, upload, parsed_args):
+        transfer = '%s to s3://%s/%s' % (
+            relative_path(upload.filename), upload.bucket, upload.key)
+        if parsed_args.dryrun:
+            uni_print('(dryrun) abort: %s\n' % transfer)
+            return True
+        params = {
+            'Bucket': upload.bucket, 'Key': upload.key,
+            'UploadId': upload.upload_id,
+        }
+        if parsed_args.request_payer:
+            params['RequestPayer'] = parsed_args.request_payer
+        try:
+            self.client.abort_multipart_upload(**params)
+        except ClientError as e:
+            # The upload was already completed or aborted.
+            if e.response['Error']['Code'] != 'NoSuchUpload':
+                uni_print(
+                    'abort failed: %s %s\n' % (transfer, e), sys.stderr)
+                return False
+        journal.delete_upload(transfer_id)
+        uni_print('abort: %s\n' % transfer)
+        return True
+
+    def _abort_download(self, journal, transfer_id, download, parsed_args):
+        transfer = 's3://%s/%s to %s' % (
+            download.bucket, download.key,
+            relative_path(download.filename))
+        if parsed_args.dryrun:
+            uni_print('(dryrun) abort: %s\n' % transfer)
+            return True
+        try:
+            os.remove(download.partial_filename)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            uni_print('abort failed: %s %s\n' % (transfer, e), sys.stderr)
+            return False
+        journal.delete_download(transfer_id)
+        uni_print('abort: %s\n' % transfer)
+        return True
+
+
 class CommandArchitecture(object):
     """
     This class drives the actual command.  A command is performed in two
@@ -998,6 +1330,10 @@ class CommandArchitecture(object):
     list of instructions to wire together an assortment of generators to
     perform the command.
     """
+    # When ``pipeline_queue_size`` is configured, the generators that feed
+    # these instructions each run on their own thread.
+    PIPELINE_STAGE_BOUNDARIES = ['comparator', 'file_info_builder']
+
     def __init__(self, session, cmd, parameters, runtime_config=None):
         self.session = session
         self.cmd = cmd
@@ -1010,32 +1346,56 @@ class CommandArchitecture(object):
         self._source_client = None
 
     def set_clients(self):
-        client_config = None
-        if self.parameters.get('sse') == 'aws:kms':
-            client_config = Config(signature_version='s3v4')
-        self._client = get_client(
-            self.session,
-            region=self.parameters['region'],
-            endpoint_url=self.parameters['endpoint_url'],
-            verify=self.parameters['verify_ssl'],
-            config=client_config
-        )
-        self._source_client = get_client(
+        self._client, self._source_client = self._create_clients()
+
+    def _create_clients(self):
+        client_config = self._get_client_config()
+        client = get_client(
             self.session,
             region=self.parameters['region'],
             endpoint_url=self.parameters['endpoint_url'],
             verify=self.parameters['verify_ssl'],
             config=client_config
         )
+        # The clients for the same region and endpoint share a client, and
+        # with it a connection pool, so connections opened to list the
+        # source can be reused to transfer to the destination.
+        source_client = client
         if self.parameters['source_region']:
             if self.parameters['paths_type'] == 's3s3':
-                self._source_client = get_client(
+                source_client = get_client(
                     self.session,
                     region=self.parameters['source_region'],
                     endpoint_url=None,
                     verify=self.parameters['verify_ssl'],
                     config=client_config
                 )
+        return client, source_client
+
+    def _get_client_config(self):
+        config_kwargs = {}
+        if self.parameters.get('sse') == 'aws:kms':
+            config_kwargs['signature_version'] = 's3v4'
+        if self._runtime_config:
+            config_kwargs['max_pool_connections'] = \
+                transferconfig.get_max_pool_connections(self._runtime_config)
+        if not config_kwargs:
+            return None
+        return Config(**config_kwargs)
+
+    def _log_connection_pool_stats(self):
+        if not LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        clients = [self._client]
+        if self._source_client is not self._client:
+            clients.append(self._source_client)
+        for client in clients:
+            for host, (opened, sent) in sorted(
+                    get_connection_pool_stats(client).items()):
+                LOGGER.debug(
+                    'Connection pool for %s: %s connections opened, %s '
+                    'requests sent, %s connections reused.', host, opened,
+                    sent, max(sent - opened, 0))
 
     def create_instructions(self):
         """
@@ -1082,7 +1442,8 @@ class CommandArchitecture(object):
 
         # Determine what strategies to override if any.
         responses = self.session.emit(
-            'choosing-s3-sync-strategy', params=self.parameters)
+            'choosing-s3-sync-strategy', params=self.parameters,
+            runtime_config=self._runtime_config)
         if responses is not None:
             for response in responses:
                 override_sync_strategy = response[1]
@@ -1181,6 +1542,24 @@ class CommandArchitecture(object):
             'page_size': self.parameters['page_size'],
             'result_queue': result_queue,
         }
+        if self._runtime_config:
+            for name in ['max_list_concurrency', 'max_walk_concurrency']:
+                value = self._runtime_config.get(name, 1)
+                fgen_kwargs[name] = value
+                rgen_kwargs[name] = value
+            if 'sort_buffer_size' in self._runtime_config:
+                sort_buffer_size = self._runtime_config['sort_buffer_size']
+                fgen_kwargs['sort_buffer_size'] = sort_buffer_size
+                rgen_kwargs['sort_buffer_size'] = sort_buffer_size
+        if self.cmd == 'sync':
+            # The comparator needs both listings in the same order.
+            fgen_kwargs['sort_listings'] = True
+            rgen_kwargs['sort_listings'] = True
+        if self.parameters.get('filters'):
+            # The generators use the filter to skip listing anything the
+            # filter would exclude anyway.
+            fgen_kwargs['file_filter'] = create_filter(self.parameters)
+            rgen_kwargs['file_filter'] = create_filter(self.parameters)
 
         fgen_request_parameters = \
             self._get_file_generator_request_parameters_skeleton()
@@ -1195,6 +1574,18 @@ class CommandArchitecture(object):
 
         file_generator = FileGenerator(**fgen_kwargs)
         rev_generator = FileGenerator(**rgen_kwargs)
+        sync_manifest = None
+        result_handlers = []
+        if self.cmd == 'sync' and self.parameters.get('manifest'):
+            sync_manifest = SyncManifest(
+                self.parameters['manifest'], files['src']['path'],
+                files['dest']['path'], self.parameters.get('filters'))
+            rev_generator = ManifestFileGenerator(
+                manifest=sync_manifest, local_dir=files['src']['path'],
+                verify=self.parameters.get('verify_manifest', False),
+                **rgen_kwargs)
+            result_handlers.append(
+                ManifestRecorder(sync_manifest, files['dest']['path']))
         stream_dest_path, stream_compare_key = find_dest_path_comp_key(files)
         stream_file_info = [FileInfo(src=files['src']['path'],
                                      dest=stream_dest_path,
@@ -1209,7 +1600,9 @@ class CommandArchitecture(object):
 
         s3_transfer_handler = S3TransferHandlerFactory(
             self.parameters, self._runtime_config)(
-                self._client, result_queue)
+                self._client, result_queue, result_handlers,
+                source_client=self._source_client,
+                client_factory=self._create_clients)
 
         sync_strategies = self.choose_sync_strategies()
 
@@ -1258,16 +1651,34 @@ class CommandArchitecture(object):
                 )
 
         files = command_dict['setup']
-        while self.instructions:
-            instruction = self.instructions.pop(0)
-            file_list = []
-            components = command_dict[instruction]
-            for i in range(len(components)):
-                if len(files) > len(components):
-                    file_list.append(components[i].call(*files))
-                else:
-                    file_list.append(components[i].call(files[i]))
-            files = file_list
+        if isinstance(s3_transfer_handler, ProcessPoolTransferHandler):
+            # Worker processes are forked before the pipeline stages start
+            # their threads.
+            s3_transfer_handler.start()
+        try:
+            while self.instructions:
+                instruction = self.instructions.pop(0)
+                file_list = []
+                components = command_dict[instruction]
+                for i in range(len(components)):
+                    if len(files) > len(components):
+                        file_list.append(components[i].call(*files))
+                    else:
+                        file_list.append(components[i].call(files[i]))
+                files = file_list
+                if self._ends_pipeline_stage():
+                    files = self._run_pipeline_stages(instruction, files)
+            if sync_manifest is not None:
+                self._record_synced_directories(
+                    sync_manifest, rev_generator, files[0])
+        finally:
+            if isinstance(s3_transfer_handler, ProcessPoolTransferHandler):
+                s3_transfer_handler.close()
+            for sync_strategy in sync_strategies.values():
+                sync_strategy.close()
+            if sync_manifest is not None:
+                sync_manifest.close()
+            self._log_connection_pool_stats()
         # This is kinda quirky, but each call through the instructions
         # will replaces the files attr with the return value of the
         # file_list.  The very last call is a single list of
@@ -1285,6 +1696,38 @@ class CommandArchitecture(object):
             rc = 2
         return rc
 
+    def _record_synced_directories(self, sync_manifest, rev_generator,
+                                   command_result):
+        # The manifest's objects are updated as each transfer completes,
+        # but the local directories are only recorded as synced once
+        # everything in them was.
+        if self.parameters.get('dryrun') or \
+                command_result.num_tasks_failed > 0 or \
+                command_result.num_tasks_warned > 0 or \
+                rev_generator.directory_mtimes is None:
+            return
+        sync_manifest.set_directory_mtimes(rev_generator.directory_mtimes)
+
+    def _ends_pipeline_stage(self):
+        # The listing of each location, including its filters, is one
+        # stage and comparing the listings is another.  The remaining
+        # instructions are run by the thread submitting the transfers.
+        if not self._runtime_config or \
+                not self._runtime_config.get('pipeline_queue_size'):
+            return False
+        return bool(self.instructions) and self.instructions[0] in \
+            self.PIPELINE_STAGE_BOUNDARIES
+
+    def _run_pipeline_stages(self, instruction, files):
+        max_queue_size = self._runtime_config['pipeline_queue_size']
+        return [
+            PipelineStage(
+                stage_files, max_queue_size,
+                name='s3-%s-%s' % (instruction, i)
+            ).run()
+            for i, stage_files in enumerate(files)
+        ]
+
     def _get_file_generator_request_parameters_skeleton(self):
         return {
             'HeadObject': {},
@@ -1443,21 +1886,6 @@ class CommandParameters(object):
         self._validate_streaming_paths()
         self._validate_path_args()
         self._validate_sse_c_args()
-        self._validate_not_s3_express_bucket_for_sync()
-
-    def _validate_not_s3_express_bucket_for_sync(self):
-        if self.cmd == 'sync' and \
-            (self._is_s3express_path(self.parameters['src']) or
-             self._is_s3express_path(self.parameters['dest'])):
-            raise ValueError(
-                "Cannot use sync command with a directory bucket."
-            )
-
-    def _is_s3express_path(self, path):
-        if path.startswith("s3://"):
-            bucket = split_s3_bucket_key(path)[0]
-            return is_s3express_bucket(bucket)
-        return False
 
     def _validate_streaming_paths(self):
         self.parameters['is_stream'] = False
@@ -1491,6 +1919,23 @@ class CommandParameters(object):
                 CHECKSUM_MODE['name'],
                 params['paths_type'],
                 ['s3local'])
+        if params.get('manifest'):
+            self._raise_if_paths_type_incorrect_for_param(
+                MANIFEST['name'],
+                params['paths_type'],
+                ['locals3'])
+        elif params.get('verify_manifest'):
+            raise ValueError(
+                "Expected verify-manifest parameter to be used with the "
+                "manifest parameter.")
+        if params.get('resume'):
+            self._raise_if_paths_type_incorrect_for_param(
+                RESUME['name'],
+                params['paths_type'],
+                ['locals3', 's3local'])
+            if params.get('is_stream'):
+                raise ValueError(
+                    "The resume parameter cannot be used with streams.")
 
         # If the user provided local path does not exist, hard fail because
         # we know that we will not be able to upload the file.
@@ -1554,16 +1999,28 @@ class CommandParameters(object):
         return is_same_key and self._validate_same_s3_paths_enabled()
 
     def _validate_same_underlying_s3_paths(self):
-        src_paths = S3PathResolver.from_session(
-            self._session,
-            self.parameters.get('source_region', self._parsed_globals.region),
-            self._parsed_globals.verify_ssl
-        ).resolve_underlying_s3_paths(self.parameters['src'])
-        dest_paths = S3PathResolver.from_session(
+        src_region = self.parameters.get(
+            'source_region', self._parsed_globals.region)
+        resolution_cache = get_resolution_cache()
+        src_resolver = S3PathResolver.from_session(
             self._session,
-            self._parsed_globals.region,
-            self._parsed_globals.verify_ssl
-        ).resolve_underlying_s3_paths(self.parameters['dest'])
+            src_region,
+            self._parsed_globals.verify_ssl,
+            resolution_cache,
+        )
+        # Only create another set of clients if the regions differ.
+        dest_resolver = src_resolver
+        if src_region != self._parsed_globals.region:
+            dest_resolver = S3PathResolver.from_session(
+                self._session,
+                self._parsed_globals.region,
+                self._parsed_globals.verify_ssl,
+                resolution_cache,
+            )
+        src_paths = src_resolver.resolve_underlying_s3_paths(
+            self.parameters['src'])
+        dest_paths = dest_resolver.resolve_underlying_s3_paths(
+            self.parameters['dest'])
         for src_path in src_paths:
             for dest_path in dest_paths:
                 self._raise_if_mv_same_paths(src_path, dest_path)
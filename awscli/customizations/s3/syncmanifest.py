@@ -0,0 +1,412 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+from dateutil.tz import tzutc
+
+from awscli.compat import sqlite3
+from awscli.customizations.s3.filegenerator import FileGenerator
+from awscli.customizations.s3.results import BaseResultHandler
+from awscli.customizations.s3.results import QueuedResult
+from awscli.customizations.s3.results import SuccessResult
+from awscli.customizations.s3.results import FailureResult
+from awscli.customizations.s3.utils import BucketLister
+
+
+LOG = logging.getLogger(__name__)
+
+
+class SyncManifest(object):
+    """Records the state of the destination of a sync between runs
+
+    A manifest file can be shared by any number of syncs.  The state of
+    each sync is identified by its local directory, its S3 prefix and its
+    filters, as the filters decide which objects of the prefix were
+    listed.  For each sync the manifest records:
+
+    * The size, last modified time and ETag of each object under the S3
+      prefix, keyed by its path relative to the prefix.
+    * The modification time of each local directory as of the last
+      successful sync, keyed by its path relative to the local directory
+      with a trailing ``/``.  The local directory itself is ``''``.
+    """
+    _CREATE_TABLES = [
+        """
+        CREATE TABLE IF NOT EXISTS syncs (
+          id INTEGER PRIMARY KEY,
+          src TEXT,
+          dest TEXT,
+          filters TEXT,
+          UNIQUE (src, dest, filters)
+        )""",
+        """
+        CREATE TABLE IF NOT EXISTS objects (
+          sync_id INTEGER,
+          key TEXT,
+          size INTEGER,
+          last_modified TEXT,
+          etag TEXT,
+          PRIMARY KEY (sync_id, key)
+        )""",
+        """
+        CREATE TABLE IF NOT EXISTS directories (
+          sync_id INTEGER,
+          path TEXT,
+          mtime_ns INTEGER,
+          PRIMARY KEY (sync_id, path)
+        )""",
+    ]
+    _ENABLE_WAL = 'PRAGMA journal_mode=WAL'
+    # The number of changes written in each transaction.
+    COMMIT_INTERVAL = 1000
+    # The number of objects read from the manifest at a time.
+    PAGE_SIZE = 1000
+
+    def __init__(self, db_filename, src, dest, filters=None):
+        """
+        :param db_filename: The path of the manifest's sqlite database. It
+            is created if it does not exist.
+        :param src: The absolute path of the local directory being synced.
+        :param dest: The S3 prefix being synced to, as ``bucket/prefix/``.
+        :param filters: The ``--exclude`` and ``--include`` filters of the
+            sync.
+        """
+        self._lock = threading.Lock()
+        self._uncommitted_changes = 0
+        self._connection = self._connect(db_filename)
+        self._sync_id = self._get_sync_id(
+            src, dest, json.dumps(filters or []))
+
+    def get_directory_mtimes(self):
+        with self._lock:
+            return dict(self._connection.execute(
+                'SELECT path, mtime_ns FROM directories WHERE sync_id = ?',
+                (self._sync_id,)))
+
+    def set_directory_mtimes(self, mtimes):
+        with self._lock:
+            self._begin()
+            self._connection.execute(
+                'DELETE FROM directories WHERE sync_id = ?',
+                (self._sync_id,))
+            self._connection.executemany(
+                'INSERT INTO directories (sync_id, path, mtime_ns) '
+                'VALUES (?, ?, ?)',
+                [(self._sync_id, path, mtime)
+                 for path, mtime in mtimes.items()])
+            self._commit()
+
+    def iter_objects(self):
+        """Yields the ``(key, size, last_modified, etag)`` of each object
+
+        Objects are yielded in the same order S3 lists them in.  Objects
+        can be added and removed while iterating.
+        """
+        last_key = None
+        while True:
+            with self._lock:
+                if last_key is None:
+                    rows = self._connection.execute(
+                        'SELECT key, size, last_modified, etag FROM objects '
+                        'WHERE sync_id = ? ORDER BY key LIMIT ?',
+                        (self._sync_id, self.PAGE_SIZE)).fetchall()
+                else:
+                    rows = self._connection.execute(
+                        'SELECT key, size, last_modified, etag FROM objects '
+                        'WHERE sync_id = ? AND key > ? ORDER BY key LIMIT ?',
+                        (self._sync_id, last_key, self.PAGE_SIZE)).fetchall()
+            for row in rows:
+                yield row
+            if len(rows) < self.PAGE_SIZE:
+                return
+            last_key = rows[-1][0]
+
+    def put_object(self, key, size, last_modified, etag=None):
+        if not isinstance(last_modified, str):
+            last_modified = last_modified.isoformat()
+        with self._lock:
+            self._write(
+                'INSERT OR REPLACE INTO objects '
+                '(sync_id, key, size, last_modified, etag) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (self._sync_id, key, size, last_modified, etag))
+
+    def delete_object(self, key):
+        with self._lock:
+            self._write(
+                'DELETE FROM objects WHERE sync_id = ? AND key = ?',
+                (self._sync_id, key))
+
+    def delete_objects(self, prefix='', recursive=True):
+        """Deletes the objects under a prefix
+
+        :param prefix: The prefix of the keys of the objects to delete.
+        :param recursive: If False, only the objects directly under the
+            prefix are deleted, i.e. those without a ``/`` after the prefix.
+        """
+        query = 'DELETE FROM objects WHERE sync_id = ?'
+        params = (self._sync_id,)
+        if prefix:
+            # The keys that start with the prefix sort between the prefix
+            # and the prefix with its last character incremented.
+            query += ' AND key >= ? AND key < ?'
+            params += (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        if not recursive:
+            query += " AND instr(substr(key, ?), '/') = 0"
+            params += (len(prefix) + 1,)
+        with self._lock:
+            self._write(query, params)
+
+    def clear(self):
+        with self._lock:
+            self._begin()
+            for table in ['objects', 'directories']:
+                self._connection.execute(
+                    'DELETE FROM %s WHERE sync_id = ?' % table,
+                    (self._sync_id,))
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._commit()
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self, db_filename):
+        if sqlite3 is None:
+            raise RuntimeError(
+                'The sqlite3 module is required to use a sync manifest.')
+        try:
+            dirname = os.path.dirname(db_filename)
+            if dirname and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            connection = sqlite3.connect(
+                db_filename, check_same_thread=False, isolation_level=None)
+            for create_table in self._CREATE_TABLES:
+                connection.execute(create_table)
+        except (OSError, sqlite3.Error) as e:
+            raise RuntimeError(
+                'Unable to open sync manifest %s: %s' % (db_filename, e))
+        try:
+            connection.execute(self._ENABLE_WAL)
+        except sqlite3.Error:
+            # This is just a performance enhancement so it is optional.
+            LOG.debug('Failed to enable sqlite WAL.')
+        return connection
+
+    def _get_sync_id(self, src, dest, filters):
+        params = (src, dest, filters)
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR IGNORE INTO syncs (src, dest, filters) '
+                'VALUES (?, ?, ?)', params)
+            return self._connection.execute(
+                'SELECT id FROM syncs WHERE src = ? AND dest = ? AND '
+                'filters = ?', params).fetchone()[0]
+
+    def _write(self, query, params):
+        self._begin()
+        self._connection.execute(query, params)
+        self._uncommitted_changes += 1
+        if self._uncommitted_changes >= self.COMMIT_INTERVAL:
+            self._commit()
+
+    def _begin(self):
+        if not self._connection.in_transaction:
+            self._connection.execute('BEGIN')
+
+    def _commit(self):
+        if self._connection.in_transaction:
+            self._connection.execute('COMMIT')
+        self._uncommitted_changes = 0
+
+
+class ManifestFileGenerator(FileGenerator):
+    """Generates the S3 destination files of a sync from a manifest
+
+    If the manifest has no state for the sync yet, or ``verify`` is True,
+    the destination is listed and the manifest is rebuilt from the
+    listing.  Otherwise only the S3 prefixes of local directories that
+    changed since the last sync are listed: a directory's modification
+    time changes when entries are added to, removed from or renamed in
+    it, so only those prefixes can have diverged from the manifest
+    because of the sync itself.  The objects of every other prefix are
+    taken from the manifest.
+
+    Changes made to the destination by anything other than the sync are
+    only picked up when it is verified.
+    """
+    def __init__(self, client, operation_name, manifest, local_dir,
+                 verify=False, **kwargs):
+        super(ManifestFileGenerator, self).__init__(
+            client, operation_name, **kwargs)
+        self._manifest = manifest
+        self._local_dir = local_dir
+        self._verify = verify
+        # The modification time of each local directory before the
+        # sync started, to be recorded if the sync succeeds.
+        self.directory_mtimes = None
+
+    def list_objects(self, s3_path, dir_op):
+        recorded_mtimes = self._manifest.get_directory_mtimes()
+        if self._verify or not recorded_mtimes:
+            iterator = self._list_all_objects(s3_path, dir_op)
+        else:
+            iterator = self._list_changed_objects(
+                s3_path, dir_op, recorded_mtimes)
+        for source_path, response_data in iterator:
+            yield source_path, response_data
+
+    def _list_all_objects(self, s3_path, dir_op):
+        LOG.debug('Listing all of %s to rebuild the sync manifest.', s3_path)
+        self._manifest.clear()
+        self.directory_mtimes = {}
+        self._record_directory_tree('', self.directory_mtimes)
+        parent = super(ManifestFileGenerator, self)
+        for source_path, response_data in parent.list_objects(
+                s3_path, dir_op):
+            self._manifest.put_object(
+                source_path[len(s3_path):], response_data['Size'],
+                response_data['LastModified'], response_data.get('ETag'))
+            yield source_path, response_data
+
+    def _list_changed_objects(self, s3_path, dir_op, recorded_mtimes):
+        self.directory_mtimes = {}
+        changed_dirs = []
+        new_dirs = []
+        for path, recorded_mtime in recorded_mtimes.items():
+            mtime = self._get_directory_mtime(path)
+            if mtime is None:
+                # The directory was removed, which changed the modification
+                # time of its parent.
+                continue
+            self.directory_mtimes[path] = mtime
+            if mtime != recorded_mtime:
+                changed_dirs.append(path)
+                for subdir in self._list_subdirectories(path):
+                    if subdir not in recorded_mtimes:
+                        new_dirs.append(subdir)
+                        self._record_directory_tree(
+                            subdir, self.directory_mtimes)
+        LOG.debug('Reconciling the sync manifest with %s changed and %s new '
+                  'directories.', len(changed_dirs), len(new_dirs))
+        for path in changed_dirs:
+            self._reconcile(s3_path, path, recursive=False)
+        for path in new_dirs:
+            self._reconcile(s3_path, path, recursive=True)
+        for key, size, last_modified, etag in self._manifest.iter_objects():
+            yield s3_path + key, {
+                'Size': size, 'LastModified': last_modified, 'ETag': etag}
+
+    def _reconcile(self, s3_path, path, recursive):
+        # Replaces the manifest's objects under the prefix of a directory
+        # with what is actually there.
+        self._manifest.delete_objects(path, recursive=recursive)
+        extra_args = dict(self.request_parameters.get('ListObjectsV2', {}))
+        if not recursive:
+            extra_args['Delimiter'] = '/'
+        bucket, _, prefix = (s3_path + path).partition('/')
+        # Sharded listings do not support delimiters, and only a few
+        # prefixes are expected to have changed anyway.
+        lister = BucketLister(self._client, date_parser=None)
+        for source_path, response_data in lister.list_objects(
+                bucket=bucket, prefix=prefix, page_size=self.page_size,
+                extra_args=extra_args):
+            if source_path.endswith('/'):
+                continue
+            self._manifest.put_object(
+                source_path[len(s3_path):], response_data['Size'],
+                response_data['LastModified'], response_data.get('ETag'))
+
+    def _record_directory_tree(self, path, mtimes):
+        paths = [path]
+        while paths:
+            path = paths.pop()
+            mtime = self._get_directory_mtime(path)
+            if mtime is None:
+                continue
+            mtimes[path] = mtime
+            paths.extend(self._list_subdirectories(path))
+
+    def _get_directory_mtime(self, path):
+        try:
+            return os.stat(self._get_local_path(path)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _list_subdirectories(self, path):
+        try:
+            with os.scandir(self._get_local_path(path)) as entries:
+                return [
+                    path + entry.name + '/' for entry in entries
+                    if entry.is_dir(follow_symlinks=self.follow_symlinks)
+                ]
+        except OSError:
+            return []
+
+    def _get_local_path(self, path):
+        return os.path.join(self._local_dir, path.replace('/', os.sep))
+
+
+class ManifestRecorder(BaseResultHandler):
+    """Records the results of a sync's transfers in its manifest"""
+    def __init__(self, manifest, dest):
+        """
+        :param manifest: The ``SyncManifest`` of the sync.
+        :param dest: The S3 prefix being synced to, as ``bucket/prefix/``.
+        """
+        self._manifest = manifest
+        self._dest = 's3://' + dest
+        # The time each upload was queued at, which is recorded as its
+        # last modified time so it is never later than when S3 received it.
+        self._queued_uploads = {}
+
+    def __call__(self, result):
+        if isinstance(result, QueuedResult):
+            if result.transfer_type == 'upload':
+                self._queued_uploads[result.dest] = (
+                    result.total_transfer_size, time.time())
+        elif isinstance(result, SuccessResult):
+            if result.transfer_type == 'upload':
+                self._record_upload(result.dest)
+            elif result.transfer_type == 'delete':
+                key = self._get_key(result.src)
+                if key is not None:
+                    self._manifest.delete_object(key)
+        elif isinstance(result, FailureResult):
+            if result.transfer_type == 'upload':
+                # The object may or may not have been replaced, so forget it
+                # to have the next sync upload it again.
+                self._queued_uploads.pop(result.dest, None)
+                key = self._get_key(result.dest)
+                if key is not None:
+                    self._manifest.delete_object(key)
+
+    def _record_upload(self, dest):
+        key = self._get_key(dest)
+        size, queued_time = self._queued_uploads.pop(dest, (None, None))
+        if key is None or size is None:
+            return
+        last_modified = datetime.datetime.fromtimestamp(queued_time, tzutc())
+        self._manifest.put_object(key, size, last_modified)
+
+    def _get_key(self, s3_path):
+        if not s3_path.startswith(self._dest):
+            return None
+        return s3_path[len(self._dest):]
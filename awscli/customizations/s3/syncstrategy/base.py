@@ -42,6 +42,13 @@ class BaseSync(object):
     # minimize amount of extra code in making a custom sync strategy.
     ARGUMENT = None
 
+    # The number of files after the file being compared that a
+    # 'file_at_src_and_dest' strategy is given to ``prepare_should_sync``
+    # before ``determine_should_sync`` is called for the file.  Strategies
+    # that are slow to compare files, such as by reading them, can use this
+    # to compare upcoming files in the background.
+    lookahead = 0
+
     # At this point all that need to be done is implement
     # ``determine_should_sync`` method (see method for more information).
 
@@ -118,6 +125,23 @@ class BaseSync(object):
 
         raise NotImplementedError("determine_should_sync")
 
+    def prepare_should_sync(self, src_file, dest_file):
+        """Starts determining whether a file should be synced
+
+        This is called for the files at both the source and the destination
+        up to ``lookahead`` files before ``determine_should_sync`` is called
+        for them.  It does nothing unless overridden.
+        """
+        pass
+
+    def close(self):
+        """Releases the resources the strategy used for a sync
+
+        This is called once the sync is done.  It does nothing unless
+        overridden.
+        """
+        pass
+
     @property
     def arg_name(self):
         # Retrieves the ``name`` of the sync strategy's ``ARGUMENT``.
@@ -0,0 +1,378 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import logging
+import math
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.compat import get_md5
+from botocore.exceptions import MD5UnavailableError
+from s3transfer.utils import ChunksizeAdjuster
+
+from awscli.compat import sqlite3
+from awscli.customizations.s3.syncstrategy.base import SizeAndLastModifiedSync
+
+
+LOG = logging.getLogger(__name__)
+
+
+CHECKSUM = {'name': 'checksum', 'action': 'store_true',
+            'help_text': (
+                'Compares the MD5 checksum of local files with the ETag of '
+                'the S3 object to decide whether same-sized items need to '
+                'be synced, instead of comparing their last modified '
+                'times. Local checksums are cached so unchanged files are '
+                'only read once. Objects whose ETag is not an MD5 checksum, '
+                'such as objects encrypted with SSE-KMS or SSE-C, are '
+                'always synced.')}
+
+CHECKSUM_CACHE_FILENAME = os.path.expanduser(
+    os.path.join('~', '.aws', 'cli', 's3', 'checksums.db'))
+
+MB = 1024 ** 2
+# The part size used by the transfer commands unless configured otherwise.
+DEFAULT_PART_SIZE = 8 * MB
+
+_ETAG_REGEX = re.compile(r'^"?([0-9a-fA-F]{32})(?:-([0-9]+))?"?$')
+
+
+class ChecksumCache(object):
+    """Caches the checksums calculated for local files
+
+    Checksums are stored on disk in a sqlite database and are only
+    returned if the file has the same inode, size and modification time
+    as when its checksum was calculated.  If the database can not be
+    used, checksums are only cached in memory.
+    """
+    _CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS checksums (
+          path TEXT,
+          part_size INTEGER,
+          inode INTEGER,
+          size INTEGER,
+          mtime_ns INTEGER,
+          etag TEXT,
+          PRIMARY KEY (path, part_size)
+        )"""
+    _GET_CHECKSUM = """
+        SELECT etag FROM checksums
+        WHERE path = ? AND part_size = ? AND inode = ? AND size = ?
+          AND mtime_ns = ?"""
+    _SET_CHECKSUM = """
+        INSERT OR REPLACE INTO checksums
+        (path, part_size, inode, size, mtime_ns, etag)
+        VALUES (?, ?, ?, ?, ?, ?)"""
+    _ENABLE_WAL = 'PRAGMA journal_mode=WAL'
+
+    def __init__(self, db_filename=None):
+        self._db_filename = db_filename
+        self._connection = None
+        self._memory_cache = {}
+        self._lock = threading.Lock()
+        if db_filename is not None:
+            self._connection = self._connect(db_filename)
+
+    def get(self, path, part_size, file_id):
+        """Returns the cached checksum of a file or None
+
+        :param path: The path of the file.
+        :param part_size: The part size the checksum was calculated with.
+            This is 0 for a checksum of the whole file.
+        :param file_id: A tuple of the file's inode, size and modification
+            time in nanoseconds.
+        """
+        with self._lock:
+            if self._connection is None:
+                return self._memory_cache.get((path, part_size, file_id))
+            try:
+                row = self._connection.execute(
+                    self._GET_CHECKSUM, (path, part_size) + file_id
+                ).fetchone()
+            except sqlite3.Error as e:
+                LOG.debug('Failed to read cached checksum of %s: %s', path, e)
+                return None
+            if row is None:
+                return None
+            return row[0]
+
+    def set(self, path, part_size, file_id, etag):
+        with self._lock:
+            if self._connection is None:
+                self._memory_cache[(path, part_size, file_id)] = etag
+                return
+            try:
+                self._connection.execute(
+                    self._SET_CHECKSUM,
+                    (path, part_size) + file_id + (etag,))
+            except sqlite3.Error as e:
+                LOG.debug('Failed to cache checksum of %s: %s', path, e)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self, db_filename):
+        if sqlite3 is None:
+            LOG.debug('sqlite3 is not available, checksums will only be '
+                      'cached in memory.')
+            return None
+        try:
+            dirname = os.path.dirname(db_filename)
+            if dirname and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            connection = sqlite3.connect(
+                db_filename, check_same_thread=False, isolation_level=None)
+            connection.execute(self._CREATE_TABLE)
+        except (OSError, sqlite3.Error) as e:
+            LOG.debug('Unable to use checksum cache %s, checksums will only '
+                      'be cached in memory: %s', db_filename, e)
+            return None
+        try:
+            connection.execute(self._ENABLE_WAL)
+        except sqlite3.Error:
+            # This is just a performance enhancement so it is optional.
+            LOG.debug('Failed to enable sqlite WAL.')
+        return connection
+
+
+class LocalFileHasher(object):
+    """Calculates the S3 ETag a local file would have if it was uploaded
+
+    Files uploaded in a single request have the MD5 of their contents as
+    their ETag.  Files uploaded in multiple parts have the MD5 of the
+    concatenated MD5 digests of each part, followed by the number of parts.
+    Files can be hashed ahead of time in the background, several at once,
+    and the parts of a file that was not are hashed concurrently.
+    """
+    READ_SIZE = MB
+
+    def __init__(self, executor, cache):
+        self._executor = executor
+        self._cache = cache
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+    def prefetch(self, path, part_size=0):
+        """Starts calculating the ETag of a local file in the background
+
+        The ETag is returned by the next call to ``get_etag`` for the file.
+        """
+        key = (path, part_size)
+        with self._pending_lock:
+            if key not in self._pending:
+                # The parts of a file hashed in the background are hashed
+                # one after another, since other files are hashed with it.
+                self._pending[key] = self._executor.submit(
+                    self._get_etag, path, part_size, False)
+
+    def get_etag(self, path, part_size=0):
+        """Returns the ETag of a local file
+
+        :param path: The path of the file.
+        :param part_size: The size of each part for a multipart ETag or 0
+            for the ETag of a file uploaded in a single request.
+        """
+        with self._pending_lock:
+            future = self._pending.pop((path, part_size), None)
+        if future is not None:
+            return future.result()
+        return self._get_etag(path, part_size, True)
+
+    def close(self):
+        """Stops hashing files in the background and closes the cache"""
+        with self._pending_lock:
+            self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._cache.close()
+
+    def _get_etag(self, path, part_size, concurrent_parts):
+        stat_result = os.stat(path)
+        file_id = (stat_result.st_ino, stat_result.st_size,
+                   stat_result.st_mtime_ns)
+        etag = self._cache.get(path, part_size, file_id)
+        if etag is None:
+            etag = self._calculate_etag(
+                path, stat_result.st_size, part_size, concurrent_parts)
+            self._cache.set(path, part_size, file_id, etag)
+        return etag
+
+    def _calculate_etag(self, path, size, part_size, concurrent_parts):
+        if not part_size:
+            return self._hash_range(path, 0, size).hexdigest()
+        starts = range(0, size, part_size)
+        if concurrent_parts:
+            futures = [
+                self._executor.submit(self._hash_range, path, start, part_size)
+                for start in starts
+            ]
+            md5s = [future.result() for future in futures]
+        else:
+            md5s = [
+                self._hash_range(path, start, part_size) for start in starts
+            ]
+        digests = b''.join(md5.digest() for md5 in md5s)
+        return '%s-%s' % (
+            get_md5(digests, usedforsecurity=False).hexdigest(), len(md5s))
+
+    def _hash_range(self, path, start, length):
+        md5 = get_md5(usedforsecurity=False)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while length > 0:
+                data = f.read(min(self.READ_SIZE, length))
+                if not data:
+                    break
+                md5.update(data)
+                length -= len(data)
+        return md5
+
+
+class ChecksumSync(SizeAndLastModifiedSync):
+
+    ARGUMENT = CHECKSUM
+
+    # The number of threads used to hash files and the parts of a file.
+    MAX_HASH_WORKERS = 8
+    # Files are hashed in the background while the files before them are
+    # compared, so the hashing threads are kept busy.
+    lookahead = 2 * MAX_HASH_WORKERS
+
+    def __init__(self, sync_type='file_at_src_and_dest', cache_filename=None):
+        super(ChecksumSync, self).__init__(sync_type)
+        self._cache_filename = cache_filename
+        self._part_size = DEFAULT_PART_SIZE
+        self._hasher = None
+        self._hasher_lock = threading.Lock()
+
+    def use_sync_strategy(self, params, runtime_config=None, **kwargs):
+        if runtime_config and runtime_config.get('multipart_chunksize'):
+            self._part_size = runtime_config['multipart_chunksize']
+        return super(ChecksumSync, self).use_sync_strategy(params, **kwargs)
+
+    def prepare_should_sync(self, src_file, dest_file):
+        if not self.compare_size(src_file, dest_file):
+            return
+        local_etag_args = self._get_local_etag_args(src_file, dest_file)
+        if local_etag_args is not None:
+            local_path, part_size = local_etag_args[:2]
+            self._get_hasher().prefetch(local_path, part_size)
+
+    def determine_should_sync(self, src_file, dest_file):
+        same_size = self.compare_size(src_file, dest_file)
+        same_checksum = None
+        if same_size:
+            same_checksum = self.compare_checksum(src_file, dest_file)
+        if same_checksum is None:
+            # The checksums could not be compared so fall back to
+            # comparing the size and last modified time.
+            return super(ChecksumSync, self).determine_should_sync(
+                src_file, dest_file)
+        should_sync = not same_checksum
+        if should_sync:
+            LOG.debug("syncing: %s -> %s, checksum changed",
+                      src_file.src, src_file.dest)
+        return should_sync
+
+    def close(self):
+        with self._hasher_lock:
+            if self._hasher is not None:
+                self._hasher.close()
+                self._hasher = None
+
+    def compare_checksum(self, src_file, dest_file):
+        """
+        :returns: True if the checksums are the same, False if they are
+            different and None if they can not be compared.
+        """
+        if src_file.operation_name == 'copy':
+            if src_file.etag is None or dest_file.etag is None:
+                return None
+            return src_file.etag == dest_file.etag
+        local_etag_args = self._get_local_etag_args(src_file, dest_file)
+        if local_etag_args is None:
+            return None
+        local_path, part_size, expected_etag, guessed = local_etag_args
+        try:
+            local_etag = self._get_hasher().get_etag(local_path, part_size)
+        except (OSError, MD5UnavailableError) as e:
+            LOG.debug('Unable to calculate checksum of %s: %s', local_path, e)
+            return None
+        if local_etag != expected_etag and guessed:
+            # The object may have been uploaded with another part size.
+            return None
+        return local_etag == expected_etag
+
+    def _get_local_etag_args(self, src_file, dest_file):
+        # Returns the path of the local file, the part size to hash it with,
+        # the ETag it is expected to have and whether the part size was
+        # guessed from the number of parts, or None if the local file can
+        # not be compared with the ETag of the S3 object.
+        cmd = src_file.operation_name
+        if cmd == 'upload':
+            local_path, etag = src_file.src, dest_file.etag
+        elif cmd == 'download':
+            local_path, etag = dest_file.src, src_file.etag
+        else:
+            return None
+        match = _ETAG_REGEX.match(etag or '')
+        if match is None:
+            return None
+        expected_digest, num_parts = match.groups()
+        part_size = 0
+        guessed = False
+        if num_parts is not None:
+            part_size, guessed = self._guess_part_size(
+                src_file.size, int(num_parts))
+            if part_size is None:
+                return None
+        expected_etag = expected_digest.lower()
+        if num_parts is not None:
+            expected_etag += '-' + num_parts
+        return local_path, part_size, expected_etag, guessed
+
+    def _guess_part_size(self, size, num_parts):
+        # The part size is not stored with the object so use the configured
+        # part size, or else the default one, as the transfer commands
+        # adjust it for a file of this size, if it results in the same
+        # number of parts.  Otherwise the size of each part rounded up to a
+        # whole number of MiB is only a guess.
+        adjuster = ChunksizeAdjuster()
+        for part_size in (self._part_size, DEFAULT_PART_SIZE):
+            part_size = adjuster.adjust_chunksize(part_size, size)
+            if self._get_num_parts(size, part_size) == num_parts:
+                return part_size, False
+        if num_parts > 0:
+            part_size = int(math.ceil(size / float(num_parts) / MB)) * MB
+            if self._get_num_parts(size, part_size) == num_parts:
+                return part_size, True
+        return None, False
+
+    def _get_num_parts(self, size, part_size):
+        if part_size <= 0:
+            return None
+        return int(math.ceil(size / float(part_size)))
+
+    def _get_hasher(self):
+        with self._hasher_lock:
+            if self._hasher is None:
+                cache_filename = self._cache_filename
+                if cache_filename is None:
+                    cache_filename = CHECKSUM_CACHE_FILENAME
+                self._hasher = LocalFileHasher(
+                    ThreadPoolExecutor(max_workers=self.MAX_HASH_WORKERS),
+                    ChecksumCache(cache_filename))
+            return self._hasher
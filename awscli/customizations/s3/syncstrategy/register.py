@@ -14,6 +14,7 @@ from awscli.customizations.s3.syncstrategy.sizeonly import SizeOnlySync
 from awscli.customizations.s3.syncstrategy.exacttimestamps import \
     ExactTimestampsSync
 from awscli.customizations.s3.syncstrategy.delete import DeleteSync
+from awscli.customizations.s3.syncstrategy.checksum import ChecksumSync
 
 
 def register_sync_strategy(session, strategy_cls,
@@ -43,6 +44,9 @@ def register_sync_strategies(command_table, session, **kwargs):
     # Register the exact timestamps sync strategy.
     register_sync_strategy(session, ExactTimestampsSync)
 
+    # Register the checksum sync strategy.
+    register_sync_strategy(session, ChecksumSync)
+
     # Register the delete sync strategy.
     register_sync_strategy(session, DeleteSync, 'file_not_at_src')
 
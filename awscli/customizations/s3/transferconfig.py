@@ -13,6 +13,7 @@
 from s3transfer.manager import TransferConfig
 
 from awscli.customizations.s3.utils import human_readable_to_bytes
+from awscli.customizations.s3.utils import DEFAULT_SORT_BUFFER_SIZE
 # If the user does not specify any overrides,
 # these are the default values we use for the s3 transfer
 # commands.
@@ -21,9 +22,28 @@ DEFAULTS = {
     'multipart_chunksize': 8 * (1024 ** 2),
     'max_concurrent_requests': 10,
     'max_queue_size': 1000,
-    'max_bandwidth': None
+    'max_bandwidth': None,
+    'max_list_concurrency': 1,
+    'max_walk_concurrency': 1,
+    'delete_batch_size': 1,
+    'pipeline_queue_size': None,
+    'sort_buffer_size': DEFAULT_SORT_BUFFER_SIZE,
+    'max_processes': 1,
+    'max_stream_memory': None,
 }
 
+# The maximum number of keys that can be deleted with a single
+# DeleteObjects request.
+MAX_DELETE_BATCH_SIZE = 1000
+
+# The number of connections botocore keeps in each connection pool unless
+# configured otherwise.
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# The most concurrent requests that an ``auto`` max_concurrent_requests
+# can adjust to.
+MAX_ADAPTIVE_CONCURRENT_REQUESTS = 128
+
 
 class InvalidConfigError(Exception):
     pass
@@ -33,8 +53,12 @@ class RuntimeConfig(object):
 
     POSITIVE_INTEGERS = ['multipart_chunksize', 'multipart_threshold',
                          'max_concurrent_requests', 'max_queue_size',
-                         'max_bandwidth']
-    HUMAN_READABLE_SIZES = ['multipart_chunksize', 'multipart_threshold']
+                         'max_bandwidth', 'max_list_concurrency',
+                         'max_walk_concurrency', 'delete_batch_size',
+                         'pipeline_queue_size', 'sort_buffer_size',
+                         'max_processes', 'max_stream_memory']
+    HUMAN_READABLE_SIZES = ['multipart_chunksize', 'multipart_threshold',
+                            'max_stream_memory']
     HUMAN_READABLE_RATES = ['max_bandwidth']
 
     @staticmethod
@@ -57,7 +81,9 @@ class RuntimeConfig(object):
             runtime_config.update(kwargs)
         self._convert_human_readable_sizes(runtime_config)
         self._convert_human_readable_rates(runtime_config)
+        self._convert_adaptive_concurrency(runtime_config)
         self._validate_config(runtime_config)
+        self._validate_delete_batch_size(runtime_config)
         return runtime_config
 
     def _convert_human_readable_sizes(self, runtime_config):
@@ -77,6 +103,15 @@ class RuntimeConfig(object):
                         '(e.g. 10MB/s or 800KB/s)' % value)
                 runtime_config[attr] = human_readable_to_bytes(value[:-2])
 
+    def _convert_adaptive_concurrency(self, runtime_config):
+        value = runtime_config.get('max_concurrent_requests')
+        if isinstance(value, str) and value.lower() == 'auto':
+            # Enough threads are started for the ceiling, and the number
+            # of them making requests is adjusted during the transfer.
+            runtime_config['max_concurrent_requests'] = \
+                MAX_ADAPTIVE_CONCURRENT_REQUESTS
+            runtime_config['adaptive_concurrency'] = True
+
     def _validate_config(self, runtime_config):
         for attr in self.POSITIVE_INTEGERS:
             value = runtime_config.get(attr)
@@ -88,6 +123,13 @@ class RuntimeConfig(object):
                 except ValueError:
                     self._error_positive_value(attr, value)
 
+    def _validate_delete_batch_size(self, runtime_config):
+        value = runtime_config.get('delete_batch_size')
+        if value is not None and value > MAX_DELETE_BATCH_SIZE:
+            raise InvalidConfigError(
+                "Value for delete_batch_size must not exceed %s: %s" % (
+                    MAX_DELETE_BATCH_SIZE, value))
+
     def _error_positive_value(self, name, value):
         raise InvalidConfigError(
             "Value for %s must be a positive integer: %s" % (name, value))
@@ -116,3 +158,24 @@ def create_transfer_config_from_runtime_config(runtime_config):
             continue
         kwargs[translation_map[key]] = value
     return TransferConfig(**kwargs)
+
+
+def get_max_pool_connections(runtime_config):
+    """
+    Determines the size of the connection pools of the transfer clients
+
+    Every thread that can make a request at the same time needs its own
+    connection for the connection to be kept alive between requests.
+    Otherwise the connections that do not fit in the pool are closed after
+    each request and new ones, with new TLS handshakes, are opened.
+
+    :type runtime_config: dict
+    :argument runtime_config: A valid RuntimeConfig-generated dict.
+
+    :returns: The maximum number of connections of each connection pool.
+    """
+    max_connections = runtime_config.get(
+        'max_concurrent_requests', DEFAULTS['max_concurrent_requests'])
+    # Both locations of a sync can be listed while the transfers are made.
+    max_connections += 2 * runtime_config.get('max_list_concurrency', 1)
+    return max(DEFAULT_MAX_POOL_CONNECTIONS, max_connections)
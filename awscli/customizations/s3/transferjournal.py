@@ -0,0 +1,800 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+from s3transfer.subscribers import BaseSubscriber
+from s3transfer.utils import ChunksizeAdjuster, OSUtils
+
+from awscli.compat import sqlite3
+
+
+LOG = logging.getLogger(__name__)
+
+TRANSFER_JOURNAL_FILENAME = os.path.expanduser(
+    os.path.join('~', '.aws', 'cli', 's3', 'transfers.db'))
+
+# Appended to the name of a file while it is being downloaded.
+PARTIAL_DOWNLOAD_SUFFIX = os.extsep + 's3resume'
+
+# The request parameters that apply to every request of a multipart upload
+# and so are needed to list, or abort, the parts of a journaled upload.
+_UPLOAD_REQUEST_PARAMS = [
+    'RequestPayer', 'ExpectedBucketOwner', 'SSECustomerAlgorithm',
+    'SSECustomerKey', 'SSECustomerKeyMD5',
+]
+# The keys of the request context used to pass state between the events
+# of a request.
+_UPLOAD_CONTEXT_KEY = 's3_resumable_upload'
+_PART_CONTEXT_KEY = 's3_resumable_part'
+_DOWNLOAD_CONTEXT_KEY = 's3_resumable_download'
+_SKIPPED_CONTEXT_KEY = 's3_resumable_skipped'
+
+_READ_CHUNKSIZE = 1024 * 1024
+
+JournaledUpload = namedtuple(
+    'JournaledUpload',
+    ['bucket', 'key', 'filename', 'size', 'mtime_ns', 'part_size',
+     'params_digest', 'upload_id', 'created'])
+
+JournaledDownload = namedtuple(
+    'JournaledDownload',
+    ['filename', 'partial_filename', 'bucket', 'key', 'etag', 'size',
+     'part_size', 'created'])
+
+
+class TransferJournal(object):
+    """Records the progress of resumable transfers between runs
+
+    For each multipart upload the journal records its upload ID along with
+    the ETag and CRC32 checksum of each part uploaded so far.  For each
+    download it records the partial file being written to and the CRC32
+    checksum of each part written to it so far.  A transfer is removed
+    from the journal once it completes.
+    """
+    _CREATE_TABLES = [
+        """
+        CREATE TABLE IF NOT EXISTS uploads (
+          id INTEGER PRIMARY KEY,
+          bucket TEXT,
+          key TEXT,
+          filename TEXT,
+          size INTEGER,
+          mtime_ns INTEGER,
+          part_size INTEGER,
+          params_digest TEXT,
+          upload_id TEXT,
+          created REAL,
+          UNIQUE (bucket, key, filename)
+        )""",
+        """
+        CREATE TABLE IF NOT EXISTS upload_parts (
+          transfer_id INTEGER,
+          part_number INTEGER,
+          etag TEXT,
+          crc32 INTEGER,
+          PRIMARY KEY (transfer_id, part_number)
+        )""",
+        """
+        CREATE TABLE IF NOT EXISTS downloads (
+          id INTEGER PRIMARY KEY,
+          filename TEXT UNIQUE,
+          partial_filename TEXT,
+          bucket TEXT,
+          key TEXT,
+          etag TEXT,
+          size INTEGER,
+          part_size INTEGER,
+          created REAL
+        )""",
+        """
+        CREATE TABLE IF NOT EXISTS download_parts (
+          transfer_id INTEGER,
+          part_number INTEGER,
+          crc32 INTEGER,
+          PRIMARY KEY (transfer_id, part_number)
+        )""",
+    ]
+    _ENABLE_WAL = 'PRAGMA journal_mode=WAL'
+
+    def __init__(self, db_filename=None):
+        """
+        :param db_filename: The path of the journal's sqlite database. It
+            is created if it does not exist.  Defaults to
+            ``~/.aws/cli/s3/transfers.db``.
+        """
+        if db_filename is None:
+            db_filename = TRANSFER_JOURNAL_FILENAME
+        self._lock = threading.Lock()
+        self._connection = self._connect(db_filename)
+
+    def get_upload(self, bucket, key, filename):
+        """Returns the ``(transfer_id, JournaledUpload)`` of an upload
+
+        None is returned if the upload is not journaled.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT id, %s FROM uploads WHERE bucket = ? AND key = ? '
+                'AND filename = ?' % ', '.join(JournaledUpload._fields),
+                (bucket, key, filename)).fetchone()
+        if row is None:
+            return None
+        return row[0], JournaledUpload(*row[1:])
+
+    def list_uploads(self):
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, %s FROM uploads ORDER BY created' %
+                ', '.join(JournaledUpload._fields)).fetchall()
+        return [(row[0], JournaledUpload(*row[1:])) for row in rows]
+
+    def start_upload(self, upload):
+        """Journals a new upload, replacing any previous upload of the file
+
+        :type upload: JournaledUpload
+        :rtype: int
+        :returns: The ID of the upload in the journal.
+        """
+        with self._lock:
+            with self._transaction():
+                self._delete_transfer(
+                    'uploads', 'upload_parts',
+                    'bucket = ? AND key = ? AND filename = ?',
+                    (upload.bucket, upload.key, upload.filename))
+                return self._connection.execute(
+                    'INSERT INTO uploads (%s) VALUES (%s)' % (
+                        ', '.join(JournaledUpload._fields),
+                        ', '.join('?' * len(upload))),
+                    upload).lastrowid
+
+    def get_upload_parts(self, transfer_id):
+        """Returns the ``(etag, crc32)`` of each uploaded part by number"""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT part_number, etag, crc32 FROM upload_parts '
+                'WHERE transfer_id = ?', (transfer_id,)).fetchall()
+        return dict((row[0], (row[1], row[2])) for row in rows)
+
+    def put_upload_part(self, transfer_id, part_number, etag, crc32):
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO upload_parts '
+                '(transfer_id, part_number, etag, crc32) VALUES (?, ?, ?, ?)',
+                (transfer_id, part_number, etag, crc32))
+
+    def delete_upload(self, transfer_id):
+        with self._lock:
+            with self._transaction():
+                self._delete_transfer(
+                    'uploads', 'upload_parts', 'id = ?', (transfer_id,))
+
+    def get_download(self, filename):
+        """Returns the ``(transfer_id, JournaledDownload)`` of a download
+
+        None is returned if the download is not journaled.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT id, %s FROM downloads WHERE filename = ?' %
+                ', '.join(JournaledDownload._fields),
+                (filename,)).fetchone()
+        if row is None:
+            return None
+        return row[0], JournaledDownload(*row[1:])
+
+    def list_downloads(self):
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT id, %s FROM downloads ORDER BY created' %
+                ', '.join(JournaledDownload._fields)).fetchall()
+        return [(row[0], JournaledDownload(*row[1:])) for row in rows]
+
+    def start_download(self, download):
+        """Journals a new download, replacing any previous download
+
+        :type download: JournaledDownload
+        :rtype: int
+        :returns: The ID of the download in the journal.
+        """
+        with self._lock:
+            with self._transaction():
+                self._delete_transfer(
+                    'downloads', 'download_parts', 'filename = ?',
+                    (download.filename,))
+                return self._connection.execute(
+                    'INSERT INTO downloads (%s) VALUES (%s)' % (
+                        ', '.join(JournaledDownload._fields),
+                        ', '.join('?' * len(download))),
+                    download).lastrowid
+
+    def get_download_parts(self, transfer_id):
+        """Returns the crc32 of each downloaded part by number"""
+        with self._lock:
+            return dict(self._connection.execute(
+                'SELECT part_number, crc32 FROM download_parts '
+                'WHERE transfer_id = ?', (transfer_id,)))
+
+    def put_download_part(self, transfer_id, part_number, crc32):
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO download_parts '
+                '(transfer_id, part_number, crc32) VALUES (?, ?, ?)',
+                (transfer_id, part_number, crc32))
+
+    def delete_download(self, transfer_id):
+        with self._lock:
+            with self._transaction():
+                self._delete_transfer(
+                    'downloads', 'download_parts', 'id = ?', (transfer_id,))
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._connection.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+
+    def _delete_transfer(self, table, parts_table, where, params):
+        transfer_ids = [
+            (row[0],) for row in self._connection.execute(
+                'SELECT id FROM %s WHERE %s' % (table, where), params)
+        ]
+        self._connection.executemany(
+            'DELETE FROM %s WHERE transfer_id = ?' % parts_table,
+            transfer_ids)
+        self._connection.executemany(
+            'DELETE FROM %s WHERE id = ?' % table, transfer_ids)
+
+    def _connect(self, db_filename):
+        if sqlite3 is None:
+            raise RuntimeError(
+                'The sqlite3 module is required to resume transfers.')
+        try:
+            dirname = os.path.dirname(db_filename)
+            if dirname and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            connection = sqlite3.connect(
+                db_filename, check_same_thread=False, isolation_level=None)
+            for create_table in self._CREATE_TABLES:
+                connection.execute(create_table)
+        except (OSError, sqlite3.Error) as e:
+            raise RuntimeError(
+                'Unable to open transfer journal %s: %s' % (db_filename, e))
+        try:
+            connection.execute(self._ENABLE_WAL)
+        except sqlite3.Error:
+            # This is just a performance enhancement so it is optional.
+            LOG.debug('Failed to enable sqlite WAL.')
+        return connection
+
+
+class ResumableTransfers(object):
+    def __init__(self, journal, client, transfer_config):
+        """Resumes the multipart uploads and ranged downloads of a client
+
+        Uploads and downloads are journaled as their parts are transferred.
+        When a journaled transfer is submitted again, each part recorded in
+        the journal is checked against the local file, and against the
+        parts S3 lists for the upload, and the request for the part is
+        answered from the journal if it matches.  Only the remaining parts
+        are transferred.
+
+        Interrupted multipart uploads are not aborted so they can be
+        resumed, and downloads are written to a partial file next to the
+        destination, which is only renamed once the download completes.
+
+        :type journal: TransferJournal
+        :param journal: The journal to record the transfers in
+
+        :type client: botocore.client.Client
+        :param client: The client the transfers are made with
+
+        :type transfer_config: s3transfer.manager.TransferConfig
+        :param transfer_config: The config of the transfer manager the
+            transfers are made with
+        """
+        self._journal = journal
+        self._client = client
+        self._transfer_config = transfer_config
+        self._lock = threading.Lock()
+        self._uploads = {}
+        self._downloads = {}
+        self._partial_downloads = {}
+        self.osutil = ResumableDownloadOSUtils(self)
+        self._register_handlers(client.meta.events)
+
+    def add_upload(self, bucket, key, filename, size):
+        """Journals the upload of a file if it is a multipart upload
+
+        :returns: True if the upload is journaled.
+        """
+        if size is None or size < self._transfer_config.multipart_threshold:
+            return False
+        part_size = ChunksizeAdjuster().adjust_chunksize(
+            self._transfer_config.multipart_chunksize, size)
+        upload = _ResumableUpload(
+            bucket, key, os.path.abspath(filename), size,
+            os.stat(filename).st_mtime_ns, part_size)
+        with self._lock:
+            if (bucket, key) in self._uploads:
+                return False
+            self._uploads[(bucket, key)] = upload
+        return True
+
+    def remove_upload(self, bucket, key):
+        with self._lock:
+            self._uploads.pop((bucket, key), None)
+
+    def add_download(self, bucket, key, filename, size, etag):
+        """Journals the download of an object if it is a ranged download
+
+        :returns: True if the download is journaled.
+        """
+        if size is None or etag is None or \
+                size < self._transfer_config.multipart_threshold:
+            return False
+        download = _ResumableDownload(
+            bucket, key, os.path.abspath(filename),
+            self._get_partial_filename(filename), size, etag,
+            self._transfer_config.multipart_chunksize)
+        with self._lock:
+            if (bucket, key) in self._downloads or \
+                    download.partial_filename in self._partial_downloads:
+                return False
+            self._downloads[(bucket, key)] = download
+            self._partial_downloads[download.partial_filename] = download
+        self._load_download(download)
+        return True
+
+    def remove_download(self, bucket, key):
+        with self._lock:
+            download = self._downloads.pop((bucket, key), None)
+            if download is not None:
+                self._partial_downloads.pop(download.partial_filename, None)
+
+    def get_partial_download(self, partial_filename):
+        with self._lock:
+            return self._partial_downloads.get(partial_filename)
+
+    def get_partial_filename(self, filename):
+        partial_filename = self._get_partial_filename(filename)
+        if self.get_partial_download(partial_filename) is None:
+            return None
+        return partial_filename
+
+    def open_partial_download(self, download):
+        """Opens the partial file of a journaled download for writing"""
+        if download.downloaded_parts:
+            fileobj = open(download.partial_filename, 'r+b')
+        else:
+            fileobj = open(download.partial_filename, 'wb')
+        return _JournaledDownloadFile(fileobj, download, self._journal)
+
+    def finish_download(self, download):
+        self._journal.delete_download(download.transfer_id)
+
+    def close(self):
+        self._journal.close()
+
+    def _get_partial_filename(self, filename):
+        dirname, name = os.path.split(os.path.abspath(filename))
+        name = name[:OSUtils._MAX_FILENAME_LEN - len(PARTIAL_DOWNLOAD_SUFFIX)]
+        return os.path.join(dirname, name + PARTIAL_DOWNLOAD_SUFFIX)
+
+    def _load_download(self, download):
+        journaled = self._journal.get_download(download.filename)
+        if journaled is not None:
+            transfer_id, record = journaled
+            if record == download.to_record(record.created) and \
+                    os.path.exists(download.partial_filename):
+                download.transfer_id = transfer_id
+                download.downloaded_parts = \
+                    self._journal.get_download_parts(transfer_id)
+                LOG.debug(
+                    'Resuming download of s3://%s/%s to %s with %s of its '
+                    'parts already downloaded.', download.bucket,
+                    download.key, download.partial_filename,
+                    len(download.downloaded_parts))
+                return
+        download.transfer_id = self._journal.start_download(
+            download.to_record(time.time()))
+
+    def _register_handlers(self, events):
+        for operation_name in ['CreateMultipartUpload', 'UploadPart',
+                               'CompleteMultipartUpload',
+                               'AbortMultipartUpload']:
+            events.register(
+                'before-parameter-build.s3.%s' % operation_name,
+                self._add_upload_to_context)
+        events.register(
+            'before-call.s3.CreateMultipartUpload', self._resume_upload)
+        events.register(
+            'after-call.s3.CreateMultipartUpload', self._record_upload)
+        events.register('before-call.s3.UploadPart', self._skip_uploaded_part)
+        events.register('after-call.s3.UploadPart', self._record_part)
+        events.register(
+            'after-call.s3.CompleteMultipartUpload', self._forget_upload)
+        events.register(
+            'before-call.s3.AbortMultipartUpload', self._keep_upload)
+        events.register(
+            'before-parameter-build.s3.GetObject',
+            self._add_download_to_context)
+        events.register(
+            'before-call.s3.GetObject', self._read_downloaded_part)
+
+    def _add_upload_to_context(self, params, model, context, **kwargs):
+        with self._lock:
+            upload = self._uploads.get(
+                (params.get('Bucket'), params.get('Key')))
+        if upload is None:
+            return
+        if model.name == 'CreateMultipartUpload':
+            upload.params_digest = _get_params_digest(params)
+            upload.request_params = dict(
+                (name, params[name]) for name in _UPLOAD_REQUEST_PARAMS
+                if name in params)
+        elif params.get('UploadId') != upload.upload_id:
+            return
+        if model.name == 'UploadPart':
+            context[_PART_CONTEXT_KEY] = (
+                params['PartNumber'], _crc32_of_body(params['Body']))
+        context[_UPLOAD_CONTEXT_KEY] = upload
+
+    def _resume_upload(self, context, **kwargs):
+        upload = context.get(_UPLOAD_CONTEXT_KEY)
+        if upload is None:
+            return None
+        journaled = self._journal.get_upload(
+            upload.bucket, upload.key, upload.filename)
+        if journaled is None:
+            return None
+        transfer_id, record = journaled
+        uploaded_parts = None
+        if record == upload.to_record(record.upload_id, record.created):
+            uploaded_parts = self._list_uploaded_parts(
+                upload, record.upload_id)
+        if uploaded_parts is None:
+            # The file changed since the upload was started, or the upload
+            # can no longer be resumed, so it is started over.
+            self._abort_upload(upload, record.upload_id)
+            self._journal.delete_upload(transfer_id)
+            return None
+        journaled_parts = self._journal.get_upload_parts(transfer_id)
+        for part_number, (etag, crc32) in journaled_parts.items():
+            part = uploaded_parts.get(part_number)
+            if part is not None and part['ETag'] == etag:
+                upload.uploaded_parts[part_number] = (crc32, part)
+        upload.transfer_id = transfer_id
+        upload.upload_id = record.upload_id
+        LOG.debug(
+            'Resuming upload %s of %s to s3://%s/%s with %s of its parts '
+            'already uploaded.', upload.upload_id, upload.filename,
+            upload.bucket, upload.key, len(upload.uploaded_parts))
+        context[_SKIPPED_CONTEXT_KEY] = True
+        return _create_response(), {
+            'Bucket': upload.bucket, 'Key': upload.key,
+            'UploadId': upload.upload_id,
+        }
+
+    def _list_uploaded_parts(self, upload, upload_id):
+        paginator = self._client.get_paginator('list_parts')
+        uploaded_parts = {}
+        try:
+            for page in paginator.paginate(
+                    Bucket=upload.bucket, Key=upload.key, UploadId=upload_id,
+                    **upload.request_params):
+                for part in page.get('Parts', []):
+                    uploaded_parts[part['PartNumber']] = part
+        except ClientError as e:
+            LOG.debug(
+                'Unable to list the parts of upload %s: %s', upload_id, e)
+            return None
+        return uploaded_parts
+
+    def _abort_upload(self, upload, upload_id):
+        abort_params = dict(
+            (name, value) for name, value in upload.request_params.items()
+            if not name.startswith('SSECustomer'))
+        try:
+            self._client.abort_multipart_upload(
+                Bucket=upload.bucket, Key=upload.key, UploadId=upload_id,
+                **abort_params)
+        except ClientError as e:
+            LOG.debug('Unable to abort upload %s: %s', upload_id, e)
+
+    def _record_upload(self, http_response, parsed, context, **kwargs):
+        upload = context.get(_UPLOAD_CONTEXT_KEY)
+        if upload is None or context.get(_SKIPPED_CONTEXT_KEY) or \
+                http_response.status_code >= 300:
+            return
+        upload.upload_id = parsed['UploadId']
+        upload.transfer_id = self._journal.start_upload(
+            upload.to_record(upload.upload_id, time.time()))
+
+    def _skip_uploaded_part(self, context, **kwargs):
+        upload = context.get(_UPLOAD_CONTEXT_KEY)
+        if upload is None or _PART_CONTEXT_KEY not in context:
+            return None
+        part_number, crc32 = context[_PART_CONTEXT_KEY]
+        journaled_crc32, part = upload.uploaded_parts.get(
+            part_number, (None, None))
+        if journaled_crc32 != crc32:
+            return None
+        LOG.debug(
+            'Skipping part %s of upload %s as it was already uploaded.',
+            part_number, upload.upload_id)
+        context[_SKIPPED_CONTEXT_KEY] = True
+        return _create_response(), dict(
+            (name, value) for name, value in part.items()
+            if name == 'ETag' or name.startswith('Checksum'))
+
+    def _record_part(self, http_response, parsed, context, **kwargs):
+        upload = context.get(_UPLOAD_CONTEXT_KEY)
+        if upload is None or _PART_CONTEXT_KEY not in context or \
+                context.get(_SKIPPED_CONTEXT_KEY) or \
+                http_response.status_code >= 300 or \
+                upload.transfer_id is None:
+            return
+        part_number, crc32 = context[_PART_CONTEXT_KEY]
+        self._journal.put_upload_part(
+            upload.transfer_id, part_number, parsed['ETag'], crc32)
+
+    def _forget_upload(self, http_response, context, **kwargs):
+        upload = context.get(_UPLOAD_CONTEXT_KEY)
+        if upload is None or http_response.status_code >= 300 or \
+                upload.transfer_id is None:
+            return
+        self._journal.delete_upload(upload.transfer_id)
+
+    def _keep_upload(self, context, **kwargs):
+        upload = context.get(_UPLOAD_CONTEXT_KEY)
+        if upload is None or upload.transfer_id is None:
+            return None
+        # The transfer manager aborts multipart uploads that fail, which
+        # would discard the parts the upload is resumed from.
+        LOG.debug(
+            'Not aborting upload %s so that it can be resumed.',
+            upload.upload_id)
+        return _create_response(204), {}
+
+    def _add_download_to_context(self, params, context, **kwargs):
+        with self._lock:
+            download = self._downloads.get(
+                (params.get('Bucket'), params.get('Key')))
+        if download is None or 'Range' not in params:
+            return
+        start = int(params['Range'][len('bytes='):].split('-', 1)[0])
+        if start % download.part_size:
+            return
+        context[_DOWNLOAD_CONTEXT_KEY] = (
+            download, start // download.part_size + 1)
+
+    def _read_downloaded_part(self, context, **kwargs):
+        if _DOWNLOAD_CONTEXT_KEY not in context:
+            return None
+        download, part_number = context[_DOWNLOAD_CONTEXT_KEY]
+        journaled_crc32 = download.downloaded_parts.get(part_number)
+        if journaled_crc32 is None:
+            return None
+        start = (part_number - 1) * download.part_size
+        size = download.get_part_size(part_number)
+        try:
+            with open(download.partial_filename, 'rb') as f:
+                f.seek(start)
+                data = f.read(size)
+        except (OSError, IOError) as e:
+            LOG.debug(
+                'Unable to read %s: %s', download.partial_filename, e)
+            return None
+        if len(data) != size or zlib.crc32(data) != journaled_crc32:
+            return None
+        LOG.debug(
+            'Skipping part %s of the download of s3://%s/%s as it was '
+            'already downloaded.', part_number, download.bucket,
+            download.key)
+        return _create_response(206), {
+            'Body': io.BytesIO(data),
+            'ContentLength': size,
+            'ContentRange': 'bytes %s-%s/%s' % (
+                start, start + size - 1, download.size),
+            'ETag': download.etag,
+        }
+
+
+class ResumableDownloadOSUtils(OSUtils):
+    """Writes journaled downloads to their partial files
+
+    The partial file of a download is kept if the download fails so that
+    it can be resumed, and the download is removed from the journal once
+    the partial file is renamed to the destination.
+    """
+    def __init__(self, resumable_transfers):
+        super(ResumableDownloadOSUtils, self).__init__()
+        self._resumable_transfers = resumable_transfers
+
+    def get_temp_filename(self, filename):
+        partial_filename = self._resumable_transfers.get_partial_filename(
+            filename)
+        if partial_filename is None:
+            return super(ResumableDownloadOSUtils, self).get_temp_filename(
+                filename)
+        return partial_filename
+
+    def open(self, filename, mode):
+        download = self._resumable_transfers.get_partial_download(filename)
+        if download is None:
+            return super(ResumableDownloadOSUtils, self).open(filename, mode)
+        return self._resumable_transfers.open_partial_download(download)
+
+    def remove_file(self, filename):
+        if self._resumable_transfers.get_partial_download(filename) is None:
+            super(ResumableDownloadOSUtils, self).remove_file(filename)
+
+    def rename_file(self, current_filename, new_filename):
+        super(ResumableDownloadOSUtils, self).rename_file(
+            current_filename, new_filename)
+        download = self._resumable_transfers.get_partial_download(
+            current_filename)
+        if download is not None:
+            self._resumable_transfers.finish_download(download)
+
+
+class ResumableTransferSubscriber(BaseSubscriber):
+    """Stops tracking a resumable transfer once it is done"""
+    def __init__(self, remove_transfer, bucket, key):
+        self._remove_transfer = remove_transfer
+        self._bucket = bucket
+        self._key = key
+
+    def on_done(self, future, **kwargs):
+        self._remove_transfer(self._bucket, self._key)
+
+
+class _ResumableUpload(object):
+    def __init__(self, bucket, key, filename, size, mtime_ns, part_size):
+        self.bucket = bucket
+        self.key = key
+        self.filename = filename
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.part_size = part_size
+        self.params_digest = None
+        self.request_params = {}
+        self.transfer_id = None
+        self.upload_id = None
+        # The crc32 and ListParts entry of each part that can be skipped
+        # by part number.
+        self.uploaded_parts = {}
+
+    def to_record(self, upload_id, created):
+        return JournaledUpload(
+            self.bucket, self.key, self.filename, self.size, self.mtime_ns,
+            self.part_size, self.params_digest, upload_id, created)
+
+
+class _ResumableDownload(object):
+    def __init__(self, bucket, key, filename, partial_filename, size, etag,
+                 part_size):
+        self.bucket = bucket
+        self.key = key
+        self.filename = filename
+        self.partial_filename = partial_filename
+        self.size = size
+        self.etag = etag
+        self.part_size = part_size
+        self.transfer_id = None
+        # The crc32 of each part written to the partial file by part
+        # number.
+        self.downloaded_parts = {}
+
+    def get_part_size(self, part_number):
+        return min(
+            self.part_size, self.size - (part_number - 1) * self.part_size)
+
+    def to_record(self, created):
+        return JournaledDownload(
+            self.filename, self.partial_filename, self.bucket, self.key,
+            self.etag, self.size, self.part_size, created)
+
+
+class _JournaledDownloadFile(object):
+    """Records the parts of a download as they are written to disk"""
+    def __init__(self, fileobj, download, journal):
+        self._fileobj = fileobj
+        self._download = download
+        self._journal = journal
+        self._position = 0
+        self._part_number = None
+        self._part_crc32 = 0
+        self._part_bytes_written = 0
+
+    def seek(self, offset, whence=0):
+        self._fileobj.seek(offset, whence)
+        self._position = self._fileobj.tell()
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        part_number = self._position // self._download.part_size + 1
+        if self._position % self._download.part_size == 0:
+            # Each part is written from its start, including when the
+            # request for the part is retried.
+            self._part_number = part_number
+            self._part_crc32 = 0
+            self._part_bytes_written = 0
+        self._fileobj.write(data)
+        self._position += len(data)
+        if part_number != self._part_number:
+            return
+        self._part_crc32 = zlib.crc32(data, self._part_crc32)
+        self._part_bytes_written += len(data)
+        if self._part_bytes_written == \
+                self._download.get_part_size(part_number):
+            # The part is only journaled once it is out of this process's
+            # buffers.
+            self._fileobj.flush()
+            self._download.downloaded_parts[part_number] = self._part_crc32
+            self._journal.put_download_part(
+                self._download.transfer_id, part_number, self._part_crc32)
+            self._part_number = None
+
+    def close(self):
+        self._fileobj.close()
+
+
+def _create_response(status_code=200):
+    return AWSResponse(None, status_code, {}, None)
+
+
+def _crc32_of_body(body):
+    if isinstance(body, bytes):
+        return zlib.crc32(body)
+    position = body.tell()
+    crc32 = 0
+    for chunk in iter(lambda: body.read(_READ_CHUNKSIZE), b''):
+        crc32 = zlib.crc32(chunk, crc32)
+    body.seek(position)
+    return crc32
+
+
+def _get_params_digest(params):
+    # The upload is only resumed with the same parameters it was started
+    # with.  The SSE-C key is checked by S3 when listing the upload's parts.
+    digest_params = dict(
+        (name, value) for name, value in params.items()
+        if name not in ['Bucket', 'Key', 'SSECustomerKey',
+                        'SSECustomerKeyMD5'])
+    return hashlib.sha256(json.dumps(
+        digest_params, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
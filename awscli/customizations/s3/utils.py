@@ -15,16 +15,25 @@ import logging
 from datetime import datetime
 import mimetypes
 import errno
+import heapq
 import os
+import pickle
 import re
+import tempfile
+import threading
 import time
 from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from dateutil.parser import parse
 from dateutil.tz import tzlocal, tzutc
 from s3transfer.subscribers import BaseSubscriber
 
 from awscli.compat import bytes_print
+from awscli.customizations.s3.resolutioncache import ACCESS_POINT_BUCKET
+from awscli.customizations.s3.resolutioncache import \
+    ACCESS_POINT_ALIAS_BUCKET
+from awscli.customizations.s3.resolutioncache import MRAP_BUCKETS
 from awscli.compat import queue
 
 LOGGER = logging.getLogger(__name__)
@@ -33,6 +42,9 @@ EPOCH_TIME = datetime(1970, 1, 1, tzinfo=tzutc())
 # Maximum object size allowed in S3.
 # See: http://docs.aws.amazon.com/AmazonS3/latest/dev/qfacts.html
 MAX_UPLOAD_SIZE = 5 * (1024 ** 3) * 10000
+# The number of listed entries sorted in memory before they are spilled to
+# a temporary file.
+DEFAULT_SORT_BUFFER_SIZE = 100000
 SIZE_SUFFIX = {
     'kb': 1024,
     'mb': 1024 ** 2,
@@ -262,7 +274,14 @@ def get_file_stat(path):
     except IOError as e:
         raise ValueError('Could not retrieve file stat of "%s": %s' % (
             path, e))
+    return get_file_stat_from_stat_result(stats)
 
+
+def get_file_stat_from_stat_result(stats):
+    """
+    Returns the size and time of last modification from an ``os.stat``
+    result, such as the one cached on an ``os.DirEntry``.
+    """
     try:
         update_time = datetime.fromtimestamp(stats.st_mtime, tzlocal())
     except (ValueError, OSError, OverflowError):
@@ -401,8 +420,75 @@ def _date_parser(date_string):
     return parse(date_string).astimezone(tzlocal())
 
 
+def parse_last_modified(last_modified):
+    """Converts an S3 ``LastModified`` timestamp to a local datetime.
+
+    Timestamps that have already been converted are returned unchanged.
+    """
+    if isinstance(last_modified, str):
+        return _date_parser(last_modified)
+    return last_modified
+
+
+
+class LastUpdateMixin(object):
+    """Parses the ``last_update`` of a file when it is first accessed
+
+    Timestamps listed from S3 are kept as strings until they are needed,
+    as most of them never are.
+    """
+    __slots__ = ('_last_update',)
+
+    @property
+    def last_update(self):
+        self._last_update = parse_last_modified(self._last_update)
+        return self._last_update
+
+    @last_update.setter
+    def last_update(self, value):
+        self._last_update = value
+
+    @property
+    def raw_last_update(self):
+        """The ``last_update`` as it was set, without parsing it"""
+        return self._last_update
+
+def get_connection_pool_stats(client):
+    """Returns how the connections of a client's pools were used.
+
+    :returns: A dictionary of each host the client made requests to, to a
+        tuple of the number of connections it opened and the number of
+        requests it sent.  Every request that did not need a new connection
+        reused a kept-alive one.
+    """
+    stats = {}
+    try:
+        http_session = client._endpoint.http_session
+        managers = [http_session._manager]
+        managers.extend(http_session._proxy_managers.values())
+    except AttributeError:
+        # Only the default botocore HTTP session is supported.
+        return stats
+    for manager in managers:
+        for pool_key in manager.pools.keys():
+            pool = manager.pools.get(pool_key)
+            if pool is None:
+                continue
+            host = '%s://%s:%s' % (pool.scheme, pool.host, pool.port)
+            opened, sent = stats.get(host, (0, 0))
+            stats[host] = (opened + pool.num_connections,
+                           sent + pool.num_requests)
+    return stats
+
+
 class BucketLister(object):
-    """List keys in a bucket."""
+    """List keys in a bucket.
+
+    The ``LastModified`` timestamp of each key is converted with
+    ``date_parser``.  If ``date_parser`` is None, the timestamp is left as
+    the string returned by S3 so callers can defer converting it until it
+    is needed.
+    """
     def __init__(self, client, date_parser=_date_parser):
         self._client = client
         self._date_parser = date_parser
@@ -421,11 +507,342 @@ class BucketLister(object):
             contents = page.get('Contents', [])
             for content in contents:
                 source_path = bucket + '/' + content['Key']
-                content['LastModified'] = self._date_parser(
-                    content['LastModified'])
+                if self._date_parser is not None:
+                    content['LastModified'] = self._date_parser(
+                        content['LastModified'])
                 yield source_path, content
 
 
+class ExternalSorter(object):
+    """Sort items that may not all fit in memory.
+
+    Items are collected in memory until ``buffer_size`` of them have been
+    seen.  Each full buffer is sorted and spilled to a temporary file as a
+    sorted run, and the runs are merged as the sorted items are read back.
+    When the items fit in a single buffer nothing is written to disk.
+    Spilled items must be picklable.
+    """
+    def __init__(self, key=None, buffer_size=DEFAULT_SORT_BUFFER_SIZE,
+                 tempdir=None):
+        self._key = key
+        self._buffer_size = buffer_size
+        self._tempdir = tempdir
+
+    def sort(self, iterable):
+        runs = []
+        try:
+            buffer = []
+            for item in iterable:
+                buffer.append(item)
+                if len(buffer) >= self._buffer_size:
+                    runs.append(self._spill(buffer))
+                    buffer = []
+            buffer.sort(key=self._key)
+            if not runs:
+                for item in buffer:
+                    yield item
+                return
+            LOGGER.debug(
+                'Merging %s sorted runs spilled to temporary files.',
+                len(runs))
+            sorted_runs = [self._read_run(run) for run in runs]
+            sorted_runs.append(iter(buffer))
+            for item in heapq.merge(*sorted_runs, key=self._key):
+                yield item
+        finally:
+            for run in runs:
+                run.close()
+
+    def _spill(self, buffer):
+        buffer.sort(key=self._key)
+        run = tempfile.TemporaryFile(dir=self._tempdir)
+        try:
+            pickler = pickle.Pickler(run, pickle.HIGHEST_PROTOCOL)
+            for item in buffer:
+                pickler.dump(item)
+                # The memo would otherwise keep a reference to every item
+                # written to the run.
+                pickler.clear_memo()
+            run.seek(0)
+        except Exception:
+            run.close()
+            raise
+        return run
+
+    def _read_run(self, run):
+        while True:
+            try:
+                yield pickle.load(run)
+            except EOFError:
+                return
+
+
+class _WorkerError(object):
+    def __init__(self, exception):
+        self.exception = exception
+
+
+_WORKER_DONE = object()
+
+
+class ShardedBucketLister(BucketLister):
+    """List keys in a bucket using concurrent paginators over key ranges.
+
+    The keys under the listed prefix are divided into disjoint, ordered
+    ranges. The boundaries of those ranges are either provided by the
+    caller as ``split_points`` or discovered by probing the prefix tree
+    with a delimiter. Each range is listed with its own paginator on a
+    worker thread and the pages are handed back through a bounded buffer
+    per range. Because the ranges are disjoint and ordered, draining the
+    buffers in range order yields keys in the same byte order as a single
+    ``ListObjectsV2`` paginator, which is what the ``Comparator`` relies on.
+
+    A split point ``k`` closes a range, so the ranges produced from the
+    split points ``[k1, k2]`` are ``(-inf, k1]``, ``(k1, k2]`` and
+    ``(k2, +inf)``. The lower bound of each range maps directly to the
+    exclusive ``StartAfter`` parameter of ``ListObjectsV2``.
+    """
+    DELIMITER = '/'
+    # How many levels of the prefix tree to probe when looking for
+    # split points.
+    MAX_PROBE_DEPTH = 3
+    # The number of ranges to create for each worker. Having more ranges
+    # than workers keeps every worker busy when ranges differ in size.
+    SHARDS_PER_WORKER = 4
+    # The number of listing pages buffered for each range. Memory is
+    # bounded by roughly
+    # ``max_concurrency * (max_buffered_pages + 1) * page_size`` keys.
+    MAX_BUFFERED_PAGES = 2
+    # How long a worker waits on a full buffer before checking whether
+    # the listing was abandoned.
+    _PUT_TIMEOUT = 0.1
+
+    def __init__(self, client, max_concurrency=10, split_points=None,
+                 date_parser=_date_parser, max_buffered_pages=None):
+        super(ShardedBucketLister, self).__init__(client, date_parser)
+        self._max_concurrency = max_concurrency
+        self._split_points = split_points
+        self._max_buffered_pages = max_buffered_pages
+        if max_buffered_pages is None:
+            self._max_buffered_pages = self.MAX_BUFFERED_PAGES
+
+    def list_objects(self, bucket, prefix=None, page_size=None,
+                     extra_args=None):
+        if self._max_concurrency <= 1:
+            split_points = []
+        else:
+            split_points = self.get_split_points(bucket, prefix, extra_args)
+        if not split_points:
+            for key in super(ShardedBucketLister, self).list_objects(
+                    bucket, prefix, page_size, extra_args):
+                yield key
+            return
+        LOGGER.debug(
+            'Listing s3://%s/%s in %s ranges with %s workers', bucket,
+            prefix or '', len(split_points) + 1, self._max_concurrency)
+        lower_bounds = [None] + split_points
+        upper_bounds = split_points + [None]
+        stop_event = threading.Event()
+        buffers = []
+        executor = ThreadPoolExecutor(
+            max_workers=min(self._max_concurrency, len(lower_bounds)))
+        try:
+            # Ranges are submitted in the same order they are consumed so
+            # a range that is being drained always has a worker.
+            for start_after, end_key in zip(lower_bounds, upper_bounds):
+                shard_buffer = queue.Queue(self._max_buffered_pages)
+                buffers.append(shard_buffer)
+                executor.submit(
+                    self._list_range, shard_buffer, stop_event, bucket,
+                    prefix, start_after, end_key, page_size, extra_args)
+            for shard_buffer in buffers:
+                for content in self._drain_range(shard_buffer):
+                    yield bucket + '/' + content['Key'], content
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_split_points(self, bucket, prefix=None, extra_args=None):
+        """Determine the keys at which the listing is split into ranges
+
+        :returns: A sorted list of unique keys. An empty list means that
+            the prefix should be listed with a single paginator.
+        """
+        if self._split_points is not None:
+            split_points = [
+                key for key in self._split_points
+                if not prefix or key.startswith(prefix)
+            ]
+        else:
+            split_points = self._discover_split_points(
+                bucket, prefix or '', extra_args)
+        return sorted(set(split_points))
+
+    def _discover_split_points(self, bucket, prefix, extra_args):
+        # Breadth first probe of the prefix tree. Prefixes with no
+        # children are leaves and are carried over to the next level
+        # as is. Probing stops once there are enough prefixes to keep
+        # every worker busy.
+        prefixes = [prefix]
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as pool:
+            for _ in range(self.MAX_PROBE_DEPTH):
+                if len(prefixes) >= self._max_concurrency:
+                    break
+                probed = list(pool.map(
+                    lambda p: self._probe_common_prefixes(
+                        bucket, p, extra_args),
+                    prefixes))
+                next_prefixes = []
+                for parent, children in zip(prefixes, probed):
+                    next_prefixes.extend(children or [parent])
+                if next_prefixes == prefixes:
+                    break
+                prefixes = next_prefixes
+        # The first range always starts at the beginning of the listed
+        # prefix so it does not need a boundary of its own.
+        boundaries = prefixes[1:]
+        max_split_points = self._max_concurrency * self.SHARDS_PER_WORKER - 1
+        if len(boundaries) > max_split_points:
+            step = len(boundaries) / float(max_split_points)
+            boundaries = [
+                boundaries[int(i * step)] for i in range(max_split_points)
+            ]
+        return boundaries
+
+    def _probe_common_prefixes(self, bucket, prefix, extra_args):
+        kwargs = {'Bucket': bucket, 'Prefix': prefix,
+                  'Delimiter': self.DELIMITER}
+        if extra_args is not None:
+            kwargs.update(extra_args)
+        # Only a single page is requested. The split points are just a
+        # partitioning hint so an incomplete set of prefixes is harmless.
+        response = self._client.list_objects_v2(**kwargs)
+        return sorted(
+            common_prefix['Prefix']
+            for common_prefix in response.get('CommonPrefixes', [])
+        )
+
+    def _list_range(self, shard_buffer, stop_event, bucket, prefix,
+                    start_after, end_key, page_size, extra_args):
+        try:
+            kwargs = {
+                'Bucket': bucket, 'PaginationConfig': {'PageSize': page_size}
+            }
+            if prefix is not None:
+                kwargs['Prefix'] = prefix
+            if start_after is not None:
+                kwargs['StartAfter'] = start_after
+            if extra_args is not None:
+                kwargs.update(extra_args)
+            paginator = self._client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(**kwargs):
+                contents = []
+                reached_end = False
+                for content in page.get('Contents', []):
+                    if end_key is not None and content['Key'] > end_key:
+                        reached_end = True
+                        break
+                    if self._date_parser is not None:
+                        content['LastModified'] = self._date_parser(
+                            content['LastModified'])
+                    contents.append(content)
+                if not self._put(shard_buffer, contents, stop_event):
+                    return
+                if reached_end:
+                    break
+        except Exception as e:
+            self._put(shard_buffer, _WorkerError(e), stop_event)
+            return
+        self._put(shard_buffer, _WORKER_DONE, stop_event)
+
+    def _put(self, shard_buffer, item, stop_event):
+        while not stop_event.is_set():
+            try:
+                shard_buffer.put(item, timeout=self._PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _drain_range(self, shard_buffer):
+        while True:
+            item = shard_buffer.get()
+            if item is _WORKER_DONE:
+                return
+            if isinstance(item, _WorkerError):
+                raise item.exception
+            for content in item:
+                yield content
+
+
+class PipelineStage(object):
+    """Runs an iterable on its own thread.
+
+    The items produced by the iterable are handed to the consuming thread
+    through a bounded queue, so a slow consumer applies back pressure and a
+    slow producer does not stall the work the consumer can already do.
+    Items are yielded in the order they were produced.  An exception
+    raised by the iterable is raised in the consuming thread once all of
+    the items produced before it have been consumed.  If the consumer
+    stops iterating, e.g. because of an error or a Ctrl-C, the worker
+    thread stops producing items.
+    """
+    _QUEUE_TIMEOUT = 0.1
+
+    def __init__(self, iterable, max_queue_size, name=None):
+        self._iterable = iterable
+        self._queue = queue.Queue(max_queue_size)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name=name)
+        # The worker may be blocked on a network call when the command
+        # is interrupted, which must not prevent the process from exiting.
+        self._thread.daemon = True
+
+    def run(self):
+        """Starts the worker thread and returns an iterator of its items."""
+        self._thread.start()
+        return self._consume()
+
+    def _produce(self):
+        iterator = iter(self._iterable)
+        try:
+            for item in iterator:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._put(_WorkerError(e))
+            return
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        self._put(_WORKER_DONE)
+
+    def _put(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=self._QUEUE_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _consume(self):
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._QUEUE_TIMEOUT)
+                except queue.Empty:
+                    continue
+                if item is _WORKER_DONE:
+                    return
+                if isinstance(item, _WorkerError):
+                    raise item.exception
+                yield item
+        finally:
+            self._stop_event.set()
+
+
 class PrintTask(namedtuple('PrintTask',
                           ['message', 'error', 'total_parts', 'warning'])):
     def __new__(cls, message, error=False, total_parts=None, warning=None):
@@ -865,10 +1282,85 @@ class NonSeekableStream(object):
             return self._fileobj.read(amt)
 
 
+class ReadAheadStream(NonSeekableStream):
+    """Read a non seekable stream ahead of its consumer.
+
+    A reader thread reads the stream in parts of ``part_size`` bytes and
+    buffers up to ``max_buffered_parts`` of them, so reading the stream
+    overlaps with the consumer's handling of the previous parts instead
+    of waiting on it.  Reads of exactly ``part_size`` bytes return the
+    parts as they were read, without copying them.  An exception raised
+    while reading the stream is raised by ``read()`` once the parts read
+    before it have been consumed.
+    """
+    MAX_BUFFERED_PARTS = 2
+
+    def __init__(self, fileobj, part_size, max_buffered_parts=None):
+        super(ReadAheadStream, self).__init__(fileobj)
+        self._part_size = part_size
+        if max_buffered_parts is None:
+            max_buffered_parts = self.MAX_BUFFERED_PARTS
+        self._parts = queue.Queue(max_buffered_parts)
+        self._pending = b''
+        self._done = False
+        self._thread = None
+
+    def read(self, amt=None):
+        if self._thread is None:
+            # The reader thread is a daemon as it can be blocked reading
+            # the stream, such as stdin, after the transfer was cancelled.
+            self._thread = threading.Thread(target=self._read_parts)
+            self._thread.daemon = True
+            self._thread.start()
+        chunks = []
+        remaining = amt
+        while remaining is None or remaining > 0:
+            if not self._pending:
+                self._pending = self._get_part()
+                if not self._pending:
+                    break
+            if remaining is None or len(self._pending) <= remaining:
+                chunk = self._pending
+                self._pending = b''
+            else:
+                chunk = self._pending[:remaining]
+                self._pending = self._pending[remaining:]
+            chunks.append(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+        if len(chunks) == 1:
+            return chunks[0]
+        return b''.join(chunks)
+
+    def _get_part(self):
+        if self._done:
+            return b''
+        part = self._parts.get()
+        if part is _WORKER_DONE:
+            self._done = True
+            return b''
+        if isinstance(part, _WorkerError):
+            self._done = True
+            raise part.exception
+        return part
+
+    def _read_parts(self):
+        try:
+            while True:
+                part = self._fileobj.read(self._part_size)
+                if not part:
+                    break
+                self._parts.put(part)
+        except Exception as e:
+            self._parts.put(_WorkerError(e))
+            return
+        self._parts.put(_WORKER_DONE)
+
+
 class S3PathResolver:
     _S3_ACCESSPOINT_ARN_TO_ACCOUNT_NAME_REGEX = re.compile(
-        r'^arn:aws.*:s3:[a-z0-9\-]+:(?P<account>[0-9]{12}):accesspoint[:/]'
-        r'(?P<name>[a-z0-9\-]{3,50})$'
+        r'^arn:(?P<partition>aws[^:]*):s3:(?P<region>[a-z0-9\-]+):'
+        r'(?P<account>[0-9]{12}):accesspoint[:/](?P<name>[a-z0-9\-]{3,50})$'
     )
     _S3_OUTPOST_ACCESSPOINT_ARN_TO_ACCOUNT_REGEX = re.compile(
         r'^arn:aws.*:s3-outposts:[a-z0-9\-]+:(?P<account>[0-9]{12}):outpost/'
@@ -879,9 +1371,10 @@ class S3PathResolver:
         r'(?P<alias>[a-zA-Z0-9]+\.mrap)$'
     )
 
-    def __init__(self, s3control_client, sts_client):
+    def __init__(self, s3control_client, sts_client, resolution_cache=None):
         self._s3control_client = s3control_client
         self._sts_client = sts_client
+        self._resolution_cache = resolution_cache
 
     @classmethod
     def has_underlying_s3_path(self, path):
@@ -893,7 +1386,8 @@ class S3PathResolver:
             bucket.endswith('-s3alias') or bucket.endswith('--op-s3'))
 
     @classmethod
-    def from_session(cls, session, region, verify_ssl):
+    def from_session(cls, session, region, verify_ssl,
+                     resolution_cache=None):
         s3control_client = session.create_client(
             's3control',
             region_name=region,
@@ -903,19 +1397,21 @@ class S3PathResolver:
             'sts',
             verify=verify_ssl,
         )
-        return cls(s3control_client, sts_client)
+        return cls(s3control_client, sts_client, resolution_cache)
 
     def resolve_underlying_s3_paths(self, path):
         bucket, key = split_s3_bucket_key(path)
         match = self._S3_ACCESSPOINT_ARN_TO_ACCOUNT_NAME_REGEX.match(bucket)
         if match:
+            cache_key = '{partition}/{region}/{account}/{name}'.format(
+                **match.groupdict())
             return self._resolve_accesspoint_arn(
-                match.group('account'), match.group('name'), key
+                cache_key, match.group('account'), match.group('name'), key
             )
         match = self._S3_OUTPOST_ACCESSPOINT_ARN_TO_ACCOUNT_REGEX.match(bucket)
         if match:
             return self._resolve_accesspoint_arn(
-                match.group('account'), bucket, key
+                bucket, match.group('account'), bucket, key
             )
         match = self._S3_MRAP_ARN_TO_ACCOUNT_ALIAS_REGEX.match(bucket)
         if match:
@@ -932,19 +1428,42 @@ class S3PathResolver:
             )
         return [path]
 
-    def _resolve_accesspoint_arn(self, account, name, key):
-        bucket = self._get_access_point_bucket(account, name)
+    def _resolve_accesspoint_arn(self, cache_key, account, name, key):
+        # Access point names are only unique within an account and region,
+        # so the cache key has to include the partition and region of the
+        # ARN as well.
+        bucket = self._get_cached(
+            ACCESS_POINT_BUCKET, cache_key,
+            self._get_access_point_bucket, account, name)
         return [f"s3://{bucket}/{key}"]
 
     def _resolve_accesspoint_alias(self, alias, key):
-        account = self._get_account_id()
-        bucket = self._get_access_point_bucket(account, alias)
+        # Access point aliases are globally unique, so the account is only
+        # looked up if the alias is not cached.
+        bucket = self._get_cached(
+            ACCESS_POINT_ALIAS_BUCKET, alias,
+            self._get_access_point_alias_bucket, alias)
         return [f"s3://{bucket}/{key}"]
 
     def _resolve_mrap_alias(self, account, alias, key):
-        buckets = self._get_mrap_buckets(account, alias)
+        buckets = self._get_cached(
+            MRAP_BUCKETS, f'{account}/{alias}',
+            self._get_mrap_buckets, account, alias)
         return [f"s3://{bucket}/{key}" for bucket in buckets]
 
+    def _get_cached(self, namespace, key, resolve, *args):
+        if self._resolution_cache is None:
+            return resolve(*args)
+        value = self._resolution_cache.get(namespace, key)
+        if value is None:
+            value = resolve(*args)
+            self._resolution_cache.put(namespace, key, value)
+        return value
+
+    def _get_access_point_alias_bucket(self, alias):
+        account = self._get_account_id()
+        return self._get_access_point_bucket(account, alias)
+
     def _get_access_point_bucket(self, account, name):
         return self._s3control_client.get_access_point(
             AccountId=account,
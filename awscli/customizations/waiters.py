@@ -13,7 +13,7 @@
 from botocore import xform_name
 from botocore.exceptions import DataNotFoundError
 
-from awscli.clidriver import ServiceOperation
+from awscli.clidriver import ServiceCommand, ServiceOperation
 from awscli.customizations.commands import BasicCommand, BasicHelp, \
     BasicDocHandler
 from awscli.utils import create_nested_client
@@ -24,6 +24,9 @@ def register_add_waiters(cli):
 
 
 def add_waiters(command_table, session, command_object, **kwargs):
+    if isinstance(command_object, ServiceCommand):
+        _add_service_waiters(command_table, session, command_object)
+        return
     # Check if the command object passed in has a ``service_object``. We
     # only want to add wait commands to top level model-driven services.
     # These require service objects.
@@ -41,6 +44,18 @@ def add_waiters(command_table, session, command_object, **kwargs):
                 session, waiter_model, service_model)
 
 
+def _add_service_waiters(command_table, session, service_command):
+    # Whether the service has waiters is cached with its command table, so
+    # the waiter model is only loaded when a wait command is run.
+    def has_waiters():
+        waiter_model = get_waiter_model_from_service_model(
+            session, service_command.service_model)
+        return bool(waiter_model is not None and waiter_model.waiter_names)
+
+    if service_command.get_cached_value('has-waiters', has_waiters):
+        command_table['wait'] = ServiceWaitCommand(session, service_command)
+
+
 def get_waiter_model_from_service_model(session, service_model):
     try:
         model = session.get_waiter_model(service_model.service_name,
@@ -59,13 +74,25 @@ class WaitCommand(BasicCommand):
     def __init__(self, session, waiter_model, service_model):
         self._model = waiter_model
         self._service_model = service_model
-        self.waiter_cmd_builder = WaiterStateCommandBuilder(
-            session=session,
-            model=self._model,
-            service_model=self._service_model
-        )
+        self._waiter_cmd_builder = None
         super(WaitCommand, self).__init__(session)
 
+    @property
+    def waiter_cmd_builder(self):
+        if self._waiter_cmd_builder is None:
+            self._waiter_cmd_builder = WaiterStateCommandBuilder(
+                session=self._session,
+                model=self._get_waiter_model(),
+                service_model=self._get_service_model()
+            )
+        return self._waiter_cmd_builder
+
+    def _get_waiter_model(self):
+        return self._model
+
+    def _get_service_model(self):
+        return self._service_model
+
     def _run_main(self, parsed_args, parsed_globals):
         if parsed_args.subcommand is None:
             raise ValueError("usage: aws [options] <command> <subcommand> "
@@ -84,6 +111,24 @@ class WaitCommand(BasicCommand):
                          event_handler_class=WaiterCommandDocHandler)
 
 
+class ServiceWaitCommand(WaitCommand):
+    """The wait command of a service command
+
+    The service and waiter models are loaded once the wait command is run
+    or documented.
+    """
+    def __init__(self, session, service_command):
+        self._service_command = service_command
+        super(ServiceWaitCommand, self).__init__(session, None, None)
+
+    def _get_waiter_model(self):
+        return get_waiter_model_from_service_model(
+            self._session, self._get_service_model())
+
+    def _get_service_model(self):
+        return self._service_command.service_model
+
+
 class WaiterStateCommandBuilder(object):
     def __init__(self, session, model, service_model):
         self._session = session
@@ -10,11 +10,12 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import itertools
 import logging
 
 from botocore.compat import json
 from botocore.paginate import PageIterator
-from botocore.utils import set_value_from_jmespath
+from botocore.utils import merge_dicts, set_value_from_jmespath
 
 from awscli import compat, text
 from awscli.table import ColorizedStyler, MultiTable, Styler
@@ -27,6 +28,113 @@ def is_response_paginated(response):
     return isinstance(response, PageIterator)
 
 
+def _is_top_level_key(result_key):
+    return result_key.parsed['type'] == 'field'
+
+
+def _get_item_query_result_key(query, response):
+    """Return the result key that a query projects item by item.
+
+    A query like ``Versions[].Key`` or ``Versions[?Size > `0`]`` applied to
+    the full result gives the same list as applying it to each page and
+    concatenating the results, so it can be evaluated one page at a time.
+    ``None`` is returned for any query that needs the whole result.
+    """
+    node = query.parsed
+    if node['type'] not in ('projection', 'filter_projection', 'flatten'):
+        return None
+    while node['type'] in ('projection', 'filter_projection', 'flatten'):
+        node = node['children'][0]
+    if node['type'] != 'field':
+        return None
+    for result_key in response.result_keys:
+        if _is_top_level_key(result_key) and (
+            result_key.expression == node['value']
+        ):
+            return node['value']
+    return None
+
+
+def _merge_page(result, page, result_keys):
+    # This mirrors how PageIterator.build_full_result() aggregates pages.
+    for result_key in result_keys:
+        value = result_key.search(page)
+        if value is None:
+            continue
+        existing_value = result_key.search(result)
+        if existing_value is None:
+            set_value_from_jmespath(result, result_key.expression, value)
+        elif isinstance(value, list):
+            existing_value.extend(value)
+        elif isinstance(value, (int, float, str)):
+            set_value_from_jmespath(
+                result, result_key.expression, existing_value + value
+            )
+
+
+def _build_full_result(response, pages):
+    result = {}
+    for page in pages:
+        _merge_page(result, page, response.result_keys)
+    merge_dicts(result, response.non_aggregate_part)
+    if response.resume_token is not None:
+        result['NextToken'] = response.resume_token
+    return result
+
+
+def _dump_json(value, indent_level=0):
+    dumped = json.dumps(
+        value, indent=4, default=json_encoder, ensure_ascii=False
+    )
+    if indent_level:
+        dumped = dumped.replace('\n', '\n' + '    ' * indent_level)
+    return dumped
+
+
+def _dump_json_line(value):
+    return json.dumps(
+        value, separators=(',', ':'), default=json_encoder, ensure_ascii=False
+    ) + '\n'
+
+
+def _get_list(value):
+    if isinstance(value, list):
+        return value
+    return []
+
+
+def _iter_json_list(chunks, indent_level=0):
+    """Yield a JSON list chunk by chunk, indented as json.dump() would.
+
+    ``None`` chunks are skipped and the list is written as ``null`` if
+    every chunk was ``None``, just like searching an aggregated result
+    that never had the result key.
+    """
+    item_prefix = '\n' + '    ' * (indent_level + 1)
+    started = False
+    num_items = 0
+    for chunk in chunks:
+        if chunk is None:
+            continue
+        fragment = []
+        if not started:
+            fragment.append('[')
+            started = True
+        for item in chunk:
+            if num_items:
+                fragment.append(',')
+            fragment.append(item_prefix)
+            fragment.append(_dump_json(item, indent_level + 1))
+            num_items += 1
+        yield ''.join(fragment)
+    if not started:
+        yield 'null'
+    elif num_items:
+        yield '\n' + '    ' * indent_level + ']'
+    else:
+        yield ']'
+
+
 class Formatter:
     def __init__(self, args):
         self._args = args
@@ -47,6 +155,20 @@ class Formatter:
         except OSError:
             pass
 
+    def _write_fragments(self, fragments, stream):
+        # Pages are only requested as the fragments are consumed, so errors
+        # from the service still propagate, while a closed stdout stops the
+        # pagination.
+        try:
+            for fragment in fragments:
+                try:
+                    stream.write(fragment)
+                    stream.flush()
+                except OSError:
+                    return
+        finally:
+            self._flush_stream(stream)
+
 
 class FullyBufferedFormatter(Formatter):
     def __call__(self, command_name, response, stream=None):
@@ -61,6 +183,9 @@ class FullyBufferedFormatter(Formatter):
             response_data = response.build_full_result()
         else:
             response_data = response
+        self._format_buffered_response(command_name, response_data, stream)
+
+    def _format_buffered_response(self, command_name, response_data, stream):
         self._remove_request_id(response_data)
         if self._args.query is not None:
             response_data = self._args.query.search(response_data)
@@ -77,6 +202,55 @@ class FullyBufferedFormatter(Formatter):
 
 
 class JSONFormatter(FullyBufferedFormatter):
+    """Format a response as a JSON document.
+
+    Paginated responses are written page by page instead of being
+    aggregated with ``build_full_result()`` first, so large listings start
+    printing right away and only a page of results is held in memory.
+    This is possible when the first result key is a top level list, or
+    when ``--query`` is a projection over the items of a result key (for
+    example ``Versions[].Key`` or ``Snapshots[?State=='error'].SnapshotId``).
+    Any other query needs the whole result, so the response is buffered.
+    The output is the same either way, except that an error on a later
+    page leaves the pages written so far on stdout.
+    """
+
+    def __call__(self, command_name, response, stream=None):
+        if not is_response_paginated(response):
+            return super().__call__(command_name, response, stream)
+        if stream is None:
+            stream = self._get_default_stream()
+        query = self._args.query
+        pages = iter(response)
+        if query is not None:
+            result_key = _get_item_query_result_key(query, response)
+            if result_key is None:
+                return self._format_buffered_response(
+                    command_name, response.build_full_result(), stream
+                )
+            fragments = _iter_json_list(
+                query.search({result_key: page.get(result_key)})
+                for page in pages
+            )
+        else:
+            first_page = next(pages)
+            primary_key = response.result_keys[0]
+            if not _is_top_level_key(primary_key) or not isinstance(
+                primary_key.search(first_page), list
+            ):
+                # The result keys would not be written in the same order
+                # as build_full_result() so buffer the whole result.
+                response_data = _build_full_result(
+                    response, itertools.chain([first_page], pages)
+                )
+                return self._format_buffered_response(
+                    command_name, response_data, stream
+                )
+            fragments = self._iter_paginated_json(
+                response, itertools.chain([first_page], pages)
+            )
+        self._write_fragments(itertools.chain(fragments, ['\n']), stream)
+
     def _format_response(self, command_name, response, stream):
         # For operations that have no response body (e.g. s3 put-object)
         # the response will be an empty string.  We don't want to print
@@ -92,6 +266,31 @@ class JSONFormatter(FullyBufferedFormatter):
             )
             stream.write('\n')
 
+    def _iter_paginated_json(self, response, pages):
+        # The items of the first result key are written as they arrive.
+        # Everything else in the full result is either small or only known
+        # once the last page has been seen, so it is written at the end.
+        primary_key, *other_keys = response.result_keys
+        remaining = {}
+
+        def iter_primary_items():
+            for page in pages:
+                _merge_page(remaining, page, other_keys)
+                yield primary_key.search(page)
+
+        yield '{\n    %s: ' % _dump_json(primary_key.expression)
+        yield from _iter_json_list(iter_primary_items(), indent_level=1)
+        merge_dicts(remaining, response.non_aggregate_part)
+        if response.resume_token is not None:
+            remaining['NextToken'] = response.resume_token
+        self._remove_request_id(remaining)
+        for key, value in remaining.items():
+            yield ',\n    %s: %s' % (
+                _dump_json(key),
+                _dump_json(value, indent_level=1),
+            )
+        yield '\n}'
+
 
 class TableFormatter(FullyBufferedFormatter):
     """Pretty print a table from a given response.
@@ -267,9 +466,91 @@ class TextFormatter(Formatter):
         text.format_text(response, stream)
 
 
+class JSONLinesFormatter(Formatter):
+    """Format a response as JSON Lines, one compact JSON value per line.
+
+    For paginated responses every item of the first result key is written
+    on its own line as each page arrives, as with the json output.  The
+    rest of the full result, such as the other result keys, the keys that
+    are not aggregated and the ``NextToken`` when ``--max-items`` truncated
+    the results, is written as a final line if it is not empty.  If the
+    first result key is not a top level list, the full result is written
+    as a single line.  A ``--query`` that projects the items of a result
+    key is evaluated page by page as well.  Any other query is applied to
+    the full result, and a list result is written one element per line.
+    Responses that are not paginated are written as a single line.
+    """
+
+    def __call__(self, command_name, response, stream=None):
+        if stream is None:
+            stream = self._get_default_stream()
+        self._write_fragments(
+            (
+                ''.join(_dump_json_line(value) for value in values)
+                for values in self._iter_pages_of_values(response)
+            ),
+            stream,
+        )
+
+    def _iter_pages_of_values(self, response):
+        query = self._args.query
+        if not is_response_paginated(response):
+            self._remove_request_id(response)
+            if query is not None:
+                response = query.search(response)
+            yield self._get_values(response)
+        elif query is None:
+            yield from self._iter_paginated_values(response)
+        else:
+            result_key = _get_item_query_result_key(query, response)
+            if result_key is None:
+                yield self._get_values(
+                    query.search(response.build_full_result())
+                )
+                return
+            for page in response:
+                yield _get_list(
+                    query.search({result_key: page.get(result_key)})
+                )
+
+    def _iter_paginated_values(self, response):
+        pages = iter(response)
+        first_page = next(pages)
+        primary_key, *other_keys = response.result_keys
+        if not _is_top_level_key(primary_key) or not isinstance(
+            primary_key.search(first_page), list
+        ):
+            yield self._get_values(
+                _build_full_result(
+                    response, itertools.chain([first_page], pages)
+                )
+            )
+            return
+        remaining = {}
+        for page in itertools.chain([first_page], pages):
+            _merge_page(remaining, page, other_keys)
+            yield _get_list(primary_key.search(page))
+        merge_dicts(remaining, response.non_aggregate_part)
+        if response.resume_token is not None:
+            remaining['NextToken'] = response.resume_token
+        self._remove_request_id(remaining)
+        yield self._get_values(remaining)
+
+    def _get_values(self, response):
+        # As with the json output, empty responses (e.g. s3api put-object)
+        # are not written.
+        if response is None or response == {}:
+            return []
+        if isinstance(response, list):
+            return response
+        return [response]
+
+
 def get_formatter(format_type, args):
     if format_type == 'json':
         return JSONFormatter(args)
+    elif format_type == 'jsonl':
+        return JSONLinesFormatter(args)
     elif format_type == 'text':
         return TextFormatter(args)
     elif format_type == 'table':
@@ -18,52 +18,19 @@ registered with the event system.
 """
 
 from awscli.argprocess import ParamShorthandParser
-from awscli.customizations import datapipeline
 from awscli.customizations.addexamples import add_examples
 from awscli.customizations.argrename import register_arg_renames
 from awscli.customizations.assumerole import register_assume_role_provider
-from awscli.customizations.awslambda import register_lambda_create_function
 from awscli.customizations.cliinputjson import register_cli_input_json
-from awscli.customizations.cloudformation import (
-    initialize as cloudformation_init,
-)
 from awscli.customizations.cloudfront import register as register_cloudfront
-from awscli.customizations.cloudsearch import initialize as cloudsearch_init
-from awscli.customizations.cloudsearchdomain import register_cloudsearchdomain
-from awscli.customizations.cloudtrail import initialize as cloudtrail_init
-from awscli.customizations.cloudwatch import register_rename_otel_commands
-from awscli.customizations.codeartifact import register_codeartifact_commands
-from awscli.customizations.codecommit import initialize as codecommit_init
 from awscli.customizations.codedeploy.codedeploy import (
     initialize as codedeploy_init,
 )
-from awscli.customizations.configservice.getstatus import register_get_status
-from awscli.customizations.configservice.putconfigurationrecorder import (
-    register_modify_put_configuration_recorder,
-)
 from awscli.customizations.configservice.rename_cmd import (
     register_rename_config,
 )
-from awscli.customizations.configservice.subscribe import register_subscribe
 from awscli.customizations.configure.configure import register_configure_cmd
-from awscli.customizations.dlm.dlm import dlm_initialize
-from awscli.customizations.dynamodb import register_dynamodb_paginator_fix
-from awscli.customizations.ec2.addcount import register_count_events
-from awscli.customizations.ec2.bundleinstance import register_bundleinstance
 from awscli.customizations.ec2.decryptpassword import ec2_add_priv_launch_key
-from awscli.customizations.ec2.paginate import register_ec2_page_size_injector
-from awscli.customizations.ec2.protocolarg import register_protocol_args
-from awscli.customizations.ec2.runinstances import register_runinstances
-from awscli.customizations.ec2.secgroupsimplify import register_secgroup
-from awscli.customizations.ecr import register_ecr_commands
-from awscli.customizations.ecr_public import register_ecr_public_commands
-from awscli.customizations.ecs import initialize as ecs_initialize
-from awscli.customizations.eks import initialize as eks_initialize
-from awscli.customizations.emr.emr import emr_initialize
-from awscli.customizations.emrcontainers import (
-    initialize as emrcontainers_initialize,
-)
-from awscli.customizations.gamelift import register_gamelift_commands
 from awscli.customizations.generatecliskeleton import (
     register_generate_cli_skeleton,
 )
@@ -72,59 +39,381 @@ from awscli.customizations.history import (
     register_history_commands,
     register_history_mode,
 )
-from awscli.customizations.iamvirtmfa import IAMVMFAWrapper
 from awscli.customizations.iot import (
     register_create_keys_and_cert_arguments,
     register_create_keys_from_csr_arguments,
 )
-from awscli.customizations.iot_data import register_custom_endpoint_note
-from awscli.customizations.kinesis import (
-    register_kinesis_list_streams_pagination_backcompat,
-)
-from awscli.customizations.kms import register_fix_kms_create_grant_docs
-from awscli.customizations.logs import register_logs_commands
-from awscli.customizations.mturk import register_alias_mturk_command
 from awscli.customizations.overridesslcommonname import (
     register_override_ssl_common_name,
 )
 from awscli.customizations.paginate import register_pagination
 from awscli.customizations.preview import register_preview_commands
-from awscli.customizations.putmetricdata import register_put_metric_data
-from awscli.customizations.quicksight import (
-    register_quicksight_asset_bundle_customizations,
-)
-from awscli.customizations.rds import (
-    register_add_generate_db_auth_token,
-    register_rds_modify_split,
-)
-from awscli.customizations.rekognition import (
-    register_rekognition_detect_labels,
-)
-from awscli.customizations.removals import register_removals
-from awscli.customizations.route53 import register_create_hosted_zone_doc_fix
 from awscli.customizations.s3.s3 import s3_plugin_initialize
 from awscli.customizations.s3errormsg import register_s3_error_msg
-from awscli.customizations.s3events import register_event_stream_arg, register_document_expires_string
 from awscli.customizations.sagemaker import (
     register_alias_sagemaker_runtime_command,
 )
 from awscli.customizations.scalarparse import register_scalar_parser
-from awscli.customizations.servicecatalog import (
-    register_servicecatalog_commands,
-)
-from awscli.customizations.sessendemail import register_ses_send_email
-from awscli.customizations.sessionmanager import register_ssm_session
-from awscli.customizations.signin import register_alias_signin_command
 from awscli.customizations.sms_voice import register_sms_voice_hide
-from awscli.customizations.socialmessaging import register_alias_socialmessaging_command
 from awscli.customizations.streamingoutputarg import add_streaming_output_arg
-from awscli.customizations.toplevelbool import register_bool_params
-from awscli.customizations.translate import (
-    register_translate_import_terminology,
-)
 from awscli.customizations.waiters import register_add_waiters
+from awscli.lazyload import LazyCustomization, register_lazy_customizations
 from awscli.paramfile import register_uri_param_handler
 
+# The customizations that only register handlers for the events of
+# specific services.  They are only imported once one of these events is
+# emitted, so a command does not import the customizations of every other
+# service.  The events must match the ones each customization registers
+# handlers for.
+LAZY_CUSTOMIZATIONS = [
+    LazyCustomization(
+        'awscli.customizations.ec2.addcount',
+        'register_count_events',
+        events=[
+            'building-argument-table.ec2.run-instances',
+            'before-parameter-build.ec2.RunInstances',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ec2.secgroupsimplify',
+        'register_secgroup',
+        events=[
+            'building-argument-table.ec2.authorize-security-group-ingress',
+            'building-argument-table.ec2.authorize-security-group-egress',
+            'building-argument-table.ec2.revoke-security-group-ingress',
+            'building-argument-table.ec2.revoke-security-group-egress',
+            'operation-args-parsed.ec2.authorize-security-group-ingress',
+            'operation-args-parsed.ec2.authorize-security-group-egress',
+            'operation-args-parsed.ec2.revoke-security-group-ingress',
+            'operation-args-parsed.ec2.revoke-security-group-egress',
+            'doc-description.ec2.authorize-security-group-ingress',
+            'doc-description.ec2.authorize-security-group-egress',
+            'doc-description.ec2.revoke-security-group-ingress',
+            'doc-description.ec2.revoke-security-groupdoc-ingress',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ec2.bundleinstance',
+        'register_bundleinstance',
+        events=[
+            'building-argument-table.ec2.bundle-instance',
+            'operation-args-parsed.ec2.bundle-instance',
+            'before-parameter-build.ec2.BundleInstance',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ec2.runinstances',
+        'register_runinstances',
+        events=[
+            'building-argument-table.ec2.run-instances',
+            'operation-args-parsed.ec2.run-instances',
+            'before-parameter-build.ec2.RunInstances',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.removals',
+        'register_removals',
+        events=[
+            'building-command-table.ses',
+            'building-command-table.ec2',
+            'building-command-table.emr',
+            'building-command-table.kinesis',
+            'building-command-table.lexv2-runtime',
+            'building-command-table.lambda',
+            'building-command-table.sagemaker-runtime',
+            'building-command-table.bedrock-runtime',
+            'building-command-table.bedrock-agent-runtime',
+            'building-command-table.bedrock-agentcore',
+            'building-command-table.qbusiness',
+            'building-command-table.iotsitewise',
+            'building-command-table.logs',
+            'building-command-table.connecthealth',
+            'building-command-table.polly',
+            'building-command-table.devops-agent',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.rds',
+        'register_rds_modify_split',
+        events=[
+            'building-command-table.rds',
+            'building-argument-table.rds.add-option-to-option-group',
+            'building-argument-table.rds.remove-option-from-option-group',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.rekognition',
+        'register_rekognition_detect_labels',
+        events=[
+            'building-argument-table.rekognition.compare-faces',
+            'building-argument-table.rekognition.*',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.rds',
+        'register_add_generate_db_auth_token',
+        events=['building-command-table.rds'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.putmetricdata',
+        'register_put_metric_data',
+        events=[
+            'building-argument-table.cloudwatch.put-metric-data',
+            'operation-args-parsed.cloudwatch.put-metric-data',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.sessendemail',
+        'register_ses_send_email',
+        events=[
+            'building-argument-table.ses.send-email',
+            'operation-args-parsed.ses.send-email',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.iamvirtmfa',
+        'IAMVMFAWrapper',
+        events=[
+            'building-argument-table.iam.create-virtual-mfa-device',
+            'after-call.iam.CreateVirtualMFADevice',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.cloudtrail',
+        'initialize',
+        events=['building-command-table.cloudtrail'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ecr',
+        'register_ecr_commands',
+        events=['building-command-table.ecr'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ecr_public',
+        'register_ecr_public_commands',
+        events=['building-command-table.ecr-public'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.toplevelbool',
+        'register_bool_params',
+        events=['building-argument-table.ec2.*'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ec2.protocolarg',
+        'register_protocol_args',
+        events=[
+            'before-parameter-build.ec2.CreateNetworkAclEntry',
+            'before-parameter-build.ec2.ReplaceNetworkAclEntry',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.datapipeline',
+        'register_customizations',
+        events=[
+            'building-argument-table.datapipeline.put-pipeline-definition',
+            'building-argument-table.datapipeline.activate-pipeline',
+            'after-call.datapipeline.GetPipelineDefinition',
+            'building-command-table.datapipeline',
+        ],
+        last_events=['doc-output.datapipeline.get-pipeline-definition'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.cloudsearch',
+        'initialize',
+        events=[
+            'building-argument-table.cloudsearch.define-expression',
+            'building-argument-table.cloudsearch.define-index-field',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.emr.emr',
+        'emr_initialize',
+        events=[
+            'building-command-table.emr',
+            'building-argument-table.emr.add-tags',
+            'building-argument-table.emr.list-clusters',
+            'before-building-argument-table-parser.emr.*',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.emrcontainers',
+        'initialize',
+        events=['building-command-table.emr-containers'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.eks',
+        'initialize',
+        events=['building-command-table.eks'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ecs',
+        'initialize',
+        events=['building-command-table.ecs'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.cloudsearchdomain',
+        'register_cloudsearchdomain',
+        events=[
+        ],
+        last_events=['calling-command.cloudsearchdomain'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.configservice.subscribe',
+        'register_subscribe',
+        events=['building-command-table.configservice'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.configservice.getstatus',
+        'register_get_status',
+        events=['building-command-table.configservice'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.awslambda',
+        'register_lambda_create_function',
+        events=[
+            'building-argument-table.lambda.create-function',
+            'building-argument-table.lambda.publish-layer-version',
+            'building-argument-table.lambda.update-function-code',
+            'process-cli-arg.lambda.update-function-code',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.kms',
+        'register_fix_kms_create_grant_docs',
+        events=['doc-title.kms.create-grant'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.route53',
+        'register_create_hosted_zone_doc_fix',
+        events=['doc-option.route53.create-hosted-zone.hosted-zone-config'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.configservice.putconfigurationrecorder',
+        'register_modify_put_configuration_recorder',
+        events=[
+            'building-argument-table.configservice.put-configuration-recorder',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.codeartifact',
+        'register_codeartifact_commands',
+        events=['building-command-table.codeartifact'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.codecommit',
+        'initialize',
+        events=['building-command-table.codecommit'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.iot_data',
+        'register_custom_endpoint_note',
+        events=[
+        ],
+        last_events=['doc-description.iot-data'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.gamelift',
+        'register_gamelift_commands',
+        events=['building-command-table.gamelift'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.ec2.paginate',
+        'register_ec2_page_size_injector',
+        events=[
+        ],
+        last_events=[
+            'calling-command.ec2.describe-volumes',
+            'calling-command.ec2.describe-snapshots',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.cloudformation',
+        'initialize',
+        events=['building-command-table.cloudformation'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.mturk',
+        'register_alias_mturk_command',
+        events=['building-command-table.mturk'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.signin',
+        'register_alias_signin_command',
+        events=['building-command-table.signin'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.socialmessaging',
+        'register_alias_socialmessaging_command',
+        events=['building-command-table.socialmessaging'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.cloudwatch',
+        'register_rename_otel_commands',
+        events=['building-command-table.cloudwatch'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.servicecatalog',
+        'register_servicecatalog_commands',
+        events=['building-command-table.servicecatalog'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.translate',
+        'register_translate_import_terminology',
+        events=[
+            'building-argument-table.translate.import-terminology',
+            'building-argument-table.translate.translate-document',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.s3events',
+        'register_event_stream_arg',
+        events=['building-argument-table.s3api.select-object-content'],
+        last_events=['doc-output.s3api.select-object-content'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.s3events',
+        'register_document_expires_string',
+        events=[
+        ],
+        last_events=['doc-output.s3api'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.dlm.dlm',
+        'dlm_initialize',
+        events=['building-command-table.dlm'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.sessionmanager',
+        'register_ssm_session',
+        events=['building-command-table.ssm'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.dynamodb',
+        'register_dynamodb_paginator_fix',
+        events=['calling-command.dynamodb.*'],
+    ),
+    LazyCustomization(
+        'awscli.customizations.kinesis',
+        'register_kinesis_list_streams_pagination_backcompat',
+        events=[
+            'building-argument-table.kinesis.list-streams',
+            'operation-args-parsed.kinesis.list-streams',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.quicksight',
+        'register_quicksight_asset_bundle_customizations',
+        events=[
+            'building-argument-table.quicksight.start-asset-bundle-import-job',
+        ],
+    ),
+    LazyCustomization(
+        'awscli.customizations.logs',
+        'register_logs_commands',
+        events=['building-command-table.logs'],
+    ),
+]
+
 
 def awscli_initialize(event_handlers):
     event_handlers.register('session-initialized', register_uri_param_handler)
@@ -147,54 +436,22 @@ def awscli_initialize(event_handlers):
     event_handlers.register(
         'building-argument-table.*', add_streaming_output_arg
     )
-    register_count_events(event_handlers)
     event_handlers.register(
         'building-argument-table.ec2.get-password-data',
         ec2_add_priv_launch_key,
     )
     register_parse_global_args(event_handlers)
     register_pagination(event_handlers)
-    register_secgroup(event_handlers)
-    register_bundleinstance(event_handlers)
     s3_plugin_initialize(event_handlers)
-    register_runinstances(event_handlers)
-    register_removals(event_handlers)
     register_preview_commands(event_handlers)
-    register_rds_modify_split(event_handlers)
-    register_rekognition_detect_labels(event_handlers)
-    register_add_generate_db_auth_token(event_handlers)
-    register_put_metric_data(event_handlers)
-    register_ses_send_email(event_handlers)
-    IAMVMFAWrapper(event_handlers)
     register_arg_renames(event_handlers)
     register_configure_cmd(event_handlers)
-    cloudtrail_init(event_handlers)
-    register_ecr_commands(event_handlers)
-    register_ecr_public_commands(event_handlers)
-    register_bool_params(event_handlers)
-    register_protocol_args(event_handlers)
-    datapipeline.register_customizations(event_handlers)
-    cloudsearch_init(event_handlers)
-    emr_initialize(event_handlers)
-    emrcontainers_initialize(event_handlers)
-    eks_initialize(event_handlers)
-    ecs_initialize(event_handlers)
-    register_cloudsearchdomain(event_handlers)
     register_generate_cli_skeleton(event_handlers)
     register_assume_role_provider(event_handlers)
     register_add_waiters(event_handlers)
     codedeploy_init(event_handlers)
-    register_subscribe(event_handlers)
-    register_get_status(event_handlers)
     register_rename_config(event_handlers)
     register_scalar_parser(event_handlers)
-    register_lambda_create_function(event_handlers)
-    register_fix_kms_create_grant_docs(event_handlers)
-    register_create_hosted_zone_doc_fix(event_handlers)
-    register_modify_put_configuration_recorder(event_handlers)
-    register_codeartifact_commands(event_handlers)
-    codecommit_init(event_handlers)
-    register_custom_endpoint_note(event_handlers)
     event_handlers.register(
         'building-argument-table.iot.create-keys-and-certificate',
         register_create_keys_and_cert_arguments,
@@ -204,25 +461,12 @@ def awscli_initialize(event_handlers):
         register_create_keys_from_csr_arguments,
     )
     register_cloudfront(event_handlers)
-    register_gamelift_commands(event_handlers)
-    register_ec2_page_size_injector(event_handlers)
-    cloudformation_init(event_handlers)
-    register_alias_mturk_command(event_handlers)
     register_alias_sagemaker_runtime_command(event_handlers)
-    register_alias_signin_command(event_handlers)
-    register_alias_socialmessaging_command(event_handlers)
-    register_rename_otel_commands(event_handlers)
-    register_servicecatalog_commands(event_handlers)
-    register_translate_import_terminology(event_handlers)
     register_history_mode(event_handlers)
     register_history_commands(event_handlers)
-    register_event_stream_arg(event_handlers)
-    register_document_expires_string(event_handlers)
-    dlm_initialize(event_handlers)
-    register_ssm_session(event_handlers)
     register_sms_voice_hide(event_handlers)
-    register_dynamodb_paginator_fix(event_handlers)
     register_override_ssl_common_name(event_handlers)
-    register_kinesis_list_streams_pagination_backcompat(event_handlers)
-    register_quicksight_asset_bundle_customizations(event_handlers)
-    register_logs_commands(event_handlers)
+    # None of the lazy customizations register handlers for the same events
+    # as the customizations above, so registering them last does not
+    # change the order handlers are called in.
+    register_lazy_customizations(event_handlers, LAZY_CUSTOMIZATIONS)
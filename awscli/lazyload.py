@@ -0,0 +1,198 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Customizations that are only imported once they are needed.
+
+Most customizations only apply to a single service, yet importing all of
+them takes a significant part of the startup time of every command.  A
+customization that is registered lazily declares the events it registers
+handlers for up front.  A placeholder handler is registered for each of
+these events in place of the customization's handler, and the
+customization is only imported and registered the first time one of
+these events is emitted.
+
+"""
+import importlib
+import logging
+import threading
+
+LOG = logging.getLogger(__name__)
+
+_FIRST = 'first'
+_MIDDLE = 'middle'
+_LAST = 'last'
+_REGISTER_METHODS = {
+    _FIRST: 'register_first',
+    _MIDDLE: 'register',
+    _LAST: 'register_last',
+}
+
+
+class LazyCustomization:
+    def __init__(
+        self,
+        module_name,
+        function_name,
+        events,
+        first_events=None,
+        last_events=None,
+    ):
+        """A customization that is imported the first time it is needed
+
+        :param module_name: The name of the module of the customization.
+        :param function_name: The name of the function in the module that
+            registers the customization's handlers.  It is called with an
+            event emitter.
+        :param events: The events the customization registers handlers
+            for with ``register()``.
+        :param first_events: The events the customization registers
+            handlers for with ``register_first()``.
+        :param last_events: The events the customization registers
+            handlers for with ``register_last()``.
+        """
+        self.module_name = module_name
+        self.function_name = function_name
+        self.registrations = [(_MIDDLE, event) for event in events]
+        self.registrations.extend(
+            (_FIRST, event) for event in first_events or []
+        )
+        self.registrations.extend(
+            (_LAST, event) for event in last_events or []
+        )
+
+    def get_register_function(self):
+        module = importlib.import_module(self.module_name)
+        return getattr(module, self.function_name)
+
+    def __repr__(self):
+        return f'LazyCustomization({self.module_name}.{self.function_name})'
+
+
+def register_lazy_customizations(event_handlers, customizations):
+    """Registers customizations to be imported once their events fire
+
+    :type customizations: list of LazyCustomization
+    :param customizations: The customizations to register, in the order
+        their handlers would have been registered.
+    """
+    for customization in customizations:
+        _LazyRegistration(customization, event_handlers).register()
+
+
+class _RecordingEmitter:
+    """Records the handlers a customization registers
+
+    Some customizations keep the emitter they are registered with to
+    register more handlers once their events are emitted.  Once the
+    customization is registered, these are registered with the emitter
+    the customization was lazily registered with.
+    """
+
+    def __init__(self, event_handlers):
+        self.registrations = []
+        self._event_handlers = event_handlers
+        self._recording = True
+
+    def stop_recording(self):
+        self._recording = False
+
+    def register(self, event_name, handler, **kwargs):
+        self._register(_MIDDLE, event_name, handler, kwargs)
+
+    def register_first(self, event_name, handler, **kwargs):
+        self._register(_FIRST, event_name, handler, kwargs)
+
+    def register_last(self, event_name, handler, **kwargs):
+        self._register(_LAST, event_name, handler, kwargs)
+
+    def _register(self, position, event_name, handler, kwargs):
+        if self._recording:
+            self.registrations.append((position, event_name, handler, kwargs))
+        else:
+            register = getattr(
+                self._event_handlers, _REGISTER_METHODS[position]
+            )
+            register(event_name, handler, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._event_handlers, name)
+
+
+class _LazyRegistration:
+    def __init__(self, customization, event_handlers):
+        self._customization = customization
+        self._event_handlers = event_handlers
+        self._handlers = None
+        self._lock = threading.Lock()
+
+    def register(self):
+        for position, event_name in self._customization.registrations:
+            register = getattr(
+                self._event_handlers, _REGISTER_METHODS[position]
+            )
+            register(event_name, _LazyHandler(self, position, event_name))
+
+    def dispatch(self, position, event_name, kwargs):
+        # The placeholders stay registered, in the same place in the order
+        # of handlers as the customization's handlers would have been, and
+        # call them whenever their event is emitted.
+        response = None
+        for handler in self._get_handlers(position, event_name):
+            handler_response = handler(**kwargs)
+            if response is None:
+                response = handler_response
+        return response
+
+    def _get_handlers(self, position, event_name):
+        with self._lock:
+            if self._handlers is None:
+                self._handlers = self._load()
+        return self._handlers.get((position, event_name), [])
+
+    def _load(self):
+        LOG.debug('Loading customization %s', self._customization)
+        recorder = _RecordingEmitter(self._event_handlers)
+        self._customization.get_register_function()(recorder)
+        recorder.stop_recording()
+        declared = set(self._customization.registrations)
+        handlers = {}
+        for position, event_name, handler, kwargs in recorder.registrations:
+            if (position, event_name) in declared:
+                handlers.setdefault((position, event_name), []).append(
+                    handler
+                )
+                continue
+            # The event was not declared, so it could have already been
+            # emitted.  The handler is still registered for the events
+            # that are emitted from now on.
+            LOG.debug(
+                'Customization %s registered an undeclared handler for %s',
+                self._customization,
+                event_name,
+            )
+            register = getattr(
+                self._event_handlers, _REGISTER_METHODS[position]
+            )
+            register(event_name, handler, **kwargs)
+        return handlers
+
+
+class _LazyHandler:
+    def __init__(self, registration, position, event_name):
+        self._registration = registration
+        self._position = position
+        self._event_name = event_name
+
+    def __call__(self, **kwargs):
+        return self._registration.dispatch(
+            self._position, self._event_name, kwargs
+        )
@@ -0,0 +1,383 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""A long-lived server that runs CLI commands for the ``aws`` command.
+
+Most of the time of a short command goes to starting Python, importing the
+CLI and its customizations, and loading the data the commands are built
+from.  The CLI server does this once, and then runs each command in a
+process forked from its warm state::
+
+    $ aws_server &
+    $ export AWS_CLI_SERVER_SOCKET=~/.aws/cli/server/aws.sock
+    $ aws sts get-caller-identity
+
+The ``aws`` command forwards its arguments, environment, working directory
+and standard streams to the server (see ``awscli.serverclient``), so the
+command behaves as if it ran in the process of the ``aws`` command.  Every
+command still creates its own session and clients, as they depend on the
+environment and configuration of the command.
+
+The server restarts itself when the config or credentials files, or
+the models added to the data paths, change.
+
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import struct
+import sys
+
+from botocore.exceptions import DataNotFoundError
+
+from awscli.clidriver import HISTORY_RECORDER, create_clidriver
+from awscli.commandcache import get_data_path_state
+from awscli.handlers import LAZY_CUSTOMIZATIONS
+from awscli.serverclient import (
+    DEFAULT_SERVER_SOCKET,
+    SERVER_SOCKET_ENV_VAR,
+    STANDARD_STREAMS,
+    recv_message,
+    send_message,
+    server_mode_supported,
+)
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PRELOADED_SERVICES = ['sts']
+# How often, in seconds, the server checks whether it needs to reload
+# while no commands are sent to it.
+POLL_INTERVAL = 1
+
+_PRELOADED_DATA = [
+    'endpoints',
+    'partitions',
+    'sdk-default-configuration',
+    '_retry',
+]
+_PRELOADED_SERVICE_DATA = ['paginators-1', 'waiters-2']
+_ERROR_RC = 255
+
+
+class ServerError(Exception):
+    pass
+
+
+class CLIServer:
+    def __init__(self, socket_path, preloaded_services=None):
+        """Runs CLI commands sent to a Unix domain socket
+
+        :param socket_path: The path of the socket to listen on.
+        :param preloaded_services: The services whose models and clients
+            are loaded before the server starts to listen.
+        """
+        self._socket_path = socket_path
+        self._preloaded_services = preloaded_services
+        if self._preloaded_services is None:
+            self._preloaded_services = DEFAULT_PRELOADED_SERVICES
+        self._loader = None
+        self._data_path = None
+        self._watched_files = []
+        self._watched_state = None
+
+    def serve_forever(self):
+        self.warm_up()
+        server = self._listen()
+        try:
+            while True:
+                conn = self._accept(server)
+                self._reap_children()
+                if self._needs_reload():
+                    # A command that was not started is run by the client
+                    # in its own process instead.
+                    if conn is not None:
+                        conn.close()
+                    server.close()
+                    self._remove_socket()
+                    self.reload()
+                if conn is not None:
+                    self._fork_command(server, conn)
+        finally:
+            server.close()
+            self._remove_socket()
+
+    def warm_up(self):
+        """Imports and loads what the commands are built from"""
+        for customization in LAZY_CUSTOMIZATIONS:
+            customization.get_register_function()
+        driver = create_clidriver()
+        session = driver.session
+        self._loader = session.get_component('data_loader')
+        self._data_path = session.get_config_variable('data_path')
+        for name in _PRELOADED_DATA:
+            self._loader.load_data(name)
+        self._loader.list_available_services('service-2')
+        for service_name in self._preloaded_services:
+            self._preload_service(session, service_name)
+        self._watched_files = [
+            os.path.expanduser(session.get_config_variable(name))
+            for name in ['config_file', 'credentials_file']
+        ]
+        self._watched_state = self._get_watched_state()
+
+    def _preload_service(self, session, service_name):
+        # Creating a client also imports the modules that sending requests
+        # needs.  Its credentials are never used, and passing them keeps
+        # the credential providers from being called.
+        session.create_client(
+            service_name,
+            region_name='us-east-1',
+            aws_access_key_id='preload',
+            aws_secret_access_key='preload',
+        )
+        for type_name in _PRELOADED_SERVICE_DATA:
+            try:
+                self._loader.load_service_model(service_name, type_name)
+            except DataNotFoundError:
+                pass
+
+    def reload(self):
+        """Replaces the server with a new server with the same arguments"""
+        LOG.debug('Reloading the CLI server')
+        os.execv(sys.executable, sys.orig_argv)
+
+    def _get_watched_state(self):
+        files = []
+        for filename in self._watched_files:
+            try:
+                files.append([filename, os.stat(filename).st_mtime_ns])
+            except OSError:
+                files.append([filename, None])
+        return {
+            'files': files,
+            'data_paths': [
+                get_data_path_state(path)
+                for path in self._loader.search_paths
+            ],
+        }
+
+    def _needs_reload(self):
+        return self._get_watched_state() != self._watched_state
+
+    def _listen(self):
+        dirname = os.path.dirname(self._socket_path)
+        if dirname:
+            os.makedirs(dirname, mode=0o700, exist_ok=True)
+        self._remove_stale_socket()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the user that runs the server may connect to it, as the
+        # commands run with the user's credentials.
+        umask = os.umask(0o177)
+        try:
+            server.bind(self._socket_path)
+        finally:
+            os.umask(umask)
+        server.listen(socket.SOMAXCONN)
+        server.settimeout(POLL_INTERVAL)
+        LOG.debug('CLI server listening on %s', self._socket_path)
+        return server
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self._socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(self._socket_path)
+            except OSError:
+                os.remove(self._socket_path)
+                return
+        raise ServerError(
+            f'A CLI server is already listening on {self._socket_path}'
+        )
+
+    def _remove_socket(self):
+        try:
+            os.remove(self._socket_path)
+        except OSError:
+            pass
+
+    def _accept(self, server):
+        try:
+            conn, _ = server.accept()
+        except socket.timeout:
+            return None
+        conn.settimeout(None)
+        if not self._is_from_same_user(conn):
+            LOG.debug('Rejected a connection from another user')
+            conn.close()
+            return None
+        return conn
+
+    def _is_from_same_user(self, conn):
+        if not hasattr(socket, 'SO_PEERCRED'):
+            # The permissions of the socket already keep other users from
+            # connecting to it.
+            return True
+        creds = struct.Struct('3i')
+        _, uid, _ = creds.unpack(
+            conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, creds.size)
+        )
+        return uid == os.getuid()
+
+    def _reap_children(self):
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+    def _fork_command(self, server, conn):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            LOG.debug('Running command in process %s', pid)
+            conn.close()
+            return
+        try:
+            server.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.handle_connection(conn)
+        except BaseException:
+            LOG.debug('Error handling CLI server connection', exc_info=True)
+        finally:
+            os._exit(0)
+
+    def handle_connection(self, conn):
+        """Runs the command sent on a connection, in the current process"""
+        request, fds = recv_message(conn, maxfds=len(STANDARD_STREAMS))
+        send_message(conn, {'pid': os.getpid()})
+        rc = self._run_command(request, fds)
+        send_message(conn, {'rc': rc})
+
+    def _run_command(self, request, fds):
+        self._redirect_standard_streams(request['streams'], fds)
+        try:
+            os.environ.clear()
+            os.environ.update(request['env'])
+            os.chdir(request['cwd'])
+            sys.argv = ['aws'] + request['args']
+            driver = create_clidriver()
+            self._use_warm_loader(driver.session)
+            rc = driver.main(request['args'])
+            HISTORY_RECORDER.record('CLI_RC', rc, 'CLI')
+        except SystemExit as e:
+            rc = e.code if isinstance(e.code, int) else _ERROR_RC
+        except Exception as e:
+            LOG.debug('Exception running CLI server command', exc_info=True)
+            sys.stderr.write(f'\n{e}\n')
+            rc = _ERROR_RC
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        return rc
+
+    def _redirect_standard_streams(self, streams, fds):
+        for fd, name in enumerate(STANDARD_STREAMS):
+            if name in streams:
+                source = fds[streams.index(name)]
+            else:
+                source = os.open(os.devnull, os.O_RDWR)
+            os.dup2(source, fd)
+            os.close(source)
+        sys.stdin = self._reopen_stream(0, 'r', sys.stdin)
+        sys.stdout = self._reopen_stream(
+            1, 'w', sys.stdout, line_buffering=os.isatty(1)
+        )
+        sys.stderr = self._reopen_stream(
+            2, 'w', sys.stderr, line_buffering=True
+        )
+
+    def _reopen_stream(self, fd, mode, stream, line_buffering=False):
+        return open(
+            fd,
+            mode,
+            encoding=stream.encoding,
+            errors=stream.errors,
+            buffering=1 if line_buffering else -1,
+            closefd=False,
+        )
+
+    def _use_warm_loader(self, session):
+        # The loaded data is only shared with commands that load it from
+        # the same paths.
+        if session.get_config_variable('data_path') == self._data_path:
+            session.register_component('data_loader', self._loader)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='aws_server',
+        description=(
+            'Runs the commands of the aws command in a long-lived server. '
+            f'Set {SERVER_SOCKET_ENV_VAR} to the path of the socket for '
+            'the aws command to use the server.'
+        ),
+    )
+    parser.add_argument(
+        '--socket',
+        default=os.environ.get(SERVER_SOCKET_ENV_VAR, DEFAULT_SERVER_SOCKET),
+        help=f'The path of the socket to listen on. '
+        f'(default: {DEFAULT_SERVER_SOCKET})',
+    )
+    parser.add_argument(
+        '--preload-services',
+        nargs='*',
+        default=DEFAULT_PRELOADED_SERVICES,
+        metavar='SERVICE',
+        help='The services to load the models and clients of before '
+        'listening. (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--debug', action='store_true', help='Log what the server does.'
+    )
+    parsed_args = parser.parse_args(args)
+    if not server_mode_supported():
+        sys.stderr.write('The CLI server requires Unix domain sockets.\n')
+        return 1
+    if parsed_args.debug:
+        _enable_logging()
+    # The server is stopped with a SIGTERM as well as a Ctrl-C, and removes
+    # its socket in both cases.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    server = CLIServer(
+        os.path.expanduser(parsed_args.socket),
+        preloaded_services=parsed_args.preload_services,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        return 0
+    except ServerError as e:
+        sys.stderr.write(f'{e}\n')
+        return 1
+    return 0
+
+
+def _enable_logging():
+    # The server logs to its own stderr even in the processes of commands,
+    # whose standard streams are the ones of the client.
+    stream = os.fdopen(os.dup(sys.stderr.fileno()), 'w', buffering=1)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(process)d - %(message)s')
+    )
+    LOG.addHandler(handler)
+    LOG.setLevel(logging.DEBUG)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
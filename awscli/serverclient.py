@@ -0,0 +1,179 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""The client of the CLI server.
+
+When ``AWS_CLI_SERVER_SOCKET`` is set, the ``aws`` command forwards its
+arguments, environment, working directory and standard streams to the CLI
+server listening on that socket (see ``awscli.server``), and exits with
+the return code of the command the server ran.  If no server is listening,
+the command runs in the current process as usual.
+
+This module is imported by every invocation of ``aws``, so it must only
+import modules of the standard library.
+
+"""
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+
+SERVER_SOCKET_ENV_VAR = 'AWS_CLI_SERVER_SOCKET'
+DEFAULT_SERVER_SOCKET = os.path.expanduser(
+    os.path.join('~', '.aws', 'cli', 'server', 'aws.sock')
+)
+STANDARD_STREAMS = ['stdin', 'stdout', 'stderr']
+FORWARDED_SIGNALS = ['SIGINT', 'SIGTERM', 'SIGHUP', 'SIGQUIT']
+
+_HEADER = struct.Struct('!I')
+# The return code of a command that is interrupted by losing the
+# connection to the server, which matches the return code of
+# unexpected errors in the CLI.
+_CONNECTION_LOST_RC = 255
+
+
+class ConnectionClosedError(Exception):
+    pass
+
+
+def main():
+    socket_path = os.environ.get(SERVER_SOCKET_ENV_VAR)
+    if socket_path and server_mode_supported():
+        rc = forward_command(socket_path, sys.argv[1:])
+        if rc is not None:
+            return rc
+    import awscli.clidriver
+
+    return awscli.clidriver.main()
+
+
+def server_mode_supported():
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket, 'send_fds')
+
+
+def forward_command(socket_path, args):
+    """Runs a command in the CLI server
+
+    :param socket_path: The path of the socket the server listens on.
+    :param args: The arguments of the command, with the 'aws' removed.
+
+    :returns: The return code of the command, or None if the command could
+        not be started in the server, in which case it has not run.
+    """
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except OSError:
+        return None
+    with client:
+        try:
+            client.connect(socket_path)
+            pid = _start_command(client, args)
+        except (OSError, ValueError, ConnectionClosedError):
+            return None
+        return _wait_for_command(client, pid)
+
+
+def _start_command(client, args):
+    streams, fds = _get_open_standard_streams()
+    send_message(
+        client,
+        {
+            'args': args,
+            'env': dict(os.environ),
+            'cwd': os.getcwd(),
+            'streams': streams,
+        },
+        fds,
+    )
+    message, _ = recv_message(client)
+    return message['pid']
+
+
+def _get_open_standard_streams():
+    streams = []
+    fds = []
+    for fd, stream in enumerate(STANDARD_STREAMS):
+        try:
+            os.fstat(fd)
+        except OSError:
+            continue
+        streams.append(stream)
+        fds.append(fd)
+    return streams, fds
+
+
+def _wait_for_command(client, pid):
+    # The command runs in a process of the server, so the signals the
+    # client receives, such as the SIGINT of a Ctrl-C, are passed on to it.
+    def forward_signal(signum, frame):
+        try:
+            os.kill(pid, signum)
+        except OSError:
+            pass
+
+    previous_handlers = {}
+    for name in FORWARDED_SIGNALS:
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            previous_handlers[signum] = signal.signal(signum, forward_signal)
+    try:
+        message, _ = recv_message(client)
+        return message['rc']
+    except (OSError, ValueError, ConnectionClosedError) as e:
+        sys.stderr.write(
+            f'\nLost the connection to the CLI server while the command '
+            f'was running: {e}\n'
+        )
+        return _CONNECTION_LOST_RC
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+
+
+def send_message(sock, message, fds=None):
+    """Sends a JSON message, and optionally file descriptors, on a socket"""
+    body = json.dumps(message).encode('utf-8')
+    data = _HEADER.pack(len(body)) + body
+    if fds:
+        sent = socket.send_fds(sock, [data], fds)
+        data = data[sent:]
+    sock.sendall(data)
+
+
+def recv_message(sock, maxfds=0):
+    """Receives a message sent with ``send_message()``
+
+    :returns: The message and a list of the file descriptors that were
+        sent with it.
+    """
+    header, fds = _recv_exactly(sock, _HEADER.size, maxfds)
+    (size,) = _HEADER.unpack(header)
+    body, _ = _recv_exactly(sock, size)
+    return json.loads(body.decode('utf-8')), fds
+
+
+def _recv_exactly(sock, size, maxfds=0):
+    data = b''
+    fds = []
+    while len(data) < size:
+        if maxfds and not data:
+            chunk, fds, _, _ = socket.recv_fds(sock, size, maxfds)
+        else:
+            chunk = sock.recv(size - len(data))
+        if not chunk:
+            for fd in fds:
+                os.close(fd)
+            raise ConnectionClosedError('Connection closed')
+        data += chunk
+    return data, fds
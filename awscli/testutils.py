@@ -94,6 +94,9 @@ def create_clidriver():
         data_path = []
     _LOADER.search_paths.extend(data_path)
     session.register_component('data_loader', _LOADER)
+    # Commands are built from the models of the test loader rather than
+    # from what earlier runs of the CLI cached.
+    driver.command_table_cache = None
     return driver
 
 
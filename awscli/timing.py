@@ -0,0 +1,205 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Timings of the phases of a CLI invocation.
+
+The phases of every invocation are timed, and the timings are written out
+when ``--debug-timing`` is specified or the ``AWS_CLI_DEBUG_TIMING``
+environment variable is set.  ``AWS_CLI_DEBUG_TIMING`` is either ``json``
+or ``chrome-trace``, the trace event format that can be loaded in
+``chrome://tracing`` or Perfetto.  The timings are written to standard
+error, or to the file named by ``AWS_CLI_DEBUG_TIMING_FILE``.
+
+"""
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+DEBUG_TIMING_ENV_VAR = 'AWS_CLI_DEBUG_TIMING'
+DEBUG_TIMING_FILE_ENV_VAR = 'AWS_CLI_DEBUG_TIMING_FILE'
+JSON_FORMAT = 'json'
+CHROME_TRACE_FORMAT = 'chrome-trace'
+FORMATS = [JSON_FORMAT, CHROME_TRACE_FORMAT]
+
+
+def resolve_debug_timing_format(parsed_globals):
+    """Returns the format the timings are written in, or None
+
+    :param parsed_globals: The parsed global arguments, or None if they
+        have not been parsed.
+    """
+    env_format = os.environ.get(DEBUG_TIMING_ENV_VAR, '').lower()
+    if env_format in ['', 'false']:
+        env_format = None
+    elif env_format not in FORMATS:
+        LOG.debug(
+            'Unknown %s value %s, using %s',
+            DEBUG_TIMING_ENV_VAR,
+            env_format,
+            JSON_FORMAT,
+        )
+        env_format = JSON_FORMAT
+    if getattr(parsed_globals, 'debug_timing', False):
+        return env_format or JSON_FORMAT
+    return env_format
+
+
+class PhaseTimer:
+    def __init__(self, clock=time.perf_counter, start_time=None):
+        """Records how long the phases of an invocation take
+
+        Phases can be nested, and also record how many modules were
+        imported while they ran.
+
+        :param clock: Returns a monotonic time in seconds.
+        :param start_time: The time the invocation started at.  Defaults
+            to when the timer is created.
+        """
+        self._clock = clock
+        self._start_time = start_time
+        if self._start_time is None:
+            self._start_time = clock()
+        self._phases = []
+        self._lock = threading.Lock()
+        self._request_starts = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start_time = self._clock()
+        start_modules = len(sys.modules)
+        try:
+            yield
+        finally:
+            self.add_phase(
+                name,
+                start_time,
+                self._clock(),
+                imports=len(sys.modules) - start_modules,
+            )
+
+    def add_phase(self, name, start_time, end_time, imports=0):
+        with self._lock:
+            self._phases.append(
+                {
+                    'name': name,
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'imports': imports,
+                    'thread': threading.get_ident(),
+                }
+            )
+
+    def register_request_timing(self, event_handlers):
+        """Records the HTTP requests sent with the event handlers"""
+        event_handlers.register('before-send', self._start_request)
+        event_handlers.register('response-received', self._end_request)
+
+    def _start_request(self, **kwargs):
+        self._request_starts[threading.get_ident()] = self._clock()
+
+    def _end_request(self, **kwargs):
+        start_time = self._request_starts.pop(threading.get_ident(), None)
+        if start_time is not None:
+            self.add_phase('send-request', start_time, self._clock())
+
+    def get_timings(self):
+        """Returns the timings of the phases, in milliseconds"""
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p['start_time'])
+        return {
+            'total': self._to_ms(self._clock() - self._start_time),
+            'phases': [
+                {
+                    'name': phase['name'],
+                    'start': self._to_ms(
+                        phase['start_time'] - self._start_time
+                    ),
+                    'duration': self._to_ms(
+                        phase['end_time'] - phase['start_time']
+                    ),
+                    'imports': phase['imports'],
+                }
+                for phase in phases
+            ],
+        }
+
+    def get_chrome_trace(self):
+        """Returns the phases as complete events of a Chrome trace"""
+        with self._lock:
+            phases = list(self._phases)
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': phase['name'],
+                    'ph': 'X',
+                    'ts': self._to_us(phase['start_time'] - self._start_time),
+                    'dur': self._to_us(
+                        phase['end_time'] - phase['start_time']
+                    ),
+                    'pid': pid,
+                    'tid': phase['thread'],
+                    'args': {'imports': phase['imports']},
+                }
+                for phase in phases
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def write(self, timing_format, filename=None):
+        """Writes the timings in the given format
+
+        :param timing_format: Either ``json`` or ``chrome-trace``.
+        :param filename: The file to write the timings to.  Defaults to the
+            ``AWS_CLI_DEBUG_TIMING_FILE`` environment variable, or to
+            standard error if it is not set.
+        """
+        if timing_format == CHROME_TRACE_FORMAT:
+            timings = self.get_chrome_trace()
+        else:
+            timings = self.get_timings()
+        if filename is None:
+            filename = os.environ.get(DEBUG_TIMING_FILE_ENV_VAR)
+        if not filename:
+            sys.stderr.write(json.dumps(timings, indent=4))
+            sys.stderr.write('\n')
+            return
+        try:
+            with open(filename, 'w') as f:
+                json.dump(timings, f, indent=4)
+        except (IOError, OSError) as e:
+            sys.stderr.write(
+                f'Could not write debug timings to {filename}: {e}\n'
+            )
+
+    def _to_ms(self, seconds):
+        return round(seconds * 1000, 3)
+
+    def _to_us(self, seconds):
+        return round(seconds * 1000000, 1)
+
+
+class NullPhaseTimer:
+    """A phase timer that does not record anything"""
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        yield
+
+    def add_phase(self, name, start_time, end_time, imports=0):
+        pass
@@ -14,10 +14,13 @@ import base64
 import contextlib
 import csv
 import datetime
+import json
+import logging
 import os
 import signal
 import subprocess
 import sys
+import tempfile
 
 from awscli.compat import (
     StringIO,
@@ -25,6 +28,8 @@ from awscli.compat import (
     get_popen_kwargs_for_pager_cmd,
 )
 
+LOG = logging.getLogger(__name__)
+
 
 def split_on_commas(value):
     if not any(char in value for char in ['"', '\\', "'", ']', '[']):
@@ -268,6 +273,73 @@ def write_exception(ex, outfile):
     outfile.write("\n")
 
 
+class SharedJSONFile:
+    def __init__(self, filename, description):
+        """A JSON file that is shared by every invocation of the CLI
+
+        The file is used to cache values that are only an optimization: if
+        it cannot be read, it is treated as missing, and if it cannot be
+        written, the values are only kept in memory.
+
+        :param filename: The name of the file.
+        :param description: Describes the file in log messages.
+        """
+        self._filename = filename
+        self._description = description
+
+    def load(self):
+        """Returns the contents of the file, or None if it cannot be read"""
+        try:
+            with open(self._filename) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                LOG.debug(
+                    'Could not read %s %s: %s',
+                    self._description,
+                    self._filename,
+                    e,
+                )
+            return None
+
+    def save(self, value):
+        """Replaces the contents of the file with ``value``"""
+        dirname = os.path.dirname(self._filename)
+        prefix = '.%s-' % os.path.splitext(os.path.basename(self._filename))[0]
+        try:
+            os.makedirs(dirname, exist_ok=True)
+            # The file is replaced in a single step so other invocations
+            # never read a partially written file.
+            fd, temp_filename = tempfile.mkstemp(dir=dirname, prefix=prefix)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(temp_filename, self._filename)
+            except BaseException:
+                os.remove(temp_filename)
+                raise
+        except (IOError, OSError) as e:
+            LOG.debug(
+                'Could not write %s %s: %s',
+                self._description,
+                self._filename,
+                e,
+            )
+
+    def update(self, update):
+        """Writes what ``update`` returns for the contents of the file
+
+        Other invocations may have written the file since it was read, so
+        ``update`` is called with what is in the file now, as returned by
+        ``load()``.  It returns the new contents of the file, or None to
+        leave the file unchanged.  The value it returns is also returned.
+        """
+        value = update(self.load())
+        if value is not None:
+            self.save(value)
+        return value
+
+
 class ShapeWalker:
     def walk(self, shape, visitor):
         """Walk through and visit shapes for introspection
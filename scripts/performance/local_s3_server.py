@@ -0,0 +1,544 @@
+"""An in-process HTTP stand-in for S3 used to benchmark the s3 commands.
+
+The server implements enough of the S3 REST API, using path style
+addressing, for the ``aws s3`` transfer commands to run against it:
+listing, getting, putting, copying and deleting objects as well as
+multipart uploads and copies.  It does not authenticate requests.
+
+Object contents are not kept.  Only the size and ETag of each object are
+stored, and downloads return zero bytes of the stored size, so large
+workloads can be benchmarked without holding them in memory.
+
+The latency of each request and the throughput of each connection can be
+limited to approximate a real network::
+
+    server = LocalS3Server(latency=0.02, throughput=100 * 1024 ** 2)
+    server.start()
+    server.create_bucket('bucket')
+    ...
+    server.stop()
+
+"""
+import collections
+import hashlib
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+
+S3_NAMESPACE = 'http://s3.amazonaws.com/doc/2006-03-01/'
+COPY_BUFFER_SIZE = 256 * 1024
+ZEROS = bytes(COPY_BUFFER_SIZE)
+MAX_KEYS = 1000
+
+
+StoredObject = collections.namedtuple(
+    'StoredObject', ['size', 'etag', 'last_modified'])
+
+
+class LocalS3Server(object):
+    def __init__(self, latency=0, throughput=None, host='127.0.0.1', port=0):
+        """
+        :param latency: The number of seconds each request is delayed
+            before it is handled.
+        :param throughput: The maximum number of bytes per second read
+            from or written to each connection, or None for no limit.
+        """
+        self.latency = latency
+        self.throughput = throughput
+        self._buckets = {}
+        self._uploads = {}
+        self._lock = threading.Lock()
+        self._request_counts = collections.Counter()
+        self._bytes_transferred = 0
+        self._httpd = ThreadingHTTPServer((host, port), _S3RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.s3_server = self
+        self._thread = None
+
+    @property
+    def endpoint_url(self):
+        host, port = self._httpd.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def reset(self):
+        """Removes all buckets and clears the request statistics."""
+        with self._lock:
+            self._buckets.clear()
+            self._uploads.clear()
+            self._request_counts.clear()
+            self._bytes_transferred = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self._request_counts.clear()
+            self._bytes_transferred = 0
+
+    def get_stats(self):
+        """Returns the requests made per operation and the bytes sent."""
+        with self._lock:
+            return {
+                'requests': dict(self._request_counts),
+                'total_requests': sum(self._request_counts.values()),
+                'bytes_transferred': self._bytes_transferred,
+            }
+
+    def create_bucket(self, bucket):
+        with self._lock:
+            self._buckets.setdefault(bucket, {})
+
+    def put_object(self, bucket, key, size):
+        """Adds an object without making a request."""
+        etag = '"%s"' % hashlib.md5(key.encode('utf-8')).hexdigest()
+        with self._lock:
+            self._buckets[bucket][key] = StoredObject(
+                size, etag, datetime.now(timezone.utc))
+
+    def list_keys(self, bucket):
+        with self._lock:
+            return sorted(self._buckets[bucket])
+
+    # The methods below are called by the request handler.
+
+    def record_request(self, operation):
+        with self._lock:
+            self._request_counts[operation] += 1
+
+    def record_bytes(self, num_bytes):
+        with self._lock:
+            self._bytes_transferred += num_bytes
+
+    def get_bucket(self, bucket):
+        with self._lock:
+            return self._buckets.get(bucket)
+
+    def get_object(self, bucket, key):
+        with self._lock:
+            return self._buckets.get(bucket, {}).get(key)
+
+    def store_object(self, bucket, key, size, etag):
+        with self._lock:
+            self._buckets[bucket][key] = StoredObject(
+                size, etag, datetime.now(timezone.utc))
+
+    def delete_object(self, bucket, key):
+        with self._lock:
+            self._buckets.get(bucket, {}).pop(key, None)
+
+    def create_upload(self, bucket, key):
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = (bucket, key, {})
+        return upload_id
+
+    def add_part(self, upload_id, part_number, size, digest):
+        with self._lock:
+            self._uploads[upload_id][2][part_number] = (size, digest)
+
+    def complete_upload(self, upload_id):
+        with self._lock:
+            bucket, key, parts = self._uploads.pop(upload_id)
+            size = sum(part[0] for part in parts.values())
+            digests = b''.join(parts[i][1] for i in sorted(parts))
+            etag = '"%s-%s"' % (hashlib.md5(digests).hexdigest(), len(parts))
+            self._buckets[bucket][key] = StoredObject(
+                size, etag, datetime.now(timezone.utc))
+        return etag
+
+    def abort_upload(self, upload_id):
+        with self._lock:
+            self._uploads.pop(upload_id, None)
+
+
+class _S3RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def s3_server(self):
+        return self.server.s3_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_HEAD(self):
+        self._handle('HEAD')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method):
+        if self.s3_server.latency:
+            time.sleep(self.s3_server.latency)
+        url = urlsplit(self.path)
+        query = {
+            name: values[0]
+            for name, values in parse_qs(
+                url.query, keep_blank_values=True).items()
+        }
+        bucket, _, key = unquote(url.path).lstrip('/').partition('/')
+        handler = self._get_handler(method, key, query)
+        self.s3_server.record_request(handler.__name__.lstrip('_'))
+        handler(bucket, key, query)
+
+    def _get_handler(self, method, key, query):
+        if method == 'GET':
+            if not key:
+                return self._ListObjectsV2
+            return self._GetObject
+        if method == 'HEAD':
+            return self._HeadObject
+        if method == 'PUT':
+            copy_source = self.headers.get('x-amz-copy-source')
+            if 'partNumber' in query:
+                if copy_source:
+                    return self._UploadPartCopy
+                return self._UploadPart
+            if copy_source:
+                return self._CopyObject
+            return self._PutObject
+        if method == 'POST':
+            if 'delete' in query:
+                return self._DeleteObjects
+            if 'uploads' in query:
+                return self._CreateMultipartUpload
+            return self._CompleteMultipartUpload
+        if 'uploadId' in query:
+            return self._AbortMultipartUpload
+        return self._DeleteObject
+
+    def _ListObjectsV2(self, bucket, key, query):
+        objects = self.s3_server.get_bucket(bucket)
+        if objects is None:
+            return self._send_error(404, 'NoSuchBucket')
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        start_after = query.get(
+            'continuation-token', query.get('start-after', ''))
+        max_keys = min(int(query.get('max-keys', MAX_KEYS)), MAX_KEYS)
+        contents = []
+        common_prefixes = []
+        last_key = None
+        is_truncated = False
+        for name in sorted(objects):
+            if not name.startswith(prefix) or name <= start_after:
+                continue
+            if delimiter:
+                index = name.find(delimiter, len(prefix))
+                if index != -1:
+                    common_prefix = name[:index + len(delimiter)]
+                    if common_prefixes and \
+                            common_prefixes[-1] == common_prefix:
+                        continue
+                    if common_prefix <= start_after:
+                        continue
+                    if len(contents) + len(common_prefixes) >= max_keys:
+                        is_truncated = True
+                        break
+                    common_prefixes.append(common_prefix)
+                    last_key = common_prefix
+                    continue
+            if len(contents) + len(common_prefixes) >= max_keys:
+                is_truncated = True
+                break
+            contents.append((name, objects[name]))
+            last_key = name
+        body = ['<ListBucketResult xmlns="%s">' % S3_NAMESPACE,
+                '<Name>%s</Name>' % escape(bucket),
+                '<Prefix>%s</Prefix>' % escape(prefix),
+                '<KeyCount>%s</KeyCount>' % (
+                    len(contents) + len(common_prefixes)),
+                '<MaxKeys>%s</MaxKeys>' % max_keys,
+                '<IsTruncated>%s</IsTruncated>' % str(is_truncated).lower()]
+        if is_truncated:
+            body.append('<NextContinuationToken>%s</NextContinuationToken>'
+                        % escape(last_key))
+        for name, stored in contents:
+            body.append(
+                '<Contents><Key>%s</Key><LastModified>%s</LastModified>'
+                '<ETag>%s</ETag><Size>%s</Size>'
+                '<StorageClass>STANDARD</StorageClass></Contents>' % (
+                    escape(name), _format_timestamp(stored.last_modified),
+                    escape(stored.etag), stored.size))
+        for common_prefix in common_prefixes:
+            body.append('<CommonPrefixes><Prefix>%s</Prefix>'
+                        '</CommonPrefixes>' % escape(common_prefix))
+        body.append('</ListBucketResult>')
+        self._send_xml(''.join(body))
+
+    def _HeadObject(self, bucket, key, query):
+        stored = self.s3_server.get_object(bucket, key)
+        if stored is None:
+            return self._send_error(404, 'NoSuchKey', body=False)
+        self.send_response(200)
+        self._send_object_headers(stored, stored.size)
+        self.end_headers()
+
+    def _GetObject(self, bucket, key, query):
+        stored = self.s3_server.get_object(bucket, key)
+        if stored is None:
+            return self._send_error(404, 'NoSuchKey')
+        start, end = 0, stored.size - 1
+        byte_range = self.headers.get('Range')
+        if byte_range:
+            start, _, end = byte_range[len('bytes='):].partition('-')
+            start = int(start)
+            end = min(int(end), stored.size - 1) if end else stored.size - 1
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %s-%s/%s' % (
+                start, end, stored.size))
+        else:
+            self.send_response(200)
+        length = max(end - start + 1, 0)
+        self._send_object_headers(stored, length)
+        self.end_headers()
+        self._write_zeros(length)
+
+    def _PutObject(self, bucket, key, query):
+        if self.s3_server.get_bucket(bucket) is None:
+            self._read_body()
+            return self._send_error(404, 'NoSuchBucket')
+        size, digest = self._read_body()
+        etag = '"%s"' % digest.hex()
+        self.s3_server.store_object(bucket, key, size, etag)
+        self._send_empty(headers={'ETag': etag})
+
+    def _CopyObject(self, bucket, key, query):
+        stored = self._get_copy_source()
+        if stored is None:
+            return self._send_error(404, 'NoSuchKey')
+        self.s3_server.store_object(bucket, key, stored.size, stored.etag)
+        self._send_xml(
+            '<CopyObjectResult><ETag>%s</ETag>'
+            '<LastModified>%s</LastModified></CopyObjectResult>' % (
+                escape(stored.etag),
+                _format_timestamp(datetime.now(timezone.utc))))
+
+    def _DeleteObject(self, bucket, key, query):
+        self.s3_server.delete_object(bucket, key)
+        self._send_empty(status=204)
+
+    def _DeleteObjects(self, bucket, key, query):
+        _, _, body = self._read_body(keep=True)
+        root = ElementTree.fromstring(body)
+        for element in root.iter('{%s}Key' % S3_NAMESPACE):
+            self.s3_server.delete_object(bucket, element.text)
+        self._send_xml(
+            '<DeleteResult xmlns="%s"></DeleteResult>' % S3_NAMESPACE)
+
+    def _CreateMultipartUpload(self, bucket, key, query):
+        upload_id = self.s3_server.create_upload(bucket, key)
+        self._send_xml(
+            '<InitiateMultipartUploadResult xmlns="%s"><Bucket>%s</Bucket>'
+            '<Key>%s</Key><UploadId>%s</UploadId>'
+            '</InitiateMultipartUploadResult>' % (
+                S3_NAMESPACE, escape(bucket), escape(key), upload_id))
+
+    def _UploadPart(self, bucket, key, query):
+        size, digest = self._read_body()
+        self.s3_server.add_part(
+            query['uploadId'], int(query['partNumber']), size, digest)
+        self._send_empty(headers={'ETag': '"%s"' % digest.hex()})
+
+    def _UploadPartCopy(self, bucket, key, query):
+        stored = self._get_copy_source()
+        if stored is None:
+            return self._send_error(404, 'NoSuchKey')
+        size = stored.size
+        byte_range = self.headers.get('x-amz-copy-source-range')
+        if byte_range:
+            start, _, end = byte_range[len('bytes='):].partition('-')
+            size = int(end) - int(start) + 1
+        digest = hashlib.md5(
+            (stored.etag + (byte_range or '')).encode('utf-8')).digest()
+        self.s3_server.add_part(
+            query['uploadId'], int(query['partNumber']), size, digest)
+        self._send_xml(
+            '<CopyPartResult><ETag>"%s"</ETag>'
+            '<LastModified>%s</LastModified></CopyPartResult>' % (
+                digest.hex(), _format_timestamp(datetime.now(timezone.utc))))
+
+    def _CompleteMultipartUpload(self, bucket, key, query):
+        self._read_body(keep=True)
+        etag = self.s3_server.complete_upload(query['uploadId'])
+        self._send_xml(
+            '<CompleteMultipartUploadResult xmlns="%s"><Bucket>%s</Bucket>'
+            '<Key>%s</Key><ETag>%s</ETag></CompleteMultipartUploadResult>' % (
+                S3_NAMESPACE, escape(bucket), escape(key), escape(etag)))
+
+    def _AbortMultipartUpload(self, bucket, key, query):
+        self.s3_server.abort_upload(query['uploadId'])
+        self._send_empty(status=204)
+
+    def _get_copy_source(self):
+        copy_source = unquote(self.headers['x-amz-copy-source'])
+        copy_source = copy_source.split('?')[0].lstrip('/')
+        source_bucket, _, source_key = copy_source.partition('/')
+        return self.s3_server.get_object(source_bucket, source_key)
+
+    def _read_body(self, keep=False):
+        md5 = hashlib.md5()
+        kept = []
+        size = 0
+        for data in self._iter_body():
+            md5.update(data)
+            size += len(data)
+            if keep:
+                kept.append(data)
+        self.s3_server.record_bytes(size)
+        if keep:
+            return size, md5.digest(), b''.join(kept)
+        return size, md5.digest()
+
+    def _iter_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = _ChunkedReader(self.rfile.readline, self._throttled_read)
+        else:
+            body = self._iter_fixed_length_body()
+        if 'aws-chunked' in self.headers.get('Content-Encoding', ''):
+            # Uploads with trailing checksums are sent with the aws-chunked
+            # encoding, which frames the data the same way as the HTTP
+            # chunked encoding.
+            source = _BytesSource(body)
+            body = _ChunkedReader(source.readline, source.read)
+        return body
+
+    def _iter_fixed_length_body(self):
+        remaining = int(self.headers.get('Content-Length', 0))
+        while remaining > 0:
+            data = self._throttled_read(min(remaining, COPY_BUFFER_SIZE))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+    def _throttled_read(self, num_bytes):
+        start_time = time.monotonic()
+        data = self.rfile.read(num_bytes)
+        self._throttle(len(data), start_time)
+        return data
+
+    def _write_zeros(self, length):
+        self.s3_server.record_bytes(length)
+        while length > 0:
+            chunk = ZEROS[:min(length, COPY_BUFFER_SIZE)]
+            start_time = time.monotonic()
+            self.wfile.write(chunk)
+            self._throttle(len(chunk), start_time)
+            length -= len(chunk)
+
+    def _throttle(self, num_bytes, start_time):
+        if self.s3_server.throughput:
+            expected = num_bytes / float(self.s3_server.throughput)
+            elapsed = time.monotonic() - start_time
+            if expected > elapsed:
+                time.sleep(expected - elapsed)
+
+    def _send_object_headers(self, stored, length):
+        self.send_header('Content-Length', str(length))
+        self.send_header('ETag', stored.etag)
+        self.send_header('Last-Modified', stored.last_modified.strftime(
+            '%a, %d %b %Y %H:%M:%S GMT'))
+        self.send_header('Content-Type', 'binary/octet-stream')
+        self.send_header('Accept-Ranges', 'bytes')
+
+    def _send_empty(self, status=200, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _send_xml(self, body, status=200):
+        body = ('<?xml version="1.0" encoding="UTF-8"?>' + body).encode(
+            'utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, code, body=True):
+        if not body:
+            return self._send_empty(status=status)
+        self._send_xml(
+            '<Error><Code>%s</Code><Message>%s</Message>'
+            '<RequestId>%s</RequestId></Error>' % (
+                code, code, uuid.uuid4().hex), status=status)
+
+
+class _BytesSource(object):
+    """Exposes an iterable of byte strings as a readable file object."""
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._buffer = b''
+
+    def readline(self):
+        while b'\n' not in self._buffer:
+            data = next(self._iterator, b'')
+            if not data:
+                break
+            self._buffer += data
+        line, sep, self._buffer = self._buffer.partition(b'\n')
+        return line + sep
+
+    def read(self, num_bytes):
+        while len(self._buffer) < num_bytes:
+            data = next(self._iterator, b'')
+            if not data:
+                break
+            self._buffer += data
+        data, self._buffer = self._buffer[:num_bytes], self._buffer[num_bytes:]
+        return data
+
+
+class _ChunkedReader(object):
+    def __init__(self, readline, read):
+        self._readline = readline
+        self._read = read
+
+    def __iter__(self):
+        while True:
+            size_line = self._readline().strip()
+            size = int(size_line.split(b';')[0], 16)
+            if size == 0:
+                # Skip any trailers up to the terminating empty line.
+                while self._readline().strip():
+                    pass
+                return
+            remaining = size
+            while remaining > 0:
+                data = self._read(min(remaining, COPY_BUFFER_SIZE))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+            self._readline()
+
+
+def _format_timestamp(timestamp):
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
@@ -42,7 +42,7 @@ setup_options = dict(
     url='http://aws.amazon.com/cli/',
     scripts=['bin/aws', 'bin/aws.cmd',
              'bin/aws_completer', 'bin/aws_zsh_completer.sh',
-             'bin/aws_bash_completer'],
+             'bin/aws_bash_completer', 'bin/aws_server'],
     packages=find_packages(exclude=['tests*']),
     include_package_data=True,
     install_requires=install_requires,
@@ -12,6 +12,9 @@
 # language governing permissions and limitations under the License.
 import gzip
 import json
+import os
+import shutil
+import tempfile
 
 from botocore.exceptions import ClientError
 from botocore.handlers import parse_get_bucket_location
@@ -89,6 +92,15 @@ class BaseCloudTrailCommandTest(BaseAWSCommandParamsTest):
         self.driver.session.unregister(
             'after-call.s3.GetBucketLocation', parse_get_bucket_location
         )
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        resolution_cache_patch = mock.patch(
+            'awscli.customizations.s3.resolutioncache.'
+            'RESOLUTION_CACHE_FILENAME',
+            os.path.join(self.tempdir, 'resolutions.json'),
+        )
+        resolution_cache_patch.start()
+        self.addCleanup(resolution_cache_patch.stop)
         self._logs = [
             {
                 'hashValue': '44136fa355b3678a1146ad16f7e8649e94fb4fc21fe77e8310c060f61caaff8a',
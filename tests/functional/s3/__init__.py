@@ -10,6 +10,8 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import os
+
 from awscli.testutils import mock, BaseAWSCommandParamsTest, FileCreator
 from awscli.compat import BytesIO
 
@@ -17,6 +19,13 @@ class BaseS3TransferCommandTest(BaseAWSCommandParamsTest):
     def setUp(self):
         super(BaseS3TransferCommandTest, self).setUp()
         self.files = FileCreator()
+        self.resolution_cache_filename = os.path.join(
+            self.files.rootdir, 'resolutions.json')
+        resolution_cache_patch = mock.patch(
+            'awscli.customizations.s3.resolutioncache.'
+            'RESOLUTION_CACHE_FILENAME', self.resolution_cache_filename)
+        resolution_cache_patch.start()
+        self.addCleanup(resolution_cache_patch.stop)
 
     def tearDown(self):
         super(BaseS3TransferCommandTest, self).tearDown()
@@ -0,0 +1,88 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import time
+
+from awscli.customizations.s3.transferjournal import JournaledDownload
+from awscli.customizations.s3.transferjournal import JournaledUpload
+from awscli.customizations.s3.transferjournal import TransferJournal
+from awscli.testutils import mock
+from tests.functional.s3 import BaseS3TransferCommandTest
+
+
+class TestAbortResumable(BaseS3TransferCommandTest):
+
+    prefix = 's3 abort-resumable '
+
+    def setUp(self):
+        super(TestAbortResumable, self).setUp()
+        journal_filename = os.path.join(self.files.rootdir, 'transfers.db')
+        journal_filename_patch = mock.patch(
+            'awscli.customizations.s3.transferjournal.'
+            'TRANSFER_JOURNAL_FILENAME', journal_filename)
+        journal_filename_patch.start()
+        self.addCleanup(journal_filename_patch.stop)
+        self.journal = TransferJournal(journal_filename)
+        self.addCleanup(self.journal.close)
+        self.two_days_ago = time.time() - 2 * 24 * 60 * 60
+        self.partial_filename = self.files.create_file(
+            'download.s3resume', 'partial')
+        self.journal.start_upload(JournaledUpload(
+            'bucket', 'upload', os.path.join(self.files.rootdir, 'upload'),
+            10, 0, 8, 'digest', 'myid', self.two_days_ago))
+        self.journal.start_download(JournaledDownload(
+            os.path.join(self.files.rootdir, 'download'),
+            self.partial_filename, 'bucket', 'download', '"etag"', 10, 8,
+            self.two_days_ago))
+
+    def test_aborts_interrupted_transfers(self):
+        stdout, _, _ = self.run_cmd(self.prefix)
+        self.assert_operations_called([
+            ('AbortMultipartUpload', {
+                'Bucket': 'bucket', 'Key': 'upload', 'UploadId': 'myid'}),
+        ])
+        self.assertIn('abort: ', stdout)
+        self.assertIn('upload to s3://bucket/upload', stdout)
+        self.assertIn('s3://bucket/download to ', stdout)
+        self.assertFalse(os.path.exists(self.partial_filename))
+        self.assertEqual(self.journal.list_uploads(), [])
+        self.assertEqual(self.journal.list_downloads(), [])
+
+    def test_dryrun(self):
+        stdout, _, _ = self.run_cmd(self.prefix + '--dryrun')
+        self.assertEqual(self.operations_called, [])
+        self.assertEqual(stdout.count('(dryrun) abort: '), 2)
+        self.assertTrue(os.path.exists(self.partial_filename))
+        self.assertEqual(len(self.journal.list_uploads()), 1)
+        self.assertEqual(len(self.journal.list_downloads()), 1)
+
+    def test_does_not_abort_recent_transfers(self):
+        stdout, _, _ = self.run_cmd(self.prefix + '--older-than 3')
+        self.assertEqual(self.operations_called, [])
+        self.assertEqual(stdout, '')
+        self.assertEqual(len(self.journal.list_uploads()), 1)
+
+    def test_upload_already_aborted(self):
+        self.http_response.status_code = 404
+        self.parsed_responses = [
+            {'Error': {'Code': 'NoSuchUpload', 'Message': 'Not found'}}]
+        self.run_cmd(self.prefix, expected_rc=0)
+        self.assertEqual(self.journal.list_uploads(), [])
+
+    def test_failed_abort(self):
+        self.http_response.status_code = 403
+        self.parsed_responses = [
+            {'Error': {'Code': 'AccessDenied', 'Message': 'Denied'}}]
+        _, stderr, _ = self.run_cmd(self.prefix, expected_rc=1)
+        self.assertIn('abort failed: ', stderr)
+        self.assertEqual(len(self.journal.list_uploads()), 1)
@@ -12,11 +12,18 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 import os
+import time
+
+from botocore.awsrequest import AWSResponse
+from botocore.endpoint import Endpoint
 
 from awscli.testutils import BaseAWSCommandParamsTest, skip_if_windows, temporary_file, create_clidriver
 from awscli.testutils import capture_input
 from awscli.testutils import mock 
+from awscli.testutils import unittest
 from awscli.compat import BytesIO
+from awscli.customizations.s3.processpool import get_process_context
+from awscli.customizations.s3.transferjournal import TransferJournal
 from tests.functional.s3 import BaseS3TransferCommandTest
 from tests.functional.s3.test_sync_command import TestSyncCaseConflict
 from tests import requires_crt
@@ -358,6 +365,25 @@ class TestCPCommand(BaseCPCommandTest):
         self.assertEqual(self.operations_called[0][0].name, 'ListObjectsV2')
         self.assertEqual(self.operations_called[1][0].name, 'GetObject')
 
+    def test_recursive_download_lists_only_included_prefixes(self):
+        self.parsed_responses = [
+            {
+                'Contents': [
+                    {'Key': 'logs/a.txt', 'LastModified': '00:00:00Z',
+                     'Size': 3, 'ETag': '"foo-1"'},
+                ],
+                'CommonPrefixes': []
+            },
+            {'ETag': '"foo-1"', 'Body': BytesIO(b'foo')},
+        ]
+        cmdline = ('%s s3://bucket/ %s --recursive --exclude * '
+                   '--include logs/*' % (self.prefix, self.files.rootdir))
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 2, self.operations_called)
+        self.assertEqual(self.operations_called[0][0].name, 'ListObjectsV2')
+        self.assertEqual(self.operations_called[0][1]['Prefix'], 'logs/')
+        self.assertEqual(self.operations_called[1][0].name, 'GetObject')
+
     def test_recursive_glacier_download_without_force_glacier(self):
         self.parsed_responses = [
             {
@@ -1087,6 +1113,215 @@ class TestCPCommand(BaseCPCommandTest):
         )
 
 
+@unittest.skipIf(get_process_context() is None,
+                 'Processes cannot be forked on this platform')
+class TestCPCommandWithProcesses(BaseCPCommandTest):
+    def run_cmd_with_processes(self, cmdline, max_processes=2, **kwargs):
+        with temporary_file('w') as f:
+            f.write(
+                "[default]\n"
+                "s3 =\n"
+                "  max_processes = %s\n" % max_processes
+            )
+            f.flush()
+            self.environ['AWS_CONFIG_FILE'] = f.name
+            self.driver = create_clidriver()
+            return self.run_cmd(cmdline, **kwargs)
+
+    def test_recursive_upload(self):
+        for i in range(5):
+            self.files.create_file('file%s.txt' % i, 'contents')
+        # The requests are made by the worker processes, each of which
+        # has its own copy of the responses.
+        self.parsed_responses = [{'ETag': '"foo-1"'}] * 5
+        cmdline = '%s %s s3://bucket/ --recursive' % (
+            self.prefix, self.files.rootdir)
+        stdout, _, _ = self.run_cmd_with_processes(cmdline, expected_rc=0)
+        self.assertEqual(stdout.count('upload: '), 5)
+        for i in range(5):
+            self.assertIn(
+                'file%s.txt to s3://bucket/file%s.txt' % (i, i), stdout)
+
+    def test_recursive_upload_dryrun(self):
+        self.files.create_file('foo.txt', 'contents')
+        cmdline = '%s %s s3://bucket/ --recursive --dryrun' % (
+            self.prefix, self.files.rootdir)
+        stdout, _, _ = self.run_cmd_with_processes(cmdline, expected_rc=0)
+        self.assertIn('(dryrun) upload: ', stdout)
+        self.assertIn('foo.txt to s3://bucket/foo.txt', stdout)
+
+    def test_recursive_upload_failure(self):
+        self.files.create_file('foo.txt', 'contents')
+        self.http_response.status_code = 500
+        self.parsed_responses = [{'Error': {'Code': 'InternalError',
+                                            'Message': 'Internal Error'}}] * 10
+        cmdline = '%s %s s3://bucket/ --recursive' % (
+            self.prefix, self.files.rootdir)
+        _, stderr, _ = self.run_cmd_with_processes(cmdline, expected_rc=1)
+        self.assertIn('upload failed: ', stderr)
+
+
+class TestCPCommandWithResume(BaseCPCommandTest):
+    def setUp(self):
+        super(TestCPCommandWithResume, self).setUp()
+        self.journal_filename = os.path.join(
+            self.files.rootdir, 'transfers.db')
+        journal_filename_patch = mock.patch(
+            'awscli.customizations.s3.transferjournal.'
+            'TRANSFER_JOURNAL_FILENAME', self.journal_filename)
+        journal_filename_patch.start()
+        self.addCleanup(journal_filename_patch.stop)
+        self.journal = TransferJournal(self.journal_filename)
+        self.addCleanup(self.journal.close)
+        self.responses = {}
+        self.requests_made = []
+
+    def patch_make_request(self):
+        super(TestCPCommandWithResume, self).patch_make_request()
+        Endpoint.make_request.side_effect = self.make_request
+
+    def make_request(self, operation_model, request_dict):
+        name = operation_model.name
+        part_number = request_dict['query_string'].get('partNumber')
+        if name == 'GetObject':
+            part_number = request_dict['headers']['Range']
+        self.requests_made.append((name, part_number))
+        response = self.responses[(name, part_number)]
+        if callable(response):
+            return response()
+        return AWSResponse(None, 200, {}, None), response
+
+    def interrupt(self, journaled_parts):
+        # The transfer is only interrupted once its other parts were
+        # journaled, as the failure cancels any unfinished parts.
+        for _ in range(200):
+            if journaled_parts():
+                break
+            time.sleep(0.01)
+        return AWSResponse(None, 400, {}, None), {
+            'Error': {'Code': 'InvalidRequest', 'Message': 'Interrupted'}}
+
+    def get_journaled_upload_parts(self):
+        uploads = self.journal.list_uploads()
+        if not uploads:
+            return {}
+        return self.journal.get_upload_parts(uploads[0][0])
+
+    def get_journaled_download_parts(self):
+        downloads = self.journal.list_downloads()
+        if not downloads:
+            return {}
+        return self.journal.get_download_parts(downloads[0][0])
+
+    def test_resumes_interrupted_upload(self):
+        full_path = self.files.create_file('myfile', 'a' * 10 * MB)
+        cmdline = '%s %s s3://bucket/key --resume' % (self.prefix, full_path)
+        self.responses = {
+            ('CreateMultipartUpload', None): {'UploadId': 'myid'},
+            ('UploadPart', 1): {'ETag': '"etag-1"'},
+            ('UploadPart', 2): lambda: self.interrupt(
+                self.get_journaled_upload_parts),
+        }
+        self.run_cmd(cmdline, expected_rc=1)
+        # The multipart upload is kept to be resumed.
+        self.assertNotIn(('AbortMultipartUpload', None), self.requests_made)
+        self.assertEqual(
+            self.get_journaled_upload_parts(), {1: ('"etag-1"', mock.ANY)})
+
+        self.requests_made = []
+        self.responses = {
+            ('ListParts', None): {'Parts': [
+                {'PartNumber': 1, 'ETag': '"etag-1"', 'Size': 8 * MB}]},
+            ('UploadPart', 2): {'ETag': '"etag-2"'},
+            ('CompleteMultipartUpload', None): {},
+        }
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            self.requests_made,
+            [('ListParts', None), ('UploadPart', 2),
+             ('CompleteMultipartUpload', None)])
+        self.assertEqual(
+            self.operations_called[-1][1]['MultipartUpload'],
+            {'Parts': [{'ETag': '"etag-1"', 'PartNumber': 1},
+                       {'ETag': '"etag-2"', 'PartNumber': 2}]})
+        self.assertEqual(self.journal.list_uploads(), [])
+
+    def test_restarts_upload_of_changed_file(self):
+        full_path = self.files.create_file('myfile', 'a' * 10 * MB)
+        cmdline = '%s %s s3://bucket/key --resume' % (self.prefix, full_path)
+        self.responses = {
+            ('CreateMultipartUpload', None): {'UploadId': 'myid'},
+            ('UploadPart', 1): {'ETag': '"etag-1"'},
+            ('UploadPart', 2): lambda: self.interrupt(
+                self.get_journaled_upload_parts),
+        }
+        self.run_cmd(cmdline, expected_rc=1)
+
+        self.files.create_file('myfile', 'b' * 10 * MB)
+        os.utime(full_path, ns=(0, 0))
+        self.requests_made = []
+        self.responses = {
+            ('AbortMultipartUpload', None): {},
+            ('CreateMultipartUpload', None): {'UploadId': 'newid'},
+            ('UploadPart', 1): {'ETag': '"etag-1"'},
+            ('UploadPart', 2): {'ETag': '"etag-2"'},
+            ('CompleteMultipartUpload', None): {},
+        }
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            sorted(self.requests_made, key=str),
+            sorted([('AbortMultipartUpload', None),
+                    ('CreateMultipartUpload', None), ('UploadPart', 1),
+                    ('UploadPart', 2), ('CompleteMultipartUpload', None)],
+                   key=str))
+        self.assertEqual(self.journal.list_uploads(), [])
+
+    def test_resumes_interrupted_download(self):
+        local_path = os.path.join(self.files.rootdir, 'myfile')
+        cmdline = '%s s3://bucket/key %s --resume' % (self.prefix, local_path)
+        self.responses = {
+            ('HeadObject', None): self.head_object_response(
+                ContentLength=10 * MB),
+            ('GetObject', 'bytes=0-8388607'): {
+                'Body': BytesIO(b'a' * 8 * MB), 'ETag': '"foo-1"'},
+            ('GetObject', 'bytes=8388608-'): lambda: self.interrupt(
+                self.get_journaled_download_parts),
+        }
+        self.run_cmd(cmdline, expected_rc=1)
+        self.assertFalse(os.path.exists(local_path))
+        self.assertTrue(os.path.exists(local_path + '.s3resume'))
+        self.assertEqual(list(self.get_journaled_download_parts()), [1])
+
+        self.requests_made = []
+        self.responses = {
+            ('HeadObject', None): self.head_object_response(
+                ContentLength=10 * MB),
+            ('GetObject', 'bytes=8388608-'): {
+                'Body': BytesIO(b'b' * 2 * MB), 'ETag': '"foo-1"'},
+        }
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            self.requests_made,
+            [('HeadObject', None), ('GetObject', 'bytes=8388608-')])
+        with open(local_path, 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 8 * MB + b'b' * 2 * MB)
+        self.assertFalse(os.path.exists(local_path + '.s3resume'))
+        self.assertEqual(self.journal.list_downloads(), [])
+
+    def test_small_files_are_not_journaled(self):
+        full_path = self.files.create_file('myfile', 'mycontent')
+        self.responses = {('PutObject', None): {'ETag': '"foo-1"'}}
+        cmdline = '%s %s s3://bucket/key --resume' % (self.prefix, full_path)
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(self.requests_made, [('PutObject', None)])
+        self.assertEqual(self.journal.list_uploads(), [])
+
+    def test_resume_cannot_be_used_with_streams(self):
+        cmdline = '%s - s3://bucket/key --resume' % self.prefix
+        _, stderr, _ = self.run_cmd(cmdline, expected_rc=255)
+        self.assertIn('cannot be used with streams', stderr)
+
+
 class TestStreamingCPCommand(BaseAWSCommandParamsTest):
     def test_streaming_upload(self):
         command = "s3 cp - s3://bucket/streaming.txt"
@@ -0,0 +1,130 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import datetime
+
+from tests.functional.s3 import BaseS3TransferCommandTest
+
+
+class TestDUCommand(BaseS3TransferCommandTest):
+
+    prefix = 's3 du '
+
+    def days_ago(self, days):
+        last_modified = datetime.datetime.now(datetime.timezone.utc) - \
+            datetime.timedelta(days=days)
+        return last_modified.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+    def set_listing(self, contents):
+        self.parsed_responses = [
+            # The probe for split points finds no prefixes, so the prefix
+            # is listed with a single paginator.
+            {'CommonPrefixes': []},
+            {'Contents': contents},
+        ]
+
+    def create_object(self, key, size, storage_class='STANDARD', days=1):
+        return {
+            'Key': key, 'Size': size, 'StorageClass': storage_class,
+            'LastModified': self.days_ago(days),
+        }
+
+    def test_reports_total_of_prefix(self):
+        self.set_listing([
+            self.create_object('logs/a', 100),
+            self.create_object('logs/2024/b', 200),
+        ])
+        stdout, _, _ = self.run_cmd(self.prefix + 's3://bucket/logs/')
+        self.assertEqual(
+            stdout, '       300          2 s3://bucket/logs/\n')
+        self.assertEqual(self.operations_called[1][1], {
+            'Bucket': 'bucket', 'Prefix': 'logs/'})
+
+    def test_reports_totals_to_depth(self):
+        self.set_listing([
+            self.create_object('logs/a', 100),
+            self.create_object('logs/2024/01/b', 200),
+            self.create_object('logs/2024/02/c', 300),
+            self.create_object('logs/2025/d', 400),
+        ])
+        stdout, _, _ = self.run_cmd(
+            self.prefix + 's3://bucket/logs/ --depth 1')
+        self.assertEqual(
+            stdout,
+            '      1000          4 s3://bucket/logs/\n'
+            '       500          2 s3://bucket/logs/2024/\n'
+            '       400          1 s3://bucket/logs/2025/\n')
+
+    def test_reports_intermediate_prefixes_to_depth(self):
+        self.set_listing([
+            self.create_object('logs/a', 100),
+            self.create_object('logs/2024/01/b', 200),
+            self.create_object('logs/2024/01/c/d', 300),
+            self.create_object('logs/2024/e', 400),
+            self.create_object('logs/2025/f', 500),
+        ])
+        stdout, _, _ = self.run_cmd(
+            self.prefix + 's3://bucket/logs/ --depth 2')
+        self.assertEqual(
+            stdout,
+            '      1500          5 s3://bucket/logs/\n'
+            '       900          3 s3://bucket/logs/2024/\n'
+            '       500          2 s3://bucket/logs/2024/01/\n'
+            '       500          1 s3://bucket/logs/2025/\n')
+
+    def test_breakdowns_include_prefixes(self):
+        self.set_listing([
+            self.create_object('logs/a', 100, 'GLACIER'),
+            self.create_object('logs/2024/b', 200),
+        ])
+        stdout, _, _ = self.run_cmd(
+            self.prefix + 's3://bucket/logs/ --depth 1 --by-storage-class')
+        self.assertEqual(
+            stdout,
+            '       300          2 s3://bucket/logs/\n'
+            '       100          1     GLACIER\n'
+            '       200          1     STANDARD\n'
+            '       200          1 s3://bucket/logs/2024/\n'
+            '       200          1     STANDARD\n')
+
+    def test_breakdowns(self):
+        self.set_listing([
+            self.create_object('a', 100, 'GLACIER', days=400),
+            self.create_object('b', 200, days=40),
+            self.create_object('c', 300, days=1),
+        ])
+        stdout, _, _ = self.run_cmd(
+            self.prefix + 's3://bucket --by-storage-class --by-age')
+        self.assertEqual(
+            stdout,
+            '       600          3 s3://bucket/\n'
+            '       100          1     GLACIER\n'
+            '       500          2     STANDARD\n'
+            '       300          1     < 30 days\n'
+            '       200          1     30-90 days\n'
+            '       100          1     > 365 days\n')
+
+    def test_human_readable(self):
+        self.set_listing([self.create_object('a', 2048)])
+        stdout, _, _ = self.run_cmd(
+            self.prefix + 's3://bucket/ --human-readable')
+        self.assertEqual(stdout, '   2.0 KiB          1 s3://bucket/\n')
+
+    def test_empty_prefix(self):
+        self.set_listing([])
+        stdout, _, _ = self.run_cmd(self.prefix + 's3://bucket/missing/')
+        self.assertEqual(
+            stdout, '         0          0 s3://bucket/missing/\n')
+
+    def test_requires_bucket(self):
+        _, stderr, _ = self.run_cmd(self.prefix + 's3://', expected_rc=255)
+        self.assertIn('du requires an S3 URI with a bucket', stderr)
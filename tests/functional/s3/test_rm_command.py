@@ -10,6 +10,7 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+from awscli.testutils import temporary_file, create_clidriver
 from tests.functional.s3 import BaseS3TransferCommandTest
 
 
@@ -54,3 +55,74 @@ class TestRmCommand(BaseS3TransferCommandTest):
             ]
 
         )
+
+    def use_delete_batch_size(self, batch_size):
+        with temporary_file('w') as f:
+            f.write(
+                "[default]\n"
+                "s3 =\n"
+                "  delete_batch_size = %s\n" % batch_size
+            )
+            f.flush()
+            self.environ['AWS_CONFIG_FILE'] = f.name
+            self.driver = create_clidriver()
+
+    def test_recursive_delete_with_batches(self):
+        self.use_delete_batch_size(2)
+        cmdline = '%s s3://mybucket/ --recursive --request-payer' % self.prefix
+        self.parsed_responses = [
+            self.list_objects_response(['key1', 'key2', 'key3']),
+            self.empty_response(),
+            self.empty_response(),
+        ]
+        stdout, _, _ = self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 3)
+        self.assertEqual(
+            self.operations_called[0][0].name, 'ListObjectsV2')
+        deleted_keys = []
+        for operation, params in self.operations_called[1:]:
+            self.assertEqual(operation.name, 'DeleteObjects')
+            self.assertEqual(params['Bucket'], 'mybucket')
+            self.assertEqual(params['RequestPayer'], 'requester')
+            self.assertTrue(params['Delete']['Quiet'])
+            deleted_keys.extend(
+                obj['Key'] for obj in params['Delete']['Objects'])
+        self.assertEqual(sorted(deleted_keys), ['key1', 'key2', 'key3'])
+        for key in ['key1', 'key2', 'key3']:
+            self.assertIn('delete: s3://mybucket/%s' % key, stdout)
+
+    def test_recursive_delete_with_batches_reports_key_errors(self):
+        self.use_delete_batch_size(1000)
+        cmdline = '%s s3://mybucket/ --recursive' % self.prefix
+        self.parsed_responses = [
+            self.list_objects_response(['key1', 'key2']),
+            {'Errors': [{'Key': 'key2', 'Code': 'AccessDenied',
+                         'Message': 'Access Denied'}]},
+        ]
+        stdout, stderr, _ = self.run_cmd(cmdline, expected_rc=1)
+        self.assertEqual(len(self.operations_called), 2)
+        self.assertEqual(
+            self.operations_called[1][0].name, 'DeleteObjects')
+        self.assertIn('delete: s3://mybucket/key1', stdout)
+        self.assertIn(
+            'delete failed: s3://mybucket/key2 An error occurred '
+            '(AccessDenied) when calling the DeleteObjects operation: '
+            'Access Denied', stderr)
+
+    def test_recursive_delete_with_batches_dryrun(self):
+        self.use_delete_batch_size(1000)
+        cmdline = '%s s3://mybucket/ --recursive --dryrun' % self.prefix
+        self.parsed_responses = [
+            self.list_objects_response(['key1', 'key2']),
+        ]
+        stdout, _, _ = self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 1)
+        self.assertIn('(dryrun) delete: s3://mybucket/key1', stdout)
+        self.assertIn('(dryrun) delete: s3://mybucket/key2', stdout)
+
+    def test_single_delete_not_batched(self):
+        self.use_delete_batch_size(1000)
+        cmdline = '%s s3://mybucket/mykey' % self.prefix
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assert_operations_called(
+            [self.delete_object_request('mybucket', 'mykey')])
@@ -11,8 +11,11 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 import os
+import shutil
+import tempfile
 
 from awscli.testutils import cd, mock, skip_if_case_sensitive, skip_if_windows
+from awscli.testutils import create_clidriver, temporary_file
 from awscli.compat import BytesIO
 from tests.functional.s3 import BaseS3TransferCommandTest
 from tests import requires_crt
@@ -157,6 +160,54 @@ class TestSyncCommand(BaseS3TransferCommandTest):
         self.assertEqual(self.operations_called[0][0].name, 'ListObjectsV2')
         self.assertEqual(self.operations_called[1][0].name, 'PutObject')
 
+    def use_pipeline_queue_size(self, queue_size):
+        with temporary_file('w') as f:
+            f.write(
+                "[default]\n"
+                "s3 =\n"
+                "  pipeline_queue_size = %s\n" % queue_size
+            )
+            f.flush()
+            self.environ['AWS_CONFIG_FILE'] = f.name
+            self.driver = create_clidriver()
+
+    def test_sync_with_pipeline_stages(self):
+        self.use_pipeline_queue_size(1)
+        self.files.create_file('a.txt', 'mycontent')
+        self.files.create_file('b.txt', 'mycontent')
+        self.files.create_file('c.txt', 'mycontent')
+        cmdline = '%s %s s3://bucket/' % (self.prefix, self.files.rootdir)
+        self.parsed_responses = [
+            {"CommonPrefixes": [], "Contents": [
+                {"Key": "b.txt", "Size": 9,
+                 "LastModified": "2100-01-01T00:00:00.000Z",
+                 "ETag": '"c8afdb36c52cf4727836669019e69222"'}]},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'},
+        ]
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 3, self.operations_called)
+        self.assertEqual(self.operations_called[0][0].name, 'ListObjectsV2')
+        self.assertEqual(
+            sorted(params['Key'] for _, params in self.operations_called[1:]),
+            ['a.txt', 'c.txt'])
+
+    def test_sync_with_pipeline_stages_reports_listing_error(self):
+        self.use_pipeline_queue_size(1)
+        self.files.create_file('a.txt', 'mycontent')
+        cmdline = '%s %s s3://bucket/' % (self.prefix, self.files.rootdir)
+        self.parsed_responses = [{
+            'Error': {
+                'Code': 'NoSuchBucket',
+                'Message': 'The specified bucket does not exist',
+                'BucketName': 'bucket'
+            }
+        }]
+        self.http_response.status_code = 404
+        _, stderr, _ = self.run_cmd(cmdline, expected_rc=1)
+        self.assertIn('NoSuchBucket', stderr)
+        self.assertEqual(len(self.operations_called), 1, self.operations_called)
+
     def test_sync_with_delete_on_downloads(self):
         full_path = self.files.create_file('foo.txt', 'mycontent')
         cmdline = '%s s3://bucket %s --delete' % (
@@ -447,6 +498,121 @@ class TestSyncCommand(BaseS3TransferCommandTest):
         self.assertEqual(self.operations_called[1][0].name, 'PutObject')
         self.assertEqual(self.operations_called[1][1]['ChecksumAlgorithm'], 'SHA1')
 
+    def test_checksum_skips_unchanged_newer_files(self):
+        self.files.create_file('foo.txt', 'contents')
+        self.files.create_file('bar.txt', 'changed!')
+        cmdline = f'{self.prefix} {self.files.rootdir} s3://bucket/ --checksum'
+        self.parsed_responses = [
+            {
+                'Contents': [
+                    {'Key': 'bar.txt', 'Size': 8,
+                     'LastModified': '2014-01-09T20:45:49.000Z',
+                     'ETag': '"98bf7d8c15784f0a3d63204441e1e2aa"'},
+                    {'Key': 'foo.txt', 'Size': 8,
+                     'LastModified': '2014-01-09T20:45:49.000Z',
+                     'ETag': '"98bf7d8c15784f0a3d63204441e1e2aa"'},
+                ],
+                'CommonPrefixes': []
+            },
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'},
+        ]
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache_filename = os.path.join(cache_dir, 'checksums.db')
+        with mock.patch('awscli.customizations.s3.syncstrategy.checksum.'
+                        'CHECKSUM_CACHE_FILENAME', cache_filename):
+            self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 2, self.operations_called)
+        self.assertEqual(self.operations_called[1][0].name, 'PutObject')
+        self.assertEqual(self.operations_called[1][1]['Key'], 'bar.txt')
+
+    def get_manifest_filename(self):
+        manifest_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, manifest_dir)
+        return os.path.join(manifest_dir, 'manifest.db')
+
+    def run_initial_manifest_sync(self, manifest):
+        cmdline = (f'{self.prefix} {self.files.rootdir} s3://bucket/prefix/ '
+                   f'--manifest {manifest}')
+        self.parsed_responses = [
+            {'Contents': [], 'CommonPrefixes': []},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'},
+        ]
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            [op[0].name for op in self.operations_called],
+            ['ListObjectsV2', 'PutObject'])
+        self.operations_called = []
+        self.driver = create_clidriver()
+
+    def test_sync_with_manifest_does_not_list_unchanged_destination(self):
+        self.files.create_file(os.path.join('dir', 'foo.txt'), 'contents')
+        manifest = self.get_manifest_filename()
+        self.run_initial_manifest_sync(manifest)
+
+        cmdline = (f'{self.prefix} {self.files.rootdir} s3://bucket/prefix/ '
+                   f'--manifest {manifest}')
+        self.parsed_responses = []
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(self.operations_called, [])
+
+    def test_sync_with_manifest_lists_changed_directories(self):
+        self.files.create_file(os.path.join('dir', 'foo.txt'), 'contents')
+        manifest = self.get_manifest_filename()
+        self.run_initial_manifest_sync(manifest)
+
+        self.files.create_file(os.path.join('dir', 'bar.txt'), 'contents')
+        # Make sure the directory's modification time changed regardless of
+        # the resolution of the filesystem's timestamps.
+        os.utime(os.path.join(self.files.rootdir, 'dir'), ns=(0, 0))
+        cmdline = (f'{self.prefix} {self.files.rootdir} s3://bucket/prefix/ '
+                   f'--manifest {manifest} --size-only')
+        self.parsed_responses = [
+            {'Contents': [
+                {'Key': 'prefix/dir/foo.txt', 'Size': 8,
+                 'LastModified': '2014-01-09T20:45:49.000Z'},
+            ], 'CommonPrefixes': []},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'},
+        ]
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            [op[0].name for op in self.operations_called],
+            ['ListObjectsV2', 'PutObject'])
+        self.assertEqual(self.operations_called[0][1]['Prefix'], 'prefix/dir/')
+        self.assertEqual(self.operations_called[0][1]['Delimiter'], '/')
+        self.assertEqual(
+            self.operations_called[1][1]['Key'], 'prefix/dir/bar.txt')
+
+    def test_sync_with_verify_manifest_lists_whole_destination(self):
+        self.files.create_file(os.path.join('dir', 'foo.txt'), 'contents')
+        manifest = self.get_manifest_filename()
+        self.run_initial_manifest_sync(manifest)
+
+        cmdline = (f'{self.prefix} {self.files.rootdir} s3://bucket/prefix/ '
+                   f'--manifest {manifest} --verify-manifest --delete')
+        self.parsed_responses = [
+            {'Contents': [
+                {'Key': 'prefix/other.txt', 'Size': 8,
+                 'LastModified': '2014-01-09T20:45:49.000Z'},
+            ], 'CommonPrefixes': []},
+            {'ETag': '"c8afdb36c52cf4727836669019e69222"'},
+            {},
+        ]
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            [op[0].name for op in self.operations_called],
+            ['ListObjectsV2', 'PutObject', 'DeleteObject'])
+        self.assertNotIn('Delimiter', self.operations_called[0][1])
+        self.assertEqual(
+            self.operations_called[2][1]['Key'], 'prefix/other.txt')
+
+    def test_manifest_only_supported_for_uploads(self):
+        manifest = self.get_manifest_filename()
+        cmdline = (f'{self.prefix} s3://bucket/ {self.files.rootdir} '
+                   f'--manifest {manifest}')
+        stderr = self.run_cmd(cmdline, expected_rc=255)[1]
+        self.assertIn('Expected manifest parameter', stderr)
+
     def test_copy_with_checksum_algorithm_update_sha1(self):
         cmdline = f'{self.prefix} s3://src-bucket/ s3://dest-bucket/ --checksum-algorithm SHA1'
         self.parsed_responses = [
@@ -699,25 +865,54 @@ class TestSyncCommandWithS3Express(BaseS3TransferCommandTest):
 
     prefix = 's3 sync '
 
-    def test_incompatible_with_sync_upload(self):
-        cmdline = '%s %s s3://testdirectorybucket--usw2-az1--x-s3/' % (self.prefix, self.files.rootdir)
-        stderr = self.run_cmd(cmdline, expected_rc=255)[1]
-        self.assertIn('Cannot use sync command with a directory bucket.', stderr)
-
-    def test_incompatible_with_sync_download(self):
-        cmdline = '%s s3://testdirectorybucket--usw2-az1--x-s3/ %s' % (self.prefix, self.files.rootdir)
-        stderr = self.run_cmd(cmdline, expected_rc=255)[1]
-        self.assertIn('Cannot use sync command with a directory bucket.', stderr)
+    def test_sync_upload_sorts_directory_bucket_listing(self):
+        self.files.create_file('a.txt', 'a')
+        self.files.create_file('b.txt', 'b')
+        self.files.create_file('c.txt', 'c')
+        # Directory buckets do not list keys in lexicographical order.
+        self.parsed_responses = [
+            self.list_objects_response(['c.txt', 'b.txt'], Size=1),
+            {'ETag': '"foo"'},
+        ]
+        cmdline = '%s %s s3://testdirectorybucket--usw2-az1--x-s3/ ' \
+            '--size-only' % (self.prefix, self.files.rootdir)
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 2)
+        self.assertEqual(self.operations_called[0][0].name, 'ListObjectsV2')
+        self.assertEqual(self.operations_called[1][0].name, 'PutObject')
+        self.assertEqual(self.operations_called[1][1]['Key'], 'a.txt')
 
-    def test_incompatible_with_sync_copy(self):
-        cmdline = '%s s3://bucket/ s3://testdirectorybucket--usw2-az1--x-s3/' % self.prefix
-        stderr = self.run_cmd(cmdline, expected_rc=255)[1]
-        self.assertIn('Cannot use sync command with a directory bucket.', stderr)
+    def test_sync_download_sorts_directory_bucket_listing(self):
+        self.files.create_file('b.txt', 'b')
+        self.parsed_responses = [
+            self.list_objects_response(['b.txt', 'a.txt'], Size=1),
+            self.get_object_response(),
+        ]
+        cmdline = '%s s3://testdirectorybucket--usw2-az1--x-s3/ %s ' \
+            '--size-only' % (self.prefix, self.files.rootdir)
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(len(self.operations_called), 2)
+        self.assertEqual(self.operations_called[0][0].name, 'ListObjectsV2')
+        self.assertEqual(self.operations_called[1][0].name, 'GetObject')
+        self.assertEqual(self.operations_called[1][1]['Key'], 'a.txt')
 
-    def test_incompatible_with_sync_with_delete(self):
-        cmdline = '%s s3://bucket/ s3://testdirectorybucket--usw2-az1--x-s3/ --delete' % self.prefix
-        stderr = self.run_cmd(cmdline, expected_rc=255)[1]
-        self.assertIn('Cannot use sync command with a directory bucket.', stderr)
+    def test_sync_with_delete_sorts_directory_bucket_listing(self):
+        self.parsed_responses = [
+            self.list_objects_response(['a.txt']),
+            self.list_objects_response(['c.txt', 'a.txt', 'b.txt']),
+            {},
+            {},
+        ]
+        cmdline = '%s s3://bucket/ s3://testdirectorybucket--usw2-az1--x-s3/ ' \
+            '--size-only --delete' % self.prefix
+        self.run_cmd(cmdline, expected_rc=0)
+        self.assertEqual(
+            [operation.name for operation, _ in self.operations_called],
+            ['ListObjectsV2', 'ListObjectsV2', 'DeleteObject',
+             'DeleteObject'])
+        self.assertEqual(
+            sorted(params['Key'] for _, params in self.operations_called[2:]),
+            ['b.txt', 'c.txt'])
 
     def test_compatible_with_sync_with_local_directory_like_directory_bucket(self):
         self.parsed_responses = [
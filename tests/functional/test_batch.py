@@ -0,0 +1,139 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import io
+import json
+import os
+
+from botocore.session import Session
+
+from awscli.testutils import BaseAWSCommandParamsTest, FileCreator, mock
+
+
+class TestBatchFile(BaseAWSCommandParamsTest):
+    def setUp(self):
+        super().setUp()
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.parsed_response = {'Regions': [{'RegionName': 'us-east-1'}]}
+        create_client = Session.create_client
+        self.clients = []
+
+        def record_client(session, *args, **kwargs):
+            client = create_client(session, *args, **kwargs)
+            self.clients.append(client)
+            return client
+
+        self.create_client = mock.Mock(side_effect=record_client)
+        patch = mock.patch.object(
+            Session,
+            'create_client',
+            lambda session, *args, **kwargs: self.create_client(
+                session, *args, **kwargs),
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def run_batch(self, contents, args=None, expected_rc=0):
+        filename = self.files.create_file('cmds.txt', contents)
+        return self.run_cmd(
+            ['--batch-file', filename] + (args or []), expected_rc)
+
+    def get_request_urls(self):
+        return [
+            call[0][1]['url']
+            for call in self.make_request_patch.target.make_request
+            .call_args_list
+        ]
+
+    def get_created_services(self):
+        return [call[0][1] for call in self.create_client.call_args_list]
+
+    def test_runs_commands(self):
+        stdout, _, _ = self.run_batch(
+            'ec2 describe-regions\n'
+            'ec2 describe-regions --query Regions[].RegionName\n'
+        )
+        decoder = json.JSONDecoder()
+        first, end = decoder.raw_decode(stdout)
+        second, _ = decoder.raw_decode(stdout[end:].lstrip())
+        self.assertEqual(first, self.parsed_response)
+        self.assertEqual(second, ['us-east-1'])
+        self.assertEqual(len(self.get_request_urls()), 2)
+
+    def test_commands_share_connections(self):
+        self.run_batch('ec2 describe-regions\nec2 describe-regions\n')
+        self.assertEqual(self.get_created_services(), ['ec2', 'ec2'])
+        self.assertIsNot(self.clients[0], self.clients[1])
+        self.assertIs(
+            self.clients[0]._endpoint.http_session,
+            self.clients[1]._endpoint.http_session,
+        )
+
+    def test_streaming_outfiles_of_each_line(self):
+        # The outfile of a streaming operation is written by a handler that
+        # the command registers on its own session, so every line needs its
+        # own client.
+        self.parsed_responses = [
+            {'Body': io.BytesIO(b'body-of-k1')},
+            {'Body': io.BytesIO(b'body-of-k2')},
+        ]
+        out1 = os.path.join(self.files.rootdir, 'out1')
+        out2 = os.path.join(self.files.rootdir, 'out2')
+        self.run_batch(
+            f's3api get-object --bucket bkt --key k1 {out1}\n'
+            f's3api get-object --bucket bkt --key k2 {out2}\n'
+        )
+        with open(out1, 'rb') as f:
+            self.assertEqual(f.read(), b'body-of-k1')
+        with open(out2, 'rb') as f:
+            self.assertEqual(f.read(), b'body-of-k2')
+
+    def test_global_arguments_only_apply_to_their_line(self):
+        self.run_batch(
+            'ec2 describe-regions --region us-west-2\n'
+            'ec2 describe-regions\n'
+        )
+        self.assertEqual(self.get_created_services(), ['ec2', 'ec2'])
+        urls = self.get_request_urls()
+        self.assertIn('us-west-2', urls[0])
+        self.assertIn('us-east-1', urls[1])
+
+    def test_shared_global_arguments_apply_to_all_lines(self):
+        self.run_batch(
+            'ec2 describe-regions\nec2 describe-regions\n',
+            ['--region', 'eu-west-1'],
+        )
+        for url in self.get_request_urls():
+            self.assertIn('eu-west-1', url)
+
+    def test_reports_failed_commands(self):
+        _, stderr, _ = self.run_batch(
+            'ec2 describe-regions --unknown-arg\nec2 describe-regions\n',
+            expected_rc=255,
+        )
+        self.assertIn('Unknown options: --unknown-arg', stderr)
+        self.assertIn('Command on line 1 failed with return code 255', stderr)
+        self.assertEqual(len(self.get_request_urls()), 1)
+
+    def test_concurrent_tagged_output(self):
+        stdout, stderr, _ = self.run_batch(
+            'ec2 describe-regions --output text\n'
+            'ec2 describe-regions --output text\n',
+            ['--batch-concurrency', '2', '--batch-output', 'tagged'],
+        )
+        self.assertEqual(
+            sorted(stdout.splitlines()),
+            ['[1] REGIONS\tus-east-1', '[2] REGIONS\tus-east-1'],
+        )
+        self.assertIn('[1] return code: 0', stderr)
+        self.assertIn('[2] return code: 0', stderr)
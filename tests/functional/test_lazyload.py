@@ -0,0 +1,99 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from awscli.handlers import LAZY_CUSTOMIZATIONS
+
+# Runs a command with its requests stubbed out, and prints the
+# customization modules that were imported.
+IMPORTED_MODULES_SCRIPT = """
+import json
+import sys
+from unittest import mock
+
+from botocore.awsrequest import AWSResponse
+
+from awscli.clidriver import create_clidriver
+
+with mock.patch('botocore.endpoint.Endpoint.make_request') as make_request:
+    make_request.return_value = (AWSResponse(None, 200, {}, None), {})
+    rc = create_clidriver().main(sys.argv[1:])
+sys.stdout.write('\\n' + json.dumps({
+    'rc': rc,
+    'modules': [m for m in sys.modules if m.startswith('awscli.')],
+}))
+"""
+
+
+class RecordingEmitter:
+    def __init__(self):
+        self.registrations = set()
+
+    def register(self, event_name, handler, **kwargs):
+        self.registrations.add(('middle', event_name))
+
+    def register_first(self, event_name, handler, **kwargs):
+        self.registrations.add(('first', event_name))
+
+    def register_last(self, event_name, handler, **kwargs):
+        self.registrations.add(('last', event_name))
+
+
+def get_imported_modules(args, tmp_path):
+    env = {
+        'PATH': os.environ.get('PATH', ''),
+        'AWS_ACCESS_KEY_ID': 'access_key',
+        'AWS_SECRET_ACCESS_KEY': 'secret_key',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'AWS_CONFIG_FILE': str(tmp_path / 'config'),
+        'AWS_SHARED_CREDENTIALS_FILE': str(tmp_path / 'credentials'),
+        'HOME': str(tmp_path),
+    }
+    output = subprocess.check_output(
+        [sys.executable, '-c', IMPORTED_MODULES_SCRIPT] + args, env=env
+    )
+    result = json.loads(output.decode('utf-8').splitlines()[-1])
+    assert result['rc'] == 0
+    return set(result['modules'])
+
+
+def get_services(customization):
+    return {event.split('.')[1] for _, event in customization.registrations}
+
+
+@pytest.mark.parametrize('customization', LAZY_CUSTOMIZATIONS, ids=repr)
+def test_lazy_customization_declares_its_events(customization):
+    emitter = RecordingEmitter()
+    customization.get_register_function()(emitter)
+    assert emitter.registrations == set(customization.registrations)
+
+
+def test_service_command_does_not_import_other_customizations(tmp_path):
+    imported_modules = get_imported_modules(
+        ['ec2', 'describe-regions'], tmp_path
+    )
+    unrelated_modules = {
+        customization.module_name
+        for customization in LAZY_CUSTOMIZATIONS
+        if 'ec2' not in get_services(customization)
+    }
+    assert 'awscli.customizations.emr.emr' in unrelated_modules
+    assert 'awscli.customizations.cloudformation' in unrelated_modules
+    assert 'awscli.customizations.datapipeline' in unrelated_modules
+    assert not imported_modules & unrelated_modules
+    assert 'awscli.customizations.toplevelbool' in imported_modules
@@ -0,0 +1,136 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import subprocess
+import sys
+import time
+
+from awscli.testutils import FileCreator, skip_if_windows, unittest
+
+AWS_CMD = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__)))),
+    'bin',
+    'aws',
+)
+
+
+@skip_if_windows('The CLI server requires Unix domain sockets.')
+class TestCLIServer(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.config_file = self.files.create_file(
+            'config', '[default]\nregion = us-west-2\n')
+        self.files.create_file(
+            os.path.join('.aws', 'cli', 'alias'),
+            '[toplevel]\n'
+            'mycat = !cat\n'
+            'mypwd = !pwd\n'
+            'myenv = !printenv MY_VARIABLE\n',
+        )
+        self.socket_path = os.path.join(self.files.rootdir, 'aws.sock')
+        self.log_file = os.path.join(self.files.rootdir, 'server.log')
+        self.env = {
+            'PATH': os.environ.get('PATH', ''),
+            'HOME': self.files.rootdir,
+            'AWS_CONFIG_FILE': self.config_file,
+            'AWS_SHARED_CREDENTIALS_FILE': os.path.join(
+                self.files.rootdir, 'credentials'),
+            'AWS_CLI_SERVER_SOCKET': self.socket_path,
+        }
+        self.start_server()
+
+    def start_server(self):
+        with open(self.log_file, 'w') as log:
+            self.server = subprocess.Popen(
+                [sys.executable, '-m', 'awscli.server',
+                 '--preload-services', '--debug'],
+                env=self.env, stdout=log, stderr=log,
+            )
+        self.addCleanup(self.stop_server)
+        self.wait_for_log('CLI server listening')
+
+    def stop_server(self):
+        self.server.terminate()
+        self.server.wait()
+
+    def read_log(self):
+        with open(self.log_file) as f:
+            return f.read()
+
+    def wait_for_log(self, text, count=1):
+        for _ in range(600):
+            if self.read_log().count(text) >= count:
+                return
+            if self.server.poll() is not None:
+                self.fail('CLI server stopped: %s' % self.read_log())
+            time.sleep(0.1)
+        self.fail('%r not logged by CLI server: %s' % (text, self.read_log()))
+
+    def run_aws(self, args, input_data=b'', env=None, cwd=None):
+        return subprocess.run(
+            [sys.executable, AWS_CMD] + args,
+            input=input_data,
+            capture_output=True,
+            env=env or self.env,
+            cwd=cwd,
+        )
+
+    def test_runs_command_in_server(self):
+        result = self.run_aws(['configure', 'get', 'region'])
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'us-west-2\n')
+        self.assertIn('Running command in process', self.read_log())
+
+    def test_forwards_environment(self):
+        env = dict(self.env, MY_VARIABLE='foo')
+        result = self.run_aws(['myenv'], env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'foo\n')
+
+    def test_forwards_stdin(self):
+        result = self.run_aws(['mycat'], input_data=b'foo\nbar\n')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'foo\nbar\n')
+
+    def test_forwards_working_directory(self):
+        cwd = self.files.create_file(os.path.join('cwd', 'file'), '')
+        cwd = os.path.dirname(cwd)
+        result = self.run_aws(['mypwd'], cwd=cwd)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(
+            os.path.realpath(result.stdout.decode().strip()),
+            os.path.realpath(cwd),
+        )
+
+    def test_returns_errors(self):
+        result = self.run_aws(['not-a-command'])
+        self.assertEqual(result.returncode, 2)
+        self.assertIn(b'Invalid choice', result.stderr)
+
+    def test_reloads_when_config_changes(self):
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns,
+                                       stat.st_mtime_ns + 10 ** 9))
+        self.wait_for_log('CLI server listening', count=2)
+        self.assertIn('Reloading the CLI server', self.read_log())
+        result = self.run_aws(['configure', 'get', 'region'])
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'us-west-2\n')
+
+    def test_runs_command_without_server(self):
+        self.stop_server()
+        result = self.run_aws(['configure', 'get', 'region'])
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, b'us-west-2\n')
@@ -80,3 +80,82 @@ def compare_files(self, result_file, ref_file):
     self.assertEqual(result_file.src_type, ref_file.src_type)
     self.assertEqual(result_file.dest_type, ref_file.dest_type)
     self.assertEqual(result_file.operation_name, ref_file.operation_name)
+
+
+class FakeListObjectsV2Client(object):
+    """A client that serves ListObjectsV2 requests from a list of keys
+
+    It understands the ``Prefix``, ``Delimiter``, ``StartAfter`` and
+    ``MaxKeys`` parameters and records every request made so tests can
+    make assertions about how a bucket was listed.
+    """
+    def __init__(self, keys, max_keys=1000):
+        self.keys = sorted(keys)
+        self.max_keys = max_keys
+        self.requests = []
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter=None,
+                        StartAfter=None, MaxKeys=None,
+                        ContinuationToken=None, **kwargs):
+        self.requests.append({
+            'Bucket': Bucket, 'Prefix': Prefix, 'Delimiter': Delimiter,
+            'StartAfter': StartAfter, 'ContinuationToken': ContinuationToken,
+        })
+        max_keys = MaxKeys or self.max_keys
+        if ContinuationToken is not None:
+            StartAfter = ContinuationToken
+        contents = []
+        common_prefixes = []
+        is_truncated = False
+        last_key = None
+        for key in self.keys:
+            if not key.startswith(Prefix):
+                continue
+            if StartAfter is not None and key <= StartAfter:
+                continue
+            if len(contents) + len(common_prefixes) >= max_keys:
+                is_truncated = True
+                break
+            if Delimiter and Delimiter in key[len(Prefix):]:
+                remainder = key[len(Prefix):]
+                common_prefix = (
+                    Prefix + remainder[:remainder.index(Delimiter) + 1])
+                if common_prefix not in common_prefixes:
+                    common_prefixes.append(common_prefix)
+                last_key = key
+                continue
+            contents.append({
+                'Key': key, 'Size': len(key),
+                'LastModified': '2014-02-27T04:20:38.000Z',
+            })
+            last_key = key
+        response = {
+            'Contents': contents,
+            'IsTruncated': is_truncated,
+        }
+        if common_prefixes:
+            response['CommonPrefixes'] = [
+                {'Prefix': p} for p in common_prefixes
+            ]
+        if is_truncated:
+            response['NextContinuationToken'] = last_key
+        return response
+
+    def get_paginator(self, operation_name):
+        return FakeListObjectsV2Paginator(self)
+
+
+class FakeListObjectsV2Paginator(object):
+    def __init__(self, client):
+        self._client = client
+
+    def paginate(self, PaginationConfig=None, **kwargs):
+        page_size = (PaginationConfig or {}).get('PageSize')
+        if page_size:
+            kwargs['MaxKeys'] = page_size
+        while True:
+            response = self._client.list_objects_v2(**kwargs)
+            yield response
+            if not response['IsTruncated']:
+                return
+            kwargs['ContinuationToken'] = response['NextContinuationToken']
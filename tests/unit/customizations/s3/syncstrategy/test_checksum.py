@@ -0,0 +1,277 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import datetime
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from awscli.customizations.s3.filegenerator import FileStat
+from awscli.customizations.s3.syncstrategy.checksum import (
+    ChecksumCache, ChecksumSync, LocalFileHasher, MB
+)
+
+from awscli.testutils import FileCreator, mock, unittest
+
+
+def md5_etag(contents):
+    return '"%s"' % hashlib.md5(contents).hexdigest()
+
+
+def multipart_etag(contents, part_size):
+    digests = b''.join(
+        hashlib.md5(contents[i:i + part_size]).digest()
+        for i in range(0, len(contents), part_size))
+    num_parts = (len(contents) + part_size - 1) // part_size
+    return '"%s-%s"' % (hashlib.md5(digests).hexdigest(), num_parts)
+
+
+class TestChecksumSync(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.cache_filename = os.path.join(self.files.rootdir, 'cache.db')
+        self.sync_strategy = ChecksumSync(cache_filename=self.cache_filename)
+        self.addCleanup(self.sync_strategy.close)
+        self.contents = b'my contents'
+        self.local_path = self.files.create_file(
+            'foo.txt', self.contents, mode='wb')
+        self.time_src = datetime.datetime.now()
+        self.time_dst = self.time_src - datetime.timedelta(days=1)
+
+    def upload_file_stats(self, etag, size=None):
+        if size is None:
+            size = len(self.contents)
+        src_file = FileStat(src=self.local_path, dest='bucket/foo.txt',
+                            compare_key='foo.txt', size=size,
+                            last_update=self.time_src, src_type='local',
+                            dest_type='s3', operation_name='upload')
+        dest_file = FileStat(src='bucket/foo.txt', dest='',
+                             compare_key='foo.txt', size=len(self.contents),
+                             last_update=self.time_dst, src_type='s3',
+                             dest_type='local', operation_name='',
+                             etag=etag)
+        return src_file, dest_file
+
+    def download_file_stats(self, etag):
+        src_file = FileStat(src='bucket/foo.txt', dest=self.local_path,
+                            compare_key='foo.txt', size=len(self.contents),
+                            last_update=self.time_dst, src_type='s3',
+                            dest_type='local', operation_name='download',
+                            etag=etag)
+        dest_file = FileStat(src=self.local_path, dest='',
+                             compare_key='foo.txt', size=len(self.contents),
+                             last_update=self.time_src, src_type='local',
+                             dest_type='s3', operation_name='')
+        return src_file, dest_file
+
+    def test_upload_same_checksum_newer_file(self):
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(md5_etag(self.contents)))
+        self.assertFalse(should_sync)
+
+    def test_upload_different_checksum(self):
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(md5_etag(b'my_contents')))
+        self.assertTrue(should_sync)
+
+    def test_upload_different_size(self):
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(md5_etag(self.contents), size=1))
+        self.assertTrue(should_sync)
+
+    def test_download_same_checksum(self):
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.download_file_stats(md5_etag(self.contents)))
+        self.assertFalse(should_sync)
+
+    def test_download_different_checksum(self):
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.download_file_stats(md5_etag(b'my_contents')))
+        self.assertTrue(should_sync)
+
+    def test_falls_back_to_last_modified_without_etag(self):
+        # The source file is newer than the destination.
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(None))
+        self.assertTrue(should_sync)
+
+    def test_falls_back_to_last_modified_with_unknown_etag(self):
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats('"not-an-md5"'))
+        self.assertTrue(should_sync)
+
+    def test_copy_compares_etags(self):
+        src_file, dest_file = self.upload_file_stats(
+            md5_etag(self.contents))
+        src_file.operation_name = 'copy'
+        src_file.etag = md5_etag(self.contents)
+        self.assertFalse(
+            self.sync_strategy.determine_should_sync(src_file, dest_file))
+        src_file.etag = md5_etag(b'other')
+        self.assertTrue(
+            self.sync_strategy.determine_should_sync(src_file, dest_file))
+
+    def test_multipart_etag(self):
+        self.contents = os.urandom(9 * MB)
+        self.local_path = self.files.create_file(
+            'large.bin', self.contents, mode='wb')
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(multipart_etag(self.contents, 8 * MB)))
+        self.assertFalse(should_sync)
+
+    def test_multipart_etag_with_non_default_part_size(self):
+        self.contents = os.urandom(9 * MB)
+        self.local_path = self.files.create_file(
+            'large.bin', self.contents, mode='wb')
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(multipart_etag(self.contents, 3 * MB)))
+        self.assertFalse(should_sync)
+
+    def test_multipart_etag_with_configured_part_size(self):
+        # The guess from the number of parts would be 13 MiB.
+        self.contents = b'a' * (64 * MB + 1)
+        self.local_path = self.files.create_file(
+            'large.bin', self.contents, mode='wb')
+        self.assertIs(
+            self.sync_strategy.use_sync_strategy(
+                {'checksum': True},
+                runtime_config={'multipart_chunksize': 16 * MB}),
+            self.sync_strategy)
+        should_sync = self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(multipart_etag(self.contents, 16 * MB)))
+        self.assertFalse(should_sync)
+
+    def test_guessed_part_size_mismatch_is_not_compared(self):
+        self.contents = os.urandom(9 * MB)
+        self.local_path = self.files.create_file(
+            'large.bin', self.contents, mode='wb')
+        file_stats = self.upload_file_stats(
+            multipart_etag(os.urandom(9 * MB), 3 * MB))
+        self.assertIsNone(self.sync_strategy.compare_checksum(*file_stats))
+
+    def test_checksums_are_cached_across_runs(self):
+        self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(md5_etag(self.contents)))
+        sync_strategy = ChecksumSync(cache_filename=self.cache_filename)
+        with mock.patch.object(LocalFileHasher, '_calculate_etag') as hash_mock:
+            should_sync = sync_strategy.determine_should_sync(
+                *self.upload_file_stats(md5_etag(self.contents)))
+        self.assertFalse(should_sync)
+        self.assertFalse(hash_mock.called)
+
+    def test_prepared_files_are_hashed_in_background(self):
+        file_stats = self.upload_file_stats(md5_etag(self.contents))
+        self.sync_strategy.prepare_should_sync(*file_stats)
+        hasher = self.sync_strategy._get_hasher()
+        self.assertIn((self.local_path, 0), hasher._pending)
+        self.assertFalse(self.sync_strategy.determine_should_sync(*file_stats))
+        self.assertEqual(hasher._pending, {})
+
+    def test_different_size_is_not_prepared(self):
+        self.sync_strategy.prepare_should_sync(
+            *self.upload_file_stats(md5_etag(self.contents), size=1))
+        self.assertIsNone(self.sync_strategy._hasher)
+
+    def test_close_closes_hasher(self):
+        self.sync_strategy.determine_should_sync(
+            *self.upload_file_stats(md5_etag(self.contents)))
+        hasher = self.sync_strategy._hasher
+        with mock.patch.object(hasher, 'close') as close_mock:
+            self.sync_strategy.close()
+        close_mock.assert_called_with()
+        self.assertIsNone(self.sync_strategy._hasher)
+
+
+class TestLocalFileHasher(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+        self.cache = ChecksumCache(
+            os.path.join(self.files.rootdir, 'cache.db'))
+        self.addCleanup(self.cache.close)
+        self.hasher = LocalFileHasher(self.executor, self.cache)
+
+    def test_get_etag(self):
+        path = self.files.create_file('foo', b'foo', mode='wb')
+        self.assertEqual(
+            self.hasher.get_etag(path), hashlib.md5(b'foo').hexdigest())
+
+    def test_get_multipart_etag(self):
+        contents = b'a' * 10 + b'b' * 10 + b'c' * 5
+        path = self.files.create_file('foo', contents, mode='wb')
+        self.assertEqual(
+            self.hasher.get_etag(path, part_size=10),
+            multipart_etag(contents, 10).strip('"'))
+
+    def test_modified_file_is_rehashed(self):
+        path = self.files.create_file('foo', b'foo', mode='wb')
+        self.hasher.get_etag(path)
+        with open(path, 'wb') as f:
+            f.write(b'bar')
+        stat_result = os.stat(path)
+        os.utime(path, ns=(stat_result.st_atime_ns,
+                           stat_result.st_mtime_ns + 10 ** 9))
+        self.assertEqual(
+            self.hasher.get_etag(path), hashlib.md5(b'bar').hexdigest())
+
+    def test_prefetch(self):
+        contents = b'a' * 10 + b'b' * 10 + b'c' * 5
+        path = self.files.create_file('foo', contents, mode='wb')
+        self.hasher.prefetch(path)
+        self.hasher.prefetch(path, part_size=10)
+        self.assertEqual(
+            self.hasher.get_etag(path), hashlib.md5(contents).hexdigest())
+        self.assertEqual(
+            self.hasher.get_etag(path, part_size=10),
+            multipart_etag(contents, 10).strip('"'))
+
+    def test_prefetch_errors_are_raised_by_get_etag(self):
+        path = os.path.join(self.files.rootdir, 'missing')
+        self.hasher.prefetch(path)
+        with self.assertRaises(OSError):
+            self.hasher.get_etag(path)
+
+    def test_close(self):
+        executor = mock.Mock()
+        cache = mock.Mock()
+        LocalFileHasher(executor, cache).close()
+        executor.shutdown.assert_called_with(wait=True, cancel_futures=True)
+        cache.close.assert_called_with()
+
+
+class TestChecksumCache(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+
+    def test_persists_checksums(self):
+        filename = os.path.join(self.files.rootdir, 'nested', 'cache.db')
+        cache = ChecksumCache(filename)
+        cache.set('/foo', 0, (1, 2, 3), 'etag')
+        cache.close()
+        cache = ChecksumCache(filename)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.get('/foo', 0, (1, 2, 3)), 'etag')
+        self.assertIsNone(cache.get('/foo', 0, (1, 2, 4)))
+        self.assertIsNone(cache.get('/foo', 5, (1, 2, 3)))
+
+    def test_falls_back_to_memory(self):
+        cache = ChecksumCache(self.files.rootdir)
+        cache.set('/foo', 0, (1, 2, 3), 'etag')
+        self.assertEqual(cache.get('/foo', 0, (1, 2, 3)), 'etag')
+
+
+if __name__ == "__main__":
+    unittest.main()
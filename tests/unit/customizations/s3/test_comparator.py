@@ -24,6 +24,10 @@ class ComparatorTest(unittest.TestCase):
         self.sync_strategy = mock.Mock()
         self.not_at_src_sync_strategy = mock.Mock()
         self.not_at_dest_sync_strategy = mock.Mock()
+        for sync_strategy in (self.sync_strategy,
+                              self.not_at_src_sync_strategy,
+                              self.not_at_dest_sync_strategy):
+            sync_strategy.lookahead = 0
         self.comparator = Comparator(self.sync_strategy,
                                      self.not_at_dest_sync_strategy,
                                      self.not_at_src_sync_strategy)
@@ -230,6 +234,40 @@ class ComparatorTest(unittest.TestCase):
             result_list.append(filename)
         self.assertEqual(result_list, ref_list)
 
+    def test_prepares_upcoming_files_with_lookahead(self):
+        calls = []
+        self.sync_strategy.lookahead = 2
+        self.sync_strategy.prepare_should_sync.side_effect = (
+            lambda src_file, dest_file: calls.append(
+                ('prepare', src_file.compare_key)))
+        self.sync_strategy.determine_should_sync.side_effect = (
+            lambda src_file, dest_file: calls.append(
+                ('determine', src_file.compare_key)) or True)
+        self.not_at_dest_sync_strategy.determine_should_sync.return_value = \
+            True
+        time = datetime.datetime.now()
+        keys = ['a', 'b', 'c', 'd']
+        src_files = [
+            FileStat(src=key, dest='', compare_key=key, size=10,
+                     last_update=time, src_type='local', dest_type='s3',
+                     operation_name='upload')
+            for key in keys
+        ]
+        dest_files = [
+            FileStat(src=key, dest='', compare_key=key, size=10,
+                     last_update=time, src_type='s3', dest_type='local',
+                     operation_name='')
+            for key in keys[:3]
+        ]
+        files = self.comparator.call(iter(src_files), iter(dest_files))
+        self.assertEqual(list(files), src_files)
+        self.assertEqual(calls, [
+            ('prepare', 'a'), ('prepare', 'b'), ('prepare', 'c'),
+            ('determine', 'a'), ('determine', 'b'), ('determine', 'c'),
+        ])
+        self.assertFalse(self.not_at_dest_sync_strategy.prepare_should_sync
+                         .called)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,124 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+from botocore.hooks import HierarchicalEmitter
+from s3transfer.upload import PutObjectTask
+
+from awscli.customizations.s3.concurrency import AdaptiveConcurrencyController
+from awscli.customizations.s3.concurrency import AdaptiveConcurrencyExecutor
+from awscli.testutils import mock, unittest
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveConcurrencyController(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = AdaptiveConcurrencyController(
+            initial_limit=4, max_limit=8, clock=self.clock)
+
+    def run_interval(self, num_bytes, latency=0.1, throttled=0):
+        # Reaches the limit, and the last request completes as the
+        # interval ends.
+        num_requests = self.controller.limit
+        for _ in range(num_requests):
+            self.controller.acquire()
+        self.controller.record_bytes(num_bytes)
+        for _ in range(throttled):
+            self.controller.record_throttling()
+        for _ in range(num_requests - 1):
+            self.controller.release(latency)
+        self.clock.now += 1
+        self.controller.release(latency)
+
+    def test_increases_limit_while_throughput_keeps_up(self):
+        self.run_interval(100)
+        self.assertEqual(self.controller.limit, 5)
+        self.run_interval(120)
+        self.assertEqual(self.controller.limit, 6)
+
+    def test_does_not_exceed_max_limit(self):
+        for _ in range(10):
+            self.run_interval(100)
+        self.assertEqual(self.controller.limit, 8)
+
+    def test_does_not_increase_limit_that_is_not_reached(self):
+        self.controller.acquire()
+        self.controller.record_bytes(100)
+        self.clock.now += 1
+        self.controller.release(0.1)
+        self.assertEqual(self.controller.limit, 4)
+
+    def test_halves_limit_when_throttled(self):
+        self.run_interval(100, throttled=2)
+        self.assertEqual(self.controller.limit, 2)
+        self.run_interval(100, throttled=1)
+        self.run_interval(100, throttled=1)
+        self.assertEqual(self.controller.limit, 1)
+
+    def test_decreases_limit_when_latency_grows_without_throughput(self):
+        self.run_interval(100)
+        self.assertEqual(self.controller.limit, 5)
+        self.run_interval(50, latency=0.5)
+        self.assertEqual(self.controller.limit, 4)
+
+    def test_only_adjusts_once_per_interval(self):
+        self.run_interval(100)
+        self.controller.record_throttling()
+        self.assertEqual(self.controller.limit, 5)
+
+    def test_detects_throttling_from_retries(self):
+        emitter = HierarchicalEmitter()
+        self.controller.register(emitter)
+        http_response = mock.Mock(status_code=503)
+        emitter.emit(
+            'needs-retry.s3.PutObject',
+            response=(http_response, {'Error': {'Code': 'SlowDown'}}))
+        http_response = mock.Mock(status_code=200)
+        emitter.emit('needs-retry.s3.PutObject', response=(http_response, {}))
+        emitter.emit('needs-retry.s3.PutObject', response=None)
+        self.run_interval(100)
+        self.assertEqual(self.controller.limit, 2)
+
+    def test_run_waits_for_limit(self):
+        controller = AdaptiveConcurrencyController(
+            initial_limit=1, max_limit=1, clock=self.clock)
+        self.assertEqual(controller.run(lambda x: x * 2, 2), 4)
+
+
+class TestAdaptiveConcurrencyExecutor(unittest.TestCase):
+    def setUp(self):
+        self.controller = mock.Mock(AdaptiveConcurrencyController)
+        self.controller.run.side_effect = lambda fn, *args: fn(*args)
+        self.executor = AdaptiveConcurrencyExecutor(2, self.controller)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_limits_request_tasks(self):
+        task = mock.Mock(PutObjectTask, return_value='result')
+        future = self.executor.submit(task, 'context')
+        self.assertEqual(future.result(), 'result')
+        self.controller.run.assert_called_with(task, 'context')
+
+    def test_does_not_limit_other_tasks(self):
+        future = self.executor.submit(lambda: 'result')
+        self.assertEqual(future.result(), 'result')
+        self.assertFalse(self.controller.run.called)
+
+
+if __name__ == "__main__":
+    unittest.main()
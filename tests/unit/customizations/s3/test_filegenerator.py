@@ -10,6 +10,7 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import datetime
 import os
 import platform
 from awscli.testutils import mock, unittest, FileCreator, BaseAWSCommandParamsTest
@@ -20,12 +21,14 @@ import shutil
 import socket
 
 from botocore.exceptions import ClientError
+from dateutil.tz import tzutc
 
 from awscli.customizations.s3.filegenerator import FileGenerator, \
     FileDecodingError, FileStat, is_special_file, is_readable
+from awscli.customizations.s3.filters import Filter
 from awscli.customizations.s3.utils import get_file_stat, EPOCH_TIME
 from tests.unit.customizations.s3 import make_loc_files, clean_loc_files, \
-    compare_files
+    compare_files, FakeListObjectsV2Client
 
 
 @skip_if_windows('Special files only supported on mac/linux')
@@ -383,7 +386,8 @@ class TestListFilesLocally(unittest.TestCase):
     def tearDown(self):
         shutil.rmtree(self.directory)
 
-    @mock.patch('os.listdir')
+    @mock.patch(
+        'awscli.customizations.s3.filegenerator._iter_directory_names')
     def test_error_raised_on_decoding_error(self, listdir_mock):
         # On Python3, sys.getdefaultencoding
         file_generator = FileGenerator(None, None, None)
@@ -414,6 +418,21 @@ class TestListFilesLocally(unittest.TestCase):
                                key=lambda items: items.replace(os.sep, '/')))
         self.assertEqual(values, ref_vals)
 
+    def test_list_files_larger_than_sort_buffer_is_in_sorted_order(self):
+        p = os.path.join
+        for i in range(10):
+            open(p(self.directory, 'test-%d.txt' % (9 - i)), 'w').close()
+        os.mkdir(p(self.directory, 'test'))
+        open(p(self.directory, 'test', 'foo.txt'), 'w').close()
+
+        file_generator = FileGenerator(None, None, None, sort_buffer_size=3)
+        values = list(el[0] for el in file_generator.list_files(
+            self.directory, dir_op=True))
+        ref_vals = list(sorted(values,
+                               key=lambda items: items.replace(os.sep, '/')))
+        self.assertEqual(len(values), 11)
+        self.assertEqual(values, ref_vals)
+
     @mock.patch('awscli.customizations.s3.filegenerator.get_file_stat')
     def test_list_files_with_invalid_timestamp(self, stat_mock):
         stat_mock.return_value = 9, None
@@ -452,6 +471,115 @@ class TestListFilesLocally(unittest.TestCase):
         self.assertEqual(values, expected_order)
 
 
+class TestWalkFilesLocally(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.root = self.files.rootdir
+        for filename in ['a', 'a\u0300', 'a\u0300-1', 'z', '\u00e6',
+                         os.path.join('a\u0300a', 'a'),
+                         os.path.join('a\u0300a', 'z'),
+                         os.path.join('test', 'foo.txt'),
+                         os.path.join('test', 'nested', 'deep', 'bar.txt'),
+                         'test-123.txt', 'test123.txt']:
+            self.files.create_file(filename, contents=filename)
+        os.mkdir(os.path.join(self.root, 'empty'))
+
+    def tearDown(self):
+        self.files.remove_all()
+
+    def list_files(self, max_walk_concurrency, follow_symlinks=True):
+        file_gen = FileGenerator(
+            None, '', follow_symlinks,
+            max_walk_concurrency=max_walk_concurrency)
+        listed = list(file_gen.list_files(self.root, dir_op=True))
+        warnings = []
+        while not file_gen.result_queue.empty():
+            warnings.append(file_gen.result_queue.get().message)
+        return listed, warnings
+
+    def test_walk_matches_list_files(self):
+        expected, _ = self.list_files(max_walk_concurrency=1)
+        self.assertEqual(self.list_files(max_walk_concurrency=4),
+                         (expected, []))
+        self.assertEqual(len(expected), 11)
+
+    def test_walk_with_limited_lookahead(self):
+        expected, _ = self.list_files(max_walk_concurrency=1)
+        self.assertEqual(self.list_files(max_walk_concurrency=2)[0],
+                         expected)
+
+    def test_walk_returns_size_and_last_update(self):
+        listed, _ = self.list_files(max_walk_concurrency=4)
+        for path, extra_information in listed:
+            size, last_update = get_file_stat(path)
+            self.assertEqual(extra_information['Size'], size)
+            self.assertEqual(extra_information['LastModified'], last_update)
+
+    @skip_if_windows('Symlink tests only supported on mac/linux')
+    def test_walk_symlinks(self):
+        os.symlink(os.path.join(self.root, 'test'),
+                   os.path.join(self.root, 'linked-dir'))
+        os.symlink(os.path.join(self.root, 'z'),
+                   os.path.join(self.root, 'linked-file'))
+        os.symlink('does-not-exist', os.path.join(self.root, 'broken'))
+        for follow_symlinks in [True, False]:
+            expected = self.list_files(1, follow_symlinks)
+            self.assertEqual(self.list_files(4, follow_symlinks), expected)
+        _, warnings = self.list_files(4, follow_symlinks=True)
+        self.assertEqual(
+            warnings,
+            ['warning: Skipping file %s. File does not exist.' %
+             os.path.join(self.root, 'broken')])
+        _, warnings = self.list_files(4, follow_symlinks=False)
+        self.assertEqual(warnings, [])
+
+    @skip_if_windows('Special files only supported on mac/linux')
+    def test_walk_skips_special_files(self):
+        file_path = os.path.join(self.root, 'sock')
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(sock.close)
+        sock.bind(file_path)
+        listed, warnings = self.list_files(max_walk_concurrency=4)
+        self.assertNotIn(file_path, [path for path, _ in listed])
+        self.assertEqual(
+            warnings,
+            ['warning: Skipping file %s. File is character special device, '
+             'block special device, FIFO, or socket.' % file_path])
+
+    def test_walk_skips_unreadable_files(self):
+        file_path = os.path.join(self.root, 'z')
+        with mock.patch('os.access', return_value=False):
+            listed, warnings = self.list_files(max_walk_concurrency=4)
+        self.assertNotIn(file_path, [path for path, _ in listed])
+        self.assertIn(
+            'warning: Skipping file %s. File/Directory is not readable.' %
+            file_path, warnings)
+
+    @mock.patch('awscli.customizations.s3.filegenerator.'
+                'get_file_stat_from_stat_result')
+    def test_walk_with_invalid_timestamp(self, stat_mock):
+        stat_mock.return_value = 9, None
+        listed, warnings = self.list_files(max_walk_concurrency=4)
+        self.assertIs(listed[0][1]['LastModified'], EPOCH_TIME)
+        self.assertEqual(len(warnings), len(listed))
+
+    def test_walk_skips_excluded_directories(self):
+        file_filter = Filter(
+            [['exclude', 'test/*'], ['include', 'test/foo.txt']],
+            self.root, 'bucket/')
+        for max_walk_concurrency in [1, 4]:
+            file_gen = FileGenerator(
+                None, '', max_walk_concurrency=max_walk_concurrency,
+                file_filter=file_filter)
+            listed = [path for path, _ in
+                      file_gen.list_files(self.root, dir_op=True)]
+            self.assertIn(os.path.join(self.root, 'test', 'foo.txt'), listed)
+            self.assertNotIn(
+                os.path.join(self.root, 'test', 'nested', 'deep', 'bar.txt'),
+                listed)
+            self.assertIn(os.path.join(self.root, 'z'), listed)
+
+
 class TestNormalizeSort(unittest.TestCase):
     def test_normalize_sort(self):
         names = ['xyz123456789',
@@ -645,5 +773,132 @@ class S3FileGeneratorTest(BaseAWSCommandParamsTest):
             compare_files(self, result_list[i], ref_list[i])
 
 
+class TestFileStat(unittest.TestCase):
+    def test_last_update_is_parsed_when_accessed(self):
+        file_stat = FileStat(src='bucket/key',
+                             last_update='2014-01-09T20:45:49.000Z')
+        self.assertEqual(
+            file_stat.last_update,
+            datetime.datetime(2014, 1, 9, 20, 45, 49, tzinfo=tzutc()))
+        self.assertIs(file_stat.last_update, file_stat.last_update)
+
+    def test_raw_last_update_is_not_parsed(self):
+        file_stat = FileStat(src='bucket/key',
+                             last_update='2014-01-09T20:45:49.000Z')
+        self.assertEqual(
+            file_stat.raw_last_update, '2014-01-09T20:45:49.000Z')
+
+    def test_last_update_datetime_is_unchanged(self):
+        last_update = datetime.datetime.now()
+        file_stat = FileStat(src='file', last_update=last_update)
+        self.assertIs(file_stat.last_update, last_update)
+
+    def test_s3_listing_defers_parsing_last_modified(self):
+        client = FakeListObjectsV2Client(['a'])
+        file_stats = list(FileGenerator(client, '').call({
+            'src': {'path': 'bucket/', 'type': 's3'},
+            'dest': {'path': 'dir' + os.sep, 'type': 'local'},
+            'dir_op': True, 'use_src_name': True
+        }))
+        self.assertIsInstance(
+            file_stats[0].response_data['LastModified'], str)
+        self.assertIsInstance(
+            file_stats[0].last_update, datetime.datetime)
+
+    def test_has_no_instance_dict(self):
+        file_stat = FileStat(src='file')
+        with self.assertRaises(AttributeError):
+            file_stat.unknown_attribute = 'value'
+
+
+class TestListObjectsConcurrently(unittest.TestCase):
+    def setUp(self):
+        self.keys = [
+            'a/1.txt', 'a/2.txt', 'b/1.txt', 'b/c/1.txt', 'c.txt', 'd/1.txt'
+        ]
+        self.client = FakeListObjectsV2Client(self.keys)
+        self.input_s3_dir = {
+            'src': {'path': 'bucket/', 'type': 's3'},
+            'dest': {'path': 'dir' + os.sep, 'type': 'local'},
+            'dir_op': True, 'use_src_name': True
+        }
+
+    def test_concurrent_listing_matches_serial_listing(self):
+        serial = FileGenerator(self.client, '').call(self.input_s3_dir)
+        serial_keys = [file_stat.compare_key for file_stat in serial]
+        self.assertEqual(serial_keys, self.keys)
+
+        concurrent = FileGenerator(
+            self.client, '', max_list_concurrency=3).call(self.input_s3_dir)
+        self.assertEqual(
+            [file_stat.compare_key for file_stat in concurrent], serial_keys)
+
+    def test_default_does_not_probe_prefix(self):
+        list(FileGenerator(self.client, '').call(self.input_s3_dir))
+        self.assertEqual(len(self.client.requests), 1)
+        self.assertIsNone(self.client.requests[0]['Delimiter'])
+
+    def test_concurrent_listing_probes_prefix(self):
+        list(FileGenerator(self.client, '', max_list_concurrency=3).call(
+            self.input_s3_dir))
+        self.assertEqual(self.client.requests[0]['Delimiter'], '/')
+
+    def test_filter_limits_listed_prefixes(self):
+        file_filter = Filter(
+            [['exclude', '*'], ['include', 'b/*'], ['include', 'd/*']],
+            'bucket/', 'dir' + os.sep)
+        listed = FileGenerator(
+            self.client, '', file_filter=file_filter).call(self.input_s3_dir)
+        self.assertEqual(
+            [file_stat.compare_key for file_stat in listed],
+            ['b/1.txt', 'b/c/1.txt', 'd/1.txt'])
+        self.assertEqual(
+            [request['Prefix'] for request in self.client.requests],
+            ['b/', 'd/'])
+
+
+class TestListDirectoryBucket(unittest.TestCase):
+    def setUp(self):
+        self.bucket = 'bucket--usw2-az1--x-s3'
+        self.keys = ['b/1.txt', 'a/2.txt', 'c.txt', 'a/1.txt']
+        self.client = mock.Mock()
+        self.paginator = self.client.get_paginator.return_value
+        self.paginator.paginate.return_value = [
+            {'Contents': [
+                {'Key': key, 'Size': 1,
+                 'LastModified': '2014-01-09T20:45:49.000Z'}
+                for key in self.keys]}
+        ]
+        self.input_s3_dir = {
+            'src': {'path': self.bucket + '/', 'type': 's3'},
+            'dest': {'path': 'dir' + os.sep, 'type': 'local'},
+            'dir_op': True, 'use_src_name': True
+        }
+
+    def list_compare_keys(self, **kwargs):
+        file_generator = FileGenerator(self.client, '', **kwargs)
+        return [
+            file_stat.compare_key
+            for file_stat in file_generator.call(self.input_s3_dir)]
+
+    def test_listing_order_is_kept_by_default(self):
+        self.assertEqual(self.list_compare_keys(), self.keys)
+
+    def test_sorts_listing(self):
+        self.assertEqual(
+            self.list_compare_keys(sort_listings=True, sort_buffer_size=2),
+            ['a/1.txt', 'a/2.txt', 'b/1.txt', 'c.txt'])
+
+    def test_sorted_listing_is_not_sharded_or_narrowed(self):
+        file_filter = Filter(
+            [['exclude', '*'], ['include', 'a/*']],
+            self.bucket + '/', 'dir' + os.sep)
+        self.list_compare_keys(
+            sort_listings=True, max_list_concurrency=3,
+            file_filter=file_filter)
+        self.paginator.paginate.assert_called_once_with(
+            Bucket=self.bucket, Prefix='', PaginationConfig={'PageSize': None})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -10,6 +10,8 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
+import datetime
+
 from awscli.testutils import mock
 from awscli.testutils import unittest
 from awscli.customizations.s3.filegenerator import FileStat
@@ -23,8 +25,9 @@ class TestFileInfoBuilder(unittest.TestCase):
                                       source_client='source_client',
                                       parameters='parameters',
                                       is_stream='is_stream')
+        last_update = datetime.datetime.now()
         files = [FileStat(src='src', dest='dest', compare_key='compare_key',
-                          size='size', last_update='last_update',
+                          size='size', last_update=last_update,
                           src_type='src_type', dest_type='dest_type',
                           operation_name='operation_name',
                           response_data='associated_response_data',
@@ -33,10 +36,21 @@ class TestFileInfoBuilder(unittest.TestCase):
                           case_conflict_key='case_conflict_key',)]
         file_infos = info_setter.call(files)
         for file_info in file_infos:
-            attributes = file_info.__dict__.keys()
-            for key in attributes:
+            self.assertEqual(file_info.last_update, last_update)
+            for key in FileInfo.__slots__:
                 self.assertEqual(getattr(file_info, key), str(key))
 
+    def test_does_not_parse_listed_last_update(self):
+        info_setter = FileInfoBuilder(client='client', parameters={})
+        last_update = '2014-01-09T20:45:49.000Z'
+        files = [FileStat(src='src', dest='dest', compare_key='compare_key',
+                          size=10, last_update=last_update,
+                          src_type='s3', dest_type='local',
+                          operation_name='download')]
+        file_info = list(info_setter.call(files))[0]
+        self.assertEqual(files[0].raw_last_update, last_update)
+        self.assertEqual(file_info.raw_last_update, last_update)
+
     def test_swaps_clients_for_sync_delete(self):
         client_name = 'client'
         source_client_name = 'source_client'
@@ -45,7 +59,7 @@ class TestFileInfoBuilder(unittest.TestCase):
                                       parameters={'delete': True},
                                       is_stream='is_stream')
         files = [FileStat(src='src', dest='dest', compare_key='compare_key',
-                          size='size', last_update='last_update',
+                          size='size', last_update=None,
                           src_type='src_type', dest_type='dest_type',
                           operation_name='delete')]
         file_infos = info_setter.call(files)
@@ -223,5 +223,81 @@ class FiltersTest(unittest.TestCase):
         for filtered_file in filtered:
             self.assertFalse('.txt' in filtered_file.src)
 
+class TestFilterPruning(unittest.TestCase):
+    def create_s3_filter(self, filters):
+        return Filter(filters, 'bucket/', 'bucket/')
+
+    def test_should_include_matches_fnmatch_semantics(self):
+        s3_filter = self.create_s3_filter(
+            [['exclude', '*'], ['include', '*.tx?'],
+             ['exclude', 'logs/[0-9]*']])
+        self.assertTrue(s3_filter.should_include('bucket/a.txt', 's3'))
+        self.assertFalse(s3_filter.should_include('bucket/a.jpg', 's3'))
+        self.assertFalse(s3_filter.should_include('bucket/logs/1.txt', 's3'))
+        self.assertTrue(s3_filter.should_include('bucket/logs/a.txt', 's3'))
+
+    def test_should_include_last_match_wins(self):
+        s3_filter = self.create_s3_filter(
+            [['include', '*.txt'], ['exclude', '*']])
+        self.assertFalse(s3_filter.should_include('bucket/a.txt', 's3'))
+
+    def test_should_include_without_patterns(self):
+        self.assertTrue(
+            Filter({}, None, None).should_include('bucket/a.txt', 's3'))
+
+    def test_listing_prefixes_for_included_directories(self):
+        s3_filter = self.create_s3_filter(
+            [['exclude', '*'], ['include', 'logs/2024/*'],
+             ['include', 'data/*.csv'], ['include', 'logs/2024/01/*']])
+        self.assertEqual(
+            s3_filter.get_listing_prefixes('bucket/'),
+            ['bucket/data/', 'bucket/logs/2024/'])
+
+    def test_listing_prefixes_without_covering_exclude(self):
+        s3_filter = self.create_s3_filter(
+            [['exclude', 'logs/*'], ['include', 'logs/2024/*']])
+        self.assertEqual(
+            s3_filter.get_listing_prefixes('bucket/'), ['bucket/'])
+
+    def test_listing_prefixes_when_include_covers_path(self):
+        s3_filter = self.create_s3_filter(
+            [['exclude', '*'], ['include', 'lo*']])
+        self.assertEqual(
+            s3_filter.get_listing_prefixes('bucket/logs/'), ['bucket/logs/'])
+
+    def test_listing_prefixes_for_literal_include(self):
+        s3_filter = self.create_s3_filter(
+            [['exclude', '*'], ['include', 'a/b.txt']])
+        self.assertEqual(
+            s3_filter.get_listing_prefixes('bucket/'), ['bucket/a/b.txt'])
+
+    def test_listing_prefixes_when_everything_is_excluded(self):
+        s3_filter = self.create_s3_filter([['exclude', '*']])
+        self.assertEqual(s3_filter.get_listing_prefixes('bucket/'), [])
+
+    def test_excluded_subtree(self):
+        root = os.path.abspath('root') + os.sep
+        local_filter = Filter(
+            [['exclude', 'build/*'], ['include', 'build/keep/*'],
+             ['exclude', '*.pyc']], root, 'bucket/')
+        self.assertTrue(local_filter.is_excluded_subtree(
+            os.path.join(root, 'build', 'lib') + os.sep, 'local'))
+        self.assertFalse(local_filter.is_excluded_subtree(
+            os.path.join(root, 'build', 'keep') + os.sep, 'local'))
+        self.assertFalse(local_filter.is_excluded_subtree(
+            os.path.join(root, 'src') + os.sep, 'local'))
+
+    def test_excluded_subtree_with_nested_include(self):
+        local_filter = Filter(
+            [['exclude', '*'], ['include', '*/keep.txt']], 'root', 'bucket')
+        self.assertFalse(local_filter.is_excluded_subtree(
+            os.path.join('root', 'a') + os.sep, 'local'))
+
+    def test_excluded_subtree_with_partial_wildcard_exclude(self):
+        local_filter = Filter([['exclude', '*.pyc']], 'root', 'bucket')
+        self.assertFalse(local_filter.is_excluded_subtree(
+            os.path.join('root', 'a') + os.sep, 'local'))
+
+
 if __name__ == "__main__":
     unittest.main()
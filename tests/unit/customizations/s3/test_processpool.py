@@ -0,0 +1,202 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import threading
+
+from awscli.compat import queue
+from awscli.customizations.s3.fileinfo import FileInfo
+from awscli.customizations.s3.processpool import ProcessPoolTransferHandler
+from awscli.customizations.s3.processpool import get_process_context
+from awscli.customizations.s3.processpool import _WorkerResultQueue
+from awscli.customizations.s3.results import CommandResultRecorder
+from awscli.customizations.s3.results import ErrorResult
+from awscli.customizations.s3.results import FailureResult
+from awscli.customizations.s3.results import QueuedResult
+from awscli.customizations.s3.results import ResultProcessor
+from awscli.customizations.s3.results import ResultRecorder
+from awscli.customizations.s3.results import SuccessResult
+
+from awscli.testutils import mock
+from awscli.testutils import unittest
+
+
+class FakeWorkerHandler(object):
+    """Reports every FileInfo as transferred by the client it was given"""
+    def __init__(self, client, result_command_recorder):
+        self._client = client
+        self._result_command_recorder = result_command_recorder
+
+    def call(self, fileinfos):
+        result_queue = self._result_command_recorder.result_queue
+        with self._result_command_recorder:
+            total_submissions = 0
+            for fileinfo in fileinfos:
+                if fileinfo.src == 'crash':
+                    os._exit(3)
+                if fileinfo.src == 'error':
+                    raise RuntimeError('worker error')
+                dest = '%s/%s/%s' % (
+                    fileinfo.client, fileinfo.source_client, fileinfo.dest)
+                result_queue.put(QueuedResult(
+                    transfer_type='upload', src=fileinfo.src, dest=dest,
+                    total_transfer_size=1))
+                result_queue.put(SuccessResult(
+                    transfer_type='upload', src=fileinfo.src, dest=dest))
+                total_submissions += 1
+            self._result_command_recorder.notify_total_submissions(
+                total_submissions)
+
+
+class UnpicklableError(Exception):
+    def __reduce__(self):
+        raise TypeError('cannot pickle')
+
+
+class TestGetProcessContext(unittest.TestCase):
+    def test_no_context_on_macos(self):
+        with mock.patch('sys.platform', 'darwin'):
+            self.assertIsNone(get_process_context())
+
+    def test_no_context_on_windows(self):
+        with mock.patch('sys.platform', 'win32'):
+            self.assertIsNone(get_process_context())
+
+
+@unittest.skipIf(get_process_context() is None,
+                 'Processes cannot be forked on this platform')
+class TestProcessPoolTransferHandler(unittest.TestCase):
+    def setUp(self):
+        self.client = object()
+        self.source_client = object()
+        self.result_queue = queue.Queue()
+        self.result_recorder = ResultRecorder()
+        self.processed_results = []
+        result_processor = ResultProcessor(
+            self.result_queue,
+            [self.result_recorder, self.processed_results.append])
+        self.command_result_recorder = CommandResultRecorder(
+            self.result_queue, self.result_recorder, result_processor)
+        self.handler = ProcessPoolTransferHandler(
+            clients=(self.client, self.source_client),
+            client_factory=lambda: ('worker-client', 'worker-source'),
+            create_worker_handler=FakeWorkerHandler,
+            result_command_recorder=self.command_result_recorder,
+            num_processes=3, context=get_process_context())
+        self.handler.POLL_INTERVAL = 0.05
+
+    def create_fileinfos(self, num_files, **kwargs):
+        kwargs.setdefault('client', self.client)
+        kwargs.setdefault('source_client', self.source_client)
+        return [
+            FileInfo(src='file%s' % i, dest='bucket/file%s' % i,
+                     compare_key='file%s' % i, operation_name='upload',
+                     **kwargs)
+            for i in range(num_files)
+        ]
+
+    def get_results(self, result_cls):
+        return [
+            result for result in self.processed_results
+            if isinstance(result, result_cls)
+        ]
+
+    def test_transfers_files_with_worker_processes(self):
+        command_result = self.handler.call(self.create_fileinfos(250))
+        self.assertEqual(command_result, (0, 0))
+        self.assertEqual(self.result_recorder.files_transferred, 250)
+        self.assertEqual(
+            self.result_recorder.final_expected_files_transferred, 250)
+        self.assertEqual(
+            sorted(result.src for result in self.get_results(SuccessResult)),
+            sorted('file%s' % i for i in range(250)))
+
+    def test_workers_use_their_own_clients(self):
+        fileinfos = self.create_fileinfos(
+            2, client=self.source_client, source_client=self.client)
+        self.handler.call(fileinfos)
+        self.assertEqual(
+            sorted(result.dest for result in self.get_results(SuccessResult)),
+            ['worker-source/worker-client/bucket/file0',
+             'worker-source/worker-client/bucket/file1'])
+
+    def test_reports_worker_errors(self):
+        fileinfos = self.create_fileinfos(5)
+        fileinfos.append(FileInfo(src='error', operation_name='upload'))
+        command_result = self.handler.call(fileinfos)
+        self.assertEqual(command_result.num_tasks_failed, 1)
+        errors = self.get_results(ErrorResult)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(str(errors[0].exception), 'worker error')
+
+    def test_reports_worker_processes_that_exit(self):
+        fileinfos = [FileInfo(src='crash', operation_name='upload')]
+        command_result = self.handler.call(fileinfos)
+        self.assertEqual(command_result.num_tasks_failed, 1)
+        errors = self.get_results(ErrorResult)
+        self.assertEqual(len(errors), 1)
+        self.assertIn('exit code 3', str(errors[0].exception))
+
+    def test_cancels_workers_on_error(self):
+        def fileinfos():
+            for fileinfo in self.create_fileinfos(150):
+                yield fileinfo
+            raise RuntimeError('listing error')
+
+        command_result = self.handler.call(fileinfos())
+        self.assertEqual(command_result.num_tasks_failed, 1)
+        errors = self.get_results(ErrorResult)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(str(errors[0].exception), 'listing error')
+        self.assertEqual(
+            [thread.name for thread in threading.enumerate()
+             if thread.name == 's3-result-forwarder'], [])
+
+
+    def test_uses_workers_started_before_call(self):
+        self.handler.start()
+        workers = self.handler._workers
+        command_result = self.handler.call(self.create_fileinfos(5))
+        self.assertEqual(command_result, (0, 0))
+        self.assertEqual(self.result_recorder.files_transferred, 5)
+        for worker in workers:
+            self.assertEqual(worker.process.exitcode, 0)
+
+    def test_close_stops_workers_that_were_never_called(self):
+        self.handler.start()
+        workers = self.handler._workers
+        self.handler.close()
+        for worker in workers:
+            self.assertIsNotNone(worker.process.exitcode)
+
+class TestWorkerResultQueue(unittest.TestCase):
+    def setUp(self):
+        self.worker_results = queue.Queue()
+        self.result_queue = _WorkerResultQueue(self.worker_results)
+
+    def test_put(self):
+        result = SuccessResult(transfer_type='upload', src='a', dest='b')
+        self.result_queue.put(result)
+        self.assertIs(self.worker_results.get(), result)
+
+    def test_replaces_unpicklable_exceptions(self):
+        self.result_queue.put(FailureResult(
+            transfer_type='upload', src='a', dest='b',
+            exception=UnpicklableError('failed')))
+        result = self.worker_results.get()
+        self.assertIsInstance(result, FailureResult)
+        self.assertNotIsInstance(result.exception, UnpicklableError)
+        self.assertEqual(str(result.exception), 'failed')
+
+
+if __name__ == "__main__":
+    unittest.main()
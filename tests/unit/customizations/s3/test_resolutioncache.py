@@ -0,0 +1,229 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import json
+import os
+
+from botocore.hooks import HierarchicalEmitter
+
+from awscli.customizations.s3.resolutioncache import BUCKET_REGION
+from awscli.customizations.s3.resolutioncache import BucketRegionCacheHandler
+from awscli.customizations.s3.resolutioncache import ResolutionCache
+from awscli.testutils import mock, unittest, FileCreator
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = os.path.join(
+            self.files.rootdir, 'cache', 'resolutions.json')
+        self.clock = FakeClock()
+
+    def create_cache(self, **kwargs):
+        return ResolutionCache(self.filename, clock=self.clock, **kwargs)
+
+    def test_get_missing_resolution(self):
+        cache = self.create_cache()
+        self.assertIsNone(cache.get(BUCKET_REGION, 'aws/bucket'))
+
+    def test_put_and_get(self):
+        cache = self.create_cache()
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.assertEqual(cache.get(BUCKET_REGION, 'aws/bucket'), 'us-west-2')
+
+    def test_resolutions_are_shared_through_file(self):
+        self.create_cache().put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        cache = self.create_cache()
+        self.assertEqual(cache.get(BUCKET_REGION, 'aws/bucket'), 'us-west-2')
+
+    def test_namespaces_are_separate(self):
+        cache = self.create_cache()
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.assertIsNone(cache.get('other', 'aws/bucket'))
+
+    def test_resolution_expires(self):
+        cache = self.create_cache(ttl=10)
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.clock.now = 9
+        self.assertEqual(cache.get(BUCKET_REGION, 'aws/bucket'), 'us-west-2')
+        self.clock.now = 10
+        self.assertIsNone(cache.get(BUCKET_REGION, 'aws/bucket'))
+
+    def test_delete(self):
+        cache = self.create_cache()
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        cache.delete(BUCKET_REGION, 'aws/bucket')
+        self.assertIsNone(cache.get(BUCKET_REGION, 'aws/bucket'))
+        self.assertIsNone(
+            self.create_cache().get(BUCKET_REGION, 'aws/bucket'))
+
+    def test_put_keeps_resolutions_written_by_others(self):
+        cache = self.create_cache()
+        cache.get(BUCKET_REGION, 'aws/bucket')
+        self.create_cache().put(BUCKET_REGION, 'aws/other', 'eu-west-1')
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.assertEqual(
+            self.create_cache().get(BUCKET_REGION, 'aws/other'), 'eu-west-1')
+
+    def test_evicts_resolutions_closest_to_expiring(self):
+        cache = self.create_cache(max_entries=2)
+        for i in range(3):
+            self.clock.now = i
+            cache.put(BUCKET_REGION, 'aws/bucket%s' % i, 'us-west-2')
+        self.assertIsNone(cache.get(BUCKET_REGION, 'aws/bucket0'))
+        self.assertEqual(cache.get(BUCKET_REGION, 'aws/bucket1'), 'us-west-2')
+        self.assertEqual(cache.get(BUCKET_REGION, 'aws/bucket2'), 'us-west-2')
+
+    def test_evicts_expired_resolutions_on_put(self):
+        cache = self.create_cache(ttl=10)
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.clock.now = 20
+        cache.put(BUCKET_REGION, 'aws/other', 'eu-west-1')
+        with open(self.filename) as f:
+            self.assertEqual(list(json.load(f)), ['bucket-region:aws/other'])
+
+    def test_ignores_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.filename))
+        with open(self.filename, 'w') as f:
+            f.write('not json')
+        cache = self.create_cache()
+        self.assertIsNone(cache.get(BUCKET_REGION, 'aws/bucket'))
+        cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.assertEqual(
+            self.create_cache().get(BUCKET_REGION, 'aws/bucket'), 'us-west-2')
+
+    def test_ignores_errors_writing_file(self):
+        cache = self.create_cache()
+        with mock.patch('os.replace', side_effect=OSError('denied')):
+            cache.put(BUCKET_REGION, 'aws/bucket', 'us-west-2')
+        self.assertEqual(cache.get(BUCKET_REGION, 'aws/bucket'), 'us-west-2')
+        self.assertEqual(
+            os.listdir(os.path.dirname(self.filename)), [])
+
+
+class TestBucketRegionCacheHandler(unittest.TestCase):
+    def setUp(self):
+        self.cache = mock.Mock(ResolutionCache)
+        self.cache.get.return_value = None
+        self.handler = BucketRegionCacheHandler(self.cache, 'aws')
+
+    def create_response(self, status_code=400, error_code=None,
+                        headers=None, region=None):
+        http_response = mock.Mock(status_code=status_code)
+        parsed = {'ResponseMetadata': {'HTTPHeaders': headers or {}}}
+        if error_code:
+            parsed['Error'] = {'Code': error_code}
+            if region:
+                parsed['Error']['Region'] = region
+        return http_response, parsed
+
+    def create_request_dict(self, bucket='bucket'):
+        return {'context': {'s3_redirect': {'bucket': bucket}}}
+
+    def test_registers_handlers(self):
+        emitter = mock.Mock(HierarchicalEmitter)
+        self.handler.register(emitter)
+        emitter.register.assert_any_call(
+            'before-endpoint-resolution.s3', self.handler.redirect_from_cache)
+        emitter.register.assert_any_call(
+            'needs-retry.s3', self.handler.update_from_error)
+
+    def test_redirects_to_cached_region(self):
+        self.cache.get.return_value = 'eu-west-1'
+        builtins = {'AWS::Region': 'us-east-1'}
+        self.handler.redirect_from_cache(
+            builtins=builtins, params={'Bucket': 'bucket'})
+        self.assertEqual(builtins['AWS::Region'], 'eu-west-1')
+        self.cache.get.assert_called_with(BUCKET_REGION, 'aws/bucket')
+
+    def test_does_not_redirect_uncached_bucket(self):
+        builtins = {'AWS::Region': 'us-east-1'}
+        self.handler.redirect_from_cache(
+            builtins=builtins, params={'Bucket': 'bucket'})
+        self.assertEqual(builtins['AWS::Region'], 'us-east-1')
+
+    def test_does_not_redirect_without_bucket(self):
+        builtins = {'AWS::Region': 'us-east-1'}
+        self.handler.redirect_from_cache(builtins=builtins, params={})
+        self.assertEqual(builtins['AWS::Region'], 'us-east-1')
+        self.cache.get.assert_not_called()
+
+    def test_does_not_redirect_arns(self):
+        builtins = {'AWS::Region': 'us-east-1'}
+        self.handler.redirect_from_cache(
+            builtins=builtins,
+            params={
+                'Bucket': 'arn:aws:s3:us-west-2:123456789012:accesspoint/ap'
+            }
+        )
+        self.cache.get.assert_not_called()
+
+    def test_caches_region_from_header(self):
+        self.handler.update_from_error(
+            request_dict=self.create_request_dict(),
+            response=self.create_response(
+                301, 'PermanentRedirect',
+                headers={'x-amz-bucket-region': 'eu-west-1'})
+        )
+        self.cache.put.assert_called_with(
+            BUCKET_REGION, 'aws/bucket', 'eu-west-1')
+
+    def test_caches_region_from_error(self):
+        self.handler.update_from_error(
+            request_dict=self.create_request_dict(),
+            response=self.create_response(
+                400, 'AuthorizationHeaderMalformed', region='eu-west-1')
+        )
+        self.cache.put.assert_called_with(
+            BUCKET_REGION, 'aws/bucket', 'eu-west-1')
+
+    def test_removes_region_of_unknown_redirect(self):
+        self.handler.update_from_error(
+            request_dict=self.create_request_dict(),
+            response=self.create_response(301)
+        )
+        self.cache.delete.assert_called_with(BUCKET_REGION, 'aws/bucket')
+        self.cache.put.assert_not_called()
+
+    def test_ignores_other_errors(self):
+        self.handler.update_from_error(
+            request_dict=self.create_request_dict(),
+            response=self.create_response(403, 'AccessDenied')
+        )
+        self.cache.put.assert_not_called()
+        self.cache.delete.assert_not_called()
+
+    def test_ignores_requests_without_response(self):
+        self.handler.update_from_error(
+            request_dict=self.create_request_dict(), response=None)
+        self.cache.put.assert_not_called()
+        self.cache.delete.assert_not_called()
+
+    def test_keys_are_scoped_by_partition(self):
+        handler = BucketRegionCacheHandler(self.cache, 'aws-cn')
+        handler.update_from_error(
+            request_dict=self.create_request_dict(),
+            response=self.create_response(
+                301, 'PermanentRedirect',
+                headers={'x-amz-bucket-region': 'cn-north-1'})
+        )
+        self.cache.put.assert_called_with(
+            BUCKET_REGION, 'aws-cn/bucket', 'cn-north-1')
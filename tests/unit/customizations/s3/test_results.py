@@ -1653,6 +1653,63 @@ class TestOnlyShowErrorsResultPrinter(BaseResultPrinterTest):
         self.assertEqual(self.out_file.getvalue(), ref_statement)
 
 
+class TestResultPrinterWithProgressInterval(BaseResultPrinterTest):
+    def setUp(self):
+        super(TestResultPrinterWithProgressInterval, self).setUp()
+        self.now = 0
+        self.result_printer = ResultPrinter(
+            result_recorder=self.result_recorder,
+            out_file=self.out_file,
+            error_file=self.error_file,
+            progress_interval=0.1,
+            clock=lambda: self.now,
+        )
+        self.result_recorder.expected_files_transferred = 2
+        self.result_recorder.final_expected_files_transferred = 2
+
+    def test_holds_back_progress_until_interval_passes(self):
+        self.result_printer(self.get_progress_result())
+        self.result_recorder.files_transferred = 1
+        self.result_printer(self.get_progress_result())
+        self.result_printer.flush()
+        self.assertEqual(
+            self.out_file.getvalue(),
+            'Completed 0 file(s) with 2 file(s) remaining\r')
+
+        self.now = 0.1
+        self.result_printer.flush()
+        self.assertEqual(
+            self.out_file.getvalue(),
+            'Completed 0 file(s) with 2 file(s) remaining\r'
+            'Completed 1 file(s) with 1 file(s) remaining\r')
+
+    def test_success_is_printed_immediately(self):
+        self.result_printer(self.get_progress_result())
+        self.result_recorder.files_transferred = 1
+        self.result_printer(SuccessResult('upload', 'file', 's3://b/k'))
+        self.assertEqual(
+            self.out_file.getvalue(),
+            'Completed 0 file(s) with 2 file(s) remaining\r'
+            'upload: file to s3://b/k                    \n')
+        self.now = 0.1
+        self.result_printer.flush()
+        self.assertEqual(
+            self.out_file.getvalue(),
+            'Completed 0 file(s) with 2 file(s) remaining\r'
+            'upload: file to s3://b/k                    \n'
+            'Completed 1 file(s) with 1 file(s) remaining\r')
+
+    def test_flush_does_not_repaint_finished_progress(self):
+        self.result_printer(self.get_progress_result())
+        self.result_printer(self.get_progress_result())
+        self.result_recorder.files_transferred = 2
+        self.now = 0.1
+        self.result_printer.flush()
+        self.assertEqual(
+            self.out_file.getvalue(),
+            'Completed 0 file(s) with 2 file(s) remaining\r')
+
+
 class TestResultProcessor(unittest.TestCase):
     def setUp(self):
         self.result_queue = queue.Queue()
@@ -1779,6 +1836,42 @@ class TestResultProcessor(unittest.TestCase):
         self.assertEqual(self.results_handled, results_to_process)
 
 
+    def test_combines_progress_results_of_transfer(self):
+        results = [
+            QueuedResult('upload', 'a', 'b', 30),
+            QueuedResult('upload', 'c', 'd', 30),
+            ProgressResult('upload', 'a', 'b', 10, 30, 1),
+            ProgressResult('upload', 'c', 'd', 5, None, 2),
+            ProgressResult('upload', 'a', 'b', 20, 30, 3),
+            SuccessResult('upload', 'a', 'b'),
+            ProgressResult('upload', 'c', 'd', 25, 30, 4),
+            SuccessResult('upload', 'c', 'd'),
+        ]
+        for result in results + [ShutdownThreadRequest()]:
+            self.result_queue.put(result)
+        self.result_processor.run()
+        self.assertEqual(self.results_handled, [
+            QueuedResult('upload', 'a', 'b', 30),
+            QueuedResult('upload', 'c', 'd', 30),
+            ProgressResult('upload', 'a', 'b', 30, 30, 3),
+            ProgressResult('upload', 'c', 'd', 30, 30, 4),
+            SuccessResult('upload', 'a', 'b'),
+            SuccessResult('upload', 'c', 'd'),
+        ])
+
+    def test_flushes_handlers_after_each_batch(self):
+        handler = mock.Mock()
+        self.result_processor = ResultProcessor(self.result_queue, [handler])
+        with mock.patch.object(self.result_queue, 'get') as get:
+            # Each batch ends when the queue is empty.
+            get.side_effect = [
+                queue.Empty(), SuccessResult('upload', 'a', 'b'),
+                queue.Empty(), ShutdownThreadRequest(), queue.Empty()]
+            self.result_processor.run()
+        handler.assert_called_once_with(SuccessResult('upload', 'a', 'b'))
+        # Once when no results arrived, and once after the first batch.
+        self.assertEqual(handler.flush.call_count, 2)
+
 class TestCommandResultRecorder(unittest.TestCase):
     def setUp(self):
         self.result_queue = queue.Queue()
@@ -12,6 +12,7 @@
 # language governing permissions and limitations under the License.
 import os
 
+from s3transfer.manager import TransferConfig
 from s3transfer.manager import TransferManager
 
 from awscli.testutils import mock
@@ -26,7 +27,11 @@ from awscli.customizations.s3.s3handler import CopyRequestSubmitter
 from awscli.customizations.s3.s3handler import UploadStreamRequestSubmitter
 from awscli.customizations.s3.s3handler import DownloadStreamRequestSubmitter
 from awscli.customizations.s3.s3handler import DeleteRequestSubmitter
+from awscli.customizations.s3.s3handler import BatchDeleteRequestSubmitter
 from awscli.customizations.s3.s3handler import LocalDeleteRequestSubmitter
+from awscli.customizations.s3.s3handler import get_stream_memory_parts
+from awscli.customizations.s3.processpool import ProcessPoolTransferHandler
+from awscli.customizations.s3.processpool import get_process_context
 from awscli.customizations.s3.fileinfo import FileInfo
 from awscli.customizations.s3.results import QueuedResult
 from awscli.customizations.s3.results import SuccessResult
@@ -43,6 +48,7 @@ from awscli.customizations.s3.results import CommandResultRecorder
 from awscli.customizations.s3.results import DryRunResult
 from awscli.customizations.s3.utils import MAX_UPLOAD_SIZE
 from awscli.customizations.s3.utils import NonSeekableStream
+from awscli.customizations.s3.utils import ReadAheadStream
 from awscli.customizations.s3.utils import StdoutBytesWriter
 from awscli.customizations.s3.utils import WarningResult
 from awscli.customizations.s3.utils import ProvideSizeSubscriber
@@ -53,6 +59,7 @@ from awscli.customizations.s3.utils import DirectoryCreatorSubscriber
 from awscli.customizations.s3.utils import DeleteSourceFileSubscriber
 from awscli.customizations.s3.utils import DeleteSourceObjectSubscriber
 from awscli.customizations.s3.transferconfig import RuntimeConfig
+from awscli.customizations.s3.transferconfig import InvalidConfigError
 
 
 def runtime_config(**kwargs):
@@ -72,6 +79,117 @@ class TestS3TransferHandlerFactory(unittest.TestCase):
         self.assertIsInstance(
             factory(self.client, self.result_queue), S3TransferHandler)
 
+    @unittest.skipIf(get_process_context() is None,
+                     'Processes cannot be forked on this platform')
+    def test_call_with_max_processes(self):
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_processes=2))
+        handler = factory(
+            self.client, self.result_queue,
+            client_factory=lambda: (self.client, self.client))
+        self.assertIsInstance(handler, ProcessPoolTransferHandler)
+
+    def test_max_processes_requires_client_factory(self):
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_processes=2))
+        self.assertIsInstance(
+            factory(self.client, self.result_queue), S3TransferHandler)
+
+    def test_streams_use_single_process(self):
+        self.cli_params['is_stream'] = True
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_processes=2))
+        handler = factory(
+            self.client, self.result_queue,
+            client_factory=lambda: (self.client, self.client))
+        self.assertIsInstance(handler, S3TransferHandler)
+
+    def test_case_conflicts_use_single_process(self):
+        self.cli_params['case_conflict'] = 'skip'
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_processes=2))
+        handler = factory(
+            self.client, self.result_queue,
+            client_factory=lambda: (self.client, self.client))
+        self.assertIsInstance(handler, S3TransferHandler)
+
+    def test_running_threads_use_single_process(self):
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_processes=2))
+        with mock.patch('threading.active_count', return_value=2):
+            handler = factory(
+                self.client, self.result_queue,
+                client_factory=lambda: (self.client, self.client))
+        self.assertIsInstance(handler, S3TransferHandler)
+
+    def test_auto_max_concurrent_requests_registers_throttling_handler(self):
+        factory = S3TransferHandlerFactory(
+            self.cli_params,
+            runtime_config(max_concurrent_requests='auto'))
+        handler = factory(self.client, self.result_queue)
+        self.assertIsInstance(handler, S3TransferHandler)
+        self.client.meta.events.register.assert_any_call(
+            'needs-retry.s3', mock.ANY)
+
+    def test_limits_memory_of_streams(self):
+        self.cli_params['is_stream'] = True
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_stream_memory='160MB'))
+        with mock.patch(
+                'awscli.customizations.s3.s3handler.TransferManager') as tm:
+            factory(self.client, self.result_queue)
+        transfer_config = tm.call_args[0][1]
+        # 20 parts of 8 MiB, less the read ahead and the part being read.
+        self.assertEqual(transfer_config.max_in_memory_upload_chunks, 17)
+
+    def test_stream_memory_limit_uses_part_size_of_expected_size(self):
+        self.cli_params['is_stream'] = True
+        # The part size is raised to 16 MiB for the stream to fit in the
+        # maximum number of parts.
+        self.cli_params['expected_size'] = str(10000 * 16 * 1024 ** 2)
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_stream_memory='160MB'))
+        with mock.patch(
+                'awscli.customizations.s3.s3handler.TransferManager') as tm:
+            factory(self.client, self.result_queue)
+        transfer_config = tm.call_args[0][1]
+        self.assertEqual(transfer_config.max_in_memory_upload_chunks, 7)
+
+    def test_stream_memory_limit_reads_ahead_fewer_parts(self):
+        self.cli_params['is_stream'] = True
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_stream_memory='24MB'))
+        with mock.patch(
+                'awscli.customizations.s3.s3handler.TransferManager') as tm:
+            factory(self.client, self.result_queue)
+        transfer_config = tm.call_args[0][1]
+        # 3 parts of 8 MiB: one read ahead, one being read, one uploaded.
+        self.assertEqual(transfer_config.max_in_memory_upload_chunks, 1)
+
+    def test_rejects_stream_memory_limit_below_two_parts(self):
+        self.cli_params['is_stream'] = True
+        factory = S3TransferHandlerFactory(
+            self.cli_params, runtime_config(max_stream_memory='8MB'))
+        with self.assertRaises(InvalidConfigError):
+            factory(self.client, self.result_queue)
+
+
+class TestGetStreamMemoryParts(unittest.TestCase):
+    def test_not_capped(self):
+        self.assertEqual(get_stream_memory_parts(None, 8), (2, None))
+
+    def test_reads_ahead_with_room_for_four_parts(self):
+        self.assertEqual(get_stream_memory_parts(32, 8), (2, 1))
+        self.assertEqual(get_stream_memory_parts(47, 8), (2, 2))
+
+    def test_reads_ahead_fewer_parts_below_four_parts(self):
+        self.assertEqual(get_stream_memory_parts(24, 8), (1, 1))
+        self.assertEqual(get_stream_memory_parts(16, 8), (0, 1))
+
+    def test_rejects_memory_below_two_parts(self):
+        with self.assertRaises(InvalidConfigError):
+            get_stream_memory_parts(15, 8)
+
 
 class TestS3TransferHandler(unittest.TestCase):
     def setUp(self):
@@ -86,6 +204,7 @@ class TestS3TransferHandler(unittest.TestCase):
             self.result_queue, self.result_recorder, self.result_processor)
 
         self.transfer_manager = mock.Mock(spec=TransferManager)
+        self.transfer_manager.config = TransferConfig()
         self.transfer_manager.__enter__ = mock.Mock()
         self.transfer_manager.__exit__ = mock.Mock()
         self.parameters = {}
@@ -186,6 +305,28 @@ class TestS3TransferHandler(unittest.TestCase):
         self.assertEqual(
             self.transfer_manager.delete.call_count, num_transfers)
 
+    def test_enqueue_batched_deletes(self):
+        self.transfer_manager.config.max_request_concurrency = 1
+        self.transfer_manager.client.delete_objects.return_value = {}
+        self.parameters['dir_op'] = True
+        s3_transfer_handler = S3TransferHandler(
+            self.transfer_manager, self.parameters,
+            self.command_result_recorder,
+            runtime_config(delete_batch_size=2))
+        fileinfos = []
+        for i in range(5):
+            fileinfos.append(
+                FileInfo(src='bucket/key%s' % i, dest=None,
+                         operation_name='delete', src_type='s3'))
+        command_result = s3_transfer_handler.call(fileinfos)
+        self.assertEqual(command_result, (0, 0))
+        self.assertEqual(
+            self.transfer_manager.client.delete_objects.call_count, 3)
+        self.assertEqual(self.transfer_manager.delete.call_count, 0)
+        self.assertEqual(self.result_recorder.files_transferred, 5)
+        self.assertEqual(
+            self.result_recorder.final_expected_files_transferred, 5)
+
     def test_enqueue_local_deletes(self):
         fileinfos = []
         num_transfers = 5
@@ -254,6 +395,7 @@ class TestS3TransferHandler(unittest.TestCase):
 class BaseTransferRequestSubmitterTest(unittest.TestCase):
     def setUp(self):
         self.transfer_manager = mock.Mock(spec=TransferManager)
+        self.transfer_manager.config = TransferConfig()
         self.result_queue = queue.Queue()
         self.cli_params = {}
         self.filename = 'myfile'
@@ -888,6 +1030,37 @@ class TestUploadStreamRequestSubmitter(BaseTransferRequestSubmitterTest):
         # The ProvideSizeSubscriber should be providing the correct size
         self.assertEqual(actual_subscribers[0].size, provided_size)
 
+    def test_reads_stream_in_parts_of_expected_size(self):
+        self.cli_params['expected_size'] = str(10000 * 16 * 1024 ** 2)
+        fileinfo = FileInfo(
+            src=self.filename, dest=self.bucket+'/'+self.key)
+        self.transfer_request_submitter.submit(fileinfo)
+        fileobj = self.transfer_manager.upload.call_args[1]['fileobj']
+        self.assertIsInstance(fileobj, ReadAheadStream)
+        self.assertEqual(fileobj._part_size, 16 * 1024 ** 2)
+
+    def test_reads_ahead_parts_that_fit_max_stream_memory(self):
+        self.transfer_request_submitter = UploadStreamRequestSubmitter(
+            self.transfer_manager, self.result_queue, self.cli_params,
+            max_stream_memory=3 * 8 * 1024 ** 2)
+        fileinfo = FileInfo(
+            src=self.filename, dest=self.bucket+'/'+self.key)
+        self.transfer_request_submitter.submit(fileinfo)
+        fileobj = self.transfer_manager.upload.call_args[1]['fileobj']
+        self.assertIsInstance(fileobj, ReadAheadStream)
+        self.assertEqual(fileobj._parts.maxsize, 1)
+
+    def test_does_not_read_ahead_if_max_stream_memory_fits_two_parts(self):
+        self.transfer_request_submitter = UploadStreamRequestSubmitter(
+            self.transfer_manager, self.result_queue, self.cli_params,
+            max_stream_memory=2 * 8 * 1024 ** 2)
+        fileinfo = FileInfo(
+            src=self.filename, dest=self.bucket+'/'+self.key)
+        self.transfer_request_submitter.submit(fileinfo)
+        fileobj = self.transfer_manager.upload.call_args[1]['fileobj']
+        self.assertNotIsInstance(fileobj, ReadAheadStream)
+        self.assertIsInstance(fileobj, NonSeekableStream)
+
     def test_dry_run(self):
         self.cli_params['dryrun'] = True
         self.transfer_request_submitter = UploadStreamRequestSubmitter(
@@ -1020,6 +1193,146 @@ class TestDeleteRequestSubmitter(BaseTransferRequestSubmitterTest):
         self.assertIsNone(result.dest)
 
 
+class TestBatchDeleteRequestSubmitter(BaseTransferRequestSubmitterTest):
+    def setUp(self):
+        super(TestBatchDeleteRequestSubmitter, self).setUp()
+        self.cli_params['dir_op'] = True
+        self.transfer_manager.config.max_request_concurrency = 2
+        self.client = self.transfer_manager.client
+        self.client.delete_objects.return_value = {}
+        self.transfer_request_submitter = self.create_submitter()
+
+    def create_submitter(self, batch_size=2):
+        return BatchDeleteRequestSubmitter(
+            self.transfer_manager, self.result_queue, self.cli_params,
+            batch_size=batch_size)
+
+    def create_fileinfo(self, key):
+        return FileInfo(
+            src=self.bucket + '/' + key, dest=None, operation_name='delete',
+            src_type='s3')
+
+    def get_results(self):
+        results = []
+        while not self.result_queue.empty():
+            results.append(self.result_queue.get())
+        return results
+
+    def deleted_keys(self):
+        keys = []
+        for call in self.client.delete_objects.call_args_list:
+            keys.append(
+                [obj['Key'] for obj in call[1]['Delete']['Objects']])
+        return sorted(keys)
+
+    def test_can_submit(self):
+        fileinfo = self.create_fileinfo(self.key)
+        self.assertTrue(
+            self.transfer_request_submitter.can_submit(fileinfo))
+        fileinfo.operation_name = 'foo'
+        self.assertFalse(
+            self.transfer_request_submitter.can_submit(fileinfo))
+
+    def test_cannot_submit_single_deletes(self):
+        self.cli_params['dir_op'] = False
+        self.assertFalse(
+            self.transfer_request_submitter.can_submit(
+                self.create_fileinfo(self.key)))
+
+    def test_cannot_submit_local_deletes(self):
+        fileinfo = self.create_fileinfo(self.key)
+        fileinfo.src_type = 'local'
+        self.assertFalse(
+            self.transfer_request_submitter.can_submit(fileinfo))
+
+    def test_submit_batches_keys(self):
+        for key in ['a', 'b', 'c']:
+            self.assertTrue(self.transfer_request_submitter.submit(
+                self.create_fileinfo(key)))
+        self.transfer_request_submitter.shutdown()
+        self.assertEqual(self.deleted_keys(), [['a', 'b'], ['c']])
+        self.transfer_manager.delete.assert_not_called()
+        delete_objects_kwargs = self.client.delete_objects.call_args[1]
+        self.assertEqual(delete_objects_kwargs['Bucket'], self.bucket)
+        self.assertTrue(delete_objects_kwargs['Delete']['Quiet'])
+
+    def test_submit_with_request_payer(self):
+        self.cli_params['request_payer'] = 'requester'
+        self.transfer_request_submitter.submit(self.create_fileinfo('a'))
+        self.transfer_request_submitter.shutdown()
+        self.assertEqual(
+            self.client.delete_objects.call_args[1]['RequestPayer'],
+            'requester')
+
+    def test_queues_result_for_each_key(self):
+        for key in ['a', 'b', 'c']:
+            self.transfer_request_submitter.submit(self.create_fileinfo(key))
+        self.transfer_request_submitter.shutdown()
+        results = self.get_results()
+        queued = [r for r in results if isinstance(r, QueuedResult)]
+        succeeded = [r for r in results if isinstance(r, SuccessResult)]
+        self.assertEqual(
+            [r.src for r in queued],
+            ['s3://mybucket/a', 's3://mybucket/b', 's3://mybucket/c'])
+        self.assertEqual(
+            sorted(r.src for r in succeeded),
+            ['s3://mybucket/a', 's3://mybucket/b', 's3://mybucket/c'])
+        for result in results:
+            self.assertEqual(result.transfer_type, 'delete')
+            self.assertIsNone(result.dest)
+
+    def test_splits_key_errors_from_response(self):
+        self.client.delete_objects.return_value = {
+            'Errors': [
+                {'Key': 'b', 'Code': 'AccessDenied',
+                 'Message': 'Access Denied'}
+            ]
+        }
+        for key in ['a', 'b']:
+            self.transfer_request_submitter.submit(self.create_fileinfo(key))
+        self.transfer_request_submitter.shutdown()
+        results = self.get_results()[2:]
+        self.assertIsInstance(results[0], SuccessResult)
+        self.assertEqual(results[0].src, 's3://mybucket/a')
+        self.assertIsInstance(results[1], FailureResult)
+        self.assertEqual(results[1].src, 's3://mybucket/b')
+        self.assertIn('AccessDenied', str(results[1].exception))
+
+    def test_failed_request_fails_every_key(self):
+        self.client.delete_objects.side_effect = Exception('request failed')
+        for key in ['a', 'b']:
+            self.transfer_request_submitter.submit(self.create_fileinfo(key))
+        self.transfer_request_submitter.shutdown()
+        results = self.get_results()[2:]
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertIsInstance(result, FailureResult)
+            self.assertEqual(str(result.exception), 'request failed')
+
+    def test_cancelled_shutdown_does_not_send_pending_keys(self):
+        self.transfer_request_submitter.submit(self.create_fileinfo('a'))
+        self.transfer_request_submitter.shutdown(cancel=True)
+        self.client.delete_objects.assert_not_called()
+
+    def test_batch_size_capped_at_service_limit(self):
+        submitter = self.create_submitter(batch_size=5000)
+        for i in range(1001):
+            submitter.submit(self.create_fileinfo('key%s' % i))
+        submitter.shutdown()
+        self.assertEqual(
+            sorted(len(keys) for keys in self.deleted_keys()), [1, 1000])
+
+    def test_dry_run(self):
+        self.cli_params['dryrun'] = True
+        self.transfer_request_submitter.submit(self.create_fileinfo('a'))
+        self.transfer_request_submitter.shutdown()
+        result = self.result_queue.get()
+        self.assertIsInstance(result, DryRunResult)
+        self.assertEqual(result.src, 's3://mybucket/a')
+        self.assertTrue(self.result_queue.empty())
+        self.client.delete_objects.assert_not_called()
+
+
 class TestLocalDeleteRequestSubmitter(BaseTransferRequestSubmitterTest):
     def setUp(self):
         super(TestLocalDeleteRequestSubmitter, self).setUp()
@@ -19,7 +19,10 @@ from awscli.customizations.s3.s3 import S3
 from awscli.customizations.s3.subcommands import CommandParameters, \
     CommandArchitecture, CpCommand, SyncCommand, ListCommand, \
     RbCommand, get_client
+from awscli.customizations.s3.processpool import \
+    ProcessPoolTransferHandler, get_process_context
 from awscli.customizations.s3.transferconfig import RuntimeConfig
+from awscli.customizations.s3.utils import PipelineStage
 from awscli.customizations.s3.syncstrategy.base import \
     SizeAndLastModifiedSync, NeverSync, MissingFileSync
 from awscli.testutils import mock, unittest, BaseAWSHelpOutputTest, \
@@ -281,21 +284,16 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
                                        'verify_ssl': None,
                                        'source_region': None})
         cmd_arc.set_clients()
-        self.assertEqual(session.create_client.call_count, 2)
+        self.assertEqual(session.create_client.call_count, 1)
         self.assertEqual(
             session.create_client.call_args_list[0],
             mock.call(
              's3', region_name='us-west-1', endpoint_url=None, verify=None,
              config=None)
         )
-        # A client created with the same arguments as the first should be used
-        # for the source client since no source region was provided.
-        self.assertEqual(
-            session.create_client.call_args_list[1],
-            mock.call(
-                's3', region_name='us-west-1', endpoint_url=None, verify=None,
-                config=None)
-        )
+        # The same client, and so the same connection pool, should be used
+        # for the source since no source region was provided.
+        self.assertIs(cmd_arc._source_client, cmd_arc._client)
 
     def test_set_client_with_source(self):
         session = mock.Mock()
@@ -308,21 +306,15 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
         cmd_arc.set_clients()
         create_client_args = session.create_client.call_args_list
         # Assert that two clients were created
-        self.assertEqual(len(create_client_args), 3)
+        self.assertEqual(len(create_client_args), 2)
         self.assertEqual(
             create_client_args[0][1],
             {'region_name': 'us-west-1', 'verify': None, 'endpoint_url': None,
              'config': None}
         )
+        # Assert the second client is the one needed for the source region.
         self.assertEqual(
             create_client_args[1][1],
-            {'region_name': 'us-west-1', 'verify': None, 'endpoint_url': None,
-             'config': None}
-        )
-        # Assert override the second client created with the one needed for the
-        # source region.
-        self.assertEqual(
-            create_client_args[2][1],
             {'region_name': 'us-west-2', 'verify': None, 'endpoint_url': None,
              'config': None}
         )
@@ -334,15 +326,25 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
             {'region': 'us-west-1', 'endpoint_url': None, 'verify_ssl': None,
              'source_region': None, 'sse': 'aws:kms'})
         cmd_arc.set_clients()
-        self.assertEqual( session.create_client.call_count, 2)
+        self.assertEqual( session.create_client.call_count, 1)
         create_client_call = session.create_client.call_args_list[0]
-        create_source_client_call = session.create_client.call_args_list[1]
 
-        # Make sure that both clients are using sigv4 if kms is enabled.
+        # Make sure that the client is using sigv4 if kms is enabled.
         self.assertEqual(
             create_client_call[1]['config'].signature_version, 's3v4')
-        self.assertEqual(
-            create_source_client_call[1]['config'].signature_version, 's3v4')
+
+    def test_set_clients_sizes_connection_pool(self):
+        session = mock.Mock()
+        runtime_config = RuntimeConfig().build_config(
+            max_concurrent_requests=64)
+        cmd_arc = CommandArchitecture(
+            session, 'sync',
+            {'region': 'us-west-1', 'endpoint_url': None, 'verify_ssl': None,
+             'source_region': None, 'sse': 'aws:kms'}, runtime_config)
+        cmd_arc.set_clients()
+        config = session.create_client.call_args[1]['config']
+        self.assertEqual(config.max_pool_connections, 66)
+        self.assertEqual(config.signature_version, 's3v4')
 
     def test_create_instructions(self):
         """
@@ -618,6 +620,69 @@ class CommandArchitectureTest(BaseAWSCommandParamsTest):
         output_str = "(dryrun) upload: %s to %s" % (rel_local_file, s3_file)
         self.assertIn(output_str, self.output.getvalue())
 
+    def test_run_sync_closes_sync_strategies(self):
+        s3_prefix = 's3://' + self.bucket + '/'
+        params = {'dir_op': True, 'dryrun': True, 'quiet': False,
+                  'src': self.loc_files[3], 'dest': s3_prefix,
+                  'filters': [], 'paths_type': 'locals3',
+                  'region': 'us-east-1', 'endpoint_url': None,
+                  'verify_ssl': None, 'follow_symlinks': True,
+                  'page_size': None, 'is_stream': False,
+                  'source_region': None, 'v2_debug': False}
+        self.parsed_responses = [
+            {"CommonPrefixes": [], "Contents": []}]
+        config = RuntimeConfig().build_config()
+        cmd_arc = CommandArchitecture(self.session, 'sync', params, config)
+        cmd_arc.create_instructions()
+        cmd_arc.set_clients()
+        self.patch_make_request()
+        with mock.patch.object(SizeAndLastModifiedSync, 'close') as close:
+            cmd_arc.run()
+        close.assert_called_with()
+
+    @unittest.skipIf(get_process_context() is None,
+                     'Processes cannot be forked on this platform')
+    def test_run_sync_starts_processes_before_pipeline_stages(self):
+        # Worker processes are forked, so they must be started before the
+        # pipeline stages start their threads.
+        s3_prefix = 's3://' + self.bucket + '/'
+        local_dir = self.loc_files[3]
+        params = {'dir_op': True, 'dryrun': True, 'quiet': False,
+                  'src': local_dir, 'dest': s3_prefix, 'filters': [],
+                  'paths_type': 'locals3', 'region': 'us-east-1',
+                  'endpoint_url': None, 'verify_ssl': None,
+                  'follow_symlinks': True, 'page_size': None,
+                  'is_stream': False, 'source_region': None,
+                  'v2_debug': False}
+        self.parsed_responses = [
+            {"CommonPrefixes": [], "Contents": []}]
+        config = RuntimeConfig().build_config(
+            max_processes=2, pipeline_queue_size=1)
+        cmd_arc = CommandArchitecture(self.session, 'sync', params, config)
+        cmd_arc.create_instructions()
+        cmd_arc.set_clients()
+        self.patch_make_request()
+        events = []
+        start = ProcessPoolTransferHandler.start
+        run_stage = PipelineStage.run
+
+        def record_start(handler):
+            events.append('start')
+            return start(handler)
+
+        def record_stage(stage):
+            events.append('stage')
+            return run_stage(stage)
+
+        with mock.patch.object(
+                ProcessPoolTransferHandler, 'start', record_start), \
+                mock.patch.object(PipelineStage, 'run', record_stage):
+            rc = cmd_arc.run()
+        self.assertEqual(rc, 0)
+        self.assertEqual(events[0], 'start')
+        self.assertIn('stage', events)
+        self.assertIn('(dryrun) upload: ', self.output.getvalue())
+
     def test_v2_debug_mv(self):
         s3_file = 's3://' + self.bucket + '/' + 'text1.txt'
         filters = [['--include', '*']]
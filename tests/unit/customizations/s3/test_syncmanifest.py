@@ -0,0 +1,237 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+
+from awscli.customizations.s3.results import FailureResult
+from awscli.customizations.s3.results import QueuedResult
+from awscli.customizations.s3.results import SuccessResult
+from awscli.customizations.s3.syncmanifest import ManifestFileGenerator
+from awscli.customizations.s3.syncmanifest import ManifestRecorder
+from awscli.customizations.s3.syncmanifest import SyncManifest
+
+from awscli.testutils import FileCreator, mock, unittest
+
+
+class BaseSyncManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = os.path.join(self.files.rootdir, 'manifest.db')
+        self.manifest = self.create_manifest()
+
+    def create_manifest(self, src='/local/', dest='bucket/prefix/',
+                        filters=None):
+        manifest = SyncManifest(self.filename, src, dest, filters)
+        self.addCleanup(manifest.close)
+        return manifest
+
+    def get_keys(self, manifest=None):
+        if manifest is None:
+            manifest = self.manifest
+        return [row[0] for row in manifest.iter_objects()]
+
+
+class TestSyncManifest(BaseSyncManifestTest):
+    def test_iter_objects_in_key_order(self):
+        self.manifest.put_object('b', 1, '2014-01-09T20:45:49.000Z', '"e"')
+        self.manifest.put_object('a/c', 2, '2014-01-09T20:45:49.000Z')
+        self.manifest.put_object('a', 3, '2014-01-09T20:45:49.000Z')
+        self.assertEqual(
+            list(self.manifest.iter_objects()),
+            [('a', 3, '2014-01-09T20:45:49.000Z', None),
+             ('a/c', 2, '2014-01-09T20:45:49.000Z', None),
+             ('b', 1, '2014-01-09T20:45:49.000Z', '"e"')])
+
+    def test_iter_objects_across_pages(self):
+        self.manifest.PAGE_SIZE = 2
+        keys = ['key-%s' % i for i in range(5)]
+        for key in keys:
+            self.manifest.put_object(key, 0, '2014-01-09T20:45:49.000Z')
+        self.assertEqual(self.get_keys(), keys)
+
+    def test_persists_objects_and_directories(self):
+        self.manifest.put_object('a', 1, '2014-01-09T20:45:49.000Z')
+        self.manifest.set_directory_mtimes({'': 1, 'dir/': 2})
+        self.manifest.close()
+        manifest = self.create_manifest()
+        self.assertEqual(self.get_keys(manifest), ['a'])
+        self.assertEqual(
+            manifest.get_directory_mtimes(), {'': 1, 'dir/': 2})
+
+    def test_syncs_are_recorded_separately(self):
+        other_dest = self.create_manifest(dest='bucket/other/')
+        other_filters = self.create_manifest(
+            filters=[['--exclude', '*']])
+        self.manifest.put_object('a', 1, '2014-01-09T20:45:49.000Z')
+        self.assertEqual(self.get_keys(other_dest), [])
+        self.assertEqual(self.get_keys(other_filters), [])
+        self.assertEqual(self.get_keys(), ['a'])
+
+    def test_delete_objects(self):
+        for key in ['a', 'dir/a', 'dir/sub/a', 'dir0', 'dirs/a']:
+            self.manifest.put_object(key, 0, '2014-01-09T20:45:49.000Z')
+        self.manifest.delete_objects('dir/')
+        self.assertEqual(self.get_keys(), ['a', 'dir0', 'dirs/a'])
+
+    def test_delete_objects_not_recursive(self):
+        for key in ['a', 'dir/a', 'dir/sub/a', 'b/a']:
+            self.manifest.put_object(key, 0, '2014-01-09T20:45:49.000Z')
+        self.manifest.delete_objects('dir/', recursive=False)
+        self.assertEqual(self.get_keys(), ['a', 'b/a', 'dir/sub/a'])
+        self.manifest.delete_objects('', recursive=False)
+        self.assertEqual(self.get_keys(), ['b/a', 'dir/sub/a'])
+
+    def test_clear(self):
+        self.manifest.put_object('a', 1, '2014-01-09T20:45:49.000Z')
+        self.manifest.set_directory_mtimes({'': 1})
+        self.manifest.clear()
+        self.assertEqual(self.get_keys(), [])
+        self.assertEqual(self.manifest.get_directory_mtimes(), {})
+
+    def test_error_if_manifest_cannot_be_opened(self):
+        with self.assertRaises(RuntimeError):
+            SyncManifest(self.files.rootdir, '/local/', 'bucket/prefix/')
+
+
+class TestManifestFileGenerator(BaseSyncManifestTest):
+    def setUp(self):
+        super(TestManifestFileGenerator, self).setUp()
+        self.local_dir = os.path.join(self.files.rootdir, 'local') + os.sep
+        self.files.create_file(os.path.join('local', 'foo.txt'), 'foo')
+        self.files.create_file(
+            os.path.join('local', 'dir', 'bar.txt'), 'bar')
+        self.client = mock.Mock()
+        self.paginator = self.client.get_paginator.return_value
+        self.paginator.paginate.return_value = [{'Contents': [
+            {'Key': 'prefix/dir/bar.txt', 'Size': 3,
+             'LastModified': '2014-01-09T20:45:49.000Z', 'ETag': '"e"'},
+            {'Key': 'prefix/foo.txt', 'Size': 3,
+             'LastModified': '2014-01-09T20:45:49.000Z', 'ETag': '"e"'},
+        ]}]
+        self.files_to_list = {
+            'src': {'path': 'bucket/prefix/', 'type': 's3'},
+            'dest': {'path': self.local_dir, 'type': 'local'},
+            'dir_op': True, 'use_src_name': True,
+        }
+
+    def generate_file_stats(self, verify=False):
+        generator = ManifestFileGenerator(
+            self.client, '', manifest=self.manifest,
+            local_dir=self.local_dir, verify=verify)
+        file_stats = list(generator.call(self.files_to_list))
+        return generator, file_stats
+
+    def test_lists_destination_to_build_manifest(self):
+        generator, file_stats = self.generate_file_stats()
+        self.assertEqual(
+            [f.compare_key for f in file_stats], ['dir/bar.txt', 'foo.txt'])
+        self.assertEqual(self.get_keys(), ['dir/bar.txt', 'foo.txt'])
+        self.assertEqual(sorted(generator.directory_mtimes), ['', 'dir/'])
+
+    def test_uses_manifest_for_unchanged_directories(self):
+        generator, _ = self.generate_file_stats()
+        self.manifest.set_directory_mtimes(generator.directory_mtimes)
+        self.client.reset_mock()
+        _, file_stats = self.generate_file_stats()
+        self.assertFalse(self.paginator.paginate.called)
+        self.assertEqual(
+            [(f.src, f.compare_key, f.size, f.etag) for f in file_stats],
+            [('bucket/prefix/dir/bar.txt', 'dir/bar.txt', 3, '"e"'),
+             ('bucket/prefix/foo.txt', 'foo.txt', 3, '"e"')])
+
+    def test_lists_changed_and_new_directories(self):
+        generator, _ = self.generate_file_stats()
+        mtimes = generator.directory_mtimes
+        mtimes['dir/'] -= 1
+        self.manifest.set_directory_mtimes(mtimes)
+        self.files.create_file(
+            os.path.join('local', 'dir', 'new', 'baz.txt'), 'baz')
+        self.client.reset_mock()
+        self.paginator.paginate.side_effect = [
+            [{'Contents': [
+                {'Key': 'prefix/dir/other.txt', 'Size': 5,
+                 'LastModified': '2014-01-09T20:45:49.000Z'},
+            ]}],
+            [{'Contents': [
+                {'Key': 'prefix/dir/new/baz.txt', 'Size': 3,
+                 'LastModified': '2014-01-09T20:45:49.000Z'},
+            ]}],
+        ]
+        generator, file_stats = self.generate_file_stats()
+        self.assertEqual(
+            self.paginator.paginate.call_args_list,
+            [mock.call(Bucket='bucket', Prefix='prefix/dir/', Delimiter='/',
+                       PaginationConfig={'PageSize': None}),
+             mock.call(Bucket='bucket', Prefix='prefix/dir/new/',
+                       PaginationConfig={'PageSize': None})])
+        self.assertEqual(
+            [f.compare_key for f in file_stats],
+            ['dir/new/baz.txt', 'dir/other.txt', 'foo.txt'])
+        self.assertIn('dir/new/', generator.directory_mtimes)
+
+    def test_verify_lists_destination(self):
+        generator, _ = self.generate_file_stats()
+        self.manifest.set_directory_mtimes(generator.directory_mtimes)
+        self.manifest.put_object('stale.txt', 1, '2014-01-09T20:45:49.000Z')
+        self.client.reset_mock()
+        _, file_stats = self.generate_file_stats(verify=True)
+        self.assertTrue(self.paginator.paginate.called)
+        self.assertEqual(self.get_keys(), ['dir/bar.txt', 'foo.txt'])
+
+
+class TestManifestRecorder(BaseSyncManifestTest):
+    def setUp(self):
+        super(TestManifestRecorder, self).setUp()
+        self.recorder = ManifestRecorder(self.manifest, 'bucket/prefix/')
+
+    def test_records_uploads(self):
+        dest = 's3://bucket/prefix/dir/foo.txt'
+        self.recorder(QueuedResult(
+            transfer_type='upload', src='foo.txt', dest=dest,
+            total_transfer_size=3))
+        self.recorder(SuccessResult(
+            transfer_type='upload', src='foo.txt', dest=dest))
+        rows = list(self.manifest.iter_objects())
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][:2], ('dir/foo.txt', 3))
+
+    def test_forgets_failed_uploads(self):
+        self.manifest.put_object('foo.txt', 3, '2014-01-09T20:45:49.000Z')
+        dest = 's3://bucket/prefix/foo.txt'
+        self.recorder(QueuedResult(
+            transfer_type='upload', src='foo.txt', dest=dest,
+            total_transfer_size=4))
+        self.recorder(FailureResult(
+            transfer_type='upload', src='foo.txt', dest=dest,
+            exception=Exception()))
+        self.assertEqual(self.get_keys(), [])
+
+    def test_records_deletes(self):
+        self.manifest.put_object('foo.txt', 3, '2014-01-09T20:45:49.000Z')
+        self.recorder(SuccessResult(
+            transfer_type='delete', src='s3://bucket/prefix/foo.txt',
+            dest=None))
+        self.assertEqual(self.get_keys(), [])
+
+    def test_ignores_other_prefixes(self):
+        self.recorder(SuccessResult(
+            transfer_type='delete', src='s3://bucket/other/foo.txt',
+            dest=None))
+        self.manifest.put_object('foo.txt', 3, '2014-01-09T20:45:49.000Z')
+        self.recorder(SuccessResult(
+            transfer_type='delete', src='s3://bucket/foo.txt', dest=None))
+        self.assertEqual(self.get_keys(), ['foo.txt'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -57,6 +57,34 @@ class TestTransferConfig(unittest.TestCase):
         with self.assertRaises(transferconfig.InvalidConfigError):
             self.build_config_with(max_concurrent_requests="0")
 
+    def test_auto_max_concurrent_requests(self):
+        runtime_config = self.build_config_with(
+            max_concurrent_requests='auto')
+        self.assertEqual(
+            runtime_config['max_concurrent_requests'],
+            transferconfig.MAX_ADAPTIVE_CONCURRENT_REQUESTS)
+        self.assertTrue(runtime_config['adaptive_concurrency'])
+
+    def test_fixed_max_concurrent_requests_is_not_adaptive(self):
+        runtime_config = self.build_config_with(max_concurrent_requests='20')
+        self.assertNotIn('adaptive_concurrency', runtime_config)
+
+    def test_converts_max_stream_memory(self):
+        runtime_config = self.build_config_with(max_stream_memory='256MB')
+        self.assertEqual(runtime_config['max_stream_memory'], 256 * 1024 ** 2)
+
+    def test_validates_max_list_concurrency(self):
+        with self.assertRaises(transferconfig.InvalidConfigError):
+            self.build_config_with(max_list_concurrency="0")
+
+    def test_converts_max_list_concurrency(self):
+        runtime_config = self.build_config_with(max_list_concurrency='8')
+        self.assertEqual(runtime_config['max_list_concurrency'], 8)
+
+    def test_validates_max_delete_batch_size(self):
+        with self.assertRaises(transferconfig.InvalidConfigError):
+            self.build_config_with(delete_batch_size="1001")
+
     def test_human_readable_sizes_converted_to_bytes(self):
         runtime_config = self.build_config_with(multipart_threshold="10MB")
         self.assertEqual(runtime_config['multipart_threshold'],
@@ -106,3 +134,18 @@ class TestConvertToS3TransferConfig(unittest.TestCase):
         self.assertEqual(result.max_request_queue_size, 4)
         self.assertEqual(result.max_bandwidth, 1024 * 1024)
         self.assertNotEqual(result.max_in_memory_upload_chunks, 1000)
+
+
+class TestGetMaxPoolConnections(unittest.TestCase):
+    def test_low_concurrency_uses_botocore_default(self):
+        runtime_config = transferconfig.RuntimeConfig().build_config(
+            max_concurrent_requests=2)
+        self.assertEqual(
+            transferconfig.get_max_pool_connections(runtime_config),
+            transferconfig.DEFAULT_MAX_POOL_CONNECTIONS)
+
+    def test_sized_for_concurrent_requests(self):
+        runtime_config = transferconfig.RuntimeConfig().build_config(
+            max_concurrent_requests=64, max_list_concurrency=4)
+        self.assertEqual(
+            transferconfig.get_max_pool_connections(runtime_config), 72)
@@ -0,0 +1,179 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import zlib
+
+from s3transfer.manager import TransferConfig
+
+from awscli.customizations.s3.transferjournal import JournaledDownload
+from awscli.customizations.s3.transferjournal import JournaledUpload
+from awscli.customizations.s3.transferjournal import ResumableTransfers
+from awscli.customizations.s3.transferjournal import TransferJournal
+from awscli.testutils import FileCreator, mock, unittest
+
+
+class BaseTransferJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = os.path.join(self.files.rootdir, 'transfers.db')
+        self.journal = TransferJournal(self.filename)
+        self.addCleanup(self.journal.close)
+
+    def create_upload(self, filename='/local/file', upload_id='myid'):
+        return JournaledUpload(
+            'bucket', 'key', filename, 20, 1, 8, 'digest', upload_id, 1.0)
+
+    def create_download(self, filename='/local/file', etag='"etag"'):
+        return JournaledDownload(
+            filename, filename + '.s3resume', 'bucket', 'key', etag, 20, 8,
+            1.0)
+
+
+class TestTransferJournal(BaseTransferJournalTest):
+    def test_records_uploads_and_parts(self):
+        upload = self.create_upload()
+        transfer_id = self.journal.start_upload(upload)
+        self.journal.put_upload_part(transfer_id, 2, '"etag-2"', 22)
+        self.journal.put_upload_part(transfer_id, 1, '"etag-1"', 11)
+        self.journal.close()
+        journal = TransferJournal(self.filename)
+        self.addCleanup(journal.close)
+        self.assertEqual(
+            journal.get_upload('bucket', 'key', '/local/file'),
+            (transfer_id, upload))
+        self.assertEqual(
+            journal.get_upload_parts(transfer_id),
+            {1: ('"etag-1"', 11), 2: ('"etag-2"', 22)})
+        self.assertEqual(journal.list_uploads(), [(transfer_id, upload)])
+
+    def test_restarted_upload_replaces_previous_upload(self):
+        transfer_id = self.journal.start_upload(self.create_upload())
+        self.journal.put_upload_part(transfer_id, 1, '"etag-1"', 11)
+        upload = self.create_upload(upload_id='otherid')
+        new_transfer_id = self.journal.start_upload(upload)
+        self.assertEqual(self.journal.list_uploads(), [
+            (new_transfer_id, upload)])
+        self.assertEqual(self.journal.get_upload_parts(transfer_id), {})
+        self.assertEqual(self.journal.get_upload_parts(new_transfer_id), {})
+
+    def test_delete_upload(self):
+        transfer_id = self.journal.start_upload(self.create_upload())
+        self.journal.put_upload_part(transfer_id, 1, '"etag-1"', 11)
+        self.journal.delete_upload(transfer_id)
+        self.assertIsNone(
+            self.journal.get_upload('bucket', 'key', '/local/file'))
+        self.assertEqual(self.journal.get_upload_parts(transfer_id), {})
+
+    def test_records_downloads_and_parts(self):
+        download = self.create_download()
+        transfer_id = self.journal.start_download(download)
+        self.journal.put_download_part(transfer_id, 1, 11)
+        self.assertEqual(
+            self.journal.get_download('/local/file'), (transfer_id, download))
+        self.assertEqual(self.journal.get_download_parts(transfer_id), {1: 11})
+        self.journal.delete_download(transfer_id)
+        self.assertEqual(self.journal.list_downloads(), [])
+        self.assertEqual(self.journal.get_download_parts(transfer_id), {})
+
+    def test_error_if_journal_cannot_be_opened(self):
+        with self.assertRaises(RuntimeError):
+            TransferJournal(self.files.rootdir)
+
+
+class TestResumableDownloads(BaseTransferJournalTest):
+    def setUp(self):
+        super(TestResumableDownloads, self).setUp()
+        self.client = mock.Mock()
+        self.config = TransferConfig(
+            multipart_threshold=8, multipart_chunksize=8)
+        self.resumable_transfers = ResumableTransfers(
+            self.journal, self.client, self.config)
+        self.osutil = self.resumable_transfers.osutil
+        self.dest = os.path.join(self.files.rootdir, 'file')
+        self.partial_filename = self.dest + '.s3resume'
+
+    def add_download(self, size=20, etag='"etag"'):
+        return self.resumable_transfers.add_download(
+            'bucket', 'key', self.dest, size, etag)
+
+    def write_parts(self, parts):
+        temp_filename = self.osutil.get_temp_filename(self.dest)
+        fileobj = self.osutil.open(temp_filename, 'wb')
+        for offset, data in parts:
+            fileobj.seek(offset)
+            fileobj.write(data)
+        fileobj.close()
+        return temp_filename
+
+    def get_journaled_parts(self):
+        transfer_id, _ = self.journal.get_download(self.dest)
+        return self.journal.get_download_parts(transfer_id)
+
+    def test_small_downloads_are_not_journaled(self):
+        self.assertFalse(self.add_download(size=7))
+        self.assertNotEqual(
+            self.osutil.get_temp_filename(self.dest), self.partial_filename)
+
+    def test_journals_completed_parts(self):
+        self.assertTrue(self.add_download())
+        temp_filename = self.write_parts(
+            [(0, b'a' * 4), (8, b'b' * 8), (4, b'a' * 4), (16, b'c' * 2)])
+        self.assertEqual(temp_filename, self.partial_filename)
+        # The first part is journaled only if it is written from its start.
+        self.assertEqual(
+            self.get_journaled_parts(), {2: zlib.crc32(b'b' * 8)})
+
+    def test_rewritten_part_is_journaled_once_complete(self):
+        self.add_download()
+        self.write_parts([(0, b'a' * 4), (0, b'a' * 8)])
+        self.assertEqual(
+            self.get_journaled_parts(), {1: zlib.crc32(b'a' * 8)})
+
+    def test_failed_download_keeps_partial_file(self):
+        self.add_download()
+        temp_filename = self.write_parts([(0, b'a' * 8)])
+        self.osutil.remove_file(temp_filename)
+        self.assertTrue(os.path.exists(self.partial_filename))
+
+    def test_resumes_download_with_same_etag(self):
+        self.add_download()
+        self.write_parts([(0, b'a' * 8)])
+        self.resumable_transfers.remove_download('bucket', 'key')
+        self.add_download()
+        self.assertEqual(
+            self.get_journaled_parts(), {1: zlib.crc32(b'a' * 8)})
+        # The partial file is not truncated when resumed.
+        self.write_parts([(8, b'b' * 8)])
+        with open(self.partial_filename, 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 8 + b'b' * 8)
+
+    def test_restarts_download_of_changed_object(self):
+        self.add_download()
+        self.write_parts([(0, b'a' * 8)])
+        self.resumable_transfers.remove_download('bucket', 'key')
+        self.add_download(etag='"new-etag"')
+        self.assertEqual(self.get_journaled_parts(), {})
+
+    def test_rename_finishes_download(self):
+        self.add_download()
+        temp_filename = self.write_parts(
+            [(0, b'a' * 8), (8, b'b' * 8), (16, b'c' * 4)])
+        self.osutil.rename_file(temp_filename, self.dest)
+        self.assertIsNone(self.journal.get_download(self.dest))
+        with open(self.dest, 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 8 + b'b' * 8 + b'c' * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@ import os
 import tempfile
 import shutil
 import ntpath
+import threading
 import time
 import datetime
 
@@ -24,10 +25,12 @@ import pytest
 from dateutil.tz import tzlocal
 from s3transfer.futures import TransferMeta, TransferFuture
 from s3transfer.compat import seekable
+import botocore.session
 from botocore.hooks import HierarchicalEmitter
 
 from awscli.compat import queue
 from awscli.compat import StringIO
+from awscli.compat import BytesIO
 from awscli.testutils import FileCreator
 from awscli.customizations.s3.utils import (
     find_bucket_key,
@@ -40,12 +43,16 @@ from awscli.customizations.s3.utils import (
     ProvideLastModifiedTimeSubscriber, DirectoryCreatorSubscriber,
     DeleteSourceObjectSubscriber, DeleteSourceFileSubscriber,
     DeleteCopySourceObjectSubscriber, NonSeekableStream, CreateDirectoryError,
+    ReadAheadStream,
     S3PathResolver, CaseConflictCleanupSubscriber,
-    is_account_regional_namespace_bucket)
+    is_account_regional_namespace_bucket, ShardedBucketLister, PipelineStage,
+    get_connection_pool_stats, ExternalSorter)
 from awscli.customizations.s3.results import WarningResult
+from awscli.customizations.s3.resolutioncache import ResolutionCache
 from tests.unit.customizations.s3 import FakeTransferFuture
 from tests.unit.customizations.s3 import FakeTransferFutureMeta
 from tests.unit.customizations.s3 import FakeTransferFutureCallArgs
+from tests.unit.customizations.s3 import FakeListObjectsV2Client
 
 
 @pytest.fixture
@@ -534,6 +541,18 @@ class TestBucketList(unittest.TestCase):
         for individual_response in individual_response_elements:
             self.assertEqual(individual_response['LastModified'], now)
 
+    def test_list_objects_without_date_parser(self):
+        self.client.get_paginator.return_value.paginate.return_value = [
+            {'Contents': [
+                {'LastModified': '2014-02-27T04:20:38.000Z',
+                 'Key': 'mykey', 'Size': 3}
+            ]}
+        ]
+        lister = BucketLister(self.client, date_parser=None)
+        objects = list(lister.list_objects(bucket='mybucket'))
+        self.assertEqual(
+            objects[0][1]['LastModified'], '2014-02-27T04:20:38.000Z')
+
     def test_list_objects_passes_in_extra_args(self):
         self.client.get_paginator.return_value.paginate.return_value = [
             {'Contents': [
@@ -553,6 +572,254 @@ class TestBucketList(unittest.TestCase):
         )
 
 
+class TestExternalSorter(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+
+    def sort(self, items, **kwargs):
+        sorter = ExternalSorter(tempdir=self.tempdir, **kwargs)
+        return list(sorter.sort(items))
+
+    def test_sorts_in_memory(self):
+        with mock.patch('tempfile.TemporaryFile') as temporary_file:
+            self.assertEqual(self.sort(['c', 'a', 'b']), ['a', 'b', 'c'])
+        self.assertFalse(temporary_file.called)
+
+    def test_sorts_with_key(self):
+        items = [('b', 1), ('c', 2), ('a', 3)]
+        self.assertEqual(
+            self.sort(items, key=lambda item: item[0]),
+            [('a', 3), ('b', 1), ('c', 2)])
+
+    def test_spills_runs_larger_than_buffer(self):
+        items = ['key-%04d' % i for i in range(100)]
+        shuffled = items[1::2] + items[-2::-2]
+        self.assertEqual(self.sort(shuffled, buffer_size=7), items)
+
+    def test_spills_items_with_key(self):
+        items = [('bucket/%03d' % i, {'Size': i}) for i in range(20)]
+        self.assertEqual(
+            self.sort(reversed(items), key=lambda item: item[0],
+                      buffer_size=3),
+            items)
+
+    def test_closes_spilled_runs(self):
+        runs = []
+        create_temporary_file = tempfile.TemporaryFile
+
+        def temporary_file(*args, **kwargs):
+            runs.append(create_temporary_file(*args, **kwargs))
+            return runs[-1]
+
+        sorted_items = ExternalSorter(buffer_size=2).sort(['d', 'c', 'b', 'a'])
+        with mock.patch('tempfile.TemporaryFile', temporary_file):
+            self.assertEqual(next(sorted_items), 'a')
+        self.assertEqual(len(runs), 2)
+        sorted_items.close()
+        self.assertTrue(all(run.closed for run in runs))
+
+    def test_empty(self):
+        self.assertEqual(self.sort([], buffer_size=1), [])
+
+
+class TestShardedBucketLister(unittest.TestCase):
+    def setUp(self):
+        self.keys = [
+            'a/1', 'a/2', 'a/3/x', 'b/', 'b/1', 'b/2', 'c', 'c/1/1', 'c/1/2',
+            'c/2/1', 'd/1', 'e/\u00e9', 'e/z', 'f/1', 'g',
+        ]
+        self.client = FakeListObjectsV2Client(self.keys, max_keys=2)
+        self.date_parser = mock.Mock(return_value=mock.sentinel.now)
+
+    def list_keys(self, lister, prefix=None, page_size=None):
+        return [
+            source_path for source_path, _ in lister.list_objects(
+                bucket='bucket', prefix=prefix, page_size=page_size)
+        ]
+
+    def expected(self, prefix=''):
+        return ['bucket/' + key for key in sorted(self.keys)
+                if key.startswith(prefix)]
+
+    def test_preserves_byte_order(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=4, date_parser=self.date_parser)
+        self.assertEqual(self.list_keys(lister), self.expected())
+
+    def test_preserves_byte_order_with_prefix(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=4, date_parser=self.date_parser)
+        self.assertEqual(self.list_keys(lister, prefix='c'),
+                         self.expected('c'))
+
+    def test_lists_ranges_with_start_after(self):
+        self.client.max_keys = 1000
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=2, date_parser=self.date_parser)
+        self.assertEqual(self.list_keys(lister), self.expected())
+        start_afters = set(
+            request['StartAfter'] for request in self.client.requests
+            if request['Delimiter'] is None
+        )
+        self.assertEqual(
+            start_afters,
+            set([None] + lister.get_split_points('bucket')))
+
+    def test_split_points_come_from_common_prefixes(self):
+        self.client.max_keys = 1000
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=2, date_parser=self.date_parser)
+        self.assertEqual(
+            lister.get_split_points('bucket'),
+            ['b/', 'c/', 'd/', 'e/', 'f/'])
+
+    def test_limits_number_of_split_points(self):
+        self.client.max_keys = 1000
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=2, date_parser=self.date_parser)
+        lister.SHARDS_PER_WORKER = 2
+        self.assertEqual(len(lister.get_split_points('bucket')), 3)
+
+    def test_caller_supplied_split_points(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=3, date_parser=self.date_parser,
+            split_points=['d/1', 'b/1', 'zzz'])
+        self.assertEqual(lister.get_split_points('bucket'),
+                         ['b/1', 'd/1', 'zzz'])
+        self.assertEqual(self.list_keys(lister), self.expected())
+        # No delimiter probing is needed for caller supplied split points.
+        self.assertFalse(
+            any(request['Delimiter'] for request in self.client.requests))
+
+    def test_caller_supplied_split_points_outside_prefix_ignored(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=3, date_parser=self.date_parser,
+            split_points=['b/1', 'c/1/'])
+        self.assertEqual(lister.get_split_points('bucket', prefix='c'),
+                         ['c/1/'])
+        self.assertEqual(self.list_keys(lister, prefix='c'),
+                         self.expected('c'))
+
+    def test_flat_namespace_falls_back_to_single_paginator(self):
+        self.client = FakeListObjectsV2Client(['a', 'b', 'c'])
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=4, date_parser=self.date_parser)
+        self.assertEqual(self.list_keys(lister),
+                         ['bucket/a', 'bucket/b', 'bucket/c'])
+        self.assertEqual(lister.get_split_points('bucket'), [])
+
+    def test_single_worker_does_not_probe(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=1, date_parser=self.date_parser)
+        self.assertEqual(self.list_keys(lister), self.expected())
+        self.assertFalse(
+            any(request['Delimiter'] for request in self.client.requests))
+
+    def test_parses_last_modified(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=4, date_parser=self.date_parser)
+        for _, content in lister.list_objects(bucket='bucket'):
+            self.assertEqual(content['LastModified'], mock.sentinel.now)
+
+    def test_propagates_listing_errors(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=4, date_parser=self.date_parser,
+            split_points=['c'])
+        original = self.client.list_objects_v2
+
+        def list_objects_v2(**kwargs):
+            if kwargs.get('StartAfter') == 'c':
+                raise RuntimeError('listing failed')
+            return original(**kwargs)
+
+        self.client.list_objects_v2 = list_objects_v2
+        listed = []
+        with self.assertRaisesRegex(RuntimeError, 'listing failed'):
+            for source_path, _ in lister.list_objects(bucket='bucket'):
+                listed.append(source_path)
+        self.assertEqual(listed, self.expected()[:7])
+
+    def test_abandoned_listing_stops_workers(self):
+        lister = ShardedBucketLister(
+            self.client, max_concurrency=4, date_parser=self.date_parser,
+            max_buffered_pages=1)
+        listing = lister.list_objects(bucket='bucket', page_size=1)
+        self.assertEqual(next(listing)[0], 'bucket/a/1')
+        # Closing the generator must not hang on workers blocked on
+        # their full buffers.
+        listing.close()
+
+
+class TestPipelineStage(unittest.TestCase):
+    def test_yields_items_in_order(self):
+        stage = PipelineStage(range(100), max_queue_size=2)
+        self.assertEqual(list(stage.run()), list(range(100)))
+
+    def test_runs_iterable_on_another_thread(self):
+        threads = []
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            yield 'item'
+
+        self.assertEqual(list(PipelineStage(record_thread(), 1).run()),
+                         ['item'])
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_raises_error_after_preceding_items(self):
+        def fail_after_one_item():
+            yield 1
+            raise ValueError('listing failed')
+
+        items = PipelineStage(fail_after_one_item(), 10).run()
+        self.assertEqual(next(items), 1)
+        with self.assertRaisesRegex(ValueError, 'listing failed'):
+            next(items)
+
+    def test_stops_producing_when_consumer_stops(self):
+        produced = []
+        closed = threading.Event()
+
+        def produce():
+            try:
+                for i in range(1000):
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.set()
+
+        items = PipelineStage(produce(), max_queue_size=1).run()
+        self.assertEqual(next(items), 0)
+        items.close()
+        self.assertTrue(closed.wait(5))
+        self.assertLess(len(produced), 1000)
+
+
+class TestGetConnectionPoolStats(unittest.TestCase):
+    def create_client(self):
+        session = botocore.session.get_session()
+        return session.create_client(
+            's3', region_name='us-west-2', aws_access_key_id='foo',
+            aws_secret_access_key='bar')
+
+    def test_no_connections(self):
+        self.assertEqual(get_connection_pool_stats(self.create_client()), {})
+
+    def test_counts_connections_and_requests(self):
+        client = self.create_client()
+        manager = client._endpoint.http_session._manager
+        pool = manager.connection_from_url('https://s3.amazonaws.com/')
+        pool.num_connections = 2
+        pool.num_requests = 5
+        self.assertEqual(
+            get_connection_pool_stats(client),
+            {'https://s3.amazonaws.com:443': (2, 5)})
+
+    def test_unsupported_client(self):
+        self.assertEqual(get_connection_pool_stats(object()), {})
+
+
 class TestGetFileStat(unittest.TestCase):
 
     def test_get_file_stat(self):
@@ -1110,6 +1377,44 @@ class TestNonSeekableStream(unittest.TestCase):
         self.assertEqual(nonseekable_fileobj.read(3), 'foo')
 
 
+
+class TestReadAheadStream(unittest.TestCase):
+    def test_reads_parts(self):
+        stream = ReadAheadStream(BytesIO(b'foobarba'), part_size=3)
+        self.assertFalse(seekable(stream))
+        self.assertEqual(stream.read(3), b'foo')
+        self.assertEqual(stream.read(3), b'bar')
+        self.assertEqual(stream.read(3), b'ba')
+        self.assertEqual(stream.read(3), b'')
+
+    def test_reads_across_parts(self):
+        stream = ReadAheadStream(BytesIO(b'foobarbaz'), part_size=2)
+        self.assertEqual(stream.read(5), b'fooba')
+        self.assertEqual(stream.read(1), b'r')
+        self.assertEqual(stream.read(), b'baz')
+        self.assertEqual(stream.read(), b'')
+
+    def test_reads_ahead_of_consumer(self):
+        fileobj = BytesIO(b'foobarbaz')
+        stream = ReadAheadStream(fileobj, part_size=3, max_buffered_parts=1)
+        self.assertEqual(stream.read(3), b'foo')
+        # One part is buffered, and the reader waits to buffer the next.
+        deadline = time.time() + 5
+        while fileobj.tell() < 9 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(fileobj.tell(), 9)
+        self.assertEqual(stream.read(6), b'barbaz')
+
+    def test_raises_read_errors_after_read_parts(self):
+        fileobj = mock.Mock()
+        fileobj.read.side_effect = [b'foo', IOError('read failed')]
+        stream = ReadAheadStream(fileobj, part_size=3)
+        self.assertEqual(stream.read(3), b'foo')
+        with self.assertRaises(IOError):
+            stream.read(3)
+        self.assertEqual(stream.read(3), b'')
+
+
 class TestS3PathResolver:
     _BASE_ACCESSPOINT_ARN = (
         "s3://arn:aws:s3:us-west-2:123456789012:accesspoint/myaccesspoint")
@@ -1247,6 +1552,72 @@ class TestS3PathResolver:
         has_underlying_s3_path = S3PathResolver.has_underlying_s3_path(path)
         assert has_underlying_s3_path == expected_has_underlying_s3_path
 
+    def test_caches_accesspoint_arn_resolution(
+        self, s3control_client, sts_client, tmp_path
+    ):
+        cache = ResolutionCache(str(tmp_path / 'resolutions.json'))
+        resolver = S3PathResolver(s3control_client, sts_client, cache)
+        path = f"{self._BASE_ACCESSPOINT_ARN}/mykey"
+        assert resolver.resolve_underlying_s3_paths(path) == [
+            "s3://mybucket/mykey"]
+        assert resolver.resolve_underlying_s3_paths(path) == [
+            "s3://mybucket/mykey"]
+        assert s3control_client.get_access_point.call_count == 1
+
+    def test_caches_accesspoint_arn_resolution_per_region(
+        self, s3control_client, sts_client, tmp_path
+    ):
+        s3control_client.get_access_point.side_effect = [
+            {"Bucket": "mybucket"}, {"Bucket": "myotherbucket"}]
+        cache = ResolutionCache(str(tmp_path / 'resolutions.json'))
+        resolver = S3PathResolver(s3control_client, sts_client, cache)
+        west_path = f"{self._BASE_ACCESSPOINT_ARN}/mykey"
+        east_path = west_path.replace("us-west-2", "us-east-1")
+        assert resolver.resolve_underlying_s3_paths(west_path) == [
+            "s3://mybucket/mykey"]
+        assert resolver.resolve_underlying_s3_paths(east_path) == [
+            "s3://myotherbucket/mykey"]
+        assert resolver.resolve_underlying_s3_paths(west_path) == [
+            "s3://mybucket/mykey"]
+        assert s3control_client.get_access_point.call_count == 2
+
+    def test_caches_accesspoint_alias_resolution(
+        self, s3control_client, sts_client, tmp_path
+    ):
+        cache = ResolutionCache(str(tmp_path / 'resolutions.json'))
+        resolver = S3PathResolver(s3control_client, sts_client, cache)
+        path = f"{self._BASE_ACCESSPOINT_ALIAS}/mykey"
+        resolver.resolve_underlying_s3_paths(path)
+        resolved_paths = resolver.resolve_underlying_s3_paths(path)
+        assert resolved_paths == ["s3://mybucket/mykey"]
+        sts_client.get_caller_identity.assert_called_once()
+        s3control_client.get_access_point.assert_called_once()
+
+    def test_caches_mrap_arn_resolution(
+        self, s3control_client, sts_client, tmp_path
+    ):
+        cache = ResolutionCache(str(tmp_path / 'resolutions.json'))
+        resolver = S3PathResolver(s3control_client, sts_client, cache)
+        path = f"{self._BASE_MRAP_ARN}/mykey"
+        resolver.resolve_underlying_s3_paths(path)
+        resolved_paths = resolver.resolve_underlying_s3_paths(path)
+        assert resolved_paths == ["s3://mybucket/mykey"]
+        s3control_client.list_multi_region_access_points.assert_called_once()
+
+    def test_uses_resolutions_cached_by_other_invocations(
+        self, s3control_client, sts_client, tmp_path
+    ):
+        filename = str(tmp_path / 'resolutions.json')
+        S3PathResolver(
+            s3control_client, sts_client, ResolutionCache(filename)
+        ).resolve_underlying_s3_paths(self._BASE_ACCESSPOINT_ARN)
+        resolver = S3PathResolver(
+            s3control_client, sts_client, ResolutionCache(filename))
+        resolved_paths = resolver.resolve_underlying_s3_paths(
+            self._BASE_ACCESSPOINT_ARN)
+        assert resolved_paths == ["s3://mybucket/"]
+        s3control_client.get_access_point.assert_called_once()
+
 
 class TestCaseConflictCleanupSubscriber:
     def test_on_done_removes_key_from_set(self):
@@ -17,6 +17,7 @@ from awscli.testutils import (
     mock, unittest,
     BaseAWSHelpOutputTest,BaseAWSCommandParamsTest
 )
+from awscli.clidriver import ServiceCommand
 from awscli.customizations.waiters import add_waiters, WaitCommand, \
     get_waiter_model_from_service_model, WaiterStateCommand, WaiterCaller, \
     WaiterStateDocBuilder, WaiterStateCommandBuilder
@@ -77,6 +78,56 @@ class TestAddWaiters(unittest.TestCase):
         self.assertEqual(command_table, {})
 
 
+class TestAddServiceWaiters(unittest.TestCase):
+    def setUp(self):
+        self.session = mock.Mock()
+        self.session.get_config_variable.return_value = {}
+        self.session.get_waiter_model.return_value = WaiterModel(
+            {
+                'version': 2,
+                'waiters': {
+                    'FooExists': {
+                        'operation': 'DescribeFoo', 'maxAttempts': 1,
+                        'delay': 1, 'acceptors': [],
+                    },
+                }
+            }
+        )
+        self.cache = {}
+        command_table_cache = mock.Mock()
+        command_table_cache.get.side_effect = self.get_cached_value
+        self.service_command = ServiceCommand(
+            'foo', self.session, command_table_cache=command_table_cache)
+
+    def get_cached_value(self, name, load):
+        if name not in self.cache:
+            self.cache[name] = load()
+        return self.cache[name]
+
+    def test_caches_whether_service_has_waiters(self):
+        command_table = {}
+        add_waiters(command_table, self.session, self.service_command)
+        self.assertIsInstance(command_table['wait'], WaitCommand)
+        self.assertEqual(self.cache, {'foo//has-waiters': True})
+
+    def test_no_wait_command_without_waiters(self):
+        self.session.get_waiter_model.side_effect = DataNotFoundError(
+            data_path='foo')
+        command_table = {}
+        add_waiters(command_table, self.session, self.service_command)
+        self.assertEqual(command_table, {})
+        self.assertEqual(self.cache, {'foo//has-waiters': False})
+
+    def test_models_are_loaded_when_wait_command_is_used(self):
+        self.cache['foo//has-waiters'] = True
+        command_table = {}
+        add_waiters(command_table, self.session, self.service_command)
+        self.assertFalse(self.session.get_service_model.called)
+        self.assertFalse(self.session.get_waiter_model.called)
+        self.assertIn('foo-exists', command_table['wait'].subcommand_table)
+        self.assertTrue(self.session.get_waiter_model.called)
+
+
 class TestServicetoWaiterModel(unittest.TestCase):
     def test_service_object_to_waiter_model(self):
         service_model = mock.Mock()
@@ -13,10 +13,15 @@
 # language governing permissions and limitations under the License.
 import base64
 import contextlib
+import copy
 import io
 import sys
 from botocore.compat import json
 import platform
+
+import jmespath
+from botocore.paginate import PageIterator
+
 from awscli.formatter import JSONFormatter
 
 from awscli.testutils import BaseAWSCommandParamsTest, unittest
@@ -118,6 +123,144 @@ class TestListUsers(BaseAWSCommandParamsTest):
         self.assertIn(expected, output)
 
 
+class TestPaginatedListUsers(BaseAWSCommandParamsTest):
+    def setUp(self):
+        super(TestPaginatedListUsers, self).setUp()
+        self.parsed_responses = [
+            {
+                'Users': [{'UserName': 'testuser-50'}],
+                'IsTruncated': True,
+                'Marker': 'marker',
+            },
+            {
+                'Users': [{'UserName': 'testuser-51'}],
+                'IsTruncated': False,
+            },
+        ]
+
+    def test_json_response(self):
+        output = self.run_cmd('iam list-users', expected_rc=0)[0]
+        self.assertEqual(
+            json.loads(output),
+            {'Users': [{'UserName': 'testuser-50'},
+                       {'UserName': 'testuser-51'}]}
+        )
+
+    def test_jmespath_json_response(self):
+        output = self.run_cmd(
+            'iam list-users --query Users[].UserName', expected_rc=0)[0]
+        self.assertEqual(json.loads(output), ['testuser-50', 'testuser-51'])
+
+
+class FakePages(object):
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = 0
+
+    def __call__(self, **kwargs):
+        page = copy.deepcopy(self.pages[self.requested])
+        self.requested += 1
+        if self.requested < len(self.pages):
+            page['NextMarker'] = str(self.requested)
+        return page
+
+
+class TestStreamedPaginatedResponses(unittest.TestCase):
+    def setUp(self):
+        self.pages = FakePages([
+            {
+                'Versions': [{'Key': 'foo', 'Size': 1}],
+                'DeleteMarkers': [{'Key': 'bar'}],
+                'Name': 'mybucket',
+            },
+            {'Versions': [{'Key': 'baz', 'Size': 2}]},
+        ])
+
+    def create_response(self, max_items=None):
+        return PageIterator(
+            self.pages,
+            input_token=['Marker'],
+            output_token=[jmespath.compile('NextMarker')],
+            more_results=None,
+            result_keys=[
+                jmespath.compile('Versions'),
+                jmespath.compile('DeleteMarkers'),
+            ],
+            non_aggregate_keys=[jmespath.compile('Name')],
+            limit_key='MaxKeys',
+            max_items=max_items,
+            starting_token=None,
+            page_size=None,
+            op_kwargs={},
+        )
+
+    def format_response(self, query=None, stream=None, max_items=None):
+        if query is not None:
+            query = jmespath.compile(query)
+        if stream is None:
+            stream = StringIO()
+        formatter = JSONFormatter(mock.Mock(query=query))
+        formatter('command-name', self.create_response(max_items), stream)
+        return stream.getvalue()
+
+    def format_full_result(self, query=None, max_items=None):
+        response = self.create_response(max_items).build_full_result()
+        self.pages.requested = 0
+        if query is not None:
+            response = jmespath.search(query, response)
+        stream = StringIO()
+        JSONFormatter(mock.Mock(query=None))('command-name', response, stream)
+        return stream.getvalue()
+
+    def assert_same_as_full_result(self, query=None, max_items=None):
+        expected = self.format_full_result(query, max_items)
+        self.assertEqual(self.format_response(query, None, max_items),
+                         expected)
+
+    def test_writes_full_result(self):
+        self.assert_same_as_full_result()
+
+    def test_writes_resume_token(self):
+        self.assert_same_as_full_result(max_items=1)
+
+    def test_writes_item_query(self):
+        self.assert_same_as_full_result('Versions[].Key')
+
+    def test_writes_filter_query(self):
+        self.assert_same_as_full_result('Versions[?Size > `1`]')
+
+    def test_writes_query_of_other_result_key(self):
+        self.assert_same_as_full_result('DeleteMarkers[*].Key')
+
+    def test_writes_null_if_query_never_matches(self):
+        self.assertEqual(self.format_response('Missing[].Key'), 'null\n')
+
+    def test_buffers_query_that_needs_full_result(self):
+        self.assertEqual(self.format_response('length(Versions)'), '2\n')
+
+    def test_buffers_if_first_page_has_no_primary_result_key(self):
+        self.pages.pages[0] = {'DeleteMarkers': [{'Key': 'bar'}]}
+        self.assert_same_as_full_result()
+
+    def test_writes_first_page_before_requesting_next(self):
+        pages = self.pages
+        requested_per_write = []
+
+        class RecordingStream(StringIO):
+            def write(self, s):
+                requested_per_write.append(pages.requested)
+                return super().write(s)
+
+        self.format_response('Versions[].Key', RecordingStream())
+        self.assertEqual(requested_per_write[0], 1)
+
+    def test_stops_paginating_when_stream_is_closed(self):
+        stream = mock.Mock(spec=StringIO)
+        stream.write.side_effect = BrokenPipeError
+        self.format_response(stream=stream)
+        self.assertEqual(self.pages.requested, 1)
+
+
 class TestFormattersHandleClosedPipes(unittest.TestCase):
     def test_fully_buffered_handles_io_error(self):
         args = mock.Mock(query=None)
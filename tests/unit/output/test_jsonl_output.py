@@ -0,0 +1,223 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import copy
+import datetime
+
+import jmespath
+from botocore.paginate import PageIterator
+
+from awscli.compat import StringIO
+from awscli.formatter import JSONLinesFormatter, get_formatter
+from awscli.testutils import BaseAWSCommandParamsTest, mock, unittest
+
+
+class TestListUsers(BaseAWSCommandParamsTest):
+    def setUp(self):
+        super(TestListUsers, self).setUp()
+        self.parsed_responses = [
+            {
+                'Users': [{'UserName': 'testuser-50'}],
+                'IsTruncated': True,
+                'Marker': 'marker',
+            },
+            {
+                'Users': [{'UserName': 'testuser-51'}],
+                'IsTruncated': False,
+            },
+        ]
+
+    def test_jsonl_response(self):
+        output = self.run_cmd('iam list-users --output jsonl')[0]
+        self.assertEqual(
+            output,
+            '{"UserName":"testuser-50"}\n'
+            '{"UserName":"testuser-51"}\n'
+        )
+
+    def test_jmespath_jsonl_response(self):
+        output = self.run_cmd(
+            'iam list-users --output jsonl --query Users[].UserName')[0]
+        self.assertEqual(output, '"testuser-50"\n"testuser-51"\n')
+
+
+class FakePages(object):
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = 0
+
+    def __call__(self, **kwargs):
+        page = copy.deepcopy(self.pages[self.requested])
+        self.requested += 1
+        if self.requested < len(self.pages):
+            page['NextMarker'] = str(self.requested)
+        return page
+
+
+class TestJSONLinesFormatter(unittest.TestCase):
+    def setUp(self):
+        self.pages = FakePages([
+            {
+                'Versions': [
+                    {'Key': 'foo', 'Size': 1},
+                    {'Key': 'bar', 'Size': 2},
+                ],
+                'DeleteMarkers': [{'Key': 'baz'}],
+                'Name': 'mybucket',
+            },
+            {'Versions': [{'Key': 'qux', 'Size': 3}]},
+        ])
+
+    def create_response(self, max_items=None):
+        return PageIterator(
+            self.pages,
+            input_token=['Marker'],
+            output_token=[jmespath.compile('NextMarker')],
+            more_results=None,
+            result_keys=[
+                jmespath.compile('Versions'),
+                jmespath.compile('DeleteMarkers'),
+            ],
+            non_aggregate_keys=[jmespath.compile('Name')],
+            limit_key='MaxKeys',
+            max_items=max_items,
+            starting_token=None,
+            page_size=None,
+            op_kwargs={},
+        )
+
+    def format_response(self, response, query=None, stream=None):
+        if query is not None:
+            query = jmespath.compile(query)
+        if stream is None:
+            stream = StringIO()
+        formatter = JSONLinesFormatter(mock.Mock(query=query))
+        formatter('command-name', response, stream)
+        return stream.getvalue()
+
+    def test_get_formatter(self):
+        self.assertIsInstance(
+            get_formatter('jsonl', mock.Mock()), JSONLinesFormatter)
+
+    def test_writes_items_of_first_result_key_then_remaining_result(self):
+        self.assertEqual(
+            self.format_response(self.create_response()),
+            '{"Key":"foo","Size":1}\n'
+            '{"Key":"bar","Size":2}\n'
+            '{"Key":"qux","Size":3}\n'
+            '{"DeleteMarkers":[{"Key":"baz"}],"Name":"mybucket"}\n'
+        )
+
+    def test_keeps_result_keys_apart(self):
+        self.pages = FakePages([
+            {'Items': [{'Id': 1}, {'Id': 2}], 'Prefixes': [{'Id': 'a'}],
+             'Count': 2},
+            {'Items': [{'Id': 3}], 'Prefixes': [{'Id': 'b'}], 'Count': 1},
+        ])
+        response = PageIterator(
+            self.pages,
+            input_token=['Marker'],
+            output_token=[jmespath.compile('NextMarker')],
+            more_results=None,
+            result_keys=[
+                jmespath.compile('Items'),
+                jmespath.compile('Prefixes'),
+                jmespath.compile('Count'),
+            ],
+            non_aggregate_keys=[],
+            limit_key='MaxKeys',
+            max_items=None,
+            starting_token=None,
+            page_size=None,
+            op_kwargs={},
+        )
+        self.assertEqual(
+            self.format_response(response),
+            '{"Id":1}\n'
+            '{"Id":2}\n'
+            '{"Id":3}\n'
+            '{"Prefixes":[{"Id":"a"},{"Id":"b"}],"Count":3}\n'
+        )
+
+    def test_writes_resume_token(self):
+        response = self.create_response(max_items=2)
+        output = self.format_response(response)
+        self.assertEqual(
+            output.splitlines(),
+            [
+                '{"Key":"foo","Size":1}',
+                '{"Key":"bar","Size":2}',
+                '{"DeleteMarkers":[{"Key":"baz"}],"Name":"mybucket",'
+                '"NextToken":"%s"}' % response.resume_token,
+            ]
+        )
+
+    def test_writes_item_query(self):
+        self.assertEqual(
+            self.format_response(
+                self.create_response(), 'Versions[?Size > `1`].Key'),
+            '"bar"\n"qux"\n'
+        )
+
+    def test_writes_query_that_needs_full_result(self):
+        self.assertEqual(
+            self.format_response(
+                self.create_response(), 'sort_by(Versions, &Key)[].Key'),
+            '"bar"\n"foo"\n"qux"\n'
+        )
+
+    def test_writes_scalar_query_result(self):
+        self.assertEqual(
+            self.format_response(self.create_response(), 'length(Versions)'),
+            '3\n'
+        )
+
+    def test_writes_first_page_before_requesting_next(self):
+        pages = self.pages
+        requested_per_write = []
+
+        class RecordingStream(StringIO):
+            def write(self, s):
+                requested_per_write.append(pages.requested)
+                return super().write(s)
+
+        self.format_response(
+            self.create_response(), stream=RecordingStream())
+        # The remaining result is written once the last page was seen.
+        self.assertEqual(requested_per_write, [1, 2, 2])
+
+    def test_stops_paginating_when_stream_is_closed(self):
+        stream = mock.Mock(spec=StringIO)
+        stream.write.side_effect = BrokenPipeError
+        self.format_response(self.create_response(), stream=stream)
+        self.assertEqual(self.pages.requested, 1)
+
+    def test_writes_response_that_is_not_paginated(self):
+        response = {
+            'Bucket': 'mybucket',
+            'LastModified': datetime.datetime(2026, 1, 1),
+            'ResponseMetadata': {'RequestId': 'request-id'},
+        }
+        self.assertEqual(
+            self.format_response(response),
+            '{"Bucket":"mybucket","LastModified":"2026-01-01T00:00:00"}\n'
+        )
+
+    def test_writes_list_query_of_response_one_item_per_line(self):
+        response = {'Buckets': [{'Name': 'foo'}, {'Name': 'bar'}]}
+        self.assertEqual(
+            self.format_response(response, 'Buckets[].Name'),
+            '"foo"\n"bar"\n'
+        )
+
+    def test_empty_response_writes_nothing(self):
+        self.assertEqual(self.format_response({}), '')
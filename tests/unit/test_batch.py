@@ -0,0 +1,280 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import argparse
+import os
+import sys
+import threading
+
+from awscli.batch import (
+    BatchFileError,
+    BatchRunner,
+    HTTPSessionCache,
+    is_batch_command,
+    read_batch_file,
+    split_batch_args,
+)
+from awscli.compat import StringIO
+from awscli.testutils import FileCreator, capture_output, mock, unittest
+
+
+class FakeDriver(object):
+    def __init__(self, runs, barrier, http_session_cache):
+        self._runs = runs
+        self._barrier = barrier
+        self.http_session_cache = http_session_cache
+
+    def main(self, args):
+        self._runs.append(args)
+        command = args[0]
+        if command == 'fail':
+            sys.stderr.write('failed\n')
+            return 1
+        if command == 'exit':
+            raise SystemExit(2)
+        if command == 'wait':
+            self._barrier.wait(5)
+        sys.stdout.write(' '.join(args) + '\n')
+        return 0
+
+
+class FakeArgument(object):
+    def __init__(self, name, dest, default=None):
+        self.name = name
+        self._dest = dest
+        self._default = default
+
+    def add_to_parser(self, parser):
+        parser.add_argument(
+            '--' + self.name, dest=self._dest, default=self._default)
+
+
+ARGUMENT_TABLE = {
+    'batch-file': FakeArgument('batch-file', 'batch_file'),
+    'batch-concurrency': FakeArgument(
+        'batch-concurrency', 'batch_concurrency', 1),
+    'batch-output': FakeArgument('batch-output', 'batch_output', 'ordered'),
+}
+
+
+class TestBatchArgs(unittest.TestCase):
+    def test_is_batch_command(self):
+        self.assertTrue(is_batch_command(['--batch-file', 'cmds.txt']))
+        self.assertTrue(is_batch_command(['--batch-file=cmds.txt']))
+        self.assertFalse(is_batch_command(['s3', 'ls']))
+
+    def test_split_batch_args(self):
+        self.assertEqual(
+            split_batch_args([
+                '--region', 'us-west-2', '--batch-file', 'cmds.txt',
+                '--batch-output=tagged', '--output', 'text',
+            ]),
+            (['--batch-file', 'cmds.txt', '--batch-output=tagged'],
+             ['--region', 'us-west-2', '--output', 'text'])
+        )
+
+
+class TestReadBatchFile(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+
+    def read(self, contents):
+        filename = self.files.create_file('cmds.txt', contents)
+        return [
+            [(command.line_number, command.args) for command in group]
+            for group in read_batch_file(filename)
+        ]
+
+    def test_reads_commands(self):
+        self.assertEqual(
+            self.read('s3 ls\nec2 describe-regions --output text\n'),
+            [[(1, ['s3', 'ls']),
+              (2, ['ec2', 'describe-regions', '--output', 'text'])]]
+        )
+
+    def test_splits_like_shell(self):
+        self.assertEqual(
+            self.read('s3api get-object --key "my key" \'out file\'\n'),
+            [[(1, ['s3api', 'get-object', '--key', 'my key', 'out file'])]]
+        )
+
+    def test_skips_comments_and_leading_aws(self):
+        self.assertEqual(
+            self.read('# comment\naws s3 ls  # list\n'),
+            [[(2, ['s3', 'ls'])]]
+        )
+
+    def test_continues_lines(self):
+        self.assertEqual(
+            self.read('s3 ls \\\n  s3://bucket\ns3 ls\n'),
+            [[(1, ['s3', 'ls', 's3://bucket']), (3, ['s3', 'ls'])]]
+        )
+
+    def test_blank_lines_separate_groups(self):
+        self.assertEqual(
+            self.read('\ns3 ls\n\n\ns3 ls\n# comment\ns3 ls\n\n'),
+            [[(2, ['s3', 'ls'])], [(5, ['s3', 'ls']), (7, ['s3', 'ls'])]]
+        )
+
+    def test_reads_stdin(self):
+        commands = read_batch_file('-', stdin=StringIO('s3 ls\n'))
+        self.assertEqual(commands[0][0].args, ['s3', 'ls'])
+
+    def test_error_for_unbalanced_quotes(self):
+        with self.assertRaisesRegex(BatchFileError, 'line 2'):
+            self.read('s3 ls\ns3 ls "s3://bucket\n')
+
+    def test_error_for_nested_batch_file(self):
+        with self.assertRaisesRegex(BatchFileError, 'line 1'):
+            self.read('--batch-file other.txt\n')
+
+    def test_error_for_missing_file(self):
+        with self.assertRaises(BatchFileError):
+            read_batch_file(os.path.join(self.files.rootdir, 'missing.txt'))
+
+
+class TestHTTPSessionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = HTTPSessionCache()
+
+    def parsed_globals(self, **kwargs):
+        parsed_globals = {
+            'command': 'ec2',
+            'region': None,
+            'output': None,
+            'query': None,
+        }
+        parsed_globals.update(kwargs)
+        return argparse.Namespace(**parsed_globals)
+
+    def share_http_session(self, service_name, parsed_globals):
+        client = mock.Mock()
+        client._endpoint.http_session = object()
+        self.cache.share_http_session(service_name, parsed_globals, client)
+        return client._endpoint.http_session
+
+    def test_shares_http_session(self):
+        http_session = self.share_http_session('ec2', self.parsed_globals())
+        self.assertIs(
+            self.share_http_session('ec2', self.parsed_globals()),
+            http_session
+        )
+
+    def test_shares_http_session_for_other_display_arguments(self):
+        http_session = self.share_http_session('ec2', self.parsed_globals())
+        self.assertIs(
+            self.share_http_session(
+                'ec2', self.parsed_globals(output='text', query='Regions')),
+            http_session
+        )
+
+    def test_separate_http_sessions_for_services(self):
+        http_session = self.share_http_session('ec2', self.parsed_globals())
+        self.assertIsNot(
+            self.share_http_session('s3', self.parsed_globals()),
+            http_session
+        )
+
+    def test_separate_http_sessions_for_other_arguments(self):
+        http_session = self.share_http_session('ec2', self.parsed_globals())
+        self.assertIsNot(
+            self.share_http_session(
+                'ec2', self.parsed_globals(region='us-west-2')),
+            http_session
+        )
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.runs = []
+        self.barrier = None
+        self.http_session_caches = []
+
+    def create_driver(self, http_session_cache):
+        self.http_session_caches.append(http_session_cache)
+        return FakeDriver(self.runs, self.barrier, http_session_cache)
+
+    def run_batch(self, contents, *args):
+        filename = self.files.create_file('cmds.txt', contents)
+        runner = BatchRunner(self.create_driver, ARGUMENT_TABLE)
+        with capture_output() as captured:
+            rc = runner.run(['--batch-file', filename] + list(args))
+        return rc, captured.stdout.getvalue(), captured.stderr.getvalue()
+
+    def test_runs_commands_in_order(self):
+        rc, stdout, stderr = self.run_batch('s3 ls\nec2 describe-regions\n')
+        self.assertEqual(rc, 0)
+        self.assertEqual(stdout, 's3 ls\nec2 describe-regions\n')
+        self.assertEqual(stderr, '')
+
+    def test_adds_shared_arguments(self):
+        self.run_batch('s3 ls\n', '--region', 'us-west-2')
+        self.assertEqual(self.runs, [['--region', 'us-west-2', 's3', 'ls']])
+
+    def test_commands_share_http_session_cache(self):
+        self.run_batch('s3 ls\ns3 ls\n')
+        self.assertEqual(len(self.http_session_caches), 2)
+        self.assertIs(self.http_session_caches[0], self.http_session_caches[1])
+
+    def test_returns_rc_of_first_failed_command(self):
+        rc, stdout, stderr = self.run_batch('fail\ns3 ls\nexit\n')
+        self.assertEqual(rc, 1)
+        self.assertEqual(stdout, 's3 ls\n')
+        self.assertEqual(
+            stderr,
+            'failed\n'
+            'Command on line 1 failed with return code 1\n'
+            'Command on line 3 failed with return code 2\n'
+        )
+
+    def test_tagged_output(self):
+        rc, stdout, stderr = self.run_batch(
+            's3 ls\nfail\n', '--batch-output', 'tagged')
+        self.assertEqual(rc, 1)
+        self.assertEqual(stdout, '[1] s3 ls\n')
+        self.assertEqual(
+            stderr,
+            '[1] return code: 0\n'
+            '[2] failed\n'
+            '[2] return code: 1\n'
+        )
+
+    def test_concurrent_commands_output_in_order(self):
+        self.barrier = threading.Barrier(2)
+        rc, stdout, stderr = self.run_batch(
+            'wait 1\nwait 2\n', '--batch-concurrency', '2')
+        self.assertEqual(rc, 0)
+        self.assertEqual(stdout, 'wait 1\nwait 2\n')
+
+    def test_groups_run_one_after_another(self):
+        self.barrier = threading.Barrier(1)
+        rc, stdout, stderr = self.run_batch(
+            'wait 1\ns3 ls\n\nec2 describe-regions\n',
+            '--batch-concurrency', '4')
+        self.assertEqual(rc, 0)
+        self.assertEqual(self.runs[-1], ['ec2', 'describe-regions'])
+
+    def test_error_for_unreadable_batch_file(self):
+        runner = BatchRunner(self.create_driver, ARGUMENT_TABLE)
+        with capture_output() as captured:
+            rc = runner.run(['--batch-file', 'missing.txt'])
+        self.assertEqual(rc, 255)
+        self.assertIn('Unable to read batch file', captured.stderr.getvalue())
+        self.assertEqual(self.runs, [])
+
+    def test_error_for_invalid_concurrency(self):
+        with capture_output():
+            with self.assertRaises(SystemExit):
+                self.run_batch('s3 ls\n', '--batch-concurrency', '0')
@@ -14,10 +14,13 @@
 from awscli.testutils import mock
 from awscli.testutils import unittest
 from awscli.testutils import BaseAWSCommandParamsTest
+from awscli.testutils import FileCreator
 import logging
 import io
 import sys
 import importlib
+import json
+import os
 
 from botocore.awsrequest import AWSResponse
 from botocore.exceptions import NoCredentialsError
@@ -25,12 +28,14 @@ from botocore.compat import OrderedDict
 import botocore.model
 
 import awscli
+from awscli.batch import HTTPSessionCache
 from awscli.clidriver import CLIDriver
 from awscli.clidriver import create_clidriver
 from awscli.clidriver import CustomArgument
 from awscli.clidriver import CLICommand
 from awscli.clidriver import ServiceCommand
 from awscli.clidriver import ServiceOperation
+from awscli.clidriver import LazyServiceOperation
 from awscli.paramfile import URIArgumentHandler
 from awscli.customizations.commands import BasicCommand
 from awscli import formatter
@@ -255,6 +260,18 @@ class FakeSession(object):
             self.session_vars[name] = value
 
 
+class FakeCommandTableCache(object):
+    def __init__(self, values=None):
+        if values is None:
+            values = {}
+        self.values = values
+
+    def get(self, name, load):
+        if name not in self.values:
+            self.values[name] = load()
+        return self.values[name]
+
+
 class FakeCommand(BasicCommand):
     def _run_main(self, args, parsed_globals):
         # We just return success. If this code is reached, it means that
@@ -333,6 +350,47 @@ class TestCliDriver(unittest.TestCase):
         self.assertEqual(rc, 255)
         self.assertEqual(stderr_b.getvalue().strip(), u"☃".encode("UTF-8"))
 
+    def test_command_table_cache(self):
+        cache = FakeCommandTableCache()
+        driver = CLIDriver(session=self.session, command_table_cache=cache)
+        rc = driver.main('s3 list-objects --bucket foo'.split())
+        self.assertEqual(rc, 0)
+        self.assertEqual(cache.values['services'], ['s3'])
+        self.assertIn(
+            ['list-objects', 'ListObjects', False],
+            cache.values['s3//operations'])
+
+    def test_services_are_read_from_command_table_cache(self):
+        cache = FakeCommandTableCache({'services': ['s3', 'other']})
+        self.session.get_available_services = mock.Mock()
+        driver = CLIDriver(session=self.session, command_table_cache=cache)
+        command_table = driver._get_command_table()
+        self.assertIn('other', command_table)
+        self.assertFalse(self.session.get_available_services.called)
+
+    def test_http_sessions_are_shared_from_http_session_cache(self):
+        http_session_cache = HTTPSessionCache()
+        clients = []
+
+        def create_client(*args, **kwargs):
+            client = FakeSession().create_client(*args, **kwargs)
+            client._endpoint.http_session = object()
+            clients.append(client)
+            return client
+
+        self.session.create_client = create_client
+        for _ in range(2):
+            driver = CLIDriver(
+                session=self.session, http_session_cache=http_session_cache)
+            rc = driver.main('s3 list-objects --bucket foo'.split())
+            self.assertEqual(rc, 0)
+        self.assertEqual(len(clients), 2)
+        self.assertIsNot(clients[0], clients[1])
+        self.assertIs(
+            clients[0]._endpoint.http_session,
+            clients[1]._endpoint.http_session,
+        )
+
 
 class TestCliDriverHooks(unittest.TestCase):
     # These tests verify the proper hooks are emitted in clidriver.
@@ -490,6 +548,31 @@ class TestAWSCommand(BaseAWSCommandParamsTest):
 
         command_table['foo'] = command
 
+    def test_debug_timing(self):
+        _, stderr, _ = self.run_cmd('ec2 describe-regions --debug-timing')
+        phases = [phase['name'] for phase in json.loads(stderr)['phases']]
+        for name in ['build-command-table', 'run-command',
+                     'build-argument-table', 'resolve-credentials',
+                     'create-client', 'call-operation', 'display-response']:
+            self.assertIn(name, phases)
+
+    def test_debug_timing_chrome_trace_to_file(self):
+        files = FileCreator()
+        self.addCleanup(files.remove_all)
+        filename = os.path.join(files.rootdir, 'trace.json')
+        self.environ['AWS_CLI_DEBUG_TIMING'] = 'chrome-trace'
+        self.environ['AWS_CLI_DEBUG_TIMING_FILE'] = filename
+        _, stderr, _ = self.run_cmd('ec2 describe-regions')
+        self.assertEqual(stderr, '')
+        with open(filename) as f:
+            trace = json.load(f)
+        self.assertIn(
+            'run-command', [event['name'] for event in trace['traceEvents']])
+
+    def test_no_debug_timing_by_default(self):
+        _, stderr, _ = self.run_cmd('ec2 describe-regions')
+        self.assertEqual(stderr, '')
+
     def test_event_emission_for_top_level_params(self):
         driver = create_clidriver()
         # --unknown-foo is an known arg, so we expect a 255 rc.
@@ -912,6 +995,50 @@ class TestServiceCommand(unittest.TestCase):
         self.assertEqual(child_help_cmd.event_class, 'foo.list-objects')
 
 
+class TestServiceCommandWithCache(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession()
+        self.session.get_service_model = mock.Mock(
+            side_effect=self.session.get_service_model)
+        self.cache = FakeCommandTableCache({
+            's3//operations': [
+                ['list-objects', 'ListObjects', False],
+                ['old-operation', 'OldOperation', True],
+            ],
+        })
+        self.cmd = ServiceCommand(
+            's3', self.session, command_table_cache=self.cache)
+
+    def test_command_table_is_built_from_cache(self):
+        command_table = self.cmd._get_command_table()
+        self.assertEqual(
+            list(command_table), ['list-objects', 'old-operation'])
+        self.assertIsInstance(
+            command_table['list-objects'], LazyServiceOperation)
+        self.assertTrue(command_table['old-operation']._UNDOCUMENTED)
+        self.assertFalse(self.session.get_service_model.called)
+
+    def test_operation_model_is_loaded_when_needed(self):
+        operation = self.cmd._get_command_table()['list-objects']
+        self.assertIn('bucket', operation.arg_table)
+        self.session.get_service_model.assert_called_once_with(
+            's3', api_version=None)
+
+    def test_operations_are_cached(self):
+        self.cache.values.clear()
+        self.cmd._get_command_table()
+        self.assertIn(
+            ['list-objects', 'ListObjects', False],
+            self.cache.values['s3//operations'])
+
+    def test_cached_values_are_scoped_by_api_version(self):
+        self.session.get_config_variable = mock.Mock(
+            return_value={'s3': '2006-03-01'})
+        value = self.cmd.get_cached_value('foo', lambda: 'bar')
+        self.assertEqual(value, 'bar')
+        self.assertEqual(self.cache.values['s3/2006-03-01/foo'], 'bar')
+
+
 class TestServiceOperation(unittest.TestCase):
     def setUp(self):
         self.name = 'foo'
@@ -0,0 +1,114 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+
+from awscli.commandcache import CommandTableCache
+from awscli.testutils import FileCreator, mock, unittest
+
+
+class FakeLoader(object):
+    def __init__(self, search_paths):
+        self.search_paths = search_paths
+
+
+class TestCommandTableCache(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = os.path.join(
+            self.files.rootdir, 'cache', 'command-tables.json')
+        self.models_dir = os.path.join(self.files.rootdir, 'models')
+        self.session = mock.Mock()
+        self.session.full_config = {}
+        self.session.get_component.return_value = FakeLoader(
+            [self.models_dir])
+        self.load = mock.Mock(return_value=['ec2', 's3'])
+
+    def create_cache(self):
+        return CommandTableCache(self.session, self.filename)
+
+    def test_loads_missing_value(self):
+        self.assertEqual(
+            self.create_cache().get('services', self.load), ['ec2', 's3'])
+        self.load.assert_called_once_with()
+
+    def test_values_are_shared_through_file(self):
+        self.create_cache().get('services', self.load)
+        self.assertEqual(
+            self.create_cache().get('services', self.load), ['ec2', 's3'])
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_names_are_separate(self):
+        cache = self.create_cache()
+        cache.get('services', self.load)
+        self.assertEqual(cache.get('ec2//operations', lambda: []), [])
+        self.assertEqual(
+            self.create_cache().get('services', self.load), ['ec2', 's3'])
+
+    def test_keeps_values_written_by_others(self):
+        cache = self.create_cache()
+        cache.get('services', self.load)
+        self.create_cache().get('ec2//operations', lambda: [])
+        cache.get('s3//operations', lambda: [])
+        self.assertEqual(
+            self.create_cache().get('ec2//operations', self.load), [])
+
+    def test_invalidated_by_awscli_version(self):
+        self.create_cache().get('services', self.load)
+        with mock.patch('awscli.commandcache.awscli_version', '0.0.0'):
+            self.create_cache().get('services', self.load)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_invalidated_by_botocore_version(self):
+        self.create_cache().get('services', self.load)
+        with mock.patch('awscli.commandcache.botocore_version', '0.0.0'):
+            self.create_cache().get('services', self.load)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_invalidated_by_plugins(self):
+        self.create_cache().get('services', self.load)
+        self.session.full_config = {'plugins': {'myplugin': 'module'}}
+        self.create_cache().get('services', self.load)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_invalidated_by_added_model(self):
+        self.create_cache().get('services', self.load)
+        self.files.create_file(
+            os.path.join('models', 'foo', '2026-01-01', 'service-2.json'),
+            '{}')
+        self.create_cache().get('services', self.load)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_invalidated_by_data_paths(self):
+        self.create_cache().get('services', self.load)
+        self.session.get_component.return_value = FakeLoader(
+            [self.models_dir, os.path.join(self.files.rootdir, 'other')])
+        self.create_cache().get('services', self.load)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_ignores_corrupt_file(self):
+        self.files.create_file(
+            os.path.join('cache', 'command-tables.json'), 'not json')
+        self.assertEqual(
+            self.create_cache().get('services', self.load), ['ec2', 's3'])
+        self.assertEqual(
+            self.create_cache().get('services', self.load), ['ec2', 's3'])
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_ignores_errors_writing_file(self):
+        cache = self.create_cache()
+        with mock.patch('os.replace', side_effect=OSError('denied')):
+            self.assertEqual(cache.get('services', self.load), ['ec2', 's3'])
+        self.assertEqual(cache.get('services', self.load), ['ec2', 's3'])
+        self.assertEqual(self.load.call_count, 1)
+        self.assertEqual(os.listdir(os.path.dirname(self.filename)), [])
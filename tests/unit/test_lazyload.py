@@ -0,0 +1,167 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import copy
+import sys
+
+from botocore.hooks import HierarchicalEmitter
+
+from awscli.lazyload import LazyCustomization, register_lazy_customizations
+from awscli.testutils import unittest
+
+
+class FakeCustomizationModule(object):
+    def __init__(self):
+        self.num_registrations = 0
+        self.calls = []
+
+    def register(self, event_handlers):
+        self.num_registrations += 1
+        event_handlers.register('building-command-table.foo', self.handler)
+        event_handlers.register_last('doc-output.foo', self.last_handler)
+        event_handlers.register('calling-command.foo', self.respond)
+
+    def register_undeclared(self, event_handlers):
+        self.register(event_handlers)
+        event_handlers.register('after-call.foo', self.handler)
+
+    def register_later(self, event_handlers):
+        self.handler = lambda **kwargs: event_handlers.register(
+            'after-call.foo', self.last_handler
+        )
+        self.register(event_handlers)
+
+    def handler(self, **kwargs):
+        self.calls.append(('handler', kwargs))
+
+    def last_handler(self, **kwargs):
+        self.calls.append(('last_handler', kwargs))
+
+    def respond(self, **kwargs):
+        return 'response'
+
+
+class TestLazyCustomization(unittest.TestCase):
+    def setUp(self):
+        self.module = FakeCustomizationModule()
+        sys.modules['__fake_customization__'] = self.module
+        self.addCleanup(sys.modules.pop, '__fake_customization__')
+        self.emitter = HierarchicalEmitter()
+        self.customization = LazyCustomization(
+            '__fake_customization__',
+            'register',
+            events=['building-command-table.foo', 'calling-command.foo'],
+            last_events=['doc-output.foo'],
+        )
+
+    def register(self, customization=None):
+        if customization is None:
+            customization = self.customization
+        register_lazy_customizations(self.emitter, [customization])
+
+    def test_not_loaded_until_event_is_emitted(self):
+        self.register()
+        self.emitter.emit('building-command-table.bar')
+        self.assertEqual(self.module.num_registrations, 0)
+        self.emitter.emit('building-command-table.foo', command_table={})
+        self.assertEqual(self.module.num_registrations, 1)
+        self.assertEqual(
+            self.module.calls,
+            [
+                (
+                    'handler',
+                    {
+                        'command_table': {},
+                        'event_name': 'building-command-table.foo',
+                    },
+                )
+            ],
+        )
+
+    def test_loaded_once(self):
+        self.register()
+        self.emitter.emit('building-command-table.foo')
+        self.emitter.emit('building-command-table.foo')
+        self.emitter.emit('doc-output.foo')
+        self.assertEqual(self.module.num_registrations, 1)
+        self.assertEqual(
+            [name for name, _ in self.module.calls],
+            ['handler', 'handler', 'last_handler'],
+        )
+
+    def test_returns_handler_response(self):
+        self.register()
+        _, response = self.emitter.emit_until_response('calling-command.foo')
+        self.assertEqual(response, 'response')
+
+    def test_keeps_order_of_handlers(self):
+        calls = []
+        self.emitter.register(
+            'building-command-table.foo', lambda **kwargs: calls.append(1)
+        )
+        self.register()
+        self.emitter.register(
+            'building-command-table.foo', lambda **kwargs: calls.append(3)
+        )
+        self.module.handler = lambda **kwargs: calls.append(2)
+        self.emitter.emit('building-command-table.foo')
+        self.assertEqual(calls, [1, 2, 3])
+
+    def test_keeps_position_of_handlers(self):
+        calls = []
+        self.register()
+        self.emitter.register(
+            'doc-output.foo', lambda **kwargs: calls.append('middle')
+        )
+        self.module.last_handler = lambda **kwargs: calls.append('last')
+        self.emitter.emit('doc-output.foo')
+        self.assertEqual(calls, ['middle', 'last'])
+
+    def test_handlers_are_called_from_copied_emitters(self):
+        self.register()
+        copied_emitter = copy.copy(self.emitter)
+        copied_emitter.emit('building-command-table.foo')
+        self.emitter.emit('building-command-table.foo')
+        self.assertEqual(self.module.num_registrations, 1)
+        self.assertEqual(len(self.module.calls), 2)
+
+    def test_undeclared_handlers_are_registered(self):
+        self.register(
+            LazyCustomization(
+                '__fake_customization__',
+                'register_undeclared',
+                events=['building-command-table.foo', 'calling-command.foo'],
+                last_events=['doc-output.foo'],
+            )
+        )
+        self.emitter.emit('building-command-table.foo')
+        self.emitter.emit('after-call.foo')
+        self.assertEqual(
+            [kwargs['event_name'] for _, kwargs in self.module.calls],
+            ['building-command-table.foo', 'after-call.foo'],
+        )
+
+    def test_handlers_registered_after_loading_are_registered(self):
+        self.register(
+            LazyCustomization(
+                '__fake_customization__',
+                'register_later',
+                events=['building-command-table.foo', 'calling-command.foo'],
+                last_events=['doc-output.foo'],
+            )
+        )
+        self.emitter.emit('building-command-table.foo')
+        self.emitter.emit('after-call.foo')
+        self.assertEqual(
+            [kwargs['event_name'] for _, kwargs in self.module.calls],
+            ['after-call.foo'],
+        )
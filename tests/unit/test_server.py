@@ -0,0 +1,118 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import socket
+import stat
+
+from awscli.server import CLIServer, ServerError
+from awscli.testutils import FileCreator, mock, skip_if_windows, unittest
+
+
+class FakeLoader(object):
+    def __init__(self, search_paths):
+        self.search_paths = search_paths
+
+
+@skip_if_windows('The CLI server requires Unix domain sockets.')
+class TestCLIServer(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.socket_path = os.path.join(
+            self.files.rootdir, 'server', 'aws.sock')
+        self.config_file = self.files.create_file('config', '')
+        self.models_dir = os.path.join(self.files.rootdir, 'models')
+        self.server = CLIServer(self.socket_path)
+
+    def watch(self):
+        self.server._loader = FakeLoader([self.models_dir])
+        self.server._watched_files = [self.config_file]
+        self.server._watched_state = self.server._get_watched_state()
+
+    def listen(self):
+        listener = self.server._listen()
+        self.addCleanup(listener.close)
+        return listener
+
+    def test_socket_only_accessible_by_user(self):
+        self.listen()
+        mode = os.stat(self.socket_path).st_mode
+        self.assertTrue(stat.S_ISSOCK(mode))
+        self.assertEqual(stat.S_IMODE(mode), 0o600)
+        self.assertEqual(
+            stat.S_IMODE(os.stat(os.path.dirname(self.socket_path)).st_mode),
+            0o700,
+        )
+
+    def test_replaces_stale_socket(self):
+        self.listen().close()
+        self.assertTrue(os.path.exists(self.socket_path))
+        self.listen()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+
+    def test_error_if_server_already_listening(self):
+        self.listen()
+        with self.assertRaises(ServerError):
+            CLIServer(self.socket_path)._listen()
+
+    def test_accepts_connections_from_user(self):
+        listener = self.listen()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            conn = self.server._accept(listener)
+            self.assertIsNotNone(conn)
+            conn.close()
+
+    def test_no_reload_if_nothing_changed(self):
+        self.watch()
+        self.assertFalse(self.server._needs_reload())
+
+    def test_reload_if_config_file_changes(self):
+        self.watch()
+        config_stat = os.stat(self.config_file)
+        os.utime(
+            self.config_file,
+            ns=(config_stat.st_atime_ns, config_stat.st_mtime_ns + 10 ** 9),
+        )
+        self.assertTrue(self.server._needs_reload())
+
+    def test_reload_if_config_file_created(self):
+        self.config_file = os.path.join(self.files.rootdir, 'credentials')
+        self.watch()
+        self.files.create_file('credentials', '')
+        self.assertTrue(self.server._needs_reload())
+
+    def test_reload_if_model_added(self):
+        self.watch()
+        self.files.create_file(
+            os.path.join('models', 'foo', '2026-01-01', 'service-2.json'),
+            '{}')
+        self.assertTrue(self.server._needs_reload())
+
+    def test_uses_warm_loader_for_same_data_path(self):
+        self.server._loader = mock.sentinel.loader
+        self.server._data_path = '/data'
+        session = mock.Mock()
+        session.get_config_variable.return_value = '/data'
+        self.server._use_warm_loader(session)
+        session.register_component.assert_called_once_with(
+            'data_loader', mock.sentinel.loader)
+
+    def test_does_not_use_warm_loader_for_other_data_path(self):
+        self.server._loader = mock.sentinel.loader
+        self.server._data_path = '/data'
+        session = mock.Mock()
+        session.get_config_variable.return_value = '/other'
+        self.server._use_warm_loader(session)
+        self.assertFalse(session.register_component.called)
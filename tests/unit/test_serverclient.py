@@ -0,0 +1,110 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import os
+import socket
+import threading
+
+from awscli.compat import StringIO
+from awscli.serverclient import (
+    ConnectionClosedError,
+    forward_command,
+    recv_message,
+    send_message,
+)
+from awscli.testutils import FileCreator, mock, skip_if_windows, unittest
+
+
+@skip_if_windows('The CLI server requires Unix domain sockets.')
+class TestMessages(unittest.TestCase):
+    def setUp(self):
+        self.client, self.server = socket.socketpair()
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server.close)
+
+    def test_sends_message(self):
+        send_message(self.client, {'args': ['s3', 'ls'], 'rc': 0})
+        self.assertEqual(
+            recv_message(self.server), ({'args': ['s3', 'ls'], 'rc': 0}, []))
+
+    def test_sends_large_message(self):
+        message = {'env': {'VAR%s' % i: 'x' * 100 for i in range(1000)}}
+        send_message(self.client, message)
+        self.assertEqual(recv_message(self.server)[0], message)
+
+    def test_sends_file_descriptors(self):
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        send_message(self.client, {'streams': ['stdout']}, [write_fd])
+        message, fds = recv_message(self.server, maxfds=3)
+        self.assertEqual(message, {'streams': ['stdout']})
+        self.assertEqual(len(fds), 1)
+        with os.fdopen(fds[0], 'wb') as f:
+            f.write(b'foo')
+        self.assertEqual(os.read(read_fd, 3), b'foo')
+
+    def test_raises_error_when_connection_closed(self):
+        self.client.close()
+        with self.assertRaises(ConnectionClosedError):
+            recv_message(self.server)
+
+
+@skip_if_windows('The CLI server requires Unix domain sockets.')
+class TestForwardCommand(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.socket_path = os.path.join(self.files.rootdir, 'aws.sock')
+        self.requests = []
+
+    def start_server(self, responses):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(listener.close)
+        listener.bind(self.socket_path)
+        listener.listen(1)
+
+        def serve():
+            conn, _ = listener.accept()
+            with conn:
+                request, fds = recv_message(conn, maxfds=3)
+                for fd in fds:
+                    os.close(fd)
+                self.requests.append(request)
+                for response in responses:
+                    send_message(conn, response)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def test_returns_none_without_server(self):
+        self.assertIsNone(forward_command(self.socket_path, ['s3', 'ls']))
+
+    def test_returns_rc_of_command(self):
+        self.start_server([{'pid': os.getpid()}, {'rc': 3}])
+        self.assertEqual(forward_command(self.socket_path, ['s3', 'ls']), 3)
+        request = self.requests[0]
+        self.assertEqual(request['args'], ['s3', 'ls'])
+        self.assertEqual(request['cwd'], os.getcwd())
+        self.assertEqual(request['env'], dict(os.environ))
+
+    def test_returns_none_if_command_not_started(self):
+        self.start_server([])
+        self.assertIsNone(forward_command(self.socket_path, ['s3', 'ls']))
+
+    def test_reports_connection_lost_while_running(self):
+        self.start_server([{'pid': os.getpid()}])
+        with mock.patch('sys.stderr', StringIO()) as stderr:
+            rc = forward_command(self.socket_path, ['s3', 'ls'])
+        self.assertEqual(rc, 255)
+        self.assertIn('Lost the connection', stderr.getvalue())
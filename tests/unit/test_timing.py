@@ -0,0 +1,191 @@
+# Copyright 2026 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+#     http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+import argparse
+import json
+import os
+import sys
+
+from botocore.hooks import HierarchicalEmitter
+
+from awscli.compat import StringIO
+from awscli.testutils import FileCreator, mock, unittest
+from awscli.timing import PhaseTimer, resolve_debug_timing_format
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResolveDebugTimingFormat(unittest.TestCase):
+    def resolve(self, env=None, debug_timing=False):
+        parsed_globals = argparse.Namespace(debug_timing=debug_timing)
+        with mock.patch('os.environ', env or {}):
+            return resolve_debug_timing_format(parsed_globals)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.resolve())
+
+    def test_enabled_by_argument(self):
+        self.assertEqual(self.resolve(debug_timing=True), 'json')
+
+    def test_enabled_by_env_var(self):
+        self.assertEqual(
+            self.resolve({'AWS_CLI_DEBUG_TIMING': 'chrome-trace'}),
+            'chrome-trace')
+        self.assertEqual(
+            self.resolve({'AWS_CLI_DEBUG_TIMING': 'true'}), 'json')
+
+    def test_env_var_sets_format_of_argument(self):
+        self.assertEqual(
+            self.resolve({'AWS_CLI_DEBUG_TIMING': 'chrome-trace'},
+                         debug_timing=True),
+            'chrome-trace')
+
+    def test_disabled_by_false_env_var(self):
+        self.assertIsNone(self.resolve({'AWS_CLI_DEBUG_TIMING': 'false'}))
+
+    def test_no_parsed_globals(self):
+        with mock.patch('os.environ', {}):
+            self.assertIsNone(resolve_debug_timing_format(None))
+
+
+class TestPhaseTimer(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.timer = PhaseTimer(clock=self.clock)
+
+    def test_records_phases(self):
+        with self.timer.phase('first'):
+            self.clock.now = 0.5
+        with self.timer.phase('second'):
+            self.clock.now = 2
+        self.assertEqual(
+            self.timer.get_timings(),
+            {
+                'total': 2000,
+                'phases': [
+                    {'name': 'first', 'start': 0, 'duration': 500,
+                     'imports': 0},
+                    {'name': 'second', 'start': 500, 'duration': 1500,
+                     'imports': 0},
+                ]
+            }
+        )
+
+    def test_records_nested_phases_in_order_of_start(self):
+        with self.timer.phase('outer'):
+            self.clock.now = 1
+            with self.timer.phase('inner'):
+                self.clock.now = 2
+        self.assertEqual(
+            [(phase['name'], phase['start'], phase['duration'])
+             for phase in self.timer.get_timings()['phases']],
+            [('outer', 0, 2000), ('inner', 1000, 1000)]
+        )
+
+    def test_records_phase_that_raises(self):
+        with self.assertRaises(ValueError):
+            with self.timer.phase('failing'):
+                raise ValueError()
+        self.assertEqual(
+            self.timer.get_timings()['phases'][0]['name'], 'failing')
+
+    def test_counts_imports(self):
+        with mock.patch.dict(sys.modules):
+            with self.timer.phase('import'):
+                sys.modules['__fake_imported_module__'] = mock.Mock()
+        self.assertEqual(
+            self.timer.get_timings()['phases'][0]['imports'], 1)
+
+    def test_starts_at_start_time(self):
+        self.clock.now = 10
+        timer = PhaseTimer(clock=self.clock, start_time=4)
+        timer.add_phase('import', 4, 9, imports=100)
+        self.assertEqual(
+            timer.get_timings(),
+            {
+                'total': 6000,
+                'phases': [
+                    {'name': 'import', 'start': 0, 'duration': 5000,
+                     'imports': 100},
+                ]
+            }
+        )
+
+    def test_records_requests(self):
+        emitter = HierarchicalEmitter()
+        self.timer.register_request_timing(emitter)
+        self.clock.now = 1
+        emitter.emit('before-send.ec2.DescribeRegions', request=None)
+        self.clock.now = 3
+        emitter.emit('response-received.ec2.DescribeRegions')
+        self.assertEqual(
+            self.timer.get_timings()['phases'],
+            [{'name': 'send-request', 'start': 1000, 'duration': 2000,
+              'imports': 0}]
+        )
+
+    def test_chrome_trace(self):
+        self.clock.now = 1
+        with self.timer.phase('phase'):
+            self.clock.now = 1.5
+        trace = self.timer.get_chrome_trace()
+        self.assertEqual(trace['displayTimeUnit'], 'ms')
+        event = trace['traceEvents'][0]
+        self.assertEqual(event['name'], 'phase')
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['ts'], 1000000)
+        self.assertEqual(event['dur'], 500000)
+        self.assertEqual(event['pid'], os.getpid())
+        self.assertEqual(event['args'], {'imports': 0})
+
+
+class TestWritePhaseTimings(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = os.path.join(self.files.rootdir, 'timings.json')
+        self.timer = PhaseTimer(clock=FakeClock())
+        with self.timer.phase('phase'):
+            pass
+        self.environ = {}
+        self.environ_patch = mock.patch('os.environ', self.environ)
+        self.environ_patch.start()
+        self.addCleanup(self.environ_patch.stop)
+
+    def test_writes_json_to_stderr(self):
+        with mock.patch('sys.stderr', StringIO()) as stderr:
+            self.timer.write('json')
+        self.assertEqual(
+            json.loads(stderr.getvalue()), self.timer.get_timings())
+
+    def test_writes_chrome_trace_to_file(self):
+        self.timer.write('chrome-trace', self.filename)
+        with open(self.filename) as f:
+            self.assertEqual(json.load(f), self.timer.get_chrome_trace())
+
+    def test_writes_to_file_from_env_var(self):
+        self.environ['AWS_CLI_DEBUG_TIMING_FILE'] = self.filename
+        self.timer.write('json')
+        with open(self.filename) as f:
+            self.assertEqual(json.load(f), self.timer.get_timings())
+
+    def test_reports_errors_writing_file(self):
+        filename = os.path.join(self.files.rootdir, 'missing', 'file.json')
+        with mock.patch('sys.stderr', StringIO()) as stderr:
+            self.timer.write('json', filename)
+        self.assertIn('Could not write debug timings', stderr.getvalue())
@@ -15,15 +15,17 @@ import platform
 import pytest
 import subprocess
 import os
+import json
 
 import botocore.model
 
-from awscli.testutils import unittest, skip_if_windows, mock
+from awscli.testutils import unittest, skip_if_windows, mock, FileCreator
 from awscli.utils import (
     split_on_commas, ignore_ctrl_c, find_service_and_method_in_event_name,
     is_document_type, is_document_type_container, is_streaming_blob_type,
     is_tagged_union_type, operation_uses_document_types, ShapeWalker,
-    ShapeRecordingVisitor, OutputStreamFactory, resolve_v2_debug_mode
+    ShapeRecordingVisitor, OutputStreamFactory, resolve_v2_debug_mode,
+    SharedJSONFile
 )
 
 
@@ -240,6 +242,46 @@ class TestOutputStreamFactory(unittest.TestCase):
             self.fail('Should not raise IOError')
 
 
+class TestSharedJSONFile(unittest.TestCase):
+    def setUp(self):
+        self.files = FileCreator()
+        self.addCleanup(self.files.remove_all)
+        self.filename = os.path.join(
+            self.files.rootdir, 'cache', 'values.json')
+        self.shared_file = SharedJSONFile(self.filename, 'test cache')
+
+    def test_load_missing_file(self):
+        self.assertIsNone(self.shared_file.load())
+
+    def test_load_corrupt_file(self):
+        self.files.create_file(os.path.join('cache', 'values.json'), 'bad')
+        self.assertIsNone(self.shared_file.load())
+
+    def test_save_and_load(self):
+        self.shared_file.save({'foo': ['bar']})
+        self.assertEqual(self.shared_file.load(), {'foo': ['bar']})
+        self.assertEqual(
+            os.listdir(os.path.dirname(self.filename)), ['values.json'])
+
+    def test_save_ignores_errors(self):
+        with mock.patch('os.replace', side_effect=OSError('denied')):
+            self.shared_file.save({'foo': 'bar'})
+        self.assertEqual(os.listdir(os.path.dirname(self.filename)), [])
+
+    def test_update_uses_current_contents(self):
+        self.shared_file.load()
+        SharedJSONFile(self.filename, 'test cache').save({'foo': 1})
+        value = self.shared_file.update(
+            lambda current: dict(current, bar=2))
+        self.assertEqual(value, {'foo': 1, 'bar': 2})
+        with open(self.filename) as f:
+            self.assertEqual(json.load(f), {'foo': 1, 'bar': 2})
+
+    def test_update_returning_none_leaves_file_unchanged(self):
+        self.assertIsNone(self.shared_file.update(lambda current: None))
+        self.assertFalse(os.path.exists(self.filename))
+
+
 class BaseShapeTest(unittest.TestCase):
     def setUp(self):
         self.shapes = {}